@@ -51,10 +51,15 @@ import os
 import sys
 import plistlib
 import traceback
-import ast
 import json
-import requests
 
+#Run a recovery without the GUI if asked to. This is done before importing wx, as that is
+#slow, and needs a display.
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    import Tools.headless as Headless
+    sys.exit(Headless.main(sys.argv[1:]))
+
+import requests
 import wx
 
 #Compatibility with wxPython 4.
@@ -78,7 +83,20 @@ import wx.lib.stattext
 import wx.lib.statbmp
 
 import Tools.tools as BackendTools
-import Tools.DDRescueTools.setup as DDRescueTools
+import Tools.snapshot as Snapshot
+import Tools.terminal as Terminal
+import Tools.recovery as Recovery
+import Tools.units as Units
+import Tools.estimator as Estimator
+import Tools.mapfile as MapFile
+import Tools.blockmap as BlockMap
+import Tools.scheduler as Scheduler
+import Tools.exporter as Exporter
+import Tools.inventory as Inventory
+import Tools.deviceinfo as DeviceInfo
+import Tools.startupcache as StartupCache
+import Tools.journal as Journal
+import Tools.strategy as Strategy
 
 import getdevinfo
 
@@ -122,6 +140,8 @@ def usage():
     print("                                     The default, as it's very helpful if problems")
     print("                                     are encountered, and the user needs help\n")
     print("       -t, --tests                   Run all unit tests.")
+    print("           --headless                Run a recovery without the GUI. Use")
+    print("                                     --headless --help for more information.\n")
     print("DDRescue-GUI "+VERSION+" is released under the GNU GPL Version 3")
     print("Copyright (C) Hamish McIntyre-Bhatty 2013-2018")
 
@@ -209,16 +229,53 @@ if __name__ == "__main__":
     else:
         logger.debug("Detected Mac OS X...")
 
+def get_ddrescue_command():
+    """Return how to start ddrescue as root, for Recovery.build_exec_list()"""
+    #A stand-in for ddrescue (eg for testing) doesn't need root.
+    override = Recovery.get_ddrescue_override()
+
+    if override is not None:
+        return [override, "-v"]
+
+    if LINUX:
+        return ["pkexec", RESOURCEPATH+"/Tools/helpers/runasroot_linux_ddrescue.sh",
+                "ddrescue", "-v"]
+
+    return ["sudo", "-SH", RESOURCEPATH+"/ddrescue", "-v"] #FIXME won't work if credentials have expired.
+
+def stop_ddrescue(pid):
+    """Stop the ddrescue with process ID pid (which runs as root) with the helper"""
+    wx.CallAfter(BackendTools.stop_ddrescue, pid)
+
+def get_ddrescue_stopper():
+    """
+    Return how to stop a ddrescue started with get_ddrescue_command(), for
+    Strategy.StrategyRunner, or None if we can send it signals ourselves.
+    """
+
+    if Recovery.get_ddrescue_override() is not None:
+        return None
+
+    return stop_ddrescue
+
 #Begin Disk Information Handler thread.
 class GetDiskInformation(threading.Thread):
     """
     Used to get disk information without blocking the GUI thread.
-    Calls parent.receive_diskinfo when info has ben retrieved.
+    Calls parent.receive_diskinfo_changes with the disks as they arrive, and
+    parent.receive_diskinfo when all the info has been retrieved.
     """
 
+    #How often to pass on the disks that have arrived, in seconds.
+    PARTIAL_INTERVAL = 0.5
+
     def __init__(self, parent):
         """Initialize and start the thread."""
         self.parent = parent
+        self.decoder = DeviceInfo.DeviceInfoDecoder()
+        self.pending = {}
+        self.last_sent = time.time()
+
         threading.Thread.__init__(self)
         self.start()
 
@@ -227,16 +284,33 @@ class GetDiskInformation(threading.Thread):
         #Use a module I've written to collect data about connected Disks, and return it.
         wx.CallAfter(self.parent.receive_diskinfo, self.get_info())
 
-    def get_info(self): #pylint: disable=no-self-use
+    def get_info(self):
         """Get disk information as a privileged user"""
-        output = BackendTools.start_process(cmd=sys.executable+" "+RESOURCEPATH
-                                            +"/Tools/run_getdevinfo.py",
-                                            return_output=True,
-                                            privileged=True)[1]
+        BackendTools.start_process(cmd=sys.executable+" "+RESOURCEPATH
+                                   +"/Tools/run_getdevinfo.py",
+                                   return_output=True, privileged=True,
+                                   on_line=self.receive_line)
 
-        #Success! Now use ast to convert the returned string to a dictionary.
-        #TODO exception handling.
-        return ast.literal_eval(output)
+        if not self.decoder.finished:
+            #Use what we got, rather than nothing.
+            logger.error("GetDiskInformation().get_info(): run_getdevinfo.py's output was "
+                         "incomplete! Some disks may be missing...")
+
+        return self.decoder.devices
+
+    def receive_line(self, line):
+        """Read a line of run_getdevinfo.py's output, and pass on the disks every so often"""
+        device = self.decoder.feed(line)
+
+        if device is None:
+            return
+
+        self.pending[device[0]] = device[1]
+
+        if time.time() - self.last_sent >= self.PARTIAL_INTERVAL:
+            wx.CallAfter(self.parent.receive_diskinfo_changes, self.pending, [])
+            self.pending = {}
+            self.last_sent = time.time()
 
 #End Disk Information Handler thread.
 #Begin Starter Class
@@ -313,144 +387,244 @@ class ShowSplash(wxSplashScreen): #pylint: disable=too-few-public-methods,no-mem
 #Begin Custom wx.TextCtrl Class.
 class CustomTextCtrl(wx.TextCtrl):
     """
-    A custom wx.TextCtrl that provides features that are broken on Linux and macOS.
-
-    Features:
-        A version of PositionToXY() that works on macOS.
-        A version of XYToPosition() that works on macOS and fixed a bug on Linux.
-        carriage_return(): Handles carriage returns correctly.
-        up_one_line(): Moves insertion point up one line.
+    A custom wx.TextCtrl that displays ddrescue's output like a terminal would.
 
+    Output is applied to a Terminal.VirtualTerminal, which handles carriage returns and
+    moving up a line (things that wx.TextCtrl can't do, and that PositionToXY() and
+    XYToPosition() are broken for on macOS), and then only the rows that have changed
+    are redrawn. Only the last max_rows rows are kept, if max_rows is set.
     """
 
     def __init__(self, parent, wx_id, value, style):
         """Initialise the custom wx.TextCtrl"""
         wx.TextCtrl.__init__(self, parent, wx_id, value=value, style=style)
 
-    def PositionToXY(self, insertion_point): #pylint: disable=invalid-name,arguments-differ
-        """
-        A custom version of wx.TextCtrl.PositionToXY() that works on OS X
-        (the built-in one isn't implemented on OS X).
+        self.max_rows = None
+        self.terminal = Terminal.VirtualTerminal()
 
-        Note: Still not implemented on OS X on wxPython 4 (random numbers).
+        #The length of each row as it is currently shown, and of all the text, so we can
+        #find where rows start without looking at the text.
+        self.row_lengths = [0]
+        self.text_length = 0
+
+    def Clear(self): #pylint: disable=invalid-name
+        """Clear the text, and reset the terminal"""
+        wx.TextCtrl.Clear(self)
+
+        self.terminal = Terminal.VirtualTerminal(max_rows=self.max_rows)
+        self.row_lengths = [0]
+        self.text_length = 0
+
+    def get_row_start(self, row):
+        """
+        Return the position in the text at which the given row starts.
+        Counts back from the end, so this is quick for rows near the end.
         """
 
-        #Count the number and position of newline characters.
-        text = self.GetRange(0, insertion_point)
+        #Every row but the last is followed by a newline.
+        return (self.text_length - sum(self.row_lengths[row:])
+                - (len(self.row_lengths) - 1 - row))
 
-        newlines = [0] #Count the start of the text as a newline.
-        counter = 0
-        for char in text:
-            counter += 1
+    def write_output(self, text):
+        """Write some of ddrescue's output, and redraw the rows that changed"""
+        self.terminal.write(text)
 
-            if char == "\n":
-                newlines.append(counter)
+        #Remove any rows that the terminal has thrown away.
+        dropped_rows = self.terminal.take_dropped_rows()
 
-        #Find the last newline before our insertion point.
-        for newline in newlines:
-            if newlines.index(newline)+1 == len(newlines) or newline == insertion_point:
-                #This is the last newline in the text, or the newline at our insertion point,
-                #and is therefore the one we want.
-                last_new_line = newline
-                break
+        if dropped_rows >= len(self.row_lengths):
+            wx.TextCtrl.Clear(self)
+            self.row_lengths = [0]
+            self.text_length = 0
 
-            elif newline < insertion_point:
-                pass
+        elif dropped_rows > 0:
+            #Include the newlines after each row.
+            end = sum(self.row_lengths[:dropped_rows]) + dropped_rows
 
-            else:
-                #When this is triggered, the previous newline (last iteration of the loop)
-                #is the one we want.
-                index = newlines.index(newline)
-                last_new_line = newlines[index-1]
-                break
+            self.Remove(0, end)
+            del self.row_lengths[:dropped_rows]
+            self.text_length -= end
 
-        #Figure out what column we're in (how many chars after the last newline).
-        column = insertion_point - last_new_line
+        first_row, rows = self.terminal.take_dirty_rows()
 
-        #Figure out which line we're on (the number of the last newline).
-        row = newlines.index(last_new_line)
+        if first_row is not None:
+            start = self.get_row_start(first_row)
+            new_text = "\n".join(rows)
 
-        return column, row
+            self.Replace(start, self.text_length, new_text)
+            self.row_lengths[first_row:] = [len(row) for row in rows]
+            self.text_length = start + len(new_text)
 
-    def XYToPosition(self, column, row): #pylint: disable=invalid-name,arguments-differ
-        """
-        A custom version of wx.TextCtrl.XYToPosition() that works on OS X
-        (the built-in one isn't implemented on OS X).
+        #Put the insertion point where the terminal's cursor is.
+        self.SetInsertionPoint(self.get_row_start(self.terminal.row) + self.terminal.column)
 
-        This is also helpful for LINUX because the built-in one has a quirk
-        when you're at the end of the text and it always returns -1
+#End Custom wx.TextCtrl Class.
+#Begin Block Map Panel.
+class BlockMapPanel(wx.Panel):
+    """
+    Draws a map of the recovery from the map file, like ddrescueview does, with a
+    square cell for each part of the disk, coloured by the worst status in it.
+
+    The map file is followed with a MapFile.MapFileWatcher (from MapFileWatcherThread),
+    and only the tiles that change are worked out again. Reading the map and working out
+    the cells (also when the panel is resized) happens in other threads, and drawing is
+    just scaling up an image with one pixel per cell.
+    """
+
+    #The width and height of each cell, in pixels.
+    cell_pixels = 4
+
+    def __init__(self, parent):
+        """Initialise the panel"""
+        wx.Panel.__init__(self, parent, -1, style=wx.BORDER_SUNKEN)
+
+        self.SetMinSize(wx.Size(50, 80))
+        self.SetBackgroundStyle(wx.BG_STYLE_CUSTOM)
+
+        tooltip = ("Green: finished, grey: non-tried, yellow: non-trimmed, "
+                   "blue: non-scraped, red: bad sectors.")
+
+        if CLASSIC_WXPYTHON:
+            self.SetToolTipString(tooltip)
+
+        else:
+            self.SetToolTip(tooltip)
+
+        #self.lock is only held to swap values in and out, so drawing never has to wait
+        #for the map file. self.update_lock makes sure only one thread at a time reads
+        #the map file and works out the cells.
+        self.lock = threading.Lock()
+        self.update_lock = threading.Lock()
+        self.watcher = None
+        self.block_map = None
+
+        self.columns = 0
+        self.rows = 0
+
+        #The number of columns and rows, and the RGB data, to draw.
+        self.image = None
+
+        #Whether a resize is waiting to be worked out, and whether a thread is doing it.
+        self.resize_pending = False
+        self.resizing = False
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def set_map_file(self, path):
+        """Start following the map file at path. It is read on the next check"""
+        with self.lock:
+            self.watcher = MapFile.MapFileWatcher(path)
+            self.block_map = BlockMap.BlockMap(self.watcher.mapfile)
+            self.image = None
+
+        self.Refresh()
+
+    def check_map_file(self):
+        """
+        Re-read the map file if it has changed, and work out the cells again if it did or
+        the panel has been resized. Returns True if the map needs to be redrawn. Called
+        from MapFileWatcherThread, and the threads started by on_size().
         """
-        #Count the number and position of newline characters.
-        text = self.GetValue()
 
-        newlines = [0] #Count the start of the text as a newline.
-        counter = 0
-        for char in text:
-            counter += 1
+        with self.update_lock:
+            with self.lock:
+                watcher = self.watcher
+                block_map = self.block_map
+                columns = self.columns
+                rows = self.rows
 
-            if char == "\n":
-                newlines.append(counter)
+            if watcher is None:
+                return False
 
-        #Get the last newline.
-        last_new_line = newlines[row]
+            changes = watcher.check()
 
-        #Our position should be that number plus our column.
-        position = last_new_line + column
+            if not watcher.loaded:
+                return False
 
-        return position
+            if block_map.num_cells != columns * rows:
+                block_map.resize(columns * rows)
 
-    def carriage_return(self):
-        """Handles carriage returns in output"""
-        #Go back until the last newline character, and overwrite anything in the way on the
-        #next write.
-        #Get the text up to the current insertion point.
-        text = self.GetRange(0, self.GetInsertionPoint())
+            elif changes:
+                block_map.update(changes)
 
-        #Find the last newline char in the text.
-        newline_numbers = []
-        counter = 0
+            else:
+                return False
 
-        for char in text:
-            if char == "\n":
-                newline_numbers.append(counter)
+            rgb = block_map.get_rgb()
 
-            counter += 1
+            with self.lock:
+                #Don't show an old map file if a new one was set while we were busy.
+                if self.watcher is not watcher:
+                    return False
 
-        if newline_numbers != []:
-            last_newline = newline_numbers[-1]
+                self.image = (columns, rows, rgb)
 
-        else:
-            #Hacky bit to make the new insertion point 0 :)
-            last_newline = -1
+        return True
 
-        #Set the insertion point to just after that newline, unless we're already there,
-        #and in that case set the insertion point just after the previous newline.
-        new_insertion_point = last_newline + 1
+    def on_size(self, event=None):
+        """Work out the cells again for the new size, in another thread"""
+        width, height = self.GetClientSize()
 
-        self.SetInsertionPoint(new_insertion_point)
+        with self.lock:
+            self.columns = max(width // self.cell_pixels, 1)
+            self.rows = max(height // self.cell_pixels, 1)
+            self.resize_pending = True
 
-    def up_one_line(self):
-        """Handles '\x1b[A' (up one line) in output"""
-        #Go up one line.
-        #Get our column and line numbers.
-        column, line = self.PositionToXY(self.GetInsertionPoint())
+            start_thread = not self.resizing
+            self.resizing = True
 
-        #We go up one line, but stay in the same column, so find the integer position of the new
-        #insertion point.
-        new_insertion_point = self.XYToPosition(column, line-1)
+        if start_thread:
+            thread = threading.Thread(target=self.resize_map)
+            thread.daemon = True
+            thread.start()
 
-        if new_insertion_point == -1:
-            #Invalid column/line! Maybe we reached the start of the text in self.output_box?
-            #Do nothing but log the error.
-            logger.warning("CustomTextCtrl().up_one_line(): Invalid new insertion point when "
-                           "trying to move up one line! This might mean we've reached the "
-                           "start of the text in the output box.")
+        if event != None:
+            event.Skip()
+
+    def resize_map(self):
+        """
+        Work out the cells for the latest size until the panel stops being resized, and
+        redraw the map. Runs in a thread started by on_size().
+        """
+
+        while True:
+            with self.lock:
+                if not self.resize_pending:
+                    self.resizing = False
+                    return
+
+                self.resize_pending = False
+
+            if self.check_map_file():
+                wx.CallAfter(self.Refresh)
+
+    def on_paint(self, event=None): #pylint: disable=unused-argument
+        """Draw the map"""
+        dc = wx.BufferedPaintDC(self)
+        dc.SetBackground(wx.Brush(wx.Colour(*BlockMap.BACKGROUND)))
+        dc.Clear()
+
+        with self.lock:
+            image = self.image
+
+        if image is None:
+            return
+
+        columns, rows, rgb = image
+
+        if CLASSIC_WXPYTHON:
+            image = wx.ImageFromData(columns, rows, bytes(rgb))
+            bitmap = wx.BitmapFromImage(image.Scale(columns * self.cell_pixels,
+                                                    rows * self.cell_pixels))
 
         else:
-            #Set the new insertion point.
-            self.SetInsertionPoint(new_insertion_point)
+            image = wx.Image(columns, rows, bytes(rgb))
+            bitmap = wx.Bitmap(image.Scale(columns * self.cell_pixels, rows * self.cell_pixels))
 
-#End Custom wx.TextCtrl Class.
+        dc.DrawBitmap(bitmap, 0, 0)
+
+#End Block Map Panel.
 #Begin Main Window.
 class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-many-public-methods
     """
@@ -497,9 +671,12 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
             dlg.Destroy()
             sys.exit("\nCouldn't find ddrescue!")
 
+        #Remember what we found out last time, so we can start up quickly.
+        self.startup_cache = StartupCache.StartupCache(StartupCache.DEFAULT_PATH)
+
         logger.info("Determining ddrescue version...")
         global DDRESCUE_VERSION
-        DDRESCUE_VERSION = BackendTools.determine_ddrescue_version()
+        DDRESCUE_VERSION = BackendTools.determine_ddrescue_version(self.startup_cache)
 
         #Set the frame's icon.
         global APPICON
@@ -536,9 +713,24 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         logger.debug("MainWindow().__init__(): Creating menus...")
         self.create_menus()
 
-        #Update the Disk info.
+        #Update the Disk info. If we haven't rebooted since last time, show the disks we
+        #found then straight away, and check them in the background.
         logger.debug("MainWindow().__init__(): Updating Disk info...")
-        self.get_diskinfo()
+        cached_diskinfo = self.startup_cache.get_diskinfo()
+
+        if cached_diskinfo is None:
+            self.get_diskinfo()
+
+        else:
+            logger.info("MainWindow().__init__(): Using the Disk info found last time, and "
+                        "checking it in the background...")
+
+            global DISKINFO
+            DISKINFO = cached_diskinfo
+
+            self.update_file_choices()
+            self.update_status_bar("Checking for changes to the disks...")
+            GetDiskInformation(self)
 
         #Set up sizers.
         logger.debug("MainWindow().__init__(): Setting up sizers...")
@@ -587,15 +779,29 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         SETTINGS["RecoveringData"] = False
         SETTINGS["CheckedSettings"] = False
 
+        #How many times a second to update the recovery information during a recovery.
+        SETTINGS["DisplayRefreshRate"] = 5
+
+        #How many lines of ddrescue's output to keep in the output box, and whether to
+        #save all of it next to the map file.
+        SETTINGS["OutputBoxLines"] = 10000
+        SETTINGS["SaveTranscript"] = True
+        SETTINGS["CompressTranscript"] = False
+
+        #Record the values ddrescue reports over time next to the map file.
+        SETTINGS["SaveMetrics"] = True
+
+        #Don't serve the recoveries' statistics for Prometheus.
+        SETTINGS["Exporter"] = None
+
+        #Run the recovery in one pass, rather than using one of Strategy.STRATEGIES.
+        SETTINGS["Strategy"] = ""
+
+        #Don't restart ddrescue with adjusted options when the read rate collapses.
+        SETTINGS["AdaptiveControl"] = False
+
         #DDRescue's options.
-        SETTINGS["DirectAccess"] = "-d"
-        SETTINGS["OverwriteOutputFile"] = ""
-        SETTINGS["Reverse"] = ""
-        SETTINGS["Preallocate"] = ""
-        SETTINGS["NoSplit"] = ""
-        SETTINGS["BadSectorRetries"] = "-r 2"
-        SETTINGS["MaxErrors"] = ""
-        SETTINGS["ClusterSize"] = "-c 128"
+        SETTINGS.update(Recovery.DEFAULT_OPTIONS)
 
         #Set the wildcards and make it easy for the user to find his/her home directory
         #(helps make DDRescue-GUI more user friendly).
@@ -630,6 +836,13 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.disk_capacity = None
         self.aborted_recovery = None
         self.runtime_secs = None
+        self.snapshot = None
+        self.scheduler = None
+        self.jobs_window = None
+        self.backend_thread = None
+        self.exporter = None
+        self.inventory = None
+        self.disk_info_window = None
 
     def make_status_bar(self):
         """Create and set up a statusbar"""
@@ -652,7 +865,8 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
         #And some text for basic recovery information.
         self.time_elapsed_text = wx.StaticText(self.panel, -1, "Time Elapsed:")
-        self.time_remaining_text = wx.StaticText(self.panel, -1, "Estimated Time Remaining:")
+        self.time_remaining_text = wx.StaticText(self.panel, -1, "Estimated Time Remaining "
+                                                 "(This Phase):")
 
     def create_buttons(self):
         """Create all buttons for MainWindow"""
@@ -708,6 +922,9 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.output_box.SetDefaultStyle(wx.TextAttr(wx.WHITE))
         self.output_box.SetMinSize(wx.Size(50, 240))
 
+        #Create the block map.
+        self.block_map_panel = BlockMapPanel(self.panel)
+
         #Create the arrows.
         img1 = wx.Image(RESOURCEPATH+"/images/ArrowDown.png", wx.BITMAP_TYPE_PNG)
         img2 = wx.Image(RESOURCEPATH+"/images/ArrowRight.png", wx.BITMAP_TYPE_PNG)
@@ -824,12 +1041,13 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.main_sizer.Add(wx.StaticLine(self.panel), 0, wx.TOP|wx.EXPAND, 10)
         self.main_sizer.Add(throbber_sizer, 0, wx.ALL|wx.ALIGN_CENTER|wx.EXPAND, 5)
         self.main_sizer.Add(self.info_sizer, 1, wx.TOP|wx.BOTTOM|wx.ALIGN_CENTER|wx.EXPAND, 10)
+        self.main_sizer.Add(self.block_map_panel, 0, wx.LEFT|wx.RIGHT|wx.EXPAND, 22)
         self.main_sizer.Add(info_text_sizer, 0, wx.ALL|wx.ALIGN_CENTER|wx.EXPAND, 10)
         self.main_sizer.Add(self.progress_sizer, 0, wx.TOP|wx.BOTTOM|wx.ALIGN_CENTER|wx.EXPAND, 10)
 
         #Get the sizer set up for the frame.
         self.panel.SetSizer(self.main_sizer)
-        self.main_sizer.SetMinSize(wx.Size(1056, 360))
+        self.main_sizer.SetMinSize(wx.Size(1056, 440))
         self.main_sizer.SetSizeHints(self)
 
     def create_menus(self):
@@ -846,6 +1064,9 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.menu_disk_info = view_menu.Append(wx.ID_ANY, "&Disk Information",
                                                "Information about all detected Disks")
 
+        self.menu_jobs = view_menu.Append(wx.ID_ANY, "&Recovery Jobs",
+                                          "Recover several disks at the same time")
+
         self.menu_privacy_policy = view_menu.Append(wx.ID_ANY, "&Privacy Policy",
                                                     "View DDRescue-GUI's privacy policy")
 
@@ -878,6 +1099,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.Bind(wx.EVT_MENU, self.show_userguide, self.menu_docs)
         self.Bind(wx.EVT_MENU, self.on_about, self.menu_about)
         self.Bind(wx.EVT_MENU, self.show_dev_info, self.menu_disk_info)
+        self.Bind(wx.EVT_MENU, self.show_jobs, self.menu_jobs)
         self.Bind(wx.EVT_MENU, self.show_privacy_policy, self.menu_privacy_policy)
 
         #Choiceboxes.
@@ -1046,8 +1268,19 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         global DISKINFO
         DISKINFO = info
 
+        #Remember it for next time.
+        self.startup_cache.set_diskinfo(DISKINFO)
+
         #Update the file choices.
         self.update_file_choices()
+
+        if self.starting_up:
+            wx.CallAfter(self.check_for_interrupted_jobs)
+
+            #Follow disks being plugged in and removed from now on.
+            if LINUX:
+                self.start_inventory()
+
         self.starting_up = False
 
         #Stop the throbber and enable stuff again.
@@ -1064,6 +1297,27 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         #Fix a display on on Fedora/GNOME3 w/ py3.
         self.panel.Layout()
 
+    def start_inventory(self):
+        """Start following changes to the disks, so we don't have to run getdevinfo again"""
+        logger.info("MainWindow().start_inventory(): Following changes to the disks...")
+
+        self.inventory = Inventory.DeviceInventory(
+            lambda added, removed: wx.CallAfter(self.receive_diskinfo_changes, added, removed))
+
+        self.inventory.start()
+
+    def receive_diskinfo_changes(self, added, removed):
+        """Merge the disks that were plugged in or removed into DISKINFO, and show them"""
+        logger.info("MainWindow().receive_diskinfo_changes(): Disks added or changed: "
+                    + ", ".join(sorted(added))+". Disks removed: "+", ".join(removed)+".")
+
+        Inventory.merge(DISKINFO, added, removed)
+
+        self.update_file_choices()
+
+        if self.disk_info_window is not None:
+            self.disk_info_window.update_list_ctrl()
+
     def update_file_choices(self):
         """Update the Disk entries in the choiceboxes"""
         logger.info("MainWindow().update_file_choices(): Updating the GUI with the "
@@ -1412,7 +1666,119 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
     def show_dev_info(self, event=None): #pylint: disable=unused-argument
         """Show the Disk Information Window"""
-        DiskInfoWindow(self).Show()
+        self.disk_info_window = DiskInfoWindow(self)
+        self.disk_info_window.Show()
+
+    def create_scheduler(self):
+        """Create the scheduler for the Jobs Window, keeping its queue in the journal"""
+        try:
+            journal = Journal.JobJournal(Journal.DEFAULT_PATH)
+
+        except (IOError, OSError):
+            logger.warning("MainWindow().create_scheduler(): Couldn't open the job journal at "
+                           + Journal.DEFAULT_PATH+"! Jobs won't be restarted after a crash...")
+
+            journal = None
+
+        self.scheduler = Scheduler.Scheduler(get_ddrescue_command(), max_jobs=2, linux=LINUX,
+                                             journal=journal, stop=get_ddrescue_stopper())
+
+    def check_for_interrupted_jobs(self):
+        """Offer to restart any recovery jobs that didn't finish last time"""
+        if self.scheduler is None:
+            self.create_scheduler()
+
+        if self.scheduler.journal is None:
+            return
+
+        pending = self.scheduler.journal.get_pending()
+
+        if not pending:
+            return
+
+        logger.info("MainWindow().check_for_interrupted_jobs(): "+unicode(len(pending))
+                    + " jobs didn't finish last time. Asking the user whether to restart "
+                    "them...")
+
+        dlg = wx.MessageDialog(self.panel, unicode(len(pending))+" recovery job(s) didn't "
+                               "finish last time DDRescue-GUI was run. This can happen after "
+                               "a crash or a power cut. Do you want to restart them? ddrescue "
+                               "will carry on from where it left off, using the map files.",
+                               "DDRescue-GUI - Question!", wx.YES_NO | wx.ICON_QUESTION)
+
+        answer = dlg.ShowModal()
+        dlg.Destroy()
+
+        if answer == wx.ID_YES:
+            #Use the version of ddrescue we have now, in case it has been updated.
+            self.scheduler.restore_jobs({"DDRescueVersion": SETTINGS["DDRescueVersion"]})
+            self.show_jobs()
+            self.jobs_window.start_jobs()
+
+        else:
+            logger.info("MainWindow().check_for_interrupted_jobs(): Forgetting about the "
+                        "interrupted jobs...")
+
+            for job_id, settings in pending: #pylint: disable=unused-variable
+                self.scheduler.journal.remove(job_id)
+
+    def set_exporter(self):
+        """Start or stop serving the recoveries' statistics, as set in SETTINGS["Exporter"]"""
+        if self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+
+        if SETTINGS["Exporter"] is None:
+            return
+
+        port = SETTINGS["Exporter"][1]
+
+        self.exporter = Exporter.MetricsExporter(SETTINGS["Exporter"])
+        self.exporter.add_source(self.get_running_recoveries)
+
+        try:
+            self.exporter.start()
+
+        except (IOError, OSError):
+            logger.error("MainWindow().set_exporter(): Couldn't serve statistics on port "
+                         + unicode(port)+"! Is it already in use?")
+
+            self.exporter = None
+            SETTINGS["Exporter"] = None
+
+            dlg = wx.MessageDialog(self.panel, "Couldn't serve the recovery statistics on port "
+                                   + unicode(port)+"! Another program may "
+                                   "already be using it.", "DDRescue-GUI - Error!",
+                                   wx.OK | wx.ICON_ERROR)
+
+            dlg.ShowModal()
+            dlg.Destroy()
+
+    def get_running_recoveries(self):
+        """Return the recoveries that are running, for the exporter"""
+        recoveries = []
+
+        if SETTINGS["RecoveringData"] and (self.backend_thread is not None
+                                           and self.backend_thread.runner is not None):
+            recoveries.append(self.backend_thread.runner.recovery)
+
+        if self.scheduler is not None:
+            recoveries.extend(job.runner.recovery for job in self.scheduler.get_jobs()
+                              if job.state == "Running")
+
+        return recoveries
+
+    def show_jobs(self, event=None): #pylint: disable=unused-argument
+        """Show the Jobs Window, creating the scheduler first if needed"""
+        if self.scheduler is None:
+            self.create_scheduler()
+
+        #Keep the same window, so it keeps following the jobs when it's hidden.
+        if self.jobs_window is None:
+            self.jobs_window = JobsWindow(self)
+
+        self.jobs_window.Show()
+        self.jobs_window.Raise()
 
     def show_privacy_policy(self, event=None): #pylint: disable=unused-argument
         """Show PrivPolWindow"""
@@ -1717,8 +2083,12 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
             #Handle any unexpected errors.
             try:
-                #Start the backend thread.
-                BackendThread(self)
+                #Start the backend thread, giving it somewhere to put the recovery information.
+                self.snapshot = Snapshot.RecoverySnapshot()
+                self.output_box.max_rows = SETTINGS["OutputBoxLines"]
+                self.output_box.Clear()
+                self.block_map_panel.set_map_file(SETTINGS["MapFile"])
+                self.backend_thread = BackendThread(self)
 
             except:
                 logger.critical("Unexpected error \n\n"+unicode(traceback.format_exc())
@@ -1752,9 +2122,14 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         """Update the time elapsed text"""
         self.time_elapsed_text.SetLabel(line)
 
-    def update_time_remaining(self, time_left):
-        """Update the time remaining text"""
-        self.time_remaining_text.SetLabel("Time Remaining: "+time_left)
+    def update_time_remaining(self, time_left, phase=None):
+        """
+        Update the time remaining text. The estimate is only for the current phase (eg
+        trimming), so say which one it is.
+        """
+
+        self.time_remaining_text.SetLabel("Time Remaining ("+(phase or "This Phase")+"): "
+                                          + time_left)
 
     def update_recovered_data(self, recovered_data):
         """Update the recovered data info"""
@@ -1820,55 +2195,48 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
         self.list_ctrl.SetItem(7, 1, label=last_read)
 
-    def update_output_box(self, line):
-        """Update the output box"""
-        #TODO This should probably be implemented as part of the custom TextCtrl.
-
-        crs = []
-        uols = []
-        char_number = 0
-
-        for char in line:
-            char_number += 1
+    def update_display(self):
+        """
+        Show any new recovery information and output from ddrescue in one go.
+        Called by DisplayUpdateThread a few times a second, and once more when
+        the recovery has ended.
+        """
 
-            if char == "\r":
-                crs.append(char_number)
+        changes, output = self.snapshot.take_changes()
 
-            elif char == "¬":
-                uols.append(char_number)
+        #Update the list ctrl all at once.
+        self.list_ctrl.Freeze()
 
-        char_number = 0
-        temp_line = ""
+        for name, function in (("recovered_data", self.update_recovered_data),
+                               ("error_size", self.update_error_size),
+                               ("current_read_rate", self.update_current_read_rate),
+                               ("average_read_rate", self.update_average_read_rate),
+                               ("num_errors", self.update_num_errors),
+                               ("input_pos", self.update_input_pos),
+                               ("output_pos", self.update_output_pos),
+                               ("time_since_last_read", self.update_time_since_last_read)):
 
-        for char in line:
-            char_number += 1
+            if name in changes:
+                function(Units.format_value(name, changes[name]))
 
-            if char_number not in crs and char_number not in uols:
-                temp_line += char
-                if char == "\n":
-                    self.add_line_to_output_box(temp_line, crs, uols, char_number)
-                    temp_line = ""
+        self.list_ctrl.Thaw()
 
-            else:
-                self.add_line_to_output_box(temp_line, crs, uols, char_number)
-                temp_line = ""
+        if "progress" in changes:
+            self.update_progress(*changes["progress"])
 
-    def add_line_to_output_box(self, line, crs, uols, char_number):
-        """
-        Adds a new line to the custom output box.
-        Also handles calling carriage_return() and
-        up_one_line() when required.
-        """
+        if "time_remaining" in changes or "phase" in changes:
+            self.update_time_remaining(Estimator.format_estimate(
+                self.snapshot.get("time_remaining")), self.snapshot.get("phase"))
 
-        #TODO This should probably be implemented as part of the custom TextCtrl.
-        insertion_point = self.output_box.GetInsertionPoint()
-        self.output_box.Replace(insertion_point, insertion_point+len(line), line)
+        if "status" in changes:
+            self.update_status_bar(changes["status"])
 
-        if char_number in crs:
-            self.output_box.carriage_return()
+        if output != "":
+            self.update_output_box(output)
 
-        elif char_number in uols:
-            self.output_box.up_one_line()
+    def update_output_box(self, line):
+        """Update the output box"""
+        self.output_box.write_output(line)
 
     def update_status_bar(self, messeage):
         """Update the statusbar with a new message"""
@@ -1877,18 +2245,20 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
     def update_progress(self, recovered_data, disk_capacity):
         """Update the progressbar and the title"""
-        self.progress_bar.SetValue(recovered_data)
+        self.progress_bar.SetValue(recovered_data * self.progress_bar.GetRange() // disk_capacity)
         self.SetTitle(unicode(int(recovered_data * 100 // disk_capacity))+"%" + " - DDRescue-GUI")
 
     def on_abort(self):
         """Abort the recovery"""
-        #Ask ddrescue to exit.
-        logger.info("MainWindow().on_abort(): Attempting to stop ddrescue...")
-        BackendTools.start_process("killall -INT ddrescue",
-                                   privileged=True)
-
         self.aborted_recovery = True
 
+        #Don't start the next stage of the recovery, and ask this recovery's ddrescue to
+        #exit. Any recoveries in the jobs window are left alone.
+        if self.backend_thread is not None and self.backend_thread.runner is not None:
+            logger.info("MainWindow().on_abort(): Attempting to stop ddrescue...")
+            self.backend_thread.runner.abort()
+            self.backend_thread.runner.stop_ddrescue()
+
         #Disable control button.
         self.control_button.Disable()
 
@@ -1937,7 +2307,10 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
             dlg.Destroy()
 
     def on_recovery_ended(self, result, disk_capacity, recovered_data, return_code=None):
-        """Called to show MainWindow when a recovery is completed or aborted by the user"""
+        """
+        Called to show MainWindow when a recovery is completed or aborted by the user.
+        disk_capacity (None if we don't know it) and recovered_data are in bytes.
+        """
         #Return immediately if session is ending.
         if session_ending:
             return True
@@ -1945,6 +2318,9 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
         self.disk_capacity = disk_capacity
         self.recovered_data = recovered_data
 
+        #Show anything the backend reported since the last update.
+        self.update_display()
+
         #Stop the throbber.
         self.throbber.Stop()
 
@@ -2071,7 +2447,7 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
 
         self.list_ctrl.InsertColumn(1, heading="Value", format=wx.LIST_FORMAT_CENTRE, width=-1)
         self.control_button.SetLabel("Start")
-        self.time_remaining_text.SetLabel("Time Remaining:")
+        self.time_remaining_text.SetLabel("Time Remaining (This Phase):")
         self.time_elapsed_text.SetLabel("Time Elapsed:")
 
         #Reset the progress_bar
@@ -2132,7 +2508,8 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
             self.Destroy()
 
         #Check if DDRescue-GUI is recovering data.
-        if SETTINGS["RecoveringData"]:
+        if SETTINGS["RecoveringData"] or (self.scheduler is not None
+                                          and self.scheduler.is_busy()):
             logger.error("MainWindow().on_exit(): Can't exit while recovering data! Aborting exit "
                          "attempt...")
 
@@ -2154,6 +2531,17 @@ class MainWindow(wx.Frame): #pylint: disable=too-many-instance-attributes,too-ma
             #Run the exit sequence
             logger.info("MainWindow().on_exit(): Exiting...")
 
+            if self.exporter is not None:
+                self.exporter.stop()
+
+            if self.inventory is not None:
+                self.inventory.stop()
+
+            #Remember any disks that were plugged in or removed since we last looked.
+            self.startup_cache.set_diskinfo(DISKINFO)
+
+            BackendTools.stop_broker()
+
             #Shutdown the logger.
             logging.shutdown()
 
@@ -2378,6 +2766,11 @@ class DiskInfoWindow(wx.Frame):
         self.throbber.Stop()
         self.refresh_button.Enable()
 
+    def receive_diskinfo_changes(self, added, removed):
+        """Pass disks that have arrived on to MainWindow, which also updates the list ctrl"""
+        self.parent.disk_info_window = self
+        self.parent.receive_diskinfo_changes(added, removed)
+
     def update_list_ctrl(self, event=None): #pylint: disable=unused-argument
         """Update the list control"""
         logger.debug("DiskInfoWindow().update_list_ctrl(): Clearing all objects in list ctrl...")
@@ -2430,9 +2823,294 @@ class DiskInfoWindow(wx.Frame):
     def on_exit(self, event=None): #pylint: disable=unused-argument
         """Exit DiskInfoWindow"""
         logger.info("DiskInfoWindow().on_exit(): Closing DiskInfoWindow...")
+
+        if self.parent.disk_info_window is self:
+            self.parent.disk_info_window = None
+
         self.Destroy()
 
 #End Disk Info Window
+#Begin Jobs Window
+class JobsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
+    """
+    DDRescue-GUI's recovery jobs window, which queues recoveries of several disks and
+    runs them at the same time with MainWindow's Scheduler.Scheduler.
+    """
+
+    def __init__(self, parent):
+        """Initialize JobsWindow"""
+        wx.Frame.__init__(self, wx.GetApp().TopWindow, title="DDRescue-GUI - Recovery Jobs",
+                          size=(780, 310), style=wx.DEFAULT_FRAME_STYLE)
+
+        self.panel = wx.Panel(self)
+        self.SetClientSize(wx.Size(780, 310))
+        self.parent = parent
+        self.scheduler = parent.scheduler
+        wx.Frame.SetIcon(self, APPICON)
+
+        logger.debug("JobsWindow().__init__(): Creating widgets...")
+        self.create_widgets()
+
+        logger.debug("JobsWindow().__init__(): Setting up sizers...")
+        self.setup_sizers()
+
+        logger.debug("JobsWindow().__init__(): Binding events...")
+        self.bind_events()
+
+        self.update_list_ctrl()
+
+        #Call Layout() on self.panel() to ensure it displays properly.
+        self.panel.Layout()
+
+        #Start following the jobs.
+        self.update_thread = JobsUpdateThread(self)
+
+        logger.info("JobsWindow().__init__(): Ready. Waiting for events...")
+
+    def create_widgets(self):
+        """Create all widgets for JobsWindow"""
+        self.title_text = wx.StaticText(self.panel, -1, "Add the disk selected in the main "
+                                        "window to the queue, and start the queued recoveries")
+
+        self.list_ctrl = wx.ListCtrl(self.panel, -1, style=wx.LC_REPORT|wx.LC_VRULES)
+
+        self.list_ctrl.InsertColumn(0, heading="Input File", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(1, heading="Output File", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(2, heading="Status", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(3, heading="Recovered", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(4, heading="Progress", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(5, heading="Current Rate", format=wx.LIST_FORMAT_CENTRE)
+        self.list_ctrl.InsertColumn(6, heading="Time Elapsed", format=wx.LIST_FORMAT_CENTRE)
+
+        self.add_button = wx.Button(self.panel, -1, "Add Current Disk")
+        self.remove_button = wx.Button(self.panel, -1, "Remove")
+        self.abort_button = wx.Button(self.panel, -1, "Abort")
+        self.max_jobs_text = wx.StaticText(self.panel, -1, "Run at once:")
+        self.max_jobs_spinner = wx.SpinCtrl(self.panel, -1, "", min=1, max=16,
+                                            initial=self.scheduler.max_jobs)
+
+        self.start_button = wx.Button(self.panel, -1, "Start")
+        self.close_button = wx.Button(self.panel, -1, "Close")
+
+        if self.scheduler.running:
+            self.start_button.Disable()
+
+    def setup_sizers(self):
+        """Set up the sizers for JobsWindow"""
+        #Make a button boxsizer.
+        bottom_sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        #Add each object to the bottom sizer.
+        bottom_sizer.Add(self.add_button, 0, wx.LEFT|wx.RIGHT|wx.ALIGN_LEFT, 10)
+        bottom_sizer.Add(self.remove_button, 0, wx.RIGHT|wx.ALIGN_LEFT, 10)
+        bottom_sizer.Add(self.abort_button, 0, wx.RIGHT|wx.ALIGN_LEFT, 10)
+        bottom_sizer.Add((20, 20), 1)
+        bottom_sizer.Add(self.max_jobs_text, 0, wx.RIGHT|wx.ALIGN_CENTER, 5)
+        bottom_sizer.Add(self.max_jobs_spinner, 0, wx.ALIGN_CENTER)
+        bottom_sizer.Add((20, 20), 1)
+        bottom_sizer.Add(self.start_button, 0, wx.RIGHT|wx.ALIGN_RIGHT, 10)
+        bottom_sizer.Add(self.close_button, 0, wx.LEFT|wx.RIGHT|wx.ALIGN_RIGHT, 10)
+
+        #Make a boxsizer.
+        main_sizer = wx.BoxSizer(wx.VERTICAL)
+
+        #Add each object to the main sizer.
+        main_sizer.Add(self.title_text, 0, wx.ALL|wx.CENTER, 10)
+        main_sizer.Add(self.list_ctrl, 1, wx.EXPAND|wx.ALL, 10)
+        main_sizer.Add(bottom_sizer, 0, wx.EXPAND|wx.ALL ^ wx.TOP, 10)
+
+        #Get the sizer set up for the frame.
+        self.panel.SetSizer(main_sizer)
+        main_sizer.SetMinSize(wx.Size(780, 310))
+        main_sizer.SetSizeHints(self)
+
+    def bind_events(self):
+        """Bind all events for JobsWindow"""
+        self.Bind(wx.EVT_BUTTON, self.add_job, self.add_button)
+        self.Bind(wx.EVT_BUTTON, self.remove_job, self.remove_button)
+        self.Bind(wx.EVT_BUTTON, self.abort_job, self.abort_button)
+        self.Bind(wx.EVT_BUTTON, self.start_jobs, self.start_button)
+        self.Bind(wx.EVT_BUTTON, self.on_exit, self.close_button)
+        self.Bind(wx.EVT_SPINCTRL, self.set_max_jobs, self.max_jobs_spinner)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+        self.Bind(wx.EVT_SHOW, self.on_show)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+        self.Bind(wx.EVT_CLOSE, self.on_exit)
+
+    def on_show(self, event):
+        """Only keep the list of jobs up to date while JobsWindow is shown"""
+        self.update_thread.window_shown = event.IsShown()
+
+        if event.IsShown():
+            self.update_list_ctrl()
+
+        event.Skip()
+
+    def on_destroy(self, event):
+        """Stop following the jobs when JobsWindow is destroyed with MainWindow"""
+        if event.GetEventObject() is self:
+            self.update_thread.running = False
+
+        event.Skip()
+
+    def on_size(self, event=None):
+        """Auto resize the list_ctrl columns"""
+        width = self.list_ctrl.GetClientSize()[0]
+
+        self.list_ctrl.SetColumnWidth(0, int(width * 0.15))
+        self.list_ctrl.SetColumnWidth(1, int(width * 0.2))
+        self.list_ctrl.SetColumnWidth(2, int(width * 0.25))
+        self.list_ctrl.SetColumnWidth(3, int(width * 0.1))
+        self.list_ctrl.SetColumnWidth(4, int(width * 0.08))
+        self.list_ctrl.SetColumnWidth(5, int(width * 0.1))
+        self.list_ctrl.SetColumnWidth(6, int(width * 0.12))
+
+        if event != None:
+            event.Skip()
+
+    def show_error(self, message):
+        """Show an error message to the user"""
+        dlg = wx.MessageDialog(self.panel, message, "DDRescue-GUI - Error!",
+                               wx.OK | wx.ICON_ERROR)
+
+        dlg.ShowModal()
+        dlg.Destroy()
+
+    def add_job(self, event=None): #pylint: disable=unused-argument
+        """Queue a recovery of the disk selected in MainWindow, with the current settings"""
+        if None in [SETTINGS["InputFile"], SETTINGS["MapFile"], SETTINGS["OutputFile"]]:
+            self.show_error("Please select an input file, output file and map file in the "
+                            "main window first.")
+
+            return
+
+        for job in self.scheduler.get_jobs():
+            if job.state != "Finished" and SETTINGS["InputFile"] == job.name:
+                self.show_error(SETTINGS["InputFile"]+" is already in the queue!")
+                return
+
+        #We don't unmount disks for jobs like MainWindow().on_start() does, because the
+        #job might not start for hours.
+        for disk in [SETTINGS["InputFile"], SETTINGS["OutputFile"]]:
+            if disk in DISKINFO and BackendTools.is_mounted(disk):
+                self.show_error(disk+" is mounted! Please unmount it before adding it to "
+                                "the queue.")
+
+                return
+
+        logger.info("JobsWindow().add_job(): Adding "+SETTINGS["InputFile"]+" to the queue...")
+
+        #Each job gets its own copy of the settings, so the main window can be used to
+        #set up the next one.
+        self.scheduler.add_job(SETTINGS)
+        self.update_list_ctrl()
+
+    def remove_job(self, event=None): #pylint: disable=unused-argument
+        """Remove the selected job, if it hasn't started yet"""
+        selected = self.list_ctrl.GetFirstSelected()
+
+        if selected == -1:
+            return
+
+        if not self.scheduler.remove_job(self.scheduler.get_jobs()[selected]):
+            self.show_error("You can only remove recoveries that haven't started yet.")
+
+        self.update_list_ctrl()
+
+    def abort_job(self, event=None): #pylint: disable=unused-argument
+        """Abort the selected job, leaving the other jobs running"""
+        selected = self.list_ctrl.GetFirstSelected()
+
+        if selected == -1:
+            return
+
+        job = self.scheduler.get_jobs()[selected]
+
+        dlg = wx.MessageDialog(self.panel, "Are you sure you want to abort the recovery of "
+                               + job.name+"? Your other recoveries will carry on.",
+                               "DDRescue-GUI - Question!", wx.YES_NO | wx.ICON_QUESTION)
+
+        if dlg.ShowModal() == wx.ID_YES:
+            logger.info("JobsWindow().abort_job(): Aborting the recovery of "+job.name+"...")
+
+            if not self.scheduler.abort_job(job):
+                self.show_error("That recovery has already finished.")
+
+        dlg.Destroy()
+        self.update_list_ctrl()
+
+    def set_max_jobs(self, event=None): #pylint: disable=unused-argument
+        """Change how many recoveries can run at once"""
+        self.scheduler.set_max_jobs(self.max_jobs_spinner.GetValue())
+
+    def start_jobs(self, event=None): #pylint: disable=unused-argument
+        """Start running the queued recoveries"""
+        logger.info("JobsWindow().start_jobs(): Starting recovery jobs...")
+        self.start_button.Disable()
+        self.scheduler.start()
+        self.update_list_ctrl()
+
+    def update_list_ctrl(self):
+        """Show the latest information about each job"""
+        jobs = self.scheduler.get_jobs()
+
+        #Compatibility with wxpython < 4.
+        if CLASSIC_WXPYTHON:
+            self.list_ctrl.InsertItem = self.list_ctrl.InsertStringItem
+            self.list_ctrl.SetItem = self.list_ctrl.SetStringItem
+
+        #Add or remove rows so there is one for each job.
+        while self.list_ctrl.GetItemCount() > len(jobs):
+            self.list_ctrl.DeleteItem(self.list_ctrl.GetItemCount() - 1)
+
+        while self.list_ctrl.GetItemCount() < len(jobs):
+            self.list_ctrl.InsertItem(self.list_ctrl.GetItemCount(), label="")
+
+        for number, job in enumerate(jobs):
+            if job.state == "Queued":
+                status = "Queued"
+
+            elif job.state == "Running":
+                status = job.snapshot.get("status", "Starting...")
+
+            else:
+                status = "Finished: "+job.result
+
+            labels = [job.name, job.settings["OutputFile"], status]
+
+            #Each job's figures come from its own ddrescue's output, in its own snapshot.
+            for name in ("recovered_data", "progress", "current_read_rate"):
+                value = job.snapshot.get(name)
+
+                if value is None:
+                    labels.append("")
+
+                elif name == "progress":
+                    recovered_data, disk_capacity = value
+                    labels.append(unicode(int(recovered_data * 100 // disk_capacity))+"%"
+                                  if disk_capacity else "")
+
+                else:
+                    labels.append(Units.format_value(name, value))
+
+            labels.append(Units.format_duration(job.get_elapsed_time()))
+
+            for column, label in enumerate(labels):
+                if self.list_ctrl.GetItemText(number, column) != label:
+                    self.list_ctrl.SetItem(number, column, label=label)
+
+        if not self.scheduler.running:
+            self.start_button.Enable(bool(jobs))
+
+        #Auto Resize the columns.
+        self.on_size()
+
+    def on_exit(self, event=None): #pylint: disable=unused-argument
+        """Hide JobsWindow. It is kept, so it can carry on following the jobs"""
+        logger.info("JobsWindow().on_exit(): Hiding JobsWindow...")
+        self.Hide()
+
+#End Jobs Window
 #Begin settings Window
 class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
     """
@@ -2502,6 +3180,14 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         self.cluster_size_text = wx.StaticText(self.panel, -1, "Number of clusters to copy at "
                                                "a time:")
 
+        self.refresh_rate_text = wx.StaticText(self.panel, -1, "Recovery information updates "
+                                               "per second:")
+
+        self.output_box_lines_text = wx.StaticText(self.panel, -1, "Lines of output to keep "
+                                                   "in the output box:")
+
+        self.strategy_text = wx.StaticText(self.panel, -1, "Recovery strategy:")
+
         self.presets_text = wx.StaticText(self.panel, -1, "Presets:")
 
 
@@ -2524,6 +3210,23 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         self.no_split_check_box = wx.CheckBox(self.panel, -1, "Do a soft run (don't attempt to "
                                               "read bad sectors)")
 
+        self.save_transcript_check_box = wx.CheckBox(self.panel, -1, "Save all of ddrescue's "
+                                                     "output next to the map file")
+
+        self.compress_transcript_check_box = wx.CheckBox(self.panel, -1, "Compress the saved "
+                                                         "output (gzip)")
+
+        self.save_metrics_check_box = wx.CheckBox(self.panel, -1, "Save the recovery's "
+                                                  "statistics over time next to the map file")
+
+        self.exporter_check_box = wx.CheckBox(self.panel, -1, "Serve live statistics for "
+                                              "Prometheus on port "
+                                              + unicode(Exporter.DEFAULT_PORT))
+
+        self.adaptive_control_check_box = wx.CheckBox(self.panel, -1, "Restart ddrescue with "
+                                                      "adjusted settings if the read rate "
+                                                      "collapses")
+
     def create_choice_boxes(self):
         """
         Create all ChoiceBoxes for SettingsWindow, and call self.set_default_recovery_settings()
@@ -2540,6 +3243,19 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         self.cluster_size_choice = wx.Choice(self.panel, -1,
                                              choices=['256', 'Default (128)', '64', '32'])
 
+        self.refresh_rate_choice = wx.Choice(self.panel, -1,
+                                             choices=['1', '2', 'Default (5)', '10'])
+
+        self.output_box_lines_choice = wx.Choice(self.panel, -1,
+                                                 choices=['1000', 'Default (10000)', '100000'])
+
+        #Multi-pass strategies override the soft run, reverse and retry options for each pass.
+        self.strategy_names = [""] + sorted(Strategy.STRATEGIES)
+        self.strategy_choice = wx.Choice(self.panel, -1,
+                                         choices=["Default (single pass)"]
+                                         + [Strategy.STRATEGY_DESCRIPTIONS[name]
+                                            for name in self.strategy_names[1:]])
+
         #Set default settings.
         self.set_default_recovery_settings()
 
@@ -2564,6 +3280,24 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         cluster_size_sizer.Add(self.cluster_size_text, 1, wx.LEFT|wx.RIGHT|wx.ALIGN_CENTER, 10)
         cluster_size_sizer.Add(self.cluster_size_choice, 1, wx.RIGHT|wx.ALIGN_CENTER, 10)
 
+        #Refresh Rate Sizer.
+        refresh_rate_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        refresh_rate_sizer.Add(self.refresh_rate_text, 1, wx.LEFT|wx.RIGHT|wx.ALIGN_CENTER, 10)
+        refresh_rate_sizer.Add(self.refresh_rate_choice, 1, wx.RIGHT|wx.ALIGN_CENTER, 10)
+
+        #Output Box Lines Sizer.
+        output_box_lines_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        output_box_lines_sizer.Add(self.output_box_lines_text, 1,
+                                   wx.LEFT|wx.RIGHT|wx.ALIGN_CENTER, 10)
+
+        output_box_lines_sizer.Add(self.output_box_lines_choice, 1,
+                                   wx.RIGHT|wx.ALIGN_CENTER, 10)
+
+        #Strategy Sizer.
+        strategy_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        strategy_sizer.Add(self.strategy_text, 1, wx.LEFT|wx.RIGHT|wx.ALIGN_CENTER, 10)
+        strategy_sizer.Add(self.strategy_choice, 1, wx.RIGHT|wx.ALIGN_CENTER, 10)
+
         #Make a sizer for the best and fastest recovery buttons now, and add the objects.
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
         button_sizer.Add(self.best_button, 3, wx.LEFT|wx.EXPAND, 10)
@@ -2580,11 +3314,19 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         main_sizer.Add(self.preallocate_check_box, 3, wx.CENTER|wx.ALL, 5)
         main_sizer.Add(self.no_split_check_box, 3, wx.CENTER|wx.ALL, 5)
         main_sizer.Add(self.overwrite_output_file_check_box, 3, wx.CENTER|wx.ALL, 5)
+        main_sizer.Add(self.save_transcript_check_box, 3, wx.CENTER|wx.ALL, 5)
+        main_sizer.Add(self.compress_transcript_check_box, 3, wx.CENTER|wx.ALL, 5)
+        main_sizer.Add(self.save_metrics_check_box, 3, wx.CENTER|wx.ALL, 5)
+        main_sizer.Add(self.exporter_check_box, 3, wx.CENTER|wx.ALL, 5)
+        main_sizer.Add(self.adaptive_control_check_box, 3, wx.CENTER|wx.ALL, 5)
 
         #Choice box sizers.
         main_sizer.Add(bad_sector_retries_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
         main_sizer.Add(max_errors_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
         main_sizer.Add(cluster_size_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
+        main_sizer.Add(refresh_rate_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
+        main_sizer.Add(output_box_lines_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
+        main_sizer.Add(strategy_sizer, 4, wx.CENTER|wx.EXPAND|wx.ALL, 10)
 
         #Add the buttons, and the button sizer.
         main_sizer.Add(wx.StaticLine(self.panel), 0, wx.ALL|wx.EXPAND, 10)
@@ -2595,12 +3337,13 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         #Get the main sizer set up for the frame.
         self.panel.SetSizer(main_sizer)
-        main_sizer.SetMinSize(wx.Size(569, 479))
+        main_sizer.SetMinSize(wx.Size(569, 759))
         main_sizer.SetSizeHints(self)
 
     def bind_events(self):
         """Bind all events for SettingsWindow"""
         self.Bind(wx.EVT_CHECKBOX, self.set_soft_run, self.no_split_check_box)
+        self.Bind(wx.EVT_CHECKBOX, self.set_save_transcript, self.save_transcript_check_box)
         self.Bind(wx.EVT_BUTTON, self.set_default_recovery_settings, self.default_button)
         self.Bind(wx.EVT_BUTTON, self.set_fast_recovery_settings, self.fast_button)
         self.Bind(wx.EVT_BUTTON, self.set_best_recovery_settings, self.best_button)
@@ -2650,6 +3393,20 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             #Enable self.bad_sector_retries_choice.
             self.bad_sector_retries_choice.Enable()
 
+        #Save and compress ddrescue's output options.
+        self.save_transcript_check_box.SetValue(SETTINGS["SaveTranscript"])
+        self.compress_transcript_check_box.SetValue(SETTINGS["CompressTranscript"])
+        self.set_save_transcript()
+
+        #Save the recovery's metrics option.
+        self.save_metrics_check_box.SetValue(SETTINGS["SaveMetrics"])
+
+        #Serve the recoveries' statistics option.
+        self.exporter_check_box.SetValue(SETTINGS["Exporter"] is not None)
+
+        #Adaptive read rate control option.
+        self.adaptive_control_check_box.SetValue(SETTINGS["AdaptiveControl"])
+
         #ChoiceBoxes:
         #Retry bad sectors option.
         if SETTINGS["BadSectorRetries"] == "-r 2":
@@ -2675,6 +3432,23 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         else:
             self.cluster_size_choice.SetStringSelection(SETTINGS["ClusterSize"][3:])
 
+        #Display refresh rate option.
+        if SETTINGS["DisplayRefreshRate"] == 5:
+            self.refresh_rate_choice.SetStringSelection("Default (5)")
+
+        else:
+            self.refresh_rate_choice.SetStringSelection(unicode(SETTINGS["DisplayRefreshRate"]))
+
+        #Output box lines option.
+        if SETTINGS["OutputBoxLines"] == 10000:
+            self.output_box_lines_choice.SetStringSelection("Default (10000)")
+
+        else:
+            self.output_box_lines_choice.SetStringSelection(unicode(SETTINGS["OutputBoxLines"]))
+
+        #Recovery strategy option.
+        self.strategy_choice.SetSelection(self.strategy_names.index(SETTINGS["Strategy"]))
+
     def set_soft_run(self, event=None): #pylint: disable=unused-argument
         """
         Set up SettingsWindow based on the value of self.no_split_check_box
@@ -2693,6 +3467,19 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
             self.bad_sector_retries_choice.Enable()
             self.set_default_recovery_settings()
 
+    def set_save_transcript(self, event=None): #pylint: disable=unused-argument
+        """
+        Set up SettingsWindow based on the value of self.save_transcript_check_box
+        (the "save all of ddrescue's output" CheckBox).
+        """
+
+        if self.save_transcript_check_box.IsChecked():
+            self.compress_transcript_check_box.Enable()
+
+        else:
+            self.compress_transcript_check_box.SetValue(False)
+            self.compress_transcript_check_box.Disable()
+
     def set_default_recovery_settings(self, event=None): #pylint: disable=unused-argument
         """Set selections for the Choiceboxes to default settings"""
         logger.debug("SettingsWindow().set_default_recovery_settings(): Setting up SettingsWindow "
@@ -2703,6 +3490,7 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         self.max_errors_choice.SetSelection(0)
         self.cluster_size_choice.SetSelection(1)
+        self.strategy_choice.SetSelection(0)
 
         self.default_button.SetFocus()
 
@@ -2716,6 +3504,7 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
         self.max_errors_choice.SetSelection(0)
         self.cluster_size_choice.SetSelection(0)
+        self.strategy_choice.SetSelection(0)
 
         self.fast_button.SetFocus()
 
@@ -2730,6 +3519,9 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         self.max_errors_choice.SetSelection(0)
         self.cluster_size_choice.SetSelection(3)
 
+        #Get the healthy areas off first, then go back for the rest.
+        self.strategy_choice.SetSelection(self.strategy_names.index("MultiPass"))
+
         self.best_button.SetFocus()
 
     def save_options(self, event=None): #pylint: disable=unused-argument
@@ -2802,6 +3594,40 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         logger.info("SettingsWindow().save_options(): Split failed blocks: "
                     + unicode(not bool(SETTINGS["NoSplit"]))+".")
 
+        #Save and compress ddrescue's output options.
+        SETTINGS["SaveTranscript"] = self.save_transcript_check_box.IsChecked()
+        SETTINGS["CompressTranscript"] = self.compress_transcript_check_box.IsChecked()
+
+        logger.info("SettingsWindow().save_options(): Saving ddrescue's output: "
+                    + unicode(SETTINGS["SaveTranscript"])+", compressed: "
+                    + unicode(SETTINGS["CompressTranscript"])+".")
+
+        #Save the recovery's metrics option.
+        SETTINGS["SaveMetrics"] = self.save_metrics_check_box.IsChecked()
+
+        logger.info("SettingsWindow().save_options(): Saving the recovery's metrics: "
+                    + unicode(SETTINGS["SaveMetrics"])+".")
+
+        #Serve the recoveries' statistics option. Only restart the exporter if this changed.
+        if self.exporter_check_box.IsChecked():
+            exporter = ("", Exporter.DEFAULT_PORT)
+
+        else:
+            exporter = None
+
+        if exporter != SETTINGS["Exporter"]:
+            SETTINGS["Exporter"] = exporter
+            self.parent.set_exporter()
+
+        logger.info("SettingsWindow().save_options(): Serving statistics for Prometheus: "
+                    + unicode(SETTINGS["Exporter"] is not None)+".")
+
+        #Adaptive read rate control option.
+        SETTINGS["AdaptiveControl"] = self.adaptive_control_check_box.IsChecked()
+
+        logger.info("SettingsWindow().save_options(): Restarting ddrescue if the read rate "
+                    "collapses: "+unicode(SETTINGS["AdaptiveControl"])+".")
+
         #ChoiceBoxes:
         #Retry bad sectors option.
         bad_sector_retries_selection = self.bad_sector_retries_choice.GetCurrentSelection()
@@ -2843,6 +3669,36 @@ class SettingsWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
         logger.info("SettingsWindow().save_options(): ClusterSize is "
                     + SETTINGS["ClusterSize"][3:]+".")
 
+        #Display refresh rate option.
+        refresh_rate_selection = self.refresh_rate_choice.GetStringSelection()
+
+        if refresh_rate_selection == "Default (5)":
+            SETTINGS["DisplayRefreshRate"] = 5
+
+        else:
+            SETTINGS["DisplayRefreshRate"] = int(refresh_rate_selection)
+
+        logger.info("SettingsWindow().save_options(): Updating recovery information "
+                    + unicode(SETTINGS["DisplayRefreshRate"])+" times per second.")
+
+        #Output box lines option.
+        output_box_lines_selection = self.output_box_lines_choice.GetStringSelection()
+
+        if output_box_lines_selection == "Default (10000)":
+            SETTINGS["OutputBoxLines"] = 10000
+
+        else:
+            SETTINGS["OutputBoxLines"] = int(output_box_lines_selection)
+
+        logger.info("SettingsWindow().save_options(): Keeping "
+                    + unicode(SETTINGS["OutputBoxLines"])+" lines in the output box.")
+
+        #Recovery strategy option.
+        SETTINGS["Strategy"] = self.strategy_names[self.strategy_choice.GetSelection()]
+
+        logger.info("SettingsWindow().save_options(): Using recovery strategy: "
+                    + (SETTINGS["Strategy"] or "single pass")+".")
+
         #BlockSize detection.
         logger.info("SettingsWindow().save_options(): Determining blocksize of input file...")
 
@@ -2952,7 +3808,10 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
     """
 
     def __init__(self, parent, disk_capacity, recovered_data):
-        """Initialize FinishedWindow"""
+        """
+        Initialize FinishedWindow. disk_capacity (None if we don't know it) and
+        recovered_data are in bytes.
+        """
         wx.Frame.__init__(self, wx.GetApp().TopWindow, title="DDRescue-GUI - Finished!",
                           size=(350, 120), style=wx.DEFAULT_FRAME_STYLE)
 
@@ -2994,8 +3853,15 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
     def create_text(self):
         """Create all text for FinishedWindow"""
+        if self.disk_capacity is None:
+            disk_capacity = "an unknown amount of data"
+
+        else:
+            disk_capacity = Units.format_size(self.disk_capacity)
+
         self.stats_text = wx.StaticText(self.panel, -1, "Successfully recovered "
-                                        + self.recovered_data+" out of "+self.disk_capacity+".")
+                                        + Units.format_size(self.recovered_data)+" out of "
+                                        + disk_capacity+".")
 
         self.top_text = wx.StaticText(self.panel, -1, "Your recovered data is at:")
         self.path_text = wx.StaticText(self.panel, -1, SETTINGS["OutputFile"])
@@ -3171,7 +4037,7 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
             #Attempt to mount the disk.
             if LINUX:
-                self.output_file_mount_point = "/mnt"+SETTINGS["InputFile"]
+                self.output_file_mount_point = BackendTools.MOUNT_ROOT+SETTINGS["InputFile"]
                 retval = BackendTools.mount_disk(partition=SETTINGS["OutputFile"],
                                                  mount_point=self.output_file_mount_point,
                                                  options="-r")
@@ -3380,7 +4246,7 @@ class FinishedWindow(wx.Frame): #pylint: disable=too-many-instance-attributes
 
             if LINUX:
                 partition_to_mount = "/dev/mapper/"+selected_partition
-                self.output_file_mount_point = "/mnt"+partition_to_mount
+                self.output_file_mount_point = BackendTools.MOUNT_ROOT+partition_to_mount
 
                 #Attempt to mount the disk.
                 retval = BackendTools.mount_disk(partition_to_mount, self.output_file_mount_point,
@@ -3500,421 +4366,162 @@ class ElapsedTimeThread(threading.Thread):
             #Elapsed time.
             self.runtime_secs += 1
 
-            #Convert between Seconds, Minutes, Hours, and Days to make the value as
-            #understandable as possible.
-            if self.runtime_secs <= 60:
-                run_time = self.runtime_secs
-                unit = " seconds"
-
-            elif self.runtime_secs >= 60 and self.runtime_secs <= 3600:
-                run_time = self.runtime_secs//60
-                unit = " minutes"
-
-            elif self.runtime_secs > 3600 and self.runtime_secs <= 86400:
-                run_time = round(self.runtime_secs/3600, 2)
-                unit = " hours"
-
-            elif self.runtime_secs > 86400:
-                run_time = round(self.runtime_secs/86400, 2)
-                unit = " days"
-
             #Update the text.
-            wx.CallAfter(self.parent.update_time_elapsed, "Time Elapsed: "+unicode(run_time)+unit)
+            wx.CallAfter(self.parent.update_time_elapsed, "Time Elapsed: "
+                         + Units.format_duration(self.runtime_secs))
 
             #Wait for a second.
             time.sleep(1)
 
 #End Elapsed Time Thread
-#Begin Backend Thread
-class BackendThread(threading.Thread): #pylint: disable=too-many-instance-attributes
+#Begin Display Update Thread
+class DisplayUpdateThread(threading.Thread):
     """
-    Handles getting input from ddrescue during a recovery,
-    and forwards it back to the GUI thread as required.
+    Asks MainWindow to show the latest recovery information a few times a
+    second during a recovery, so the GUI gets one batched update per refresh
+    rather than an event for every value on every line of ddrescue's output.
     """
 
-    def __init__(self, parent): #TODO refactor me.
-        """Initialize and start the thread."""
+    def __init__(self, parent):
+        """Initialize and start the thread"""
         self.parent = parent
-
-        self.old_status = ""
-        self.got_initial_status = False
-        self.unit_list = ['null', 'B', 'k', 'M', 'G', 'T', 'P', 'E', 'Z', 'Y']
-        self.input_pos = "0 B"
-        self.disk_capacity = "An unknown amount of"
-
-        #TODO do these \/ values matter or can I set them to None?
-        self.disk_capacity_unit = "data"
-        self.recovered_data = 0
-        self.recovered_data_unit = "B"
-
-        self.time_since_last_read = None
-        self.error_size = None
-        self.time_remaining = None
-        self.current_read_rate = None
-        self.average_read_rate = None
-        self.average_read_rate_unit = None
-        self.num_errors = None
-        self.output_pos = None
+        self.interval = 1 / SETTINGS["DisplayRefreshRate"]
 
         threading.Thread.__init__(self)
         self.start()
 
     def run(self):
         """Main body of the thread, started with self.start()"""
-        logger.debug("MainBackendThread(): Setting up ddrescue tools...")
-
-        #Find suitable functions.
-        suitable_functions = DDRescueTools.setup_for_ddrescue_version(SETTINGS["DDRescueVersion"])
-
-        #Define all of these functions here under their correct names.
-        for function in suitable_functions:
-            vars(self)[function.__name__] = function
-
-        #Prepare to start ddrescue.
-        logger.debug("MainBackendThread(): Preparing to start ddrescue...")
-        options_list = [SETTINGS["DirectAccess"], SETTINGS["OverwriteOutputFile"],
-                        SETTINGS["DiskSize"], SETTINGS["Reverse"], SETTINGS["Preallocate"],
-                        SETTINGS["NoSplit"], SETTINGS["BadSectorRetries"], SETTINGS["MaxErrors"],
-                        SETTINGS["ClusterSize"], SETTINGS["InputFileBlockSize"],
-                        SETTINGS["InputFile"], SETTINGS["OutputFile"], SETTINGS["MapFile"]]
-
-        if LINUX:
-            exec_list = ["pkexec", RESOURCEPATH+"/Tools/helpers/runasroot_linux_ddrescue.sh",
-                         "ddrescue", "-v"]
-
-        else:
-            exec_list = ["sudo", "-SH", RESOURCEPATH+"/ddrescue", "-v"] #FIXME won't work if credentials have expired.
-
-        for option in options_list:
-            #Handle direct disk access on OS X.
-            if LINUX is False and options_list.index(option) == 0 and option != "":
-                #If we're recovering from a file, don't enable direct disk access (it won't work).
-                if SETTINGS["InputFile"][0:5] == "/dev/":
-                    #Remove InputFile and switch it with a string that uses /dev/rdisk (raw disk)
-                    #instead of /dev/disk.
-                    options_list.pop(10)
-                    options_list.insert(10, "/dev/r" + SETTINGS["InputFile"].split("/dev/")[1])
-
-                else:
-                    #Make sure "-d" isn't added to the exec_list if this is a file we're reading
-                    #from. It doesn't work on macOS.
-                    #(continue to next iteration of loop w/o adding).
-                    continue
-
-            elif option != "":
-                exec_list.append(option)
-
-        #Start ddrescue.
-        logger.debug("MainBackendThread(): Running ddrescue with: '"+' '.join(exec_list)+"'...")
-
-        #Ensure the rest of the program knows we are recovering data.
-        SETTINGS["RecoveringData"] = True
-
-        cmd = subprocess.Popen(exec_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        line = ""
-        char = " " #Set this so the while loop exeutes at least once.
-
-        #Give ddrescue plenty of time to start.
-        time.sleep(2)
-
-        #Grab information from ddrescue. (After ddrescue exits, attempt to keep reading chars until
-        #the last attempt gave an empty string)
-        while cmd.poll() is None or char != "":
-            char = cmd.stdout.read(1).decode("utf-8")
-            line += char
-
-            #If this is the end of the line, process it, and send the results to the GUI thread.
-            if char == "\n":
-                tidy_line = line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
-
-                if tidy_line != "":
-                    try:
-                        self.process_line(tidy_line)
-
-                    except Exception:
-                        #Handle unexpected errors. Can happen once in normal operation on
-                        #ddrescue v1.22+. TODO make smarter, don't fill log with these.
-                        #TODO suppress 1st error if on new versions.
-                        logger.warning("MainBackendThread(): Unexpected error parsing ddrescue's "
-                                       "output! Can happen once on newer versions of ddrescue "
-                                       "(1.22+) in normal operation. Are you running a "
-                                       "newer/older version of ddrescue than we support?")
-
-                #The ¬ is being used to denote where the output box should go up
-                #one line before continuing to write. A bit like a carriage return
-                #but the other way around.
-                wx.CallAfter(self.parent.update_output_box, line.replace("\x1b[A", "¬"))
-
-                #Reset line.
-                line = ""
-
-        #Parse any remaining lines afterwards.
-        if line != "":
-            tidy_line = line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
-            self.process_line(tidy_line)
-
-        #Let the GUI know that we are no longer recovering any data.
-        SETTINGS["RecoveringData"] = False
-
-        #Check if we got ddrescue's init status, and if ddrescue exited with a status other
-        #than 0. Handle errors in case someone is running DDRescue-GUI on an unsupported version
-        #of ddrescue. TODO refactor me.
-        if self.got_initial_status is False:
-            logger.error("MainBackendThread(): We didn't get the initial status before ddrescue "
-                         "exited! Something has gone wrong. Telling MainWindow and exiting...")
-
-            try:
-                wx.CallAfter(self.parent.on_recovery_ended,
-                             disk_capacity=unicode(self.disk_capacity)+" "+self.disk_capacity_unit,
-                             recovered_data=unicode(int(self.recovered_data))
-                             + " "+self.recovered_data_unit, result="NoInitialStatus",
-                             return_code=int(cmd.returncode))
-
-            except:
-                logger.error("MainBackendThread(): Unexpected error while trying to send recovery "
-                             "information to on_recovery_ended()! Continuing anyway. Are you "
-                             "running a newer/older version of ddrescue than we support?")
-
-                wx.CallAfter(self.parent.on_recovery_ended, disk_capacity="Unknown Size",
-                             recovered_data="Unknown Size", result="NoInitialStatus",
-                             return_code=int(cmd.returncode))
-
-        elif int(cmd.returncode) != 0:
-            logger.error("MainBackendThread(): ddrescue exited with exit status "
-                         + unicode(cmd.returncode)+"! Something has gone wrong. Telling "
-                         "MainWindow and exiting...")
-
-            try:
-                wx.CallAfter(self.parent.on_recovery_ended,
-                             disk_capacity=unicode(self.disk_capacity)+" "+self.disk_capacity_unit,
-                             recovered_data=unicode(int(self.recovered_data))
-                             + " "+self.recovered_data_unit, result="BadReturnCode",
-                             return_code=int(cmd.returncode))
-
-            except:
-                logger.error("MainBackendThread(): Unexpected error while trying to send recovery "
-                             "information to on_recovery_ended()! Continuing anyway. Are you "
-                             "running a newer/older version of ddrescue than we support?")
-
-                wx.CallAfter(self.parent.on_recovery_ended, disk_capacity="Unknown Size",
-                             recovered_data="Unknown Size", result="BadReturnCode",
-                             return_code=int(cmd.returncode))
-
-        else:
-            logger.info("MainBackendThread(): ddrescue finished recovering data. Telling "
-                        "MainWindow and exiting...")
-
-            try:
-                wx.CallAfter(self.parent.on_recovery_ended,
-                             disk_capacity=unicode(self.disk_capacity)+" "+self.disk_capacity_unit,
-                             recovered_data=unicode(int(self.recovered_data))
-                             + " "+self.recovered_data_unit, result="Success",
-                             return_code=int(cmd.returncode))
-
-            except:
-                logger.error("MainBackendThread(): Unexpected error while trying to send recovery "
-                             "information to on_recovery_ended()! Continuing anyway. Are you "
-                             "running a newer/older version of ddrescue than we support?")
-
-                wx.CallAfter(self.parent.on_recovery_ended, disk_capacity="Unknown Size",
-                             recovered_data="Unknown Size", result="Success",
-                             return_code=int(cmd.returncode))
-
-    def process_line(self, line): #pylint: disable=too-many-statements, too-many-branches
-        """
-        Process a given line to get ddrescue's current status and recovery information
-        and send it to the GUI Thread
-        """
-
-        split_line = line.split()
-
-        if split_line[0] == "About":
-            #All versions of ddrescue (1.14 - 1.23).
-
-            #Initial status.
-            logger.info("MainBackendThread().Processline(): Got Initial Status. "
-                        "Setting up the progressbar...")
-
-            self.got_initial_status = True
-
-            #pylint: disable=no-member
-            self.disk_capacity, self.disk_capacity_unit = self.get_initial_status(split_line)
-
-            wx.CallAfter(self.parent.set_progress_bar_range, self.disk_capacity)
-
-            #Start time elapsed thread.
-            ElapsedTimeThread(self.parent)
-
-        elif split_line[0] == "ipos:" and int(SETTINGS["DDRescueVersion"].split(".")[1]) < 21:
-            #Versions 1.14 - 1.20.
-
-            #pylint: disable=no-member
-            self.input_pos, self.num_errors, self.average_read_rate, self.average_read_rate_unit \
-            = self.get_inputpos_numerrors_averagereadrate(split_line)
-
-            wx.CallAfter(self.parent.update_input_pos, self.input_pos)
-            wx.CallAfter(self.parent.update_num_errors, self.num_errors)
-            wx.CallAfter(self.parent.update_average_read_rate, unicode(self.average_read_rate)
-                         + " "+self.average_read_rate_unit)
-
-        elif split_line[0] == "opos:":
-            #Versions 1.14 - 1.20 & 1.21 - 1.23.
-
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
-                #Get average read rate (ddrescue 1.21 - 1.23).
-                (self.output_pos, self.average_read_rate, self.average_read_rate_unit) = \
-                self.get_outputpos_average_read_rate(split_line) #pylint: disable=no-member
-
-                wx.CallAfter(self.parent.update_average_read_rate, unicode(self.average_read_rate)
-                             + " "+self.average_read_rate_unit)
-
-            else:
-                #Output Pos and time since last read (1.14 - 1.20).
-                (self.output_pos, self.time_since_last_read) = \
-                self.get_outputpos_time_since_last_read(split_line) #pylint: disable=no-member
-
-                wx.CallAfter(self.parent.update_time_since_last_read, self.time_since_last_read)
-
-            wx.CallAfter(self.parent.update_output_pos, self.output_pos)
-
-        elif split_line[0] == "non-tried:":
-            #Unreadable data (ddrescue 1.21 - 1.23).
-
-            #pylint: disable=no-member
-            self.error_size = self.get_unreadable_data(split_line)
-
-            wx.CallAfter(self.parent.update_error_size, self.error_size)
-
-        elif split_line[0] in ("time", "percent"): #Time since last read (ddrescue v1.20 - 1.23).
-            #pylint: disable=no-member
-            self.time_since_last_read = self.get_time_since_last_read(split_line)
-
-            wx.CallAfter(self.parent.update_time_since_last_read, self.time_since_last_read)
+        while SETTINGS["RecoveringData"]:
+            #Only ask for an update if something has changed, and MainWindow has
+            #dealt with the last one.
+            if self.parent.snapshot.request_update():
+                wx.CallAfter(self.parent.update_display)
 
-        elif split_line[0] == "rescued:" and int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
-            #Recovered data and number of errors (ddrescue 1.21 - 1.23).
+            time.sleep(self.interval)
 
-            #Don't crash if we're reading the initial status from the logfile.
-            try:
-                #pylint: disable=no-member
-                (self.recovered_data, self.recovered_data_unit, self.num_errors) = \
-                self.get_recovered_data_num_errors(split_line)
-
-                #Change the unit of measurement of the current amount of recovered data if needed.
-                (self.recovered_data, self.recovered_data_unit) = \
-                self.change_units(float(self.recovered_data), self.recovered_data_unit,
-                                  self.disk_capacity_unit)
+#End Display Update Thread
+#Begin Map File Watcher Thread
+class MapFileWatcherThread(threading.Thread):
+    """
+    Checks the map file for changes every couple of seconds during a recovery,
+    and redraws the block map when it changes.
+    """
 
-                self.recovered_data = round(self.recovered_data, 3)
+    def __init__(self, parent):
+        """Initialize and start the thread"""
+        self.parent = parent
 
-                self.time_remaining = self.calculate_time_remaining()
+        threading.Thread.__init__(self)
+        self.start()
 
-                wx.CallAfter(self.parent.update_recovered_data, unicode(self.recovered_data)
-                             + " "+self.recovered_data_unit)
+    def run(self):
+        """Main body of the thread, started with self.start()"""
+        while SETTINGS["RecoveringData"]:
+            if self.parent.block_map_panel.check_map_file():
+                wx.CallAfter(self.parent.block_map_panel.Refresh)
 
-                wx.CallAfter(self.parent.update_num_errors, self.num_errors)
-                wx.CallAfter(self.parent.update_progress, self.recovered_data, self.disk_capacity)
-                wx.CallAfter(self.parent.update_time_remaining, self.time_remaining)
+            time.sleep(2)
 
-            except AttributeError:
-                pass
+        #ddrescue writes the map file one last time when it exits.
+        if self.parent.block_map_panel.check_map_file():
+            wx.CallAfter(self.parent.block_map_panel.Refresh)
 
-        elif ("rescued:" in line and split_line[0] not in ("rescued:", "pct")) or "ipos:" in line:
-            #Versions 1.14 - 1.20 & 1.21 - 1.23
+#End Map File Watcher Thread
+#Begin Jobs Update Thread
+class JobsUpdateThread(threading.Thread):
+    """
+    Collects the latest information from each job in the Jobs Window every second,
+    and asks the window to show it while it is shown. Runs until self.running is set
+    to False.
+    """
 
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
-                status, info = line.split("ipos:")
+    def __init__(self, parent):
+        """Initialize and start the thread"""
+        self.parent = parent
+        self.running = True
+        self.window_shown = False
 
-            else:
-                status, info = line.split("rescued:")
+        threading.Thread.__init__(self)
 
-            #Status line.
-            if status != self.old_status:
-                wx.CallAfter(self.parent.update_status_bar, status)
-                self.old_status = status
+        #Don't keep DDRescue-GUI open after MainWindow closes.
+        self.daemon = True
+        self.start()
 
-            split_line = info.split()
+    def run(self):
+        """Main body of the thread, started with self.start()"""
+        while self.running:
+            for job in self.parent.scheduler.get_jobs():
+                #Throw away ddrescue's output - it's saved in the transcript, if the user
+                #wants it. This has to carry on while the window is hidden.
+                job.snapshot.take_changes()
 
-            if int(SETTINGS["DDRescueVersion"].split(".")[1]) >= 21:
-                #pylint: disable=no-member
-                self.current_read_rate, self.input_pos = self.get_current_rate_inputpos(split_line)
+            #Don't keep redrawing the list when nobody can see it.
+            if self.window_shown:
+                wx.CallAfter(self.parent.update_list_ctrl)
 
-                wx.CallAfter(self.parent.update_input_pos, self.input_pos)
+            time.sleep(1)
 
-            else:
-                (self.current_read_rate, self.error_size, self.recovered_data,
-                 self.recovered_data_unit) = \
-                self.get_current_rate_error_size_recovered_data(split_line) #pylint: disable=no-member,line-too-long
+#End Jobs Update Thread
+#Begin Backend Thread
+class BackendThread(threading.Thread):
+    """
+    Handles getting input from ddrescue during a recovery,
+    and forwards it back to the GUI thread as required.
+    The work is done by a Strategy.StrategyRunner, which doesn't use wx.
+    """
 
-                #Change the unit of measurement of the current amount of recovered data if needed.
-                (self.recovered_data, self.recovered_data_unit) = \
-                self.change_units(float(self.recovered_data), self.recovered_data_unit,
-                                  self.disk_capacity_unit)
+    def __init__(self, parent):
+        """Initialize and start the thread."""
+        self.parent = parent
+        self.runner = None
 
-                self.recovered_data = round(self.recovered_data, 3)
+        threading.Thread.__init__(self)
+        self.start()
 
-                self.time_remaining = self.calculate_time_remaining()
+    def run(self):
+        """Main body of the thread, started with self.start()"""
+        logger.debug("MainBackendThread(): Setting up ddrescue tools...")
 
-                wx.CallAfter(self.parent.update_error_size, self.error_size)
-                wx.CallAfter(self.parent.update_recovered_data, unicode(self.recovered_data)
-                             + " "+self.recovered_data_unit)
+        #Set up the parser for our version of ddrescue, and the stages of the recovery.
+        #ddrescue runs as root, so we can only stop it with the helper.
+        self.runner = Strategy.StrategyRunner(SETTINGS, self.parent.snapshot,
+                                              get_ddrescue_command(), linux=LINUX,
+                                              stop=get_ddrescue_stopper(),
+                                              on_initial_status=self.on_initial_status)
 
-                wx.CallAfter(self.parent.update_progress, self.recovered_data, self.disk_capacity)
-                wx.CallAfter(self.parent.update_time_remaining, self.time_remaining)
+        #Ensure the rest of the program knows we are recovering data.
+        SETTINGS["RecoveringData"] = True
 
-            wx.CallAfter(self.parent.update_current_read_rate, self.current_read_rate)
+        #Start showing the information we get from ddrescue.
+        DisplayUpdateThread(self.parent)
+        MapFileWatcherThread(self.parent)
 
-        elif "pct" not in line:
-            #Probably a status line (maybe the initial one).
-            status = line
+        #Run ddrescue, once for each stage, grabbing information from it until it closes
+        #its output.
+        result = self.runner.run()
+        recovery = self.runner.recovery
 
-            if status != self.old_status:
-                wx.CallAfter(self.parent.update_status_bar, status)
-                self.old_status = status
+        #Let the GUI know that we are no longer recovering any data.
+        SETTINGS["RecoveringData"] = False
 
-    def change_units(self, number_to_change, current_unit, required_unit):
-        """Convert data so it uses the correct unit of measurement"""
-        #Prepare for the change.
-        old_unit_number = self.unit_list.index(current_unit[0])
-        required_unit_number = self.unit_list.index(required_unit[0])
-        change_in_unit_number = required_unit_number - old_unit_number
-        power = -change_in_unit_number * 3
+        logger.info("MainBackendThread(): Recovery ended with result: "+result+". Telling "
+                    "MainWindow and exiting...")
 
-        #Do it.
-        return number_to_change * 10**power, required_unit[:2]
+        wx.CallAfter(self.parent.on_recovery_ended, disk_capacity=recovery.disk_capacity,
+                     recovered_data=recovery.recovered_data, result=result,
+                     return_code=recovery.return_code)
 
-    def calculate_time_remaining(self):
-        """
-        Calculate remaining time based on the average read rate and the current amount
-        of data recovered
-        """
+    def on_initial_status(self):
+        """Set up the progress bar and elapsed time when ddrescue's initial status arrives"""
+        logger.info("MainBackendThread().on_initial_status(): Got Initial Status. "
+                    "Setting up the progressbar...")
 
-        #Make sure everything's in the correct units.
-        new_average_read_rate = self.change_units(float(self.average_read_rate),
-                                                  self.average_read_rate_unit,
-                                                  self.disk_capacity_unit)[0]
+        #Show progress in tenths of a percent. Sizes in bytes are too big for wx.Gauge.
+        wx.CallAfter(self.parent.set_progress_bar_range, 1000)
 
-        try:
-            #Perform the calculation and round it.
-            result = (int(self.disk_capacity) - self.recovered_data) / new_average_read_rate
-
-            #Convert between Seconds, Minutes, Hours, and Days to make the value as
-            #understandable as possible.
-            if result <= 60:
-                return unicode(int(round(result)))+" seconds"
-            elif result >= 60 and result <= 3600:
-                return unicode(round(result/60, 1))+" minutes"
-            elif result > 3600 and result <= 86400:
-                return unicode(round(result/3600, 2))+" hours"
-            elif result > 86400:
-                return unicode(round(result/86400, 2))+" days"
-
-        except ZeroDivisionError:
-            #We can't divide by zero!
-            logger.warning("MainBackendThread().calculate_time_remaining(): Attempted to "
-                           "divide by zero! Returning 'Unknown'")
-
-            return "Unknown"
+        #Start time elapsed thread.
+        ElapsedTimeThread(self.parent)
 
 #End Backend thread
 
@@ -31,6 +31,7 @@ import unittest
 import os
 import sys
 import logging
+import subprocess
 import wx
 
 #Allow imports of modules & packages 1 level up.
@@ -81,6 +82,34 @@ class TestStartProcess(unittest.TestCase):
             self.assertEqual(retval, self.commands[command]["Retval"])
             self.assertEqual(output, self.commands[command]["Output"])
 
+class TestRead(unittest.TestCase):
+    """Tests for read() and read_lines()"""
+
+    def setUp(self):
+        self.cmd = subprocess.Popen(["printf", "one\\r\\ntw\\000o\\nthree"],
+                                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    def tearDown(self):
+        del self.cmd
+
+    def test_read1(self):
+        """Test #1: Line terminators are removed, NULL characters too."""
+        self.assertEqual(BackendTools.read(self.cmd), ["one", "", "two", "three"])
+        self.assertEqual(self.cmd.returncode, 0)
+
+    def test_read2(self):
+        """Test #2: Line terminators are kept when testing."""
+        self.assertEqual(BackendTools.read(self.cmd, testing=True),
+                         ["one\r", "\n", "two\n", "three"])
+
+    def test_read_lines1(self):
+        """Test #1: Lines are yielded one at a time."""
+        lines = BackendTools.read_lines(self.cmd)
+
+        self.assertEqual(next(lines), "one")
+        self.assertEqual(list(lines), ["", "two", "three"])
+        self.assertEqual(self.cmd.returncode, 0)
+
 class TestCreateUniqueKey(unittest.TestCase):
     """Tests for create_unique_key()"""
 
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Block Map tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the block map tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import mapfile as MapFile #pylint: disable=import-error
+from Tools import blockmap as BlockMap #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+#A map of a 64 KiB disk.
+TEST_MAPFILE = (b"# current_pos  current_status  current_pass\n"
+                b"0x00004000     ?               1\n"
+                b"#      pos        size  status\n"
+                b"0x00000000  0x00002000  +\n"
+                b"0x00002000  0x00000200  -\n"
+                b"0x00002200  0x00001E00  *\n"
+                b"0x00004000  0x0000C000  ?\n")
+
+def get_worst_status(mapfile, start, end):
+    """Return the worst status of the blocks between start and end, by looking at each one"""
+    statuses = set()
+    number = mapfile.find_block(start)
+
+    while number is not None and number < len(mapfile) and mapfile.starts[number] < end:
+        statuses.add(mapfile.get_block(number)[2])
+        number += 1
+
+    for code in BlockMap.PRIORITY:
+        if code.decode("ascii") in statuses:
+            return ord(code)
+
+    return 0
+
+class TestBlockMap(unittest.TestCase):
+    """Tests for BlockMap"""
+
+    def setUp(self):
+        self.mapfile = MapFile.MapFile()
+        self.mapfile.load(TEST_MAPFILE)
+        self.block_map = BlockMap.BlockMap(self.mapfile)
+
+    def tearDown(self):
+        del self.mapfile
+        del self.block_map
+
+    def test_resize1(self):
+        """Test #1: Each cell shows the worst status in it"""
+        self.block_map.resize(8)
+
+        self.assertEqual(self.block_map.cell_size, 0x2000)
+        self.assertEqual(self.block_map.cells, bytearray(b"+-??????"))
+
+        self.block_map.resize(32)
+        self.assertEqual(self.block_map.cells[:9], bytearray(b"++++-***?"))
+
+    def test_resize2(self):
+        """Test #2: Cells past the end of the rescue domain are empty"""
+        self.block_map.resize(3)
+
+        self.assertEqual(self.block_map.cell_size, 0x5556)
+        self.assertEqual(self.block_map.cells, bytearray(b"-??"))
+
+        self.mapfile.load(b"0x00000000  0x00000010  +\n")
+        self.block_map.resize(20)
+
+        self.assertEqual(self.block_map.cell_size, 1)
+        self.assertEqual(self.block_map.cells, bytearray(b"+" * 16) + bytearray(4))
+
+    def test_resize3(self):
+        """Test #3: Cells made from tiles are the same as looking at each block"""
+        #A 1 GiB disk with 2000 blocks, so each tile covers more than one byte.
+        lines = []
+
+        for number in range(2000):
+            lines.append("0x{0:X}  0x{1:X}  {2}\n".format(number * 0x80000, 0x80000,
+                                                          "+?*/-+++"[(number * 7) % 8]))
+
+        self.mapfile.load("".join(lines).encode("ascii"))
+
+        for num_cells in (1, 7, 300, 4096, 50000):
+            self.block_map.resize(num_cells)
+
+            cell_size = self.block_map.cell_size
+            expected = bytearray(get_worst_status(self.mapfile, cell * cell_size,
+                                                  (cell + 1) * cell_size)
+                                 for cell in range(num_cells))
+
+            self.assertEqual(cell_size % self.block_map.tile_size, 0)
+            self.assertEqual(self.block_map.cells, expected, num_cells)
+
+    def test_update1(self):
+        """Test #1: Only the cells that changed are worked out again"""
+        self.block_map.resize(8)
+
+        changes = self.mapfile.update(TEST_MAPFILE.replace(b"0x00004000  0x0000C000  ?",
+                                                           b"0x00004000  0x00002000  +\n"
+                                                           b"0x00006000  0x0000A000  ?"))
+
+        self.block_map.update(changes)
+        self.assertEqual(self.block_map.cells, bytearray(b"+-+?????"))
+
+    def test_get_rgb1(self):
+        """Test #1: Cells are turned into colours"""
+        self.block_map.resize(4)
+        self.block_map.cells[3] = 0
+
+        self.assertEqual(self.block_map.get_rgb(),
+                         bytearray(BlockMap.COLOURS["-"] + BlockMap.COLOURS["?"]
+                                   + BlockMap.COLOURS["?"] + BlockMap.BACKGROUND))
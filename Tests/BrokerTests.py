@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Broker tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the privileged helper broker. The broker is run as the current
+user, rather than through pkexec.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import broker as Broker #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A stand-in for ddrescue that waits to be interrupted. It is saved as "ddrescue", so
+#that is its process name.
+FAKE_DDRESCUE = "#!/bin/sh\ntrap 'exit 3' INT\nwhile true; do sleep 0.1; done\n"
+
+#A stand-in for the broker that prints a lot after it is ready, and exits when its
+#stdin is closed.
+NOISY_BROKER = ("import sys; sys.stdout.write('"+Broker.READY_MESSAGE+" /nonexistent\\n'); "
+                "sys.stdout.flush(); sys.stdout.write(('w' * 1000 + '\\n') * 200); "
+                "sys.stdout.flush(); sys.stdin.read()")
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the broker"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+
+    def test_get_command1(self):
+        """Test #1: Only allowed commands are run, from the safe path"""
+        command = Broker.get_command(["mkdir", "-p", "/mnt/ddrescue-gui/dev/sdb1"])
+
+        self.assertTrue(command[0].endswith("/mkdir"))
+        self.assertTrue(os.path.dirname(command[0]) in Broker.SAFE_PATH)
+        self.assertEqual(command[1:], ["-p", "/mnt/ddrescue-gui/dev/sdb1"])
+
+        #The user's path is ignored.
+        self.assertEqual(Broker.get_command(["/home/user/mkdir", "-p",
+                                             "/mnt/ddrescue-gui/dev/sdb1"])[0], command[0])
+
+        self.assertEqual(Broker.get_command(["rm", "-rf", "/"]), None)
+        self.assertEqual(Broker.get_command(["killall", "-INT", "ddrescue"]), None)
+        self.assertEqual(Broker.get_command([]), None)
+        self.assertEqual(Broker.get_command([1, 2]), None)
+
+    def test_get_command3(self):
+        """Test #3: Directories and mounts are only allowed inside the GUI's mount root"""
+        for args in (["mkdir", "-p", "/etc/cron.d"], ["mkdir", "/mnt/ddrescue-gui/a"],
+                     ["mkdir", "-p", "/mnt/ddrescue-gui/../../etc"],
+                     ["mkdir", "-p", "/mnt/ddrescue-gui"], ["mkdir", "-p", "mnt/ddrescue-gui/a"],
+                     ["umount", "/"], ["umount", "/home"], ["umount", "-l", "/dev/null"],
+                     ["mount", "--bind", self.temp_dir, "/etc"],
+                     ["mount", "-o", "remount,rw", "/"],
+                     ["mount", self.temp_dir, "/mnt/ddrescue-gui/a"],
+                     ["mount", "/dev/null", "/mnt/ddrescue-gui/a"]):
+
+            self.assertEqual(Broker.get_command(args), None, " ".join(args))
+
+        self.assertEqual(Broker.get_command(["umount", "/mnt/ddrescue-gui/dev/sdb1"])[1:],
+                         ["/mnt/ddrescue-gui/dev/sdb1"])
+
+        self.assertEqual(Broker.get_command(["mount"])[1:], [])
+
+    def test_get_command4(self):
+        """Test #4: Loop devices are only set up for the user's own images"""
+        image = os.path.join(self.temp_dir, "image")
+
+        with open(image, "w") as image_file:
+            image_file.write("")
+
+        #kpartx may not be installed, so check the arguments directly.
+        self.assertEqual(Broker.check_arguments("kpartx", ["-l", image], os.getuid()),
+                         ["-l", os.path.realpath(image)])
+
+        self.assertEqual(Broker.check_arguments("kpartx", ["-l", image], os.getuid()+1), None)
+        self.assertEqual(Broker.check_arguments("kpartx", ["-a", "-v", image], os.getuid()),
+                         None)
+
+        self.assertEqual(Broker.check_arguments("kpartx", ["-l", self.temp_dir], os.getuid()),
+                         None)
+
+    def test_get_command5(self):
+        """Test #5: Only the user's own ddrescue can be stopped, by its process ID"""
+        ddrescue = os.path.join(self.temp_dir, "ddrescue")
+
+        with open(ddrescue, "w") as ddrescue_file:
+            ddrescue_file.write(FAKE_DDRESCUE)
+
+        os.chmod(ddrescue, 0o755)
+        process = subprocess.Popen([ddrescue])
+
+        try:
+            #Wait for the process to become ddrescue.
+            time.sleep(0.5)
+            pid = unicode(process.pid)
+
+            self.assertEqual(Broker.get_command(["kill", "-INT", pid])[1:], ["-INT", pid])
+            self.assertEqual(Broker.get_command(["kill", "-INT", pid], uid=os.getuid()+1), None)
+            self.assertEqual(Broker.get_command(["kill", "-KILL", pid]), None)
+            self.assertEqual(Broker.get_command(["kill", "-INT", unicode(os.getpid())]), None)
+            self.assertEqual(Broker.get_command(["kill", "-INT", "-1"]), None)
+
+        finally:
+            process.kill()
+            process.wait()
+
+    def test_get_command6(self):
+        """Test #6: Only the lsblk and partprobe commands the GUI uses are allowed"""
+        self.assertEqual(Broker.check_arguments("lsblk", ["-J", "-o", "NAME,FSTYPE,SIZE"], 0),
+                         ["-J", "-o", "NAME,FSTYPE,SIZE"])
+
+        self.assertEqual(Broker.check_arguments("lsblk", ["--output-all"], 0), None)
+        self.assertEqual(Broker.check_arguments("partprobe", [], 0), [])
+        self.assertEqual(Broker.check_arguments("partprobe", ["/dev/sda"], 0), None)
+
+    def test_get_command2(self):
+        """Test #2: run_getdevinfo.py is run from next to the broker"""
+        command = Broker.get_command(["/usr/bin/python3", "/tmp/Tools/run_getdevinfo.py"])
+
+        self.assertEqual(command, [sys.executable,
+                                   os.path.join(os.path.dirname(Broker.__file__),
+                                                "run_getdevinfo.py")])
+
+    def test_split_lines1(self):
+        """Test #1: Output is split at newlines and carriage returns, however it arrives"""
+        self.assertEqual(list(Broker.split_lines([b"one\ntw", b"o\rthree\x00\n", b"four"])),
+                         ["one", "two", "three", "four"])
+
+class TestBroker(unittest.TestCase):
+    """Tests for BrokerServer and BrokerClient"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.client = Broker.BrokerClient([sys.executable,
+                                           Broker.__file__.replace(".pyc", ".py")])
+
+    def tearDown(self):
+        self.client.stop()
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.client
+
+    def test_run1(self):
+        """Test #1: Allowed commands are run, and their output is streamed back"""
+        self.assertTrue(self.client.start())
+        self.assertTrue(self.client.is_running())
+
+        lines = []
+        return_code, output = self.client.run(["mount"], on_line=lines.append)
+
+        self.assertEqual(return_code, 0)
+        self.assertTrue(output)
+        self.assertEqual(lines, output)
+
+        #Failures are passed on.
+        self.assertNotEqual(self.client.run(["umount", "/mnt/ddrescue-gui/not-mounted"])[0], 0)
+
+    def test_run3(self):
+        """Test #3: The user's ddrescue can be stopped through the broker"""
+        self.assertTrue(self.client.start())
+
+        ddrescue = os.path.join(self.temp_dir, "ddrescue")
+
+        with open(ddrescue, "w") as ddrescue_file:
+            ddrescue_file.write(FAKE_DDRESCUE)
+
+        os.chmod(ddrescue, 0o755)
+        process = subprocess.Popen([ddrescue])
+        time.sleep(0.5)
+
+        self.assertEqual(self.client.run(["kill", "-INT", unicode(process.pid)]), (0, []))
+        self.assertEqual(process.wait(), 3)
+
+    def test_run2(self):
+        """Test #2: Commands that aren't allowed are refused"""
+        self.assertTrue(self.client.start())
+
+        self.assertEqual(self.client.run(["rm", "-rf", self.temp_dir]), None)
+        self.assertTrue(os.path.isdir(self.temp_dir))
+
+    def test_start2(self):
+        """Test #2: Only the user can use the socket, and it's in a directory they can't change"""
+        self.assertTrue(self.client.start())
+
+        socket_details = os.lstat(self.client.socket_path)
+        directory_details = os.lstat(os.path.dirname(self.client.socket_path))
+
+        self.assertTrue(stat.S_ISSOCK(socket_details.st_mode))
+        self.assertEqual(stat.S_IMODE(socket_details.st_mode), 0o600)
+        self.assertEqual(socket_details.st_uid, os.getuid())
+        self.assertEqual(stat.S_IMODE(directory_details.st_mode), 0o711)
+
+    def test_start3(self):
+        """Test #3: What the broker prints after it's ready is read, so it can't get stuck"""
+        self.client = Broker.BrokerClient([sys.executable, "-c", NOISY_BROKER])
+        self.assertTrue(self.client.start())
+
+        stopper = threading.Thread(target=self.client.stop)
+        stopper.start()
+        stopper.join(10)
+
+        self.assertFalse(stopper.is_alive())
+
+    def test_stop1(self):
+        """Test #1: The broker exits and cleans up when it's stopped"""
+        self.assertTrue(self.client.start())
+
+        socket_path = self.client.socket_path
+        process = self.client.process
+
+        self.client.stop()
+
+        self.assertNotEqual(process.poll(), None)
+        self.assertFalse(os.path.exists(socket_path))
+        self.assertFalse(self.client.is_running())
+        self.assertEqual(self.client.run(["mount"]), None)
+
+    def test_start1(self):
+        """Test #1: Failing to start the broker is noticed"""
+        self.client = Broker.BrokerClient([sys.executable, "-c", "import sys; sys.exit(126)"])
+
+        self.assertFalse(self.client.start())
+        self.assertEqual(self.client.return_code, 126)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Read rate controller tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the read rate controller.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import controller as Controller #pylint: disable=import-error
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestController(unittest.TestCase):
+    """Tests for the read rate controller"""
+
+    def setUp(self):
+        self.settings = dict(Recovery.DEFAULT_OPTIONS)
+        self.settings["DDRescueVersion"] = "1.22"
+        self.recovery = Recovery.Recovery(self.settings, Snapshot.RecoverySnapshot())
+        self.recovery.average_read_rate = 50000000
+        self.recovery.current_read_rate = 50000000
+        self.recovery.time_since_last_read = 0
+
+    def tearDown(self):
+        del self.settings
+        del self.recovery
+
+    def test_get_adjustment1(self):
+        """Test #1: Each adjustment changes the right option"""
+        self.assertEqual(Controller.get_adjustment("Reverse", self.settings, self.recovery)[0],
+                         {"Reverse": "-R"})
+
+        self.assertEqual(Controller.get_adjustment("ClusterSize", self.settings,
+                                                   self.recovery)[0], {"ClusterSize": "-c 64"})
+
+        self.assertEqual(Controller.get_adjustment("MinReadRate", self.settings,
+                                                   self.recovery)[0], {"MinReadRate": "-a 5000000"})
+
+        self.assertEqual(Controller.get_adjustment("SkipSize", self.settings, self.recovery)[0],
+                         {"SkipSize": "-K 4194304"})
+
+    def test_get_adjustment2(self):
+        """Test #2: Adjustments that can't be made any more, or aren't supported, are refused"""
+        self.settings.update({"Reverse": "-R", "ClusterSize": "-c 8", "MinReadRate": "-a 65536",
+                              "DDRescueVersion": "1.20"})
+
+        self.assertEqual(Controller.get_adjustment("Reverse", self.settings, self.recovery)[0],
+                         {"Reverse": ""})
+
+        for name in ("ClusterSize", "MinReadRate", "SkipSize"):
+            self.assertEqual(Controller.get_adjustment(name, self.settings, self.recovery),
+                             (None, None))
+
+    def test_check1(self):
+        """Test #1: ddrescue is only restarted once the rate has collapsed for a while"""
+        controller = Controller.RateController(window=60, max_restarts=2)
+
+        self.assertEqual(controller.check(self.settings, self.recovery, 10), None)
+
+        #Too soon after starting.
+        self.recovery.current_read_rate = 1000
+        self.assertEqual(controller.check(self.settings, self.recovery, 30), None)
+
+        #Not slow for long enough.
+        self.assertEqual(controller.check(self.settings, self.recovery, 60), None)
+        self.assertEqual(controller.check(self.settings, self.recovery, 119), None)
+        self.assertEqual(controller.check(self.settings, self.recovery, 120), {"Reverse": "-R"})
+
+        #A stall counts straight away, and the next adjustment is tried.
+        self.recovery.time_since_last_read = 60
+        self.assertEqual(controller.check(self.settings, self.recovery, 60),
+                         {"ClusterSize": "-c 64"})
+
+        #We've given up now.
+        self.assertEqual(controller.check(self.settings, self.recovery, 600), None)
+        self.assertEqual(len(controller.decisions), 2)
+
+    def test_check2(self):
+        """Test #2: Adjustments that can't be made are skipped"""
+        controller = Controller.RateController(window=60)
+        self.settings.update({"Reverse": "-R", "ClusterSize": "-c 8",
+                              "DDRescueVersion": "1.20"})
+
+        self.recovery.time_since_last_read = 60
+
+        self.assertEqual(controller.check(self.settings, self.recovery, 60), {"Reverse": ""})
+        self.assertEqual(controller.check(self.settings, self.recovery, 60),
+                         {"MinReadRate": "-a 5000000"})
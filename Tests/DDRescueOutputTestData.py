@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# DDRescue output test data for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This module holds recorded-style ddrescue output for each supported version of
+ddrescue, as it appears on ddrescue's stdout when run with -v, including the
+carriage returns and \\x1b[A (up one line) sequences used to redraw the status.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Supported versions of ddrescue.
+VERSIONS = ["1.14", "1.15", "1.16", "1.17", "1.18", "1.19", "1.20", "1.21", "1.22", "1.23"]
+
+#The layout of the status for each version of ddrescue.
+STATUS_1_14 = ("rescued: {rescued},  errsize: {error_size},  current rate: {current_rate}\n"
+               "   ipos: {ipos},   errors: {errors},    average rate: {average_rate}\n"
+               "   opos: {opos},     time since last successful read: {last_read}\n")
+
+STATUS_1_18 = ("rescued: {rescued},  errsize: {error_size},  current rate: {current_rate}\n"
+               "   ipos: {ipos},   errors: {errors},    average rate: {average_rate}\n"
+               "   opos: {opos}, run time: {run_time},  successful read: {last_read} ago\n")
+
+STATUS_1_21 = ("     ipos: {ipos}, non-trimmed: {non_trimmed},  current rate: {current_rate}\n"
+               "     opos: {opos}, non-scraped: {non_scraped},  average rate: {average_rate}\n"
+               "non-tried: {non_tried},     errsize: {error_size},      run time: {run_time}\n"
+               "  rescued: {rescued},      errors: {errors},  remaining time: {remaining}\n"
+               "percent rescued: {percent}%      time since last successful read: {last_read}\n")
+
+STATUS_1_22 = ("     ipos: {ipos}, non-trimmed: {non_trimmed},  current rate: {current_rate}\n"
+               "     opos: {opos}, non-scraped: {non_scraped},  average rate: {average_rate}\n"
+               "non-tried: {non_tried},  bad-sector: {error_size},    error rate: {error_rate}\n"
+               "  rescued: {rescued},   bad areas: {errors},        run time: {run_time}\n"
+               "pct rescued: {percent}%, read errors: {errors},  remaining time: {remaining}\n"
+               "                              time since last successful read: {last_read}\n")
+
+#The size of the fake disk.
+DISK_SIZE = 500000000000
+
+#Functions to return test data.
+def get_status_layout(version):
+    """Returns the status layout for the given version of ddrescue."""
+    minor_version = int(version.split(".")[1])
+
+    if minor_version < 18:
+        return STATUS_1_14
+
+    elif minor_version < 21:
+        return STATUS_1_18
+
+    elif minor_version == 21:
+        return STATUS_1_21
+
+    return STATUS_1_22
+
+def format_size(num_bytes):
+    """Format a size like ddrescue does (eg "12345 MB"), and return it with the rounded size."""
+    prefixes = ["", "k", "M", "G", "T"]
+    power = 0
+
+    while num_bytes // 1000**power >= 100000:
+        power += 1
+
+    value = num_bytes // 1000**power
+
+    return unicode(value)+" "+prefixes[power]+"B", value * 1000**power
+
+def format_time(seconds, version):
+    """Format a time like ddrescue does, and return it."""
+    if seconds is None:
+        return "n/a"
+
+    elif int(version.split(".")[1]) < 21:
+        return unicode(seconds)+" s"
+
+    elif seconds < 60:
+        return unicode(seconds)+"s"
+
+    return unicode(seconds // 60)+"m "+unicode(seconds % 60)+"s"
+
+def return_fake_states():
+    """
+    Returns a list of the states of a fake recovery, one for each status update, as
+    dictionaries with sizes in bytes, rates in bytes per second, and times in seconds.
+    """
+
+    states = []
+    rescued = 0
+    error_size = 0
+    errors = 0
+    last_read = 0
+    phase = "Copying non-tried blocks... Pass 1 (forwards)"
+
+    for run_time in range(1, 121):
+        if run_time <= 60:
+            #Fast and healthy.
+            current_rate = 50000000 + (run_time % 7) * 1000000
+            last_read = 0
+
+        elif run_time <= 90:
+            #Slowing down, with errors.
+            current_rate = 2000000
+            error_size += 65536
+            errors += 1
+            last_read = run_time % 5
+
+        else:
+            #Trimming, very slowly.
+            phase = "Trimming failed blocks... (forwards)"
+            current_rate = 0
+            last_read += 1
+
+        rescued += current_rate
+
+        states.append({"status": phase, "recovered_data": rescued, "error_size": error_size,
+                       "num_errors": errors, "current_read_rate": current_rate,
+                       "average_read_rate": rescued // run_time, "input_pos": rescued,
+                       "output_pos": rescued, "run_time": run_time,
+                       "time_since_last_read": last_read,
+                       "disk_capacity": DISK_SIZE})
+
+    return states
+
+def return_fake_output(version, states=None):
+    """
+    Returns fake ddrescue output for the given version of ddrescue, and a list of the
+    states shown in it, rounded to the precision ddrescue shows them with.
+    """
+
+    if states is None:
+        states = return_fake_states()
+
+    layout = get_status_layout(version)
+    num_lines = layout.count("\n")
+
+    output = "GNU ddrescue "+version+"\n"
+    output += "About to copy 500 GBytes from /dev/sdb to /home/user/disk.img\n"
+    output += "    Starting positions: infile = 0 B,  outfile = 0 B\n"
+    output += "    Copy block size: 128 sectors       Initial skip size: 128 sectors\n"
+    output += "Sector size: 512 Bytes\n\n"
+    output += "Press Ctrl-C to interrupt\n"
+
+    shown_states = []
+
+    for number, state in enumerate(states):
+        shown = dict(state)
+        fields = {}
+
+        for field, key in (("rescued", "recovered_data"), ("error_size", "error_size"),
+                           ("ipos", "input_pos"), ("opos", "output_pos")):
+            fields[field], shown[key] = format_size(state[key])
+
+        for field, key in (("current_rate", "current_read_rate"),
+                           ("average_rate", "average_read_rate")):
+            fields[field], shown[key] = format_size(state[key])
+            fields[field] += "/s"
+
+        fields["non_tried"] = format_size(DISK_SIZE - state["recovered_data"]
+                                          - state["error_size"])[0]
+
+        fields["non_trimmed"] = fields["non_scraped"] = "0 B"
+        fields["error_rate"] = "0 B/s"
+        fields["errors"] = unicode(state["num_errors"])
+        fields["run_time"] = format_time(state["run_time"], version)
+        fields["remaining"] = "n/a"
+        fields["last_read"] = format_time(state["time_since_last_read"], version)
+        fields["percent"] = unicode(round(state["recovered_data"] * 100 / DISK_SIZE, 2))
+
+        if number > 0:
+            #Go back to the start of the status, and redraw it.
+            output += "\r"+"\x1b[A" * num_lines
+
+        output += layout.format(**fields)+state["status"]
+        shown_states.append(shown)
+
+    output += "\n\nFinished\n"
+
+    return output, shown_states
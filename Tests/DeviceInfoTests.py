@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Device information format tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the device information format tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import deviceinfo as DeviceInfo #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#Some information from getdevinfo.
+DISKINFO = {"/dev/sda": {"Name": "/dev/sda", "Type": "Device", "HostDevice": "N/A",
+                         "Vendor": "ATA", "Product": "Fake Disk", "Capacity": "1.02 GB",
+                         "RawCapacity": "1024000000", "Description": "Hard Disk Drive",
+                         "Partitions": ["/dev/sda1"], "Flags": ["smart"]},
+            "/dev/sda1": {"Name": "/dev/sda1", "Type": "Partition", "HostDevice": "/dev/sda",
+                          "Vendor": "ATA", "Product": "Fake Disk", "Capacity": "512.0 MB",
+                          "RawCapacity": "512000000", "Description": "Partition 1 on /dev/sda",
+                          "Partitions": []}}
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the device information format tools"""
+
+    def test_encode1(self):
+        """Test #1: The header, each disk, and the number of disks are on lines of their own"""
+        lines = DeviceInfo.encode(DISKINFO)
+
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[0], '{"format": "ddrescue-gui-deviceinfo", "version": 1}')
+        self.assertTrue(lines[1].startswith('{"device": "/dev/sda", '))
+        self.assertEqual(lines[3], '{"end": 2}')
+
+    def test_decode1(self):
+        """Test #1: The disk information is the same after being sent"""
+        self.assertEqual(DeviceInfo.decode("\n".join(DeviceInfo.encode(DISKINFO))), DISKINFO)
+        self.assertEqual(DeviceInfo.decode("\n".join(DeviceInfo.encode({}))), {})
+
+    def test_decode2(self):
+        """Test #2: Incomplete output isn't used"""
+        lines = DeviceInfo.encode(DISKINFO)
+
+        self.assertEqual(DeviceInfo.decode("\n".join(lines[:-1])), None)
+        self.assertEqual(DeviceInfo.decode("\n".join(lines[:2]+lines[3:])), None)
+        self.assertEqual(DeviceInfo.decode(""), None)
+
+    def test_check_info1(self):
+        """Test #1: Missing fields are filled in, and fields of the wrong type are converted"""
+        info = DeviceInfo.check_info({"Name": "/dev/sdb", "RawCapacity": 4000,
+                                      "Partitions": ("/dev/sdb1",), "Extra": 1})
+
+        self.assertEqual(info, {"Name": "/dev/sdb", "Type": "Unknown", "HostDevice": "N/A",
+                                "Vendor": "Unknown", "Product": "Unknown",
+                                "Capacity": "Unknown", "RawCapacity": "4000",
+                                "Description": "N/A", "Partitions": ["/dev/sdb1"],
+                                "Extra": 1})
+
+        self.assertEqual(DeviceInfo.check_info({"Partitions": "/dev/sdb1"})["Partitions"], [])
+        self.assertEqual(DeviceInfo.check_info(None)["Name"], "Unknown")
+
+class TestDeviceInfoDecoder(unittest.TestCase):
+    """Tests for DeviceInfoDecoder"""
+
+    def setUp(self):
+        self.decoder = DeviceInfo.DeviceInfoDecoder()
+
+    def tearDown(self):
+        del self.decoder
+
+    def test_feed1(self):
+        """Test #1: Each disk is returned as soon as its line arrives"""
+        lines = DeviceInfo.encode(DISKINFO)
+
+        self.assertEqual(self.decoder.feed(lines[0]), None)
+        self.assertEqual(self.decoder.feed(lines[1]), ("/dev/sda", DISKINFO["/dev/sda"]))
+        self.assertEqual(self.decoder.feed(lines[2]), ("/dev/sda1", DISKINFO["/dev/sda1"]))
+        self.assertFalse(self.decoder.finished)
+
+        self.assertEqual(self.decoder.feed(lines[3]), None)
+        self.assertTrue(self.decoder.finished)
+
+    def test_feed2(self):
+        """Test #2: Lines that aren't part of the output are skipped"""
+        lines = DeviceInfo.encode(DISKINFO)
+
+        for line in ["Error executing command as another user", "", "[1, 2]", "null"]+lines:
+            self.decoder.feed(line)
+
+        self.assertTrue(self.decoder.finished)
+        self.assertEqual(self.decoder.devices, DISKINFO)
+
+    def test_feed3(self):
+        """Test #3: Output in other versions of the format is ignored"""
+        self.decoder.feed('{"format": "ddrescue-gui-deviceinfo", "version": 2}')
+
+        for line in DeviceInfo.encode(DISKINFO)[1:]:
+            self.assertEqual(self.decoder.feed(line), None)
+
+        self.assertFalse(self.decoder.finished)
+        self.assertEqual(self.decoder.devices, {})
+
+    def test_feed4(self):
+        """Test #4: A new header starts again"""
+        lines = DeviceInfo.encode(DISKINFO)
+
+        for line in lines[:2]+DeviceInfo.encode({"/dev/sdb": {"Name": "/dev/sdb"}}):
+            self.decoder.feed(line)
+
+        self.assertTrue(self.decoder.finished)
+        self.assertEqual(list(self.decoder.devices), ["/dev/sdb"])
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Estimator tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the estimator tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import estimator as Estimator #pylint: disable=import-error
+from Tools.DDRescueTools import parser as DDRescueParser #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class FakeClock(object):
+    """A clock that only moves when it's told to"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the estimator tools"""
+
+    def test_get_phase1(self):
+        """Test #1: The phase is found from ddrescue's status messages"""
+        self.assertEqual(Estimator.get_phase("Copying non-tried blocks... Pass 1 (forwards)"),
+                         "Copying")
+
+        self.assertEqual(Estimator.get_phase("Trimming failed blocks... (forwards)"), "Trimming")
+        self.assertEqual(Estimator.get_phase("Retrying bad sectors... Retry 1 (forwards)"),
+                         "Retrying")
+
+        self.assertEqual(Estimator.get_phase("Finished"), "Finished")
+        self.assertEqual(Estimator.get_phase("Initial status (read from mapfile)"), None)
+
+    def test_get_progress1(self):
+        """Test #1: ddrescue's own counts are used if it gives them, and sizes otherwise"""
+        values = {"disk_capacity": 1000, "recovered_data": 600, "error_size": 100,
+                  "non_tried": 250, "non_trimmed": 30, "non_scraped": 20}
+
+        self.assertEqual(Estimator.get_progress("Copying", values), (750, 250))
+        self.assertEqual(Estimator.get_progress("Trimming", values), (-30, 30))
+        self.assertEqual(Estimator.get_progress("Scraping", values), (-20, 20))
+        self.assertEqual(Estimator.get_progress("Retrying", values), (-100, 100))
+
+        for name in ("non_tried", "non_trimmed", "non_scraped"):
+            del values[name]
+
+        self.assertEqual(Estimator.get_progress("Copying", values), (700, 300))
+        self.assertEqual(Estimator.get_progress("Trimming", values), (-100, 100))
+
+        self.assertEqual(Estimator.get_progress("Copying", {"recovered_data": 600}),
+                         (None, None))
+
+    def test_format_estimate1(self):
+        """Test #1: Estimates are shown with their range"""
+        self.assertEqual(Estimator.format_estimate(None), "Unknown")
+        self.assertEqual(Estimator.format_estimate((7200, 5400, 10800)),
+                         "2.0 hours (1.5 hours to 3.0 hours)")
+
+        self.assertEqual(Estimator.format_estimate((600, 300, None)),
+                         "10.0 minutes (at least 5.0 minutes)")
+
+class TestETAEstimator(unittest.TestCase):
+    """Tests for ETAEstimator"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        del self.clock
+
+    def replay(self, version):
+        """
+        Feed the fake output for version to an estimator, with each status update a second
+        apart like ddrescue's, and return the estimator and its estimate after each update
+        """
+
+        estimator = Estimator.ETAEstimator(clock=self.clock)
+        parser = DDRescueParser.StatusParser(version)
+        estimates = []
+
+        #Split the output in the same way as Recovery.follow().
+        for line in Data.return_fake_output(version)[0].split("\n"):
+            line = line.replace("\r", "").replace("\x1b[A", "")
+
+            if line == "":
+                continue
+
+            values = parser.parse(line)
+            estimator.update(values)
+
+            if "recovered_data" in values:
+                self.clock.now += 1
+                estimator.sample()
+                estimates.append(estimator.estimate())
+
+        return estimator, estimates
+
+    def test_estimate1(self):
+        """Test #1: While copying quickly, the estimate is close, and inside its range"""
+        for version in Data.VERSIONS:
+            estimates = self.replay(version)[1]
+            state = Data.return_fake_states()[59]
+
+            #The disk is being read at about 53 MB/s.
+            expected = ((Data.DISK_SIZE - state["recovered_data"] - state["error_size"])
+                        / 53000000)
+
+            time_left, low, high = estimates[59]
+
+            self.assertTrue(abs(time_left - expected) < expected * 0.05, version)
+            self.assertTrue(low <= expected <= high, version)
+
+    def test_estimate2(self):
+        """Test #2: The estimate follows the read rate when it collapses"""
+        for version in Data.VERSIONS:
+            estimates = self.replay(version)[1]
+
+            #The average read rate over the whole recovery would still be about 27 MB/s.
+            self.assertTrue(estimates[89][0] > estimates[59][0] * 2.5, version)
+
+    def test_estimate3(self):
+        """Test #3: A new phase starts a new estimate"""
+        for version in Data.VERSIONS:
+            estimator, estimates = self.replay(version)
+
+            self.assertEqual(estimator.phase, "Finished")
+            self.assertEqual(estimator.estimate(), (0, 0, 0))
+
+            #The status message comes at the end of each update, so the trimming phase
+            #starts with update 92.
+            self.assertEqual(estimates[91], None, version)
+
+    def test_estimate4(self):
+        """Test #4: A steady rate gives a narrow range, and a stalled one a much wider one"""
+        estimator = Estimator.ETAEstimator(clock=self.clock)
+        estimator.update({"status": "Scraping failed blocks... (forwards)",
+                          "non_scraped": 1000000})
+
+        for second in range(10):
+            self.clock.now = second
+            estimator.update({"non_scraped": 1000000 - second * 1000})
+            estimator.sample()
+
+        self.assertEqual(estimator.estimate(), (991, 991, 991))
+
+        for second in range(10, 40):
+            self.clock.now = second
+            estimator.sample()
+
+        time_left, low, high = estimator.estimate()
+
+        self.assertTrue(time_left > 991 * 2)
+        self.assertTrue(low < time_left)
+        self.assertEqual(high, None)
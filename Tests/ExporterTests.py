@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Exporter tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the exporter tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+try:
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
+except ImportError:
+    #Python 2.
+    from urllib2 import urlopen, HTTPError #pylint: disable=import-error
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import exporter as Exporter #pylint: disable=import-error
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestExporter(unittest.TestCase):
+    """Tests for the exporter"""
+
+    def setUp(self):
+        self.recovery = Recovery.Recovery({"DDRescueVersion": "1.22", "InputFile": "/dev/sdb",
+                                           "OutputFile": "/home/user/\"disk\".img",
+                                           "MapFile": "/home/user/disk.map"},
+                                          Snapshot.RecoverySnapshot())
+
+        self.recovery.old_status = "Copying non-tried blocks... Pass 1 (forwards)"
+        self.recovery.disk_capacity = 4000000000
+        self.recovery.recovered_data = 1000000000
+        self.recovery.error_size = 4096
+        self.recovery.num_errors = 2
+        self.recovery.current_read_rate = 52428000
+
+        self.labels = "input=\"/dev/sdb\",output=\"/home/user/\\\"disk\\\".img\"," \
+                      "map=\"/home/user/disk.map\""
+
+    def tearDown(self):
+        del self.recovery
+        del self.labels
+
+    def test_render1(self):
+        """Test #1: The recovery's values are rendered in the OpenMetrics text format"""
+        lines = Exporter.render([self.recovery]).split("\n")
+
+        self.assertIn("ddrescue_recovery_info{"+self.labels+",status=\"Copying non-tried "
+                      "blocks... Pass 1 (forwards)\"} 1", lines)
+
+        self.assertIn("ddrescue_rescued_bytes{"+self.labels+"} 1000000000", lines)
+        self.assertIn("ddrescue_bad_areas{"+self.labels+"} 2", lines)
+        self.assertIn("# UNIT ddrescue_error_size_bytes bytes", lines)
+
+        #Values we don't know yet are left out, and the output ends with # EOF.
+        self.assertFalse([line for line in lines if line.startswith("ddrescue_read_errors")])
+        self.assertEqual(lines[-2:], ["# EOF", ""])
+
+    def test_render2(self):
+        """Test #2: Counters get the _total suffix"""
+        self.recovery.read_errors = 7
+
+        self.assertIn("ddrescue_read_errors_total{"+self.labels+"} 7",
+                      Exporter.render([self.recovery]).split("\n"))
+
+    def test_serve1(self):
+        """Test #1: The metrics are served over HTTP, at /metrics only"""
+        exporter = Exporter.MetricsExporter(("127.0.0.1", 0))
+        exporter.add_source(lambda: [self.recovery])
+        exporter.start()
+
+        try:
+            url = "http://127.0.0.1:"+unicode(exporter.server.server_address[1])
+            response = urlopen(url+"/metrics")
+
+            self.assertEqual(response.getcode(), 200)
+            self.assertEqual(response.info()["Content-Type"], Exporter.CONTENT_TYPE)
+            self.assertEqual(response.read().decode("utf-8"), Exporter.render([self.recovery]))
+            response.close()
+
+            self.assertRaises(HTTPError, urlopen, url+"/")
+
+        finally:
+            exporter.stop()
+
+        self.assertEqual(exporter.server, None)
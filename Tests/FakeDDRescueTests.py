@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Fake ddrescue tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the fake ddrescue. They run whole recoveries with it, through
+the same code the GUI uses.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import signal
+import tempfile
+import threading
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import fakeddrescue as FakeDDRescue #pylint: disable=import-error
+from Tools import mapfile as MapFile #pylint: disable=import-error
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+from Tools import strategy as Strategy #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#The size of the fake device, and its bad areas.
+DEVICE_SIZE = 1048576
+BAD_AREAS = [(0x10000, 0x600), (0x80200, 0x200)]
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the fake ddrescue"""
+
+    def test_parse_errors1(self):
+        """Test #1: Bad areas are read, with how many times they fail if given"""
+        self.assertEqual(FakeDDRescue.parse_errors("0x1000:512, 8192:1024:2,"),
+                         [[4096, 512, None], [8192, 1024, 2]])
+
+        self.assertEqual(FakeDDRescue.parse_errors(""), [])
+        self.assertRaises(ValueError, FakeDDRescue.parse_errors, "4096")
+
+    def test_parse_options1(self):
+        """Test #1: Options are found whether or not their values are separate"""
+        self.assertEqual(FakeDDRescue.parse_options(["-v", "-r 2", "-c", "64", "-N", "in",
+                                                     "out", "map"]),
+                         ({"v": "", "r": "2", "c": "64", "N": ""}, ["in", "out", "map"]))
+
+    def test_map1(self):
+        """Test #1: Areas are marked, and neighbours with the same status are joined"""
+        fake_map = FakeDDRescue.Map(4096)
+
+        fake_map.set_status(0, 1024, "+")
+        fake_map.set_status(2048, 512, "-")
+        fake_map.set_status(1024, 1024, "+")
+
+        self.assertEqual(fake_map.blocks, [[0, 2048, "+"], [2048, 512, "-"], [2560, 1536, "?"]])
+        self.assertEqual(fake_map.get_areas("?-"), [(2048, 512), (2560, 1536)])
+
+class TestFakeDDRescue(unittest.TestCase):
+    """Tests for the fake ddrescue"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.snapshot = Snapshot.RecoverySnapshot()
+        self.environ = dict(os.environ)
+
+        self.settings = dict(Recovery.DEFAULT_OPTIONS)
+        self.settings.update({"DDRescueVersion": "1.23", "Strategy": "",
+                              "InputFile": os.path.join(self.temp_dir, "device"),
+                              "OutputFile": os.path.join(self.temp_dir, "disk.img"),
+                              "MapFile": os.path.join(self.temp_dir, "disk.map")})
+
+        #A sparse fake device, with some data at the start of each bad area.
+        FakeDDRescue.create_device(self.settings["InputFile"], DEVICE_SIZE)
+
+        with open(self.settings["InputFile"], "r+b") as device_file:
+            for pos, size in BAD_AREAS:
+                device_file.seek(pos - 512)
+                device_file.write(b"\xAA" * (512 + size))
+
+        os.environ["FAKE_DDRESCUE_ERRORS"] = ",".join(unicode(pos)+":"+unicode(size)
+                                                      for pos, size in BAD_AREAS)
+
+    def tearDown(self):
+        os.environ.clear()
+        os.environ.update(self.environ)
+
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.snapshot
+        del self.environ
+        del self.settings
+
+    def get_command(self):
+        """Return how to start the fake ddrescue"""
+        return [sys.executable, FakeDDRescue.__file__.replace(".pyc", ".py"), "-v"]
+
+    def run_recovery(self):
+        """Run a single pass with the fake ddrescue, and return the Recovery and its result"""
+        recovery = Recovery.Recovery(self.settings, self.snapshot)
+        recovery.start(Recovery.build_exec_list(self.settings, self.get_command()))
+        recovery.follow()
+
+        return recovery, recovery.finish()
+
+    def check_map(self):
+        """Check that only the bad areas are left in the map, and return the MapFile"""
+        mapfile = MapFile.read_mapfile(self.settings["MapFile"])
+
+        self.assertEqual([mapfile.get_block(number) for number in range(len(mapfile))],
+                         [(0, 0x10000, "+"), (0x10000, 0x600, "-"), (0x10600, 0x6FC00, "+"),
+                          (0x80200, 0x200, "-"), (0x80400, DEVICE_SIZE - 0x80400, "+")])
+
+        with open(self.settings["OutputFile"], "rb") as output_file:
+            output = output_file.read()
+
+        #The data that could be read was copied.
+        self.assertEqual(output[0xFE00:0x10000], b"\xAA" * 512)
+        self.assertEqual(output[0x10000:0x10600], b"\0" * 0x600)
+
+        return mapfile
+
+    def test_run1(self):
+        """Test #1: A whole recovery is followed, for every supported version"""
+        for version in Data.VERSIONS:
+            os.environ["FAKE_DDRESCUE_VERSION"] = version
+            self.settings["DDRescueVersion"] = version
+
+            for name in ("MapFile", "OutputFile"):
+                if os.path.exists(self.settings[name]):
+                    os.remove(self.settings[name])
+
+            recovery, result = self.run_recovery()
+
+            self.assertEqual(result, "Success", version)
+            self.assertEqual(recovery.old_status, "Finished", version)
+            self.assertEqual(recovery.disk_capacity, 1048000, version)
+            self.assertEqual(recovery.recovered_data, 1046000, version)
+            self.assertEqual(recovery.input_pos, 524000, version)
+
+            if int(version.split(".")[1]) >= 18:
+                self.assertEqual(recovery.num_errors, 2, version)
+
+            self.assertEqual(self.check_map().current_status, "+", version)
+
+    def test_run2(self):
+        """Test #2: The multi-pass strategy leaves only the bad sectors"""
+        self.settings["Strategy"] = "MultiPass"
+
+        runner = Strategy.StrategyRunner(self.settings, self.snapshot, self.get_command())
+
+        self.assertEqual(runner.run(), "Success")
+        self.assertEqual([result for name, result in runner.results], ["Success"] * 4)
+        self.check_map()
+
+    def test_run5(self):
+        """Test #5: The multi-pass strategy keeps every stage's output in the transcript"""
+        self.settings.update({"Strategy": "MultiPass", "SaveTranscript": True,
+                              "CompressTranscript": False})
+
+        runner = Strategy.StrategyRunner(self.settings, self.snapshot, self.get_command())
+        self.assertEqual(runner.run(), "Success")
+
+        with open(self.settings["MapFile"]+".transcript", "rb") as transcript_file:
+            transcript = transcript_file.read()
+
+        self.assertEqual(transcript.count(b"GNU ddrescue "), 4)
+        self.assertEqual(transcript.count(b"--- DDRescue-GUI: ddrescue started again at "), 3)
+
+    def test_run6(self):
+        """Test #6: The adaptive controller stops the running ddrescue before restarting it"""
+        os.environ["FAKE_DDRESCUE_RATE"] = "400000"
+        self.settings["AdaptiveControl"] = True
+
+        stopped = []
+
+        def stop(pid):
+            """Stop ddrescue by its process ID, like the GUI does"""
+            stopped.append((pid, runner.recovery.cmd))
+            os.kill(pid, signal.SIGINT)
+
+        runner = Strategy.StrategyRunner(self.settings, self.snapshot, self.get_command(),
+                                         stop=stop)
+
+        runner.interval = 0.1
+        runner.controller.window = 0.5
+        runner.controller.max_restarts = 1
+
+        #Make any read rate look like a collapse.
+        runner.controller.best_rate = 10 ** 12
+
+        self.assertEqual(runner.run(), "Success")
+        self.assertEqual(len(runner.controller.decisions), 1)
+        self.assertEqual(runner.adjustments, {"Reverse": "-R"})
+
+        #The first ddrescue was interrupted, and the restarted one finished the recovery.
+        self.assertEqual(len(stopped), 1)
+
+        pid, cmd = stopped[0]
+
+        self.assertEqual(pid, cmd.pid)
+        self.assertNotIn(cmd.poll(), (None, 0))
+        self.assertIsNot(cmd, runner.recovery.cmd)
+        self.check_map()
+
+    def test_run3(self):
+        """Test #3: Areas that can be read after failing are recovered by retrying them"""
+        #Each sector is read once while copying, and once while trimming or scraping.
+        os.environ["FAKE_DDRESCUE_ERRORS"] = "0x10000:0x600:3"
+        self.settings["BadSectorRetries"] = "-r 1"
+
+        self.run_recovery()
+        self.assertEqual(MapFile.read_mapfile(self.settings["MapFile"]).status_sizes["-"],
+                         0x600)
+
+        #Start again, with another retry.
+        os.remove(self.settings["MapFile"])
+        self.settings["BadSectorRetries"] = "-r 2"
+
+        self.run_recovery()
+        mapfile = MapFile.read_mapfile(self.settings["MapFile"])
+
+        self.assertEqual(mapfile.status_sizes["+"], DEVICE_SIZE)
+
+    def test_run4(self):
+        """Test #4: An interrupted recovery saves the map file, and can be resumed"""
+        os.environ["FAKE_DDRESCUE_RATE"] = "200000"
+
+        recovery = Recovery.Recovery(self.settings, self.snapshot)
+        recovery.start(Recovery.build_exec_list(self.settings, self.get_command()))
+
+        threading.Timer(1, recovery.stop).start()
+        recovery.follow()
+
+        self.assertEqual(recovery.finish(), "BadReturnCode")
+        self.assertEqual(recovery.old_status, "Interrupted by user")
+
+        mapfile = MapFile.read_mapfile(self.settings["MapFile"])
+
+        self.assertEqual(mapfile.current_status, "?")
+        self.assertTrue(0 < mapfile.status_sizes["?"] < DEVICE_SIZE)
+
+        #Carry on where it left off.
+        del os.environ["FAKE_DDRESCUE_RATE"]
+
+        self.assertEqual(self.run_recovery()[1], "Success")
+        self.check_map()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Headless tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the headless mode.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import io
+import json
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import headless as Headless #pylint: disable=import-error
+from Tools import strategy as Strategy #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A stand-in for ddrescue 1.22. Shows the version, or writes the file next to it to stdout.
+FAKE_DDRESCUE = """#!{python}
+import os
+import sys
+
+if sys.argv[1] == "--version":
+    print("GNU ddrescue 1.22")
+
+else:
+    sys.stdout.write(open(os.path.join(os.path.dirname(sys.argv[0]), "output"), "rb").read()
+                     .decode())
+"""
+
+class TestHeadless(unittest.TestCase):
+    """Tests for the headless mode"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+
+    def test_get_settings1(self):
+        """Test #1: Options are turned into settings like the GUI's"""
+        settings = Headless.get_settings([("--no-direct", ""), ("--retries", "-1"),
+                                          ("--cluster-size", "64"), ("-s", "localhost:8000")],
+                                         ["/dev/sdb", "disk.img", "disk.map"])
+
+        self.assertEqual(settings["DirectAccess"], "")
+        self.assertEqual(settings["BadSectorRetries"], "-r -1")
+        self.assertEqual(settings["ClusterSize"], "-c 64")
+        self.assertEqual(settings["MaxErrors"], "")
+        self.assertEqual(settings["Socket"], ("localhost", 8000))
+        self.assertEqual(settings["Format"], "json")
+        self.assertEqual(settings["MapFile"], "disk.map")
+        self.assertTrue(settings["SaveMetrics"])
+
+        settings = Headless.get_settings([("--no-metrics", "")], ["/dev/sdb", "disk.img",
+                                                                  "disk.map"])
+
+        self.assertFalse(settings["SaveMetrics"])
+
+    def test_get_settings2(self):
+        """Test #2: Invalid options are rejected"""
+        self.assertRaises(ValueError, Headless.get_settings, [], ["/dev/sdb", "disk.img"])
+        self.assertRaises(ValueError, Headless.get_settings, [("--retries", "two")],
+                          ["/dev/sdb", "disk.img", "disk.map"])
+
+        self.assertRaises(ValueError, Headless.get_settings, [("--format", "xml")],
+                          ["/dev/sdb", "disk.img", "disk.map"])
+
+        self.assertRaises(ValueError, Headless.get_settings, [("--strategy", "Slowest")],
+                          ["/dev/sdb", "disk.img", "disk.map"])
+
+    def test_get_settings3(self):
+        """Test #3: Several jobs can be given"""
+        settings = Headless.get_settings([("--job", "/dev/sdc:sdc.img:sdc.map"),
+                                          ("--max-jobs", "4")],
+                                         ["/dev/sdb", "sdb.img", "sdb.map"])
+
+        self.assertEqual(settings["Jobs"], [("/dev/sdb", "sdb.img", "sdb.map"),
+                                            ("/dev/sdc", "sdc.img", "sdc.map")])
+
+        self.assertEqual(settings["MaxJobs"], 4)
+        self.assertEqual(settings["InputFile"], "/dev/sdb")
+
+        self.assertRaises(ValueError, Headless.get_settings, [("--job", "/dev/sdc:sdc.img")], [])
+        self.assertRaises(ValueError, Headless.get_settings, [("--max-jobs", "0")],
+                          ["/dev/sdb", "sdb.img", "sdb.map"])
+
+    def test_get_settings4(self):
+        """Test #4: Jobs can be resumed from a journal without giving any new ones"""
+        settings = Headless.get_settings([("--resume", "")], [])
+
+        self.assertEqual(settings["Jobs"], [])
+        self.assertTrue(settings["Resume"])
+        self.assertEqual(settings["Journal"], Headless.Journal.DEFAULT_PATH)
+
+    def test_get_settings5(self):
+        """Test #5: The exporter's address is optional, and defaults to all interfaces"""
+        settings = Headless.get_settings([], ["/dev/sdb", "disk.img", "disk.map"])
+        self.assertEqual(settings["Exporter"], None)
+
+        settings = Headless.get_settings([("--exporter", "9776")],
+                                         ["/dev/sdb", "disk.img", "disk.map"])
+
+        self.assertEqual(settings["Exporter"], ("", 9776))
+
+        settings = Headless.get_settings([("--exporter", "127.0.0.1:9100")],
+                                         ["/dev/sdb", "disk.img", "disk.map"])
+
+        self.assertEqual(settings["Exporter"], ("127.0.0.1", 9100))
+
+    def write_fake_ddrescue(self):
+        """Write the fake ddrescue and its output, and return the path to it and the states"""
+        ddrescue = os.path.join(self.temp_dir, "ddrescue")
+
+        with open(ddrescue, "w") as ddrescue_file:
+            ddrescue_file.write(FAKE_DDRESCUE.format(python=sys.executable))
+
+        os.chmod(ddrescue, 0o755)
+
+        output, states = Data.return_fake_output("1.22")
+
+        with open(os.path.join(self.temp_dir, "output"), "wb") as output_file:
+            output_file.write(output.encode("utf-8"))
+
+        return ddrescue, states
+
+    def test_run1(self):
+        """Test #1: A recovery is run and reported as JSON lines"""
+        ddrescue, states = self.write_fake_ddrescue()
+
+        settings = Headless.get_settings([("--ddrescue", ddrescue), ("--no-transcript", "")],
+                                         ["/dev/sdb", os.path.join(self.temp_dir, "disk.img"),
+                                          os.path.join(self.temp_dir, "disk.map")])
+
+        stream = io.StringIO()
+        self.assertEqual(Headless.run(settings, Headless.JSONReporter(stream)), "Success")
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        self.assertEqual(events[0]["event"], "started")
+        self.assertEqual(events[0]["ddrescue_version"], "1.22")
+        self.assertEqual(events[-2]["event"], "progress")
+        self.assertEqual(events[-2]["recovered_data"], states[-1]["recovered_data"])
+        self.assertEqual(events[-2]["status"], "Finished")
+        self.assertEqual(events[-2]["phase"], "Finished")
+        self.assertEqual(len(events[-2]["time_remaining_range"]), 2)
+        self.assertEqual(events[-1]["event"], "finished")
+        self.assertEqual(events[-1]["return_code"], 0)
+
+    def test_run2(self):
+        """Test #2: A recovery that fails unexpectedly is reported as failed"""
+        ddrescue = self.write_fake_ddrescue()[0]
+
+        settings = Headless.get_settings([("--ddrescue", ddrescue), ("--no-transcript", "")],
+                                         ["/dev/sdb", os.path.join(self.temp_dir, "disk.img"),
+                                          os.path.join(self.temp_dir, "disk.map")])
+
+        def run(self): #pylint: disable=unused-argument
+            """Fail like a bug would"""
+            raise ValueError("Broken")
+
+        original_run = Strategy.StrategyRunner.run
+        Strategy.StrategyRunner.run = run
+
+        try:
+            stream = io.StringIO()
+            self.assertEqual(Headless.run(settings, Headless.JSONReporter(stream)), "Failed")
+
+        finally:
+            Strategy.StrategyRunner.run = original_run
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        self.assertEqual(events[-1]["event"], "finished")
+        self.assertEqual(events[-1]["result"], "Failed")
+
+    def test_main1(self):
+        """Test #1: Problems starting up are shown as one error, with a non-zero exit code"""
+        ddrescue = self.write_fake_ddrescue()[0]
+        paths = ["/dev/sdb", os.path.join(self.temp_dir, "disk.img"),
+                 os.path.join(self.temp_dir, "disk.map")]
+
+        stderr = sys.stderr
+
+        for options in (["--ddrescue", os.path.join(self.temp_dir, "missing")],
+                        ["--ddrescue", ddrescue, "--socket", "127.0.0.1:1"]):
+
+            sys.stderr = io.StringIO()
+
+            try:
+                exit_code = Headless.main(["--headless"] + options + paths)
+                errors = sys.stderr.getvalue()
+
+            finally:
+                sys.stderr = stderr
+
+            self.assertEqual(exit_code, 1, options)
+            self.assertTrue(errors.startswith("Error: "), options)
+            self.assertEqual(errors.count("\n"), 1, options)
+
+    def test_run_jobs1(self):
+        """Test #1: Several recoveries are run, and each one's events are labelled"""
+        ddrescue, states = self.write_fake_ddrescue()
+
+        options = [("--ddrescue", ddrescue), ("--no-transcript", ""), ("--interval", "0.1")]
+
+        for name in ("first", "second", "third"):
+            path = os.path.join(self.temp_dir, name)
+            options.append(("--job", path+":"+path+".img:"+path+".map"))
+
+        settings = Headless.get_settings(options, [])
+
+        stream = io.StringIO()
+        self.assertEqual(Headless.run_jobs(settings, Headless.JSONReporter(stream)),
+                         ["Success"] * 3)
+
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        for name in ("first", "second", "third"):
+            job_events = [event for event in events
+                          if event["job"] == os.path.join(self.temp_dir, name)]
+
+            self.assertEqual(job_events[0]["event"], "started")
+            self.assertEqual(job_events[-2]["recovered_data"], states[-1]["recovered_data"])
+            self.assertEqual(job_events[-1]["event"], "finished")
+            self.assertEqual(job_events[-1]["result"], "Success")
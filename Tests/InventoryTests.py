@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Device inventory tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the device inventory tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import inventory as Inventory #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class FakeSysfs(object):
+    """A sysfs block directory in a temporary directory, laid out like the real one"""
+
+    def __init__(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.block_path = os.path.join(self.temp_dir, "class", "block")
+        self.devices_path = os.path.join(self.temp_dir, "devices")
+
+        os.makedirs(self.block_path)
+        os.makedirs(self.devices_path)
+
+    def write(self, path, attributes):
+        """Write the attributes of a device"""
+        for name, value in attributes.items():
+            if not os.path.isdir(os.path.dirname(os.path.join(path, name))):
+                os.makedirs(os.path.dirname(os.path.join(path, name)))
+
+            with open(os.path.join(path, name), "w") as attribute_file:
+                attribute_file.write(value+"\n")
+
+    def add_device(self, name, sectors, vendor="ATA", model="Fake Disk", removable="0"):
+        """Add a disk"""
+        path = os.path.join(self.devices_path, name)
+        os.makedirs(path)
+
+        self.write(path, {"dev": "8:0", "size": unicode(sectors), "removable": removable,
+                          "queue/rotational": "1", "device/vendor": vendor,
+                          "device/model": model})
+
+        os.symlink(path, os.path.join(self.block_path, name))
+
+    def add_partition(self, host, number, sectors):
+        """Add a partition to a disk"""
+        name = host+unicode(number)
+        path = os.path.join(self.devices_path, host, name)
+        os.makedirs(path)
+
+        self.write(path, {"dev": "8:"+unicode(number), "size": unicode(sectors),
+                          "partition": unicode(number)})
+
+        os.symlink(path, os.path.join(self.block_path, name))
+
+    def remove(self, name):
+        """Remove a disk or partition"""
+        os.remove(os.path.join(self.block_path, name))
+
+    def close(self):
+        """Delete the directory"""
+        shutil.rmtree(self.temp_dir)
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the device inventory tools"""
+
+    def setUp(self):
+        self.sysfs = FakeSysfs()
+        self.sysfs.add_device("sda", 2000000)
+        self.sysfs.add_partition("sda", 1, 1000000)
+        os.makedirs(os.path.join(self.sysfs.devices_path, "loop0"))
+        os.symlink(os.path.join(self.sysfs.devices_path, "loop0"),
+                   os.path.join(self.sysfs.block_path, "loop0"))
+
+    def tearDown(self):
+        self.sysfs.close()
+        del self.sysfs
+
+    def test_get_device_path1(self):
+        """Test #1: sysfs names are converted to /dev paths"""
+        self.assertEqual(Inventory.get_device_path("sda"), "/dev/sda")
+        self.assertEqual(Inventory.get_device_path("cciss!c0d0"), "/dev/cciss/c0d0")
+
+    def test_scan1(self):
+        """Test #1: Disks and partitions are found, and loop devices are ignored"""
+        self.assertEqual(Inventory.scan(self.sysfs.block_path),
+                         {"sda": ("8:0", "2000000"), "sda1": ("8:1", "1000000")})
+
+        self.assertEqual(Inventory.scan(os.path.join(self.sysfs.temp_dir, "missing")), {})
+
+    def test_probe1(self):
+        """Test #1: The information for disks and partitions is read from sysfs"""
+        self.assertEqual(Inventory.probe("sda", self.sysfs.block_path),
+                         {"Name": "/dev/sda", "Type": "Device", "HostDevice": "N/A",
+                          "Vendor": "ATA", "Product": "Fake Disk",
+                          "RawCapacity": "1024000000", "Capacity": "1.02 GB",
+                          "Description": "Hard Disk Drive", "Partitions": ["/dev/sda1"]})
+
+        self.assertEqual(Inventory.probe("sda1", self.sysfs.block_path),
+                         {"Name": "/dev/sda1", "Type": "Partition", "HostDevice": "/dev/sda",
+                          "Vendor": "ATA", "Product": "Fake Disk",
+                          "RawCapacity": "512000000", "Capacity": "512.0 MB",
+                          "Description": "Partition 1 on /dev/sda", "Partitions": []})
+
+    def test_merge1(self):
+        """Test #1: Deltas are merged into the disk information"""
+        disk_info = {"/dev/sda": {"Name": "/dev/sda"}, "/dev/sdb": {"Name": "/dev/sdb"}}
+        Inventory.merge(disk_info, {"/dev/sdc": {"Name": "/dev/sdc"}}, ["/dev/sdb", "/dev/sdd"])
+
+        self.assertEqual(sorted(disk_info), ["/dev/sda", "/dev/sdc"])
+
+class TestDeviceInventory(unittest.TestCase):
+    """Tests for DeviceInventory"""
+
+    def setUp(self):
+        self.sysfs = FakeSysfs()
+        self.sysfs.add_device("sda", 2000000)
+        self.changes = []
+        self.inventory = Inventory.DeviceInventory(lambda *change: self.changes.append(change),
+                                                   self.sysfs.block_path, use_uevents=False)
+
+    def tearDown(self):
+        self.inventory.stop()
+        self.sysfs.close()
+        del self.sysfs
+        del self.changes
+        del self.inventory
+
+    def test_check1(self):
+        """Test #1: Nothing is passed on until something changes"""
+        self.assertEqual(self.inventory.check(), ({}, []))
+        self.assertEqual(self.inventory.check(), ({}, []))
+        self.assertEqual(self.changes, [])
+
+    def test_check2(self):
+        """Test #2: Only the devices that were plugged in are probed"""
+        self.inventory.check()
+        self.sysfs.add_device("sdb", 4000, vendor="Generic", model="USB Stick", removable="1")
+
+        added, removed = self.inventory.check()
+
+        self.assertEqual(sorted(added), ["/dev/sdb"])
+        self.assertEqual(added["/dev/sdb"]["Description"], "Removable Disk")
+        self.assertEqual(removed, [])
+        self.assertEqual(self.changes, [(added, removed)])
+
+    def test_check3(self):
+        """Test #3: A new partition changes its disk's list of partitions"""
+        self.inventory.check()
+        self.sysfs.add_partition("sda", 1, 1000000)
+
+        added = self.inventory.check()[0]
+
+        self.assertEqual(sorted(added), ["/dev/sda", "/dev/sda1"])
+        self.assertEqual(added["/dev/sda"]["Partitions"], ["/dev/sda1"])
+
+    def test_check4(self):
+        """Test #4: Unplugged disks are removed with their partitions"""
+        self.sysfs.add_partition("sda", 1, 1000000)
+        self.sysfs.add_device("sdb", 4000)
+        self.inventory.check()
+
+        self.sysfs.remove("sda1")
+        self.sysfs.remove("sda")
+
+        self.assertEqual(self.inventory.check(), ({}, ["/dev/sda", "/dev/sda1"]))
+
+    def test_check5(self):
+        """Test #5: Removed partitions are matched to the device they were on, not by name"""
+        self.sysfs.add_device("sdaa", 4000)
+        self.sysfs.add_partition("sdaa", 1, 2000)
+        self.sysfs.add_partition("sdaa", 2, 2000)
+        self.inventory.check()
+
+        self.sysfs.remove("sdaa1")
+        added, removed = self.inventory.check()
+
+        self.assertEqual(sorted(added), ["/dev/sdaa"])
+        self.assertEqual(removed, ["/dev/sdaa1"])
+
+        self.sysfs.remove("sdaa2")
+        self.sysfs.remove("sdaa")
+        self.assertEqual(self.inventory.check(), ({}, ["/dev/sdaa", "/dev/sdaa2"]))
+
+    def test_start1(self):
+        """Test #1: Changes are noticed by polling sysfs when there are no uevents"""
+        original_interval = Inventory.POLL_INTERVAL
+        Inventory.POLL_INTERVAL = 0.05
+
+        try:
+            self.inventory.start()
+            self.sysfs.add_device("sdb", 4000)
+
+            for _attempt in range(100):
+                if self.changes:
+                    break
+
+                Inventory.threading.Event().wait(0.05)
+
+        finally:
+            Inventory.POLL_INTERVAL = original_interval
+
+        self.assertEqual(sorted(self.changes[0][0]), ["/dev/sdb"])
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Job journal tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the job journal.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import journal as Journal #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestJobJournal(unittest.TestCase):
+    """Tests for JobJournal"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "journal", "jobs.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+
+    def test_get_pending1(self):
+        """Test #1: Jobs that didn't finish are still pending when the journal is reloaded"""
+        journal = Journal.JobJournal(self.path)
+
+        for name in ("sdb", "sdc", "sdd", "sde"):
+            journal.add(name, {"InputFile": "/dev/"+name})
+
+        journal.start("sdb")
+        journal.start("sdc")
+        journal.finish("sdc", "Success")
+        journal.remove("sde")
+
+        expected = [("sdb", {"InputFile": "/dev/sdb"}), ("sdd", {"InputFile": "/dev/sdd"})]
+
+        self.assertEqual(journal.get_pending(), expected)
+        self.assertEqual(Journal.JobJournal(self.path).get_pending(), expected)
+
+    def test_get_pending2(self):
+        """Test #2: A line that was being written during a crash is ignored"""
+        journal = Journal.JobJournal(self.path)
+        journal.add("sdb", {"InputFile": "/dev/sdb"})
+        journal.add("sdc", {"InputFile": "/dev/sdc"})
+
+        with open(self.path, "ab") as journal_file:
+            journal_file.write(b'{"event": "finished", "id": "sd')
+
+        self.assertEqual([job_id for job_id, settings in
+                          Journal.JobJournal(self.path).get_pending()], ["sdb", "sdc"])
+
+    def test_compact1(self):
+        """Test #1: Finished jobs are left out of the journal when it is loaded"""
+        journal = Journal.JobJournal(self.path)
+        journal.add("sdb", {"InputFile": "/dev/sdb"})
+        journal.add("sdc", {"InputFile": "/dev/sdc"})
+        journal.finish("sdb", "Success")
+
+        Journal.JobJournal(self.path)
+
+        with open(self.path, "r") as journal_file:
+            lines = journal_file.readlines()
+
+        self.assertEqual(len(lines), 1)
+        self.assertTrue('"sdc"' in lines[0])
+        self.assertFalse(os.path.exists(self.path+".new"))
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Map File tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the map file tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import mapfile as MapFile #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A map file, as written by ddrescue 1.22.
+TEST_MAPFILE = (b"# Mapfile. Created by GNU ddrescue version 1.22\n"
+                b"# Command line: ddrescue -v /dev/sdb /home/user/disk.img /home/user/disk.map\n"
+                b"# Start time:   2018-03-01 12:00:00\n"
+                b"# Current time: 2018-03-01 12:05:00\n"
+                b"# Copying non-tried blocks... Pass 1 (forwards)\n"
+                b"# current_pos  current_status  current_pass\n"
+                b"0x00030000     ?               1\n"
+                b"#      pos        size  status\n"
+                b"0x00000000  0x00010000  +\n"
+                b"0x00010000  0x00001000  -\n"
+                b"0x00011000  0x0000F000  *\n"
+                b"0x00020000  0x00010000  +\n"
+                b"0x00030000  0x000D0000  ?\n")
+
+class TestMapFile(unittest.TestCase):
+    """Tests for MapFile"""
+
+    def setUp(self):
+        self.mapfile = MapFile.MapFile()
+        self.mapfile.load(TEST_MAPFILE)
+
+    def tearDown(self):
+        del self.mapfile
+
+    def test_load1(self):
+        """Test #1: The current position and all of the blocks are read"""
+        self.assertEqual(self.mapfile.current_pos, 0x30000)
+        self.assertEqual(self.mapfile.current_status, "?")
+        self.assertEqual(self.mapfile.current_pass, 1)
+        self.assertEqual(len(self.mapfile), 5)
+        self.assertEqual(self.mapfile.get_block(1), (0x10000, 0x1000, "-"))
+        self.assertEqual(self.mapfile.get_end(), 0x100000)
+
+    def test_load2(self):
+        """Test #2: Old log files without a current pass, and out-of-order blocks, are read"""
+        self.mapfile.load(b"# Rescue Logfile.\n0x00001000     +\n"
+                          b"0x00001000  0x00001000  -\n0x00000000  0x00001000  +\n")
+
+        self.assertEqual(self.mapfile.current_pos, 0x1000)
+        self.assertEqual(self.mapfile.current_pass, None)
+        self.assertEqual(list(self.mapfile.starts), [0, 0x1000])
+        self.assertEqual(self.mapfile.get_status(0x1800), "-")
+
+    def test_get_status1(self):
+        """Test #1: The status at an offset is found"""
+        self.assertEqual(self.mapfile.get_status(0), "+")
+        self.assertEqual(self.mapfile.get_status(0xFFFF), "+")
+        self.assertEqual(self.mapfile.get_status(0x10000), "-")
+        self.assertEqual(self.mapfile.get_status(0x11000), "*")
+        self.assertEqual(self.mapfile.get_status(0xFFFFF), "?")
+        self.assertEqual(self.mapfile.get_status(0x100000), None)
+
+    def test_status_sizes1(self):
+        """Test #1: The number of bytes in each status is counted"""
+        self.assertEqual(self.mapfile.status_sizes, {"+": 0x20000, "-": 0x1000, "*": 0xF000,
+                                                     "/": 0, "?": 0xD0000})
+
+    def test_update1(self):
+        """Test #1: Changed blocks are found and the rest of the map is kept"""
+        changes = self.mapfile.update(TEST_MAPFILE.replace(b"0x00011000  0x0000F000  *",
+                                                           b"0x00011000  0x0000F000  +"))
+
+        self.assertEqual(changes, [(0x11000, 0x20000)])
+        self.assertEqual(len(self.mapfile), 5)
+        self.assertEqual(self.mapfile.get_status(0x11000), "+")
+        self.assertEqual(self.mapfile.status_sizes["+"], 0x2F000)
+        self.assertEqual(self.mapfile.status_sizes["*"], 0)
+
+    def test_update2(self):
+        """Test #2: Blocks that are split or added are found, and comment changes are ignored"""
+        self.assertEqual(self.mapfile.update(TEST_MAPFILE.replace(b"12:05:00", b"12:05:10")), [])
+
+        changes = self.mapfile.update(TEST_MAPFILE.replace(b"0x00030000  0x000D0000  ?\n",
+                                                           b"0x00030000  0x00008000  +\n"
+                                                           b"0x00038000  0x000C8000  ?\n"
+                                                           b"0x00100000  0x00001000  ?\n"))
+
+        self.assertEqual(changes, [(0x30000, 0x38000), (0x100000, 0x101000)])
+        self.assertEqual(len(self.mapfile), 7)
+        self.assertEqual(self.mapfile.get_status(0x37FFF), "+")
+        self.assertEqual(self.mapfile.get_end(), 0x101000)
+
+class TestMapFileWatcher(unittest.TestCase):
+    """Tests for MapFileWatcher"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "map")
+        self.watcher = MapFile.MapFileWatcher(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+        del self.watcher
+
+    def write_mapfile(self, data):
+        """Write data to the map file, making sure it looks modified"""
+        with open(self.path, "wb") as map_file:
+            map_file.write(data)
+
+        os.utime(self.path, (0, len(data) + os.path.getmtime(self.path)))
+
+    def test_check1(self):
+        """Test #1: Changes are only reported when the map file changes"""
+        self.assertEqual(self.watcher.check(), [])
+
+        self.write_mapfile(TEST_MAPFILE)
+        self.assertEqual(self.watcher.check(), [(0, 0x100000)])
+        self.assertEqual(self.watcher.check(), [])
+
+        #Half-written files are ignored.
+        self.write_mapfile(TEST_MAPFILE[:-10])
+        self.assertEqual(self.watcher.check(), [])
+
+        self.write_mapfile(TEST_MAPFILE.replace(b"0x00010000  0x00001000  -",
+                                                b"0x00010000  0x00001000  /"))
+        self.assertEqual(self.watcher.check(), [(0x10000, 0x11000)])
+        self.assertEqual(self.watcher.mapfile.get_status(0x10000), "/")
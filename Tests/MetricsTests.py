@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Metrics tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the metrics tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import metrics as Metrics #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class FakeClock(object):
+    """A clock that only moves when it's told to"""
+
+    def __init__(self):
+        self.now = 100
+
+    def __call__(self):
+        return self.now
+
+class TestMetricsWriter(unittest.TestCase):
+    """Tests for MetricsWriter"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "map.metrics.csv")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+        del self.clock
+
+    def test_record1(self):
+        """Test #1: At most one sample is taken each interval, with the latest values"""
+        writer = Metrics.MetricsWriter(self.path, clock=self.clock)
+        start_time = writer.start_time
+
+        writer.record({"status": "Copying non-tried blocks...", "input_pos": 0,
+                       "current_read_rate": 0})
+
+        writer.record({"input_pos": 1000, "current_read_rate": 52428000})
+
+        self.clock.now = 101
+        writer.record({"input_pos": 2000, "num_errors": 3})
+
+        self.clock.now = 101.5
+        writer.record({"input_pos": 3000, "percent_rescued": 2.46})
+        writer.close()
+
+        samples = Metrics.read_metrics(self.path)
+
+        self.assertEqual(len(samples), 3)
+        self.assertAlmostEqual(samples[1]["time"], start_time + 1, places=2)
+
+        self.assertEqual((samples[0]["input_pos"], samples[0]["current_read_rate"],
+                          samples[0]["num_errors"]), (0, 0, None))
+
+        self.assertEqual((samples[1]["input_pos"], samples[1]["current_read_rate"],
+                          samples[1]["num_errors"]), (2000, 52428000, 3))
+
+        self.assertEqual((samples[2]["input_pos"], samples[2]["percent_rescued"]), (3000, 2.46))
+
+    def test_record2(self):
+        """Test #2: Samples are only written to disk every flush interval"""
+        writer = Metrics.MetricsWriter(self.path, flush_interval=30, clock=self.clock)
+
+        for second in range(40):
+            self.clock.now = 100 + second
+            writer.record({"input_pos": second})
+
+            if second == 20:
+                self.assertEqual(os.path.getsize(self.path), 0)
+
+        self.assertEqual(len(Metrics.read_metrics(self.path)), 31)
+        writer.close()
+        self.assertEqual(len(Metrics.read_metrics(self.path)), 41)
+
+    def test_record3(self):
+        """Test #3: Resumed recoveries add to the end of the file, and torn lines are skipped"""
+        writer = Metrics.MetricsWriter(self.path, clock=self.clock)
+        writer.record({"input_pos": 1})
+        writer.close()
+
+        with open(self.path, "ab") as metrics_file:
+            metrics_file.write(b"123.000,5")
+
+        writer = Metrics.MetricsWriter(self.path, clock=self.clock)
+        writer.record({"input_pos": 2})
+        writer.close()
+
+        with open(self.path, "rb") as metrics_file:
+            self.assertEqual(metrics_file.read().count(b"time,"), 1)
+
+        self.assertEqual([sample["input_pos"] for sample in Metrics.read_metrics(self.path)],
+                         [1, 1, 2, 2])
+
+    def test_record4(self):
+        """Test #4: No empty samples are taken before ddrescue reports anything"""
+        writer = Metrics.MetricsWriter(self.path, clock=self.clock)
+        writer.record({})
+
+        self.clock.now = 100.5
+        writer.record({"input_pos": 1000})
+
+        self.clock.now = 101.5
+        writer.record({"input_pos": 2000})
+        writer.close()
+
+        self.assertEqual([sample["input_pos"] for sample in Metrics.read_metrics(self.path)],
+                         [1000, 2000, 2000])
+
+        #Nothing to write at all.
+        os.remove(self.path)
+        writer = Metrics.MetricsWriter(self.path, clock=self.clock)
+        writer.record({"unknown": 1})
+        writer.close()
+
+        self.assertEqual(Metrics.read_metrics(self.path), [])
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the metrics tools"""
+
+    def test_get_slow_regions1(self):
+        """Test #1: The regions read slowly are found"""
+        samples = [{"input_pos": position, "current_read_rate": rate} for position, rate in
+                   ((0, 50000000), (100, 1000), (200, 0), (300, 40000000), (400, None),
+                    (500, 500), (600, 20))]
+
+        self.assertEqual(Metrics.get_slow_regions(samples, 100000), [(100, 300), (500, 600)])
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Mount table tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the mount table tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import mounttable as MountTable #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A mountinfo file, with a space in a mount point, and an optional field.
+MOUNTINFO = ("22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw,errors=remount-ro\n"
+             "23 22 0:21 / /proc rw,nosuid,nodev,noexec,relatime - proc proc rw\n"
+             "40 22 8:17 / /media/user/My\\040Disk rw,nosuid - vfat /dev/sdb1 rw,uid=1000\n"
+             "41 22 8:17 / /mnt/ddrescue-gui rw - vfat /dev/sdb1 rw,uid=1000\n")
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the mount table tools"""
+
+    def test_parse_mountinfo1(self):
+        """Test #1: Each mount is found, with escaped characters in paths restored"""
+        self.assertEqual(MountTable.parse_mountinfo(MOUNTINFO),
+                         [("/dev/sda1", "/", "ext4"), ("proc", "/proc", "proc"),
+                          ("/dev/sdb1", "/media/user/My Disk", "vfat"),
+                          ("/dev/sdb1", "/mnt/ddrescue-gui", "vfat")])
+
+        self.assertEqual(MountTable.parse_mountinfo("\nnot a mount\n"), [])
+
+class TestMountTable(unittest.TestCase):
+    """Tests for MountTable"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "mountinfo")
+
+        with open(self.path, "w") as mountinfo_file:
+            mountinfo_file.write(MOUNTINFO)
+
+        self.table = MountTable.MountTable(self.path)
+
+    def tearDown(self):
+        self.table.close()
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+        del self.table
+
+    def test_lookups1(self):
+        """Test #1: Sources and mount points are looked up like "mount" output was"""
+        self.assertTrue(self.table.is_mounted("/dev/sdb1"))
+        self.assertTrue(self.table.is_mounted("/media/user/My Disk"))
+        self.assertFalse(self.table.is_mounted("/dev/sdc1"))
+
+        #The first place a source is mounted is used.
+        self.assertEqual(self.table.get_mount_point("/dev/sdb1"), "/media/user/My Disk")
+        self.assertEqual(self.table.get_mount_point("/dev/sdc1"), None)
+        self.assertEqual(self.table.get_source("/mnt/ddrescue-gui"), "/dev/sdb1")
+
+    def test_refresh1(self):
+        """Test #1: The table is only read again when the file changes"""
+        mounts = self.table.get_mounts()
+        self.assertTrue(self.table.get_mounts() is mounts)
+
+        with open(self.path, "a") as mountinfo_file:
+            mountinfo_file.write("42 22 8:33 / /mnt/output rw - ext4 /dev/sdc1 rw\n")
+
+        self.assertEqual(self.table.get_mount_point("/dev/sdc1"), "/mnt/output")
+
+    def test_refresh2(self):
+        """Test #2: The real mount table is read, and cached until something changes"""
+        if not os.path.exists(MountTable.MOUNTINFO_PATH):
+            self.skipTest("No "+MountTable.MOUNTINFO_PATH)
+
+        table = MountTable.MountTable()
+
+        try:
+            self.assertTrue(table.is_mounted("/"))
+
+            mounts = table.get_mounts()
+            self.assertTrue(table.get_mounts() is mounts)
+
+        finally:
+            table.close()
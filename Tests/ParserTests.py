@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# DDRescue parser tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the ddrescue output parser.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools.DDRescueTools import parser as DDRescueParser #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestStatusParser(unittest.TestCase):
+    """Tests for StatusParser"""
+
+    def test_parse1(self):
+        """Test #1: The final state of a recovery is found for every supported version"""
+        for version in Data.VERSIONS:
+            output, states = Data.return_fake_output(version)
+            parser = DDRescueParser.StatusParser(version)
+            values = {}
+
+            #Split the output in the same way as Recovery.follow().
+            for line in output.split("\n"):
+                line = line.replace("\r", "").replace("\x1b[A", "")
+
+                if line != "":
+                    values.update(parser.parse(line))
+
+            for name in ("disk_capacity", "recovered_data", "error_size", "num_errors",
+                         "current_read_rate", "average_read_rate", "input_pos", "output_pos",
+                         "time_since_last_read"):
+
+                self.assertEqual(values[name], states[-1][name], version+": "+name)
+
+            self.assertEqual(values["status"], "Finished")
+
+    def test_parse2(self):
+        """Test #2: The status message is separated from the status line that follows it"""
+        parser = DDRescueParser.StatusParser("1.22")
+
+        self.assertEqual(parser.parse("Copying non-tried blocks... Pass 1 (forwards)     ipos:"
+                                      "   12345 MB, non-trimmed:        0 B,  current rate:"
+                                      "  52428 kB/s"),
+                         {"status": "Copying non-tried blocks... Pass 1 (forwards)",
+                          "input_pos": 12345000000, "non_trimmed": 0,
+                          "current_read_rate": 52428000})
+
+        self.assertEqual(parser.parse("pct rescued:    2.46%, read errors:        3,  remaining "
+                                      "time:      2h 40m"),
+                         {"percent_rescued": 2.46, "read_errors": 3})
+
+    def test_parse3(self):
+        """Test #3: Unsupported versions use the closest supported version"""
+        self.assertEqual(DDRescueParser.StatusParser("1.12").minor_version, 14)
+        self.assertEqual(DDRescueParser.StatusParser("1.25").minor_version, 23)
+
+    def test_to_seconds1(self):
+        """Test #1: Times are converted to seconds"""
+        self.assertEqual(DDRescueParser.to_seconds("n/a"), None)
+        self.assertEqual(DDRescueParser.to_seconds("0 s"), 0)
+        self.assertEqual(DDRescueParser.to_seconds("1m 52s"), 112)
+        self.assertEqual(DDRescueParser.to_seconds("1d 2h"), 93600)
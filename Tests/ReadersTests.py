@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Readers tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the output readers.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import readers as Readers #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestChunkedReader(unittest.TestCase):
+    """Tests for ChunkedReader"""
+
+    def setUp(self):
+        self.read_fd, self.write_fd = os.pipe()
+
+    def tearDown(self):
+        os.close(self.read_fd)
+        del self.read_fd
+        del self.write_fd
+
+    def test_read_records1(self):
+        """Test #1: Records are split on newlines and returned unchanged, with the remainder last"""
+        os.write(self.write_fd, b"rescued: 1 MB\r\x1b[A\x1b[A ipos: 2 MB\nopos: 3 MB\nFinished")
+        os.close(self.write_fd)
+
+        self.assertEqual(list(Readers.ChunkedReader(self.read_fd).read_records()),
+                         [b"rescued: 1 MB\r\x1b[A\x1b[A ipos: 2 MB\n", b"opos: 3 MB\n",
+                          b"Finished"])
+
+    def test_feed1(self):
+        """Test #1: Multi-byte separators split across reads are still found"""
+        reader = Readers.ChunkedReader(self.read_fd, separators=(b"\n", b"\r", b"\x1b[A"))
+        os.close(self.write_fd)
+
+        self.assertEqual(reader.feed(b"one\rtwo\x1b"), [b"one\r"])
+        self.assertEqual(reader.feed(b"[Athree\n"), [b"two\x1b[A", b"three\n"])
+        self.assertEqual(reader.flush(), b"")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the recovery tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import estimator as Estimator #pylint: disable=import-error
+from Tools import metrics as Metrics #pylint: disable=import-error
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A stand-in for ddrescue that writes the file it is given to stdout, and exits with
+#the given return code.
+FAKE_DDRESCUE = ("import sys; sys.stdout.write(open(sys.argv[1], 'rb').read().decode()); "
+                 "sys.exit(int(sys.argv[2]))")
+
+class TickingClock(object):
+    """A clock that moves on a second each time it's read, like ddrescue's status updates"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+class RecordingSnapshot(Snapshot.RecoverySnapshot):
+    """
+    A snapshot that keeps every estimate of the time remaining with its phase, and the
+    estimates made at each status update on their own
+    """
+
+    def __init__(self):
+        Snapshot.RecoverySnapshot.__init__(self)
+        self.estimates = []
+        self.update_estimates = []
+
+    def set(self, **values):
+        """Keep the estimate, if there is one, and set the values"""
+        if "time_remaining" in values:
+            self.estimates.append((values["phase"], values["time_remaining"]))
+
+            if "recovered_data" in values:
+                self.update_estimates.append(values["time_remaining"])
+
+        Snapshot.RecoverySnapshot.set(self, **values)
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the recovery tools"""
+
+    def setUp(self):
+        self.settings = dict(Recovery.DEFAULT_OPTIONS)
+        self.settings.update({"InputFile": "/dev/disk2", "OutputFile": "/home/user/disk.img",
+                              "MapFile": "/home/user/disk.map"})
+
+    def tearDown(self):
+        del self.settings
+
+    def test_parse_ddrescue_version1(self):
+        """Test #1: The version of ddrescue is found, and prereleases are noticed"""
+        self.assertEqual(Recovery.parse_ddrescue_version("GNU ddrescue 1.23\nCopyright ..."),
+                         ("1.23", False))
+
+        self.assertEqual(Recovery.parse_ddrescue_version("GNU ddrescue 1.19.5\n"),
+                         ("1.19", False))
+
+        self.assertEqual(Recovery.parse_ddrescue_version("GNU ddrescue 1.22-rc2\n"),
+                         ("1.22", True))
+
+    def test_get_ddrescue_override1(self):
+        """Test #1: ddrescue can be replaced with another program"""
+        environ = dict(os.environ)
+
+        try:
+            os.environ.pop("DDRESCUE_GUI_DDRESCUE", None)
+            self.assertEqual(Recovery.get_ddrescue_override(), None)
+
+            os.environ["DDRESCUE_GUI_DDRESCUE"] = "/usr/bin/fakeddrescue"
+            self.assertEqual(Recovery.get_ddrescue_override(), "/usr/bin/fakeddrescue")
+
+        finally:
+            os.environ.clear()
+            os.environ.update(environ)
+
+    def test_build_exec_list1(self):
+        """Test #1: Empty options are left out"""
+        self.assertEqual(Recovery.build_exec_list(self.settings, ["ddrescue", "-v"]),
+                         ["ddrescue", "-v", "-d", "-r 2", "-c 128", "/dev/disk2",
+                          "/home/user/disk.img", "/home/user/disk.map"])
+
+    def test_build_exec_list2(self):
+        """Test #2: The raw disk is used on macOS instead of -d"""
+        self.assertEqual(Recovery.build_exec_list(self.settings, ["ddrescue", "-v"],
+                                                  linux=False),
+                         ["ddrescue", "-v", "-r 2", "-c 128", "/dev/rdisk2",
+                          "/home/user/disk.img", "/home/user/disk.map"])
+
+class TestRecovery(unittest.TestCase):
+    """Tests for Recovery"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_path = os.path.join(self.temp_dir, "output")
+        self.snapshot = Snapshot.RecoverySnapshot()
+        self.initial_statuses = []
+
+        self.settings = {"DDRescueVersion": "1.22", "SaveTranscript": True,
+                         "CompressTranscript": False, "SaveMetrics": True,
+                         "MapFile": os.path.join(self.temp_dir, "map")}
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.output_path
+        del self.snapshot
+        del self.initial_statuses
+        del self.settings
+
+    def run_recovery(self, output, return_code=0):
+        """Run a recovery with a fake ddrescue, and return the Recovery and its result"""
+        with open(self.output_path, "wb") as output_file:
+            output_file.write(output.encode("utf-8"))
+
+        recovery = Recovery.Recovery(self.settings, self.snapshot,
+                                     on_initial_status=lambda: self.initial_statuses.append(1))
+
+        recovery.start([sys.executable, "-c", FAKE_DDRESCUE, self.output_path,
+                        unicode(return_code)])
+
+        recovery.follow()
+
+        return recovery, recovery.finish()
+
+    def test_run1(self):
+        """Test #1: A whole recovery is followed, for every supported version"""
+        for version in Data.VERSIONS:
+            self.settings["DDRescueVersion"] = version
+            output, states = Data.return_fake_output(version)
+            recovery, result = self.run_recovery(output)
+
+            self.assertEqual(result, "Success")
+            self.assertEqual(recovery.return_code, 0)
+
+            for name in ("disk_capacity", "recovered_data", "error_size", "num_errors",
+                         "current_read_rate", "average_read_rate", "input_pos", "output_pos",
+                         "time_since_last_read"):
+
+                self.assertEqual(getattr(recovery, name), states[-1][name], version+": "+name)
+
+            self.assertEqual(recovery.old_status, "Finished")
+
+        self.assertEqual(len(self.initial_statuses), len(Data.VERSIONS))
+
+        #The output is passed on, and saved.
+        changes, output = self.snapshot.take_changes()
+        self.assertEqual(changes["status"], "Finished")
+
+        #As numbers, which are only formatted for display.
+        self.assertEqual(changes["recovered_data"], states[-1]["recovered_data"])
+        self.assertEqual(changes["input_pos"], states[-1]["input_pos"])
+        self.assertTrue(output.endswith("\n\nFinished\n"))
+
+        #Each run with the same map file is added to the same transcript.
+        with open(os.path.join(self.temp_dir, "map.transcript"), "rb") as transcript_file:
+            transcript = transcript_file.read()
+
+        self.assertTrue(transcript.startswith(Data.return_fake_output(Data.VERSIONS[0])[0]
+                                              .encode("utf-8")))
+
+        self.assertTrue(transcript.endswith(Data.return_fake_output(version)[0].encode("utf-8")))
+        self.assertEqual(transcript.count(b"--- DDRescue-GUI: ddrescue started again at "),
+                         len(Data.VERSIONS) - 1)
+
+    def test_run2(self):
+        """Test #2: Failed recoveries are noticed"""
+        output = Data.return_fake_output("1.22")[0]
+
+        self.assertEqual(self.run_recovery(output, return_code=1)[1], "BadReturnCode")
+        self.assertEqual(self.run_recovery("ddrescue: Can't open input file\n",
+                                           return_code=1)[1], "NoInitialStatus")
+
+    def test_run3(self):
+        """Test #3: The values ddrescue reported are saved as metrics next to the map file"""
+        output, states = Data.return_fake_output("1.22")
+        self.run_recovery(output)
+
+        samples = Metrics.read_metrics(os.path.join(self.temp_dir, "map.metrics.csv"))
+
+        self.assertTrue(samples)
+
+        for name in ("recovered_data", "error_size", "num_errors", "current_read_rate",
+                     "average_read_rate", "input_pos", "output_pos", "time_since_last_read"):
+
+            self.assertEqual(samples[-1][name], states[-1][name], name)
+
+    def test_run4(self):
+        """Test #4: The time remaining is for the phase ddrescue is in, and says which"""
+        for version in Data.VERSIONS:
+            self.settings["DDRescueVersion"] = version
+            output, states = Data.return_fake_output(version)
+
+            with open(self.output_path, "wb") as output_file:
+                output_file.write(output.encode("utf-8"))
+
+            #Replay ddrescue's output as if its status was updated every second.
+            snapshot = RecordingSnapshot()
+            recovery = Recovery.Recovery(self.settings, snapshot)
+            recovery.estimator = Estimator.ETAEstimator(clock=TickingClock())
+
+            recovery.start([sys.executable, "-c", FAKE_DDRESCUE, self.output_path, "0"])
+            recovery.follow()
+
+            self.assertEqual(recovery.finish(), "Success")
+
+            self.assertEqual(len(snapshot.update_estimates), len(states), version)
+
+            #The phases are followed in order, and each one starts a new estimate.
+            estimates = [(phase, estimate) for phase, estimate in snapshot.estimates
+                         if phase is not None]
+
+            starts = [number for number in range(len(estimates))
+                      if number == 0 or estimates[number][0] != estimates[number-1][0]]
+
+            self.assertEqual([estimates[number][0] for number in starts],
+                             ["Copying", "Trimming", "Finished"], version)
+
+            self.assertEqual(estimates[starts[1]][1], None, version)
+
+            #While copying steadily, the estimate is how long copying the rest of the disk
+            #will take at the current rate.
+            state = states[59]
+            time_left, low, high = snapshot.update_estimates[59]
+            expected = ((Data.DISK_SIZE - state["recovered_data"] - state["error_size"])
+                        / state["current_read_rate"])
+
+            self.assertTrue(abs(time_left - expected) < expected * 0.05, version)
+            self.assertTrue(low <= time_left <= high, version)
+
+            #The last estimate is for the end.
+            self.assertEqual(snapshot.estimates[-1], ("Finished", (0, 0, 0)), version)
+            self.assertEqual((recovery.phase, recovery.time_remaining), ("Finished", (0, 0, 0)))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Replay tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the replay tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import replay as Replay #pylint: disable=import-error
+from Tools import units as Units #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestReplay(unittest.TestCase):
+    """Tests for replay()"""
+
+    def test_replay1(self):
+        """Test #1: Recorded output for every supported version is followed and shown"""
+        for version in Data.VERSIONS:
+            output, states = Data.return_fake_output(version)
+            result = Replay.replay(output.encode("utf-8"), version)
+
+            self.assertEqual(result.result, "Success", version)
+            self.assertEqual(result.lines, Replay.count_lines(output.encode("utf-8")))
+
+            for name in ("recovered_data", "error_size", "num_errors", "current_read_rate",
+                         "input_pos", "time_since_last_read"):
+
+                self.assertEqual(getattr(result.recovery, name), states[-1][name],
+                                 version+": "+name)
+
+                self.assertEqual(result.display.labels[name],
+                                 Units.format_value(name, states[-1][name]), version+": "+name)
+
+            #The status is redrawn in place, so only the last one is left on the screen.
+            text = result.display.terminal.get_text()
+
+            self.assertTrue(text.endswith("\n\nFinished\n"), version)
+            self.assertEqual(text.count("ipos:"), 1, version)
+
+    def test_replay2(self):
+        """Test #2: Output can be replayed at a simulated rate, and allocations measured"""
+        output = Data.return_fake_output("1.22")[0].encode("utf-8")
+        output = output[:output.index(b"\r", len(output) // 10)]
+        lines = len(output.split(b"\n"))
+
+        result = Replay.replay(output, "1.22", rate=lines * 5, trace_allocations=True)
+
+        self.assertEqual(result.result, "Success")
+        self.assertTrue(0.15 <= result.wall_time < 5)
+
+        if Replay.tracemalloc is not None:
+            self.assertTrue(result.peak_memory > 0)
+
+        else:
+            self.assertEqual(result.peak_memory, None)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Scheduler tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the recovery scheduler.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import time
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import journal as Journal #pylint: disable=import-error
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import scheduler as Scheduler #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A stand-in for ddrescue that waits a moment, and then writes its input file to stdout.
+FAKE_DDRESCUE = ("import sys, time; time.sleep(0.5); "
+                 "sys.stdout.write(open(sys.argv[-3], 'rb').read().decode())")
+
+class TestFunctions(unittest.TestCase):
+    """Tests for the functions in the scheduler"""
+
+    def test_get_bus_from_path1(self):
+        """Test #1: USB disks are on the hub they're plugged into"""
+        self.assertEqual(Scheduler.get_bus_from_path(
+            "/sys/devices/pci0000:00/0000:00:14.0/usb2/2-1/2-1.3/2-1.3:1.0/host6/target6:0:0/"
+            "6:0:0:0/block/sdc"), "/sys/devices/pci0000:00/0000:00:14.0/usb2/2-1")
+
+        self.assertEqual(Scheduler.get_bus_from_path(
+            "/sys/devices/pci0000:00/0000:00:14.0/usb2/2-2/2-2:1.0/host7/target7:0:0/7:0:0:0/"
+            "block/sdd/sdd1"), "/sys/devices/pci0000:00/0000:00:14.0/usb2")
+
+    def test_get_bus_from_path2(self):
+        """Test #2: Other disks are on the PCI device they're attached to"""
+        self.assertEqual(Scheduler.get_bus_from_path(
+            "/sys/devices/pci0000:00/0000:00:17.0/ata3/host2/target2:0:0/2:0:0:0/block/sdb"),
+                         "/sys/devices/pci0000:00/0000:00:17.0")
+
+        self.assertEqual(Scheduler.get_bus_from_path(
+            "/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0/nvme/nvme0/nvme0n1"),
+                         "/sys/devices/pci0000:00/0000:00:1d.0/0000:3d:00.0")
+
+        self.assertEqual(Scheduler.get_bus_from_path("/sys/devices/virtual/block/loop0"), None)
+
+    def test_get_bus1(self):
+        """Test #1: Files, and disks on macOS, have no bus"""
+        self.assertEqual(Scheduler.get_bus("/home/user/disk.img"), None)
+        self.assertEqual(Scheduler.get_bus("/dev/disk2", linux=False), None)
+
+class TestScheduler(unittest.TestCase):
+    """Tests for Scheduler"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.finished_jobs = []
+        self.scheduler = Scheduler.Scheduler([sys.executable, "-c", FAKE_DDRESCUE],
+                                             max_jobs=2, on_job_finished=self.finished_jobs.append)
+
+        self.output, self.states = Data.return_fake_output("1.22")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.finished_jobs
+        del self.scheduler
+        del self.output
+        del self.states
+
+    def add_job(self, name, bus):
+        """Queue a job that recovers the fake ddrescue output from a file called name"""
+        input_file = os.path.join(self.temp_dir, name)
+
+        with open(input_file, "wb") as output_file:
+            output_file.write(self.output.encode("utf-8"))
+
+        settings = dict(Recovery.DEFAULT_OPTIONS)
+        settings.update({"DDRescueVersion": "1.22", "InputFile": input_file,
+                         "OutputFile": input_file+".img", "MapFile": input_file+".map"})
+
+        job = self.scheduler.add_job(settings)
+        job.bus = bus
+
+        return job
+
+    def test_schedule1(self):
+        """Test #1: Jobs are limited by max_jobs, and only one runs on each bus"""
+        jobs = [self.add_job("first", "usb1"), self.add_job("second", "usb1"),
+                self.add_job("third", "sata"), self.add_job("fourth", None)]
+
+        self.scheduler.start()
+
+        self.assertEqual([job.state for job in jobs], ["Running", "Queued", "Running", "Queued"])
+
+        self.assertTrue(self.scheduler.wait(timeout=30))
+        self.assertEqual(len(self.finished_jobs), 4)
+
+        for job in jobs:
+            self.assertEqual(job.state, "Finished")
+            self.assertEqual(job.result, "Success")
+            self.assertEqual(job.runner.recovery.recovered_data, self.states[-1]["recovered_data"])
+            self.assertTrue(job.get_elapsed_time() >= 0.5)
+
+    def test_schedule2(self):
+        """Test #2: Jobs that couldn't be started are finished, and queued jobs can be removed"""
+        self.scheduler.ddrescue_command = [os.path.join(self.temp_dir, "missing")]
+        jobs = [self.add_job("first", None), self.add_job("second", None),
+                self.add_job("third", None)]
+
+        self.assertTrue(self.scheduler.remove_job(jobs[2]))
+
+        self.scheduler.start()
+        self.assertTrue(self.scheduler.wait(timeout=30))
+        self.assertFalse(self.scheduler.remove_job(jobs[0]))
+
+        self.assertEqual(self.scheduler.get_jobs(), jobs[:2])
+        self.assertEqual([job.result for job in jobs[:2]], ["CouldNotStart"] * 2)
+
+    def test_abort_job1(self):
+        """Test #1: Aborting a job only stops that job's ddrescue"""
+        self.scheduler.ddrescue_command = [sys.executable, "-c", "import time; time.sleep(30)"]
+        jobs = [self.add_job("first", None), self.add_job("second", None),
+                self.add_job("third", None)]
+
+        self.scheduler.set_max_jobs(2)
+        self.scheduler.start()
+
+        #Wait for ddrescue to start for the running jobs.
+        end_time = time.time() + 10
+
+        while None in [job.runner.recovery.cmd for job in jobs[:2]] and time.time() < end_time:
+            time.sleep(0.1)
+
+        self.assertTrue(self.scheduler.abort_job(jobs[2]))
+        self.assertTrue(self.scheduler.abort_job(jobs[0]))
+
+        end_time = time.time() + 10
+
+        while jobs[0].state != "Finished" and time.time() < end_time:
+            time.sleep(0.1)
+
+        self.assertEqual(jobs[0].result, "Aborted")
+        self.assertEqual(jobs[1].state, "Running")
+        self.assertIsNone(jobs[1].runner.recovery.cmd.poll())
+        self.assertEqual(self.scheduler.get_jobs(), jobs[:2])
+
+        self.assertTrue(self.scheduler.abort_job(jobs[1]))
+        self.assertTrue(self.scheduler.wait(timeout=10))
+        self.assertFalse(self.scheduler.abort_job(jobs[1]))
+        self.assertEqual([job.result for job in jobs[:2]], ["Aborted"] * 2)
+
+    def test_run_job1(self):
+        """Test #1: Jobs that fail unexpectedly are finished, and free their place"""
+        jobs = [self.add_job("first", None), self.add_job("second", None)]
+
+        def run():
+            """Fail like a bug would"""
+            raise ValueError("Broken")
+
+        jobs[0].runner.run = run
+
+        self.scheduler.set_max_jobs(1)
+        self.scheduler.start()
+
+        self.assertTrue(self.scheduler.wait(timeout=30))
+        self.assertEqual([job.result for job in jobs], ["Failed", "Success"])
+        self.assertEqual(self.finished_jobs, jobs)
+
+    def test_restore_jobs1(self):
+        """Test #1: Jobs that didn't finish are restored from the journal"""
+        journal_path = os.path.join(self.temp_dir, "jobs.jsonl")
+        self.scheduler.journal = Journal.JobJournal(journal_path)
+
+        jobs = [self.add_job("first", None), self.add_job("second", None)]
+        self.scheduler.start()
+        self.assertTrue(self.scheduler.wait(timeout=30))
+
+        #Pretend we crashed while the third was running.
+        third_job = self.add_job("third", None)
+        self.scheduler.journal.start(third_job.job_id)
+
+        scheduler = Scheduler.Scheduler([sys.executable, "-c", FAKE_DDRESCUE],
+                                        journal=Journal.JobJournal(journal_path))
+
+        restored_jobs = scheduler.restore_jobs({"DDRescueVersion": "1.23"})
+
+        self.assertEqual([job.job_id for job in restored_jobs], [third_job.job_id])
+        self.assertEqual(restored_jobs[0].name, third_job.name)
+        self.assertEqual(restored_jobs[0].settings["DDRescueVersion"], "1.23")
+        self.assertEqual(scheduler.restore_jobs(), [])
+
+        scheduler.start()
+        self.assertTrue(scheduler.wait(timeout=30))
+        self.assertEqual(restored_jobs[0].result, "Success")
+        self.assertEqual(Journal.JobJournal(journal_path).get_pending(), [])
+        self.assertNotEqual(jobs[0].job_id, jobs[1].job_id)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Snapshot tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the recovery snapshot.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestRecoverySnapshot(unittest.TestCase):
+    """Tests for RecoverySnapshot"""
+
+    def setUp(self):
+        self.snapshot = Snapshot.RecoverySnapshot()
+
+    def tearDown(self):
+        del self.snapshot
+
+    def test_take_changes1(self):
+        """Test #1: Only the latest value of each changed item is returned, and only once"""
+        self.snapshot.set(input_pos="1 MB", num_errors="0")
+        self.snapshot.set(input_pos="2 MB")
+        self.snapshot.add_output("rescued: 1 MB\n")
+        self.snapshot.add_output("rescued: 2 MB\n")
+
+        self.assertEqual(self.snapshot.take_changes(),
+                         ({"input_pos": "2 MB", "num_errors": "0"},
+                          "rescued: 1 MB\nrescued: 2 MB\n"))
+
+        self.assertEqual(self.snapshot.take_changes(), ({}, ""))
+        self.assertEqual(self.snapshot.get("input_pos"), "2 MB")
+
+    def test_take_changes2(self):
+        """Test #2: Setting an item to the value it already has isn't a change"""
+        self.snapshot.set(num_errors="0")
+        self.snapshot.take_changes()
+        self.snapshot.set(num_errors="0")
+
+        self.assertEqual(self.snapshot.take_changes(), ({}, ""))
+
+    def test_request_update1(self):
+        """Test #1: Only one update is requested until the changes have been taken"""
+        self.assertFalse(self.snapshot.request_update())
+
+        self.snapshot.set(input_pos="1 MB")
+        self.assertTrue(self.snapshot.request_update())
+
+        self.snapshot.set(input_pos="2 MB")
+        self.assertFalse(self.snapshot.request_update())
+
+        self.snapshot.take_changes()
+        self.assertFalse(self.snapshot.request_update())
+
+        self.snapshot.add_output("Finished")
+        self.assertTrue(self.snapshot.request_update())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Startup cache tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+These are the tests for the startup cache tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import startupcache as StartupCache #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#Some information from getdevinfo.
+DISKINFO = {"/dev/sda": {"Name": "/dev/sda", "Type": "Device", "HostDevice": "N/A",
+                         "Vendor": "ATA", "Product": "Fake Disk", "Capacity": "1.02 GB",
+                         "RawCapacity": "1024000000", "Description": "Hard Disk Drive",
+                         "Partitions": []}}
+
+class TestStartupCache(unittest.TestCase):
+    """Tests for StartupCache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "cache", "startup.json")
+        self.boot_id_path = os.path.join(self.temp_dir, "boot_id")
+        self.program = os.path.join(self.temp_dir, "ddrescue")
+
+        self.write(self.boot_id_path, "1234\n")
+        self.write(self.program, "#!/bin/sh\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+        del self.boot_id_path
+        del self.program
+
+    def write(self, path, contents):
+        """Write contents to the file at path"""
+        with open(path, "w") as new_file:
+            new_file.write(contents)
+
+    def open_cache(self):
+        """Return the cache, as it would be loaded when the GUI starts"""
+        return StartupCache.StartupCache(self.path, self.boot_id_path)
+
+    def test_get_ddrescue_version1(self):
+        """Test #1: The version of ddrescue is remembered"""
+        self.assertEqual(self.open_cache().get_ddrescue_version(self.program), None)
+
+        self.open_cache().set_ddrescue_version(self.program, "1.22", True)
+        self.assertEqual(self.open_cache().get_ddrescue_version(self.program), ("1.22", True))
+
+    def test_get_ddrescue_version2(self):
+        """Test #2: The version is forgotten if ddrescue changes"""
+        self.open_cache().set_ddrescue_version(self.program, "1.22", False)
+
+        self.write(self.program, "#!/bin/sh\nexit 0\n")
+        self.assertEqual(self.open_cache().get_ddrescue_version(self.program), None)
+
+        self.open_cache().set_ddrescue_version("missing-ddrescue", "1.22", False)
+        self.assertEqual(self.open_cache().get_ddrescue_version("missing-ddrescue"), None)
+
+    def test_get_diskinfo1(self):
+        """Test #1: The disk information is remembered until the next reboot"""
+        self.assertEqual(self.open_cache().get_diskinfo(), None)
+
+        self.open_cache().set_diskinfo(DISKINFO)
+        self.assertEqual(self.open_cache().get_diskinfo(), DISKINFO)
+
+        self.write(self.boot_id_path, "5678\n")
+        self.assertEqual(self.open_cache().get_diskinfo(), None)
+
+    def test_get_diskinfo2(self):
+        """Test #2: Nothing is remembered if we can't tell when the computer was rebooted"""
+        os.remove(self.boot_id_path)
+
+        self.open_cache().set_diskinfo(DISKINFO)
+        self.assertEqual(self.open_cache().get_diskinfo(), None)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_load1(self):
+        """Test #1: Invalid caches and caches from other versions are ignored"""
+        self.open_cache().set_ddrescue_version(self.program, "1.22", False)
+
+        for contents in ("", "{\"version\":", "[]", "{\"version\": 0, \"ddrescue\": {}}"):
+            self.write(self.path, contents)
+            self.assertEqual(self.open_cache().cache, {})
+
+        self.assertEqual(self.open_cache().get_diskinfo(), None)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery strategy tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the recovery strategies.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import recovery as Recovery #pylint: disable=import-error
+from Tools import snapshot as Snapshot #pylint: disable=import-error
+from Tools import strategy as Strategy #pylint: disable=import-error
+
+#Import test data.
+from . import DDRescueOutputTestData as Data
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+#A stand-in for ddrescue that writes its input file to stdout, and then waits for
+#the given number of seconds.
+FAKE_DDRESCUE = ("import sys, time; sys.stdout.write(open(sys.argv[-3], 'rb').read().decode()); "
+                 "sys.stdout.flush(); time.sleep(float(sys.argv[1]))")
+
+class TestStrategyRunner(unittest.TestCase):
+    """Tests for StrategyRunner"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.snapshot = Snapshot.RecoverySnapshot()
+        self.initial_statuses = []
+
+        self.settings = dict(Recovery.DEFAULT_OPTIONS)
+        self.settings.update({"DDRescueVersion": "1.22", "Strategy": "MultiPass",
+                              "InputFile": os.path.join(self.temp_dir, "output"),
+                              "OutputFile": os.path.join(self.temp_dir, "disk.img"),
+                              "MapFile": os.path.join(self.temp_dir, "disk.map")})
+
+        with open(self.settings["InputFile"], "wb") as output_file:
+            output_file.write(Data.return_fake_output("1.22")[0].encode("utf-8"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.snapshot
+        del self.initial_statuses
+        del self.settings
+
+    def make_runner(self, wait=0, stop=None):
+        """Return a StrategyRunner that uses the fake ddrescue"""
+        return Strategy.StrategyRunner(self.settings, self.snapshot,
+                                       [sys.executable, "-c", FAKE_DDRESCUE, unicode(wait)],
+                                       on_initial_status=lambda: self.initial_statuses.append(1),
+                                       stop=stop)
+
+    def test_prepare_stage1(self):
+        """Test #1: Each stage uses its own options, and the user's other settings"""
+        runner = self.make_runner()
+
+        self.assertEqual(runner.exec_list[4:], ["-d", "-n", "-N", "-c 128",
+                                                self.settings["InputFile"],
+                                                self.settings["OutputFile"],
+                                                self.settings["MapFile"]])
+
+        runner.prepare_stage(2)
+        self.assertEqual(runner.exec_list[4:7], ["-d", "-R", "-c 128"])
+
+        runner.prepare_stage(3)
+        self.assertEqual(runner.exec_list[4:7], ["-d", "-r 3", "-c 128"])
+
+        #Old versions of ddrescue can't skip trimming.
+        self.settings["DDRescueVersion"] = "1.17"
+        self.assertEqual(self.make_runner().exec_list[4:7], ["-d", "-n", "-c 128"])
+
+        #Without a strategy, there's one stage, with the user's settings.
+        self.settings["Strategy"] = ""
+        runner = self.make_runner()
+
+        self.assertEqual(len(runner.stages), 1)
+        self.assertEqual(runner.exec_list[4:7], ["-d", "-r 2", "-c 128"])
+
+    def test_get_stop_reason1(self):
+        """Test #1: Stages are stopped when the disk stops responding, or gets too slow"""
+        runner = self.make_runner()
+        recovery = runner.recovery
+
+        recovery.time_since_last_read = 10
+        recovery.current_read_rate = 50000000
+        self.assertEqual(runner.get_stop_reason(100, None), (None, None))
+
+        recovery.time_since_last_read = 300
+        self.assertNotEqual(runner.get_stop_reason(100, None)[0], None)
+
+        #The rate has to stay low for the whole window.
+        recovery.time_since_last_read = 0
+        recovery.current_read_rate = 1000
+        self.assertEqual(runner.get_stop_reason(100, None), (None, 100))
+        self.assertEqual(runner.get_stop_reason(399, 100), (None, 100))
+        self.assertNotEqual(runner.get_stop_reason(400, 100)[0], None)
+
+        recovery.current_read_rate = 50000000
+        self.assertEqual(runner.get_stop_reason(401, 100), (None, None))
+
+    def test_run1(self):
+        """Test #1: Every stage is run against the same map file"""
+        runner = self.make_runner()
+
+        self.assertEqual(runner.run(), "Success")
+        self.assertEqual([result for name, result in runner.results], ["Success"] * 4)
+        self.assertEqual(len(self.initial_statuses), 1)
+        self.assertEqual(runner.recovery.recovered_data,
+                         Data.return_fake_output("1.22")[1][-1]["recovered_data"])
+
+    def test_run2(self):
+        """Test #2: Stages are stopped by their stop conditions, and the next one is run"""
+        runner = self.make_runner(wait=30)
+        runner.stages = [Strategy.Stage("First", {}, max_time=1),
+                         Strategy.Stage("Second", {}, max_time=1)]
+
+        runner.interval = 0.1
+        runner.prepare_stage(0)
+
+        self.assertEqual(runner.run(), "Success")
+        self.assertEqual(runner.results, [("First", "Stopped"), ("Second", "Stopped")])
+
+    def test_run3(self):
+        """Test #3: No more stages are run after one fails, or after an abort"""
+        self.settings["InputFile"] = os.path.join(self.temp_dir, "missing")
+        runner = self.make_runner()
+
+        self.assertEqual(runner.run(), "NoInitialStatus")
+        self.assertEqual(len(runner.results), 1)
+
+        self.settings["InputFile"] = os.path.join(self.temp_dir, "output")
+        runner = self.make_runner()
+        runner.abort()
+
+        #ddrescue is never started.
+        self.assertEqual(runner.run(), "Aborted")
+        self.assertEqual([result for name, result in runner.results], ["Aborted"])
+        self.assertTrue(runner.recovery.cmd is None)
+        self.assertEqual(self.initial_statuses, [])
+
+    def test_run4(self):
+        """Test #4: ddrescue is restarted with adjusted options when the read rate collapses"""
+        self.settings.update({"Strategy": "", "AdaptiveControl": True})
+        runner = self.make_runner(wait=1)
+
+        runner.interval = 0.1
+        runner.controller.window = 0.2
+        runner.controller.max_restarts = 2
+
+        self.assertEqual(runner.run(), "Success")
+        self.assertEqual(len(runner.controller.decisions), 2)
+        self.assertEqual(runner.adjustments, {"Reverse": "-R", "ClusterSize": "-c 64"})
+        self.assertEqual(runner.exec_list[4:8], ["-d", "-R", "-r 2", "-c 64"])
+
+    def test_run5(self):
+        """Test #5: Only the runner's own ddrescue is stopped, by its process ID"""
+        stopped = []
+
+        def stop(pid):
+            """Stop ddrescue like the GUI does, and keep track of it"""
+            stopped.append((pid, runner.recovery.cmd.pid))
+            os.kill(pid, signal.SIGINT)
+
+        #Another ddrescue, started the same way, that must be left alone.
+        other = subprocess.Popen([sys.executable, "-c", FAKE_DDRESCUE, "30",
+                                  self.settings["InputFile"], "out", "map"],
+                                 stdout=subprocess.PIPE)
+
+        try:
+            runner = self.make_runner(wait=30, stop=stop)
+            runner.stages = [Strategy.Stage("First", {}, max_time=1),
+                             Strategy.Stage("Second", {}, max_time=1)]
+
+            runner.interval = 0.1
+            runner.prepare_stage(0)
+
+            self.assertEqual(runner.run(), "Success")
+            self.assertEqual(runner.results, [("First", "Stopped"), ("Second", "Stopped")])
+            self.assertEqual(len(stopped), 2)
+            self.assertTrue(all(pid == expected for pid, expected in stopped))
+            self.assertIsNone(other.poll())
+
+        finally:
+            other.kill()
+            other.communicate()
+
+    def test_run6(self):
+        """Test #6: An abort stops ddrescue by itself, and no more stages are run"""
+        runner = self.make_runner(wait=30)
+        runner.interval = 0.1
+
+        timer = threading.Timer(0.5, runner.abort)
+        timer.start()
+
+        start_time = time.time()
+
+        try:
+            self.assertEqual(runner.run(), "Aborted")
+
+        finally:
+            timer.cancel()
+
+        self.assertTrue(time.time() - start_time < 10)
+        self.assertEqual([result for name, result in runner.results], ["Aborted"])
+        self.assertTrue(runner.recovery.cmd.poll() is not None)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Terminal tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the virtual terminal.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import terminal as Terminal #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestVirtualTerminal(unittest.TestCase):
+    """Tests for VirtualTerminal"""
+
+    def setUp(self):
+        self.terminal = Terminal.VirtualTerminal()
+
+    def tearDown(self):
+        del self.terminal
+
+    def test_write1(self):
+        """Test #1: Carriage returns and moving up a line overwrite ddrescue's old status"""
+        self.terminal.write("Press Ctrl-C to interrupt\n")
+        self.terminal.write("rescued: 1 MB\nipos: 1 MB\nCopying")
+        self.terminal.write("\r\x1b[A\x1b[Arescued: 2 MB\nipos: 2 MB\nTrimming")
+
+        self.assertEqual(self.terminal.rows, ["Press Ctrl-C to interrupt", "rescued: 2 MB",
+                                              "ipos: 2 MB", "Trimming"])
+
+        self.assertEqual((self.terminal.row, self.terminal.column), (3, 8))
+
+    def test_write2(self):
+        """Test #2: Escape sequences split across writes are still handled"""
+        self.terminal.write("one\ntwo\n\x1b")
+        self.terminal.write("[Athree")
+
+        self.assertEqual(self.terminal.get_text(), "one\nthree\n")
+
+    def test_take_dirty_rows1(self):
+        """Test #1: Only the rows from the first changed row onwards are returned"""
+        self.terminal.write("one\ntwo\nthree")
+        self.assertEqual(self.terminal.take_dirty_rows(), (0, ["one", "two", "three"]))
+        self.assertEqual(self.terminal.take_dirty_rows(), (None, []))
+
+        self.terminal.write("\r\x1b[ATWO\nthree")
+        self.assertEqual(self.terminal.take_dirty_rows(), (1, ["TWO", "three"]))
+
+        #A new row means the newline after the previous row is new too.
+        self.terminal.write("\nfour")
+        self.assertEqual(self.terminal.take_dirty_rows(), (2, ["three", "four"]))
+
+    def test_take_dropped_rows1(self):
+        """Test #1: Old rows are thrown away when there are too many"""
+        self.terminal = Terminal.VirtualTerminal(max_rows=10)
+        self.terminal.write("".join("line "+unicode(number)+"\n" for number in range(11)))
+
+        self.assertEqual(self.terminal.take_dropped_rows(), 2)
+        self.assertEqual(self.terminal.take_dropped_rows(), 0)
+        self.assertEqual(self.terminal.rows[0], "line 2")
+        self.assertEqual(len(self.terminal.rows), 10)
+        self.assertEqual(self.terminal.take_dirty_rows()[0], 0)
+
+        self.terminal.write("x\n")
+        self.assertEqual(self.terminal.take_dropped_rows(), 0)
+        self.assertEqual(self.terminal.take_dirty_rows(), (9, ["x", ""]))
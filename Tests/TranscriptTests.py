@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Transcript tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the transcript writer.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import gzip
+import shutil
+import tempfile
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import transcript as Transcript #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestTranscriptWriter(unittest.TestCase):
+    """Tests for TranscriptWriter"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "map.transcript")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        del self.temp_dir
+        del self.path
+
+    def test_get_transcript_path1(self):
+        """Test #1: The transcript is saved next to the map file"""
+        self.assertEqual(Transcript.get_transcript_path("/home/user/map"),
+                         "/home/user/map.transcript")
+
+    def test_write1(self):
+        """Test #1: Files are rotated when they get too big, keeping only the newest backups"""
+        writer = Transcript.TranscriptWriter(self.path, max_size=10, backups=2)
+
+        for number in range(4):
+            writer.write(b"output "+unicode(number).encode("utf-8")+b"\n")
+            writer.write(b"more\n")
+
+        writer.close()
+
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["map.transcript", "map.transcript.1", "map.transcript.2"])
+
+        with open(self.path+".2", "rb") as transcript_file:
+            self.assertEqual(transcript_file.read(), b"output 1\nmore\n")
+
+        with open(self.path, "rb") as transcript_file:
+            self.assertEqual(transcript_file.read(), b"output 3\nmore\n")
+
+    def test_write2(self):
+        """Test #2: Compressed files are rotated too"""
+        writer = Transcript.TranscriptWriter(self.path, max_size=10, backups=1, compress=True)
+        writer.write(b"output 0\nmore\n")
+        writer.write(b"output 1\n")
+        writer.close()
+
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ["map.transcript.1.gz", "map.transcript.gz"])
+
+        with gzip.open(self.path+".1.gz", "rb") as transcript_file:
+            self.assertEqual(transcript_file.read(), b"output 0\nmore\n")
+
+    def test_write3(self):
+        """Test #3: Resuming a recovery adds to its transcript, after a separator"""
+        for compress in (False, True):
+            for number in range(2):
+                writer = Transcript.TranscriptWriter(self.path, compress=compress)
+                writer.write(b"session "+unicode(number).encode("utf-8")+b"\n")
+                writer.close()
+
+            if compress:
+                with gzip.open(self.path+".gz", "rb") as transcript_file:
+                    lines = transcript_file.read().split(b"\n")
+
+            else:
+                with open(self.path, "rb") as transcript_file:
+                    lines = transcript_file.read().split(b"\n")
+
+            self.assertEqual(lines[0], b"session 0")
+            self.assertEqual(lines[1], b"")
+            self.assertTrue(lines[2].startswith(b"--- DDRescue-GUI: ddrescue started again at "))
+            self.assertEqual(lines[3:], [b"session 1", b""])
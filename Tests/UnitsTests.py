@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Units tests for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+These are the tests for the units tools.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules
+import unittest
+import os
+import sys
+
+#Allow imports of modules & packages 1 level up.
+sys.path.insert(0, os.path.abspath('..'))
+
+#Import tools.
+from Tools import units as Units #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin
+
+class TestUnits(unittest.TestCase):
+    """Tests for the units tools"""
+
+    def test_to_bytes1(self):
+        """Test #1: Sizes are converted to whole numbers of bytes"""
+        self.assertEqual(Units.to_bytes("12345", "M"), 12345000000)
+        self.assertEqual(Units.to_bytes("0", ""), 0)
+        self.assertEqual(Units.to_bytes("1.5", "K"), 1500)
+        self.assertEqual(Units.to_bytes("2", "K", binary=True), 2048)
+
+    def test_format_size1(self):
+        """Test #1: Sizes are shown with a sensible unit"""
+        self.assertEqual(Units.format_size(512), "512 B")
+        self.assertEqual(Units.format_size(12345000000), "12.35 GB")
+        self.assertEqual(Units.format_size(None), "Unknown")
+        self.assertEqual(Units.format_rate(52428000), "52.43 MB/s")
+
+    def test_format_duration1(self):
+        """Test #1: Times are shown in seconds, minutes, hours or days"""
+        self.assertEqual(Units.format_duration(59.6), "60 seconds")
+        self.assertEqual(Units.format_duration(90), "1.5 minutes")
+        self.assertEqual(Units.format_duration(5400), "1.5 hours")
+        self.assertEqual(Units.format_duration(172800), "2.0 days")
+
+    def test_format_value1(self):
+        """Test #1: Recovery information is formatted by what it is"""
+        self.assertEqual(Units.format_value("input_pos", 12345000000), "12.35 GB")
+        self.assertEqual(Units.format_value("average_read_rate", 52428000), "52.43 MB/s")
+        self.assertEqual(Units.format_value("num_errors", 3), "3")
+        self.assertEqual(Units.format_value("time_since_last_read", 90), "1.5 minutes")
+        self.assertEqual(Units.format_value("time_since_last_read", None), "n/a")
+
+    def test_cached1(self):
+        """Test #1: Formatted values are remembered, up to a limit"""
+        Units.format_size.cache.clear()
+
+        for num_bytes in range(Units.CACHE_SIZE):
+            Units.format_size(num_bytes)
+
+        self.assertEqual(Units.format_size.cache[512], "512 B")
+        self.assertEqual(len(Units.format_size.cache), Units.CACHE_SIZE)
+
+        Units.format_size(12345000000)
+        self.assertEqual(Units.format_size.cache, {12345000000: "12.35 GB"})
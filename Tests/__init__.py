@@ -22,3 +22,28 @@ This is the Tests package.
 from __future__ import absolute_import
 from . import BackendToolsTests
 from . import BackendToolsTestData
+from . import ReadersTests
+from . import SnapshotTests
+from . import TerminalTests
+from . import TranscriptTests
+from . import DDRescueOutputTestData
+from . import ParserTests
+from . import UnitsTests
+from . import MapFileTests
+from . import BlockMapTests
+from . import RecoveryTests
+from . import HeadlessTests
+from . import SchedulerTests
+from . import JournalTests
+from . import StrategyTests
+from . import ControllerTests
+from . import MetricsTests
+from . import ExporterTests
+from . import EstimatorTests
+from . import ReplayTests
+from . import FakeDDRescueTests
+from . import BrokerTests
+from . import MountTableTests
+from . import InventoryTests
+from . import DeviceInfoTests
+from . import StartupCacheTests
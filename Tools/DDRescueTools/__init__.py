@@ -21,9 +21,4 @@ These are the ddrescue tools.
 
 from __future__ import absolute_import
 from . import setup
-from . import decorators
-from . import allversions
-from . import one_point_forteen
-from . import one_point_eighteen
-from . import one_point_twenty
-from . import one_point_twenty_one
+from . import parser
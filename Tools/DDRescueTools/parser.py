@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# DDRescue Output Parser in the Tools Package for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+A parser for ddrescue's status output. The regular expressions for the user's
+version of ddrescue are picked and compiled once, and each line is then matched
+against the one for its first word. Values are returned as numbers: sizes in
+bytes, rates in bytes per second, and times in seconds.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import re
+import sys
+
+#Import tools modules.
+from . import setup as Setup
+from .. import units as Units
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+def size(name):
+    """Returns a pattern that matches a size like "12345 MB" or "500 GBytes\""""
+    return (r"(?P<"+name+r">\d+(?:\.\d+)?) ?(?P<"+name+r"_prefix>[kKMGTPEZY]?)"
+            r"(?P<"+name+r"_binary>i?)B(?:ytes)?")
+
+def rate(name):
+    """Returns a pattern that matches a rate like "52428 kB/s\""""
+    return size(name)+"/s"
+
+def duration(name):
+    """Returns a pattern that matches a time like "n/a", "0 s", "1m 52s" or "2h 40m\""""
+    return r"(?P<"+name+r">n/a|(?:\d+ ?[smhd](?: |$))+)"
+
+def count(name):
+    """Returns a pattern that matches a whole number"""
+    return r"(?P<"+name+r">\d+)"
+
+#What ddrescue's status lines look like. Each entry is the first word(s) of a line,
+#the (minor) versions of ddrescue it applies to, and the pattern for it.
+LINE_FORMATS = [
+    #All versions.
+    (("About",), range(14, 24),
+     r"About to copy "+size("disk_capacity")),
+
+    #1.14 - 1.20.
+    (("rescued:",), range(14, 21),
+     r"rescued:\s+"+size("recovered_data")+r",\s+errsize:\s+"+size("error_size")
+     + r",\s+current rate:\s+"+rate("current_read_rate")),
+
+    (("ipos:",), range(14, 21),
+     r"ipos:\s+"+size("input_pos")+r",\s+errors:\s+"+count("num_errors")
+     + r",\s+average rate:\s+"+rate("average_read_rate")),
+
+    #"time since last successful read: 0 s" (1.14 - 1.17),
+    #or "run time: 1 s, successful read: 0 s ago" (1.18 - 1.20).
+    (("opos:",), range(14, 21),
+     r"opos:\s+"+size("output_pos")+r",.*read:\s+"+duration("time_since_last_read")),
+
+    #1.20 - 1.23.
+    (("percent", "time"), range(20, 24),
+     r"time since last successful read:\s+"+duration("time_since_last_read")),
+
+    #1.21 - 1.23.
+    (("ipos:",), range(21, 24),
+     r"ipos:\s+"+size("input_pos")+r",\s+non-trimmed:\s+"+size("non_trimmed")
+     + r",\s+current rate:\s+"+rate("current_read_rate")),
+
+    (("opos:",), range(21, 24),
+     r"opos:\s+"+size("output_pos")+r",\s+non-scraped:\s+"+size("non_scraped")
+     + r",\s+average rate:\s+"+rate("average_read_rate")),
+
+    #"errsize:" (1.21) or "bad-sector:" (1.22 - 1.23).
+    (("non-tried:",), range(21, 24),
+     r"non-tried:\s+"+size("non_tried")+r",\s+(?:errsize|bad-sector):\s+"
+     + size("error_size")),
+
+    #"errors:" (1.21) or "bad areas:" (1.22 - 1.23).
+    (("rescued:",), range(21, 24),
+     r"rescued:\s+"+size("recovered_data")+r",\s+(?:errors|bad areas):\s+"
+     + count("num_errors")),
+
+    (("pct",), range(22, 24),
+     r"pct rescued:\s+(?P<percent_rescued>\d+(?:\.\d+)?)%,\s+read errors:\s+"
+     + count("read_errors")),
+]
+
+#The number of seconds in each unit of time ddrescue uses.
+SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+DURATION_REGEX = re.compile(r"(\d+) ?([smhd])")
+
+def to_seconds(text):
+    """Convert a time like "1m 52s" to a number of seconds. Returns None for "n/a"."""
+    if text.strip() == "n/a":
+        return None
+
+    return sum(int(number) * SECONDS[unit] for number, unit in DURATION_REGEX.findall(text))
+
+class StatusParser(object):
+    """
+    Parses lines of ddrescue's output (with the terminal control characters removed)
+    for one version of ddrescue.
+    """
+
+    def __init__(self, ddrescue_version):
+        """Pick and compile the patterns for the given version of ddrescue"""
+        #Use the closest version we support.
+        self.minor_version = int(Setup.get_best_version(ddrescue_version).split(".")[1])
+
+        self.regexes = {}
+
+        for first_words, versions, pattern in LINE_FORMATS:
+            if self.minor_version in versions:
+                for first_word in first_words:
+                    self.regexes[first_word] = re.compile(pattern)
+
+        #After a status update, ddrescue's status message is followed by the
+        #first line of the next update, which starts with this.
+        if self.minor_version >= 21:
+            self.first_status_word = "ipos:"
+
+        else:
+            self.first_status_word = "rescued:"
+
+    def parse(self, line):
+        """
+        Parse a line, and return a dictionary of what was found in it. Keys are the
+        names used in LINE_FORMATS (eg "input_pos"), plus "status" for ddrescue's
+        status messages. Returns an empty dictionary if nothing useful was found.
+        """
+
+        split_line = line.split(None, 1)
+
+        if split_line == []:
+            return {}
+
+        values = {}
+
+        if split_line[0] in self.regexes:
+            regex = self.regexes[split_line[0]]
+
+        elif self.first_status_word in line:
+            #A status message, followed by the first line of the next status update.
+            status, line = line.split(self.first_status_word, 1)
+            line = self.first_status_word+line
+            regex = self.regexes[self.first_status_word]
+
+            if status.strip() != "":
+                values["status"] = status.strip()
+
+        elif "pct" not in line:
+            #Probably a status message (maybe the initial one).
+            return {"status": line.strip()}
+
+        else:
+            return {}
+
+        match = regex.search(line)
+
+        if match is not None:
+            values.update(self.convert(match.groupdict()))
+
+        return values
+
+    def convert(self, groups): #pylint: disable=no-self-use
+        """Convert the text matched by a pattern to numbers"""
+        values = {}
+
+        for name, text in groups.items():
+            if name.endswith("_prefix") or name.endswith("_binary"):
+                continue
+
+            elif name+"_prefix" in groups:
+                values[name] = Units.to_bytes(text, groups[name+"_prefix"],
+                                              groups[name+"_binary"] == "i")
+
+            elif name == "time_since_last_read":
+                values[name] = to_seconds(text)
+
+            elif name == "percent_rescued":
+                values[name] = float(text)
+
+            else:
+                values[name] = int(text)
+
+        return values
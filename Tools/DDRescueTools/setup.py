@@ -16,8 +16,8 @@
 # along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-Used to set up the GUI to use the correct version of tools for
-the user's version of ddrescue.
+Used to pick the version of ddrescue whose output we know how to read that is
+closest to the user's version of ddrescue.
 """
 
 #Do future imports to prepare to support python 3.
@@ -28,34 +28,16 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 #Import modules.
-import types
 import sys
 
-#Import tools modules.
-from . import allversions
-from . import one_point_forteen
-from . import one_point_eighteen
-from . import one_point_twenty
-from . import one_point_twenty_one
-from . import one_point_twenty_two
-
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
 
-#Get a list of functions in all of our ddrescue tools modules.
-FUNCTIONS = []
-
-for Module in (allversions, one_point_forteen, one_point_eighteen, one_point_twenty,
-               one_point_twenty_one, one_point_twenty_two):
-
-    for function in dir(Module):
-        if isinstance(Module.__dict__.get(function), types.FunctionType):
-            FUNCTIONS.append(vars(Module)[function])
-
-def setup_for_ddrescue_version(ddrescue_version):
+def get_best_version(ddrescue_version):
     """
-    Selects the correct tools for our version of ddrescue.
+    Returns the version of ddrescue that we have tools for that is the best
+    match for the given version.
     """
 
     #Select the best tools if we have an unsupported version of ddrescue.
@@ -77,10 +59,4 @@ def setup_for_ddrescue_version(ddrescue_version):
         #Supported version.
         best_version = ddrescue_version
 
-    suitable_functions = []
-
-    for function in FUNCTIONS: #pylint: disable=redefined-outer-name
-        if best_version in function.SUPPORTEDVERSIONS:
-            suitable_functions.append(function)
-
-    return suitable_functions
+    return best_version
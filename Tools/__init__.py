@@ -20,4 +20,28 @@ This is the Tools package.
 """
 
 from __future__ import absolute_import
-from . import tools
+from . import readers
+from . import snapshot
+from . import terminal
+from . import transcript
+from . import metrics
+from . import exporter
+from . import units
+from . import estimator
+from . import mapfile
+from . import blockmap
+from . import recovery
+from . import replay
+from . import fakeddrescue
+from . import journal
+from . import controller
+from . import strategy
+from . import scheduler
+from . import broker
+from . import mounttable
+from . import inventory
+from . import deviceinfo
+from . import startupcache
+
+#tools isn't imported here, because it needs wxPython. This lets the modules that
+#don't need wx be used without it (eg by benchmarks.py). Import Tools.tools directly.
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Block Map Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Works out what to draw for a map of a recovery, like ddrescueview does. The rescue
+domain is split into as many cells as there is room to draw, and each cell gets the
+colour of the worst status of the blocks in it.
+
+To keep this quick for maps with millions of blocks, the domain is first split into a
+fixed number of tiles (a level of detail finer than any window), and each tile holds a
+bit for the worst status in it. Tiles are worked out in bulk, with bisect over the
+map's arrays, and only the tiles that overlap changes in the map file are worked out
+again. Cells are made by OR-ing groups of tiles together a whole row of tiles at a
+time, so resizing doesn't look at the blocks at all.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import binascii
+import bisect
+import itertools
+import operator
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#The order to pick statuses in when a cell has more than one, worst first.
+PRIORITY = [b"-", b"/", b"*", b"?", b"+"]
+
+#The colour of each status, and of cells outside the rescue domain.
+COLOURS = {"?": (64, 64, 64), "*": (255, 224, 0), "/": (0, 96, 255), "-": (255, 0, 0),
+           "+": (0, 224, 0)}
+
+BACKGROUND = (0, 0, 0)
+
+#The most tiles the rescue domain is split into.
+NUM_TILES = 262144
+
+#The bit for statuses that aren't in PRIORITY.
+UNKNOWN_BIT = 0x80
+
+def make_bit_table():
+    """
+    Return a table for bytearray.translate() that turns statuses into bits, with the
+    worst status in the lowest bit. The lowest bit set in a group of tiles OR-ed
+    together (or the smallest tile) is then the worst status in the group.
+    """
+
+    table = bytearray([UNKNOWN_BIT] * 256)
+
+    for number, code in enumerate(PRIORITY):
+        table[ord(code)] = 1 << number
+
+    return bytes(table)
+
+def make_status_table():
+    """Return a table for bytearray.translate() that turns tile bits into statuses"""
+    table = bytearray(256)
+
+    for value in range(1, 256):
+        lowest_bit = (value & -value).bit_length() - 1
+
+        if lowest_bit < len(PRIORITY):
+            table[value] = ord(PRIORITY[lowest_bit])
+
+    return bytes(table)
+
+def make_colour_tables():
+    """Return tables for bytearray.translate() that turn statuses into red, green and blue"""
+    tables = []
+
+    for number in range(3):
+        table = bytearray([BACKGROUND[number]] * 256)
+
+        for status, colour in COLOURS.items():
+            table[ord(status)] = colour[number]
+
+        tables.append(bytes(table))
+
+    return tables
+
+BIT_TABLE = make_bit_table()
+STATUS_TABLE = make_status_table()
+COLOUR_TABLES = make_colour_tables()
+
+def to_number(data):
+    """Return the bytes in data as one big number, so they can be OR-ed all at once"""
+    return int(binascii.hexlify(bytes(data)) or b"0", 16)
+
+def from_number(number, length):
+    """Return number as length bytes. The opposite of to_number()"""
+    return bytearray(binascii.unhexlify(("%0*x" % (2 * length, number)).encode("ascii")))
+
+class BlockMap(object): #pylint: disable=too-many-instance-attributes
+    """
+    The cells to draw for a Tools.mapfile.MapFile. self.cells holds the status character
+    (as a byte) to show for each cell, or 0 for cells past the end of the rescue domain.
+    self.tiles holds the bit (see BIT_TABLE) for the worst status in each tile.
+
+    Call update() with the changes from Tools.mapfile.MapFile.update() whenever the map
+    changes. Only one thread should use a BlockMap at a time.
+    """
+
+    def __init__(self, mapfile):
+        """Initialise the block map, with no cells"""
+        self.mapfile = mapfile
+        self.num_cells = 0
+        self.cell_size = 1
+        self.end = 0
+        self.cells = bytearray()
+
+        self.tile_size = 1
+        self.tiles = bytearray()
+
+    def make_tiles(self):
+        """Split the rescue domain into tiles, and work out all of them"""
+        self.end = self.mapfile.get_end()
+        self.tile_size = max(1, -(-self.end // NUM_TILES))
+        self.tiles = bytearray(-(-self.end // self.tile_size))
+
+        self.update_tiles(0, len(self.tiles))
+
+    def resize(self, num_cells):
+        """Split the rescue domain into num_cells cells, and work out all of them"""
+        if self.mapfile.get_end() != self.end or not self.tiles:
+            self.make_tiles()
+
+        self.num_cells = num_cells
+        self.make_cells()
+
+    def update(self, changes):
+        """Work out the tiles that overlap the (start, end) ranges in changes again"""
+        if self.mapfile.get_end() != self.end:
+            #The tiles are a different size now.
+            self.make_tiles()
+
+        else:
+            bits = self.mapfile.statuses.translate(BIT_TABLE)
+
+            for start, end in changes:
+                self.update_tiles(start // self.tile_size, -(-end // self.tile_size), bits)
+
+        self.make_cells()
+
+    def update_tiles(self, first, last, bits=None):
+        """Work out tiles first to last (not including last)"""
+        starts = self.mapfile.starts
+        last = min(last, len(self.tiles))
+
+        if first >= last or not starts:
+            return
+
+        if bits is None:
+            bits = self.mapfile.statuses.translate(BIT_TABLE)
+
+        size = self.tile_size
+        repeat = itertools.repeat
+
+        #The blocks in each tile are the one its start is in, up to the first one that
+        #starts after the tile (and at least one). Everything is done with map(), so
+        #the work for each tile happens in C.
+        lows = list(map(max, map(operator.sub, map(bisect.bisect_right, repeat(starts),
+                                                    range(first * size, last * size, size)),
+                                 repeat(1)),
+                        repeat(0)))
+
+        highs = map(max, map(bisect.bisect_left, repeat(starts),
+                             range((first + 1) * size, (last + 1) * size, size)),
+                    map(operator.add, lows, repeat(1)))
+
+        #The worst status has the smallest bit.
+        self.tiles[first:last] = bytearray(map(min, map(bits.__getitem__,
+                                                        map(slice, lows, highs))))
+
+    def make_cells(self):
+        """Work out every cell from the tiles"""
+        num_tiles = len(self.tiles)
+
+        if num_tiles == 0 or self.num_cells == 0:
+            self.cells = bytearray(self.num_cells)
+            return
+
+        tiles_per_cell = max(1, -(-num_tiles // max(self.num_cells, 1)))
+        num_used = -(-num_tiles // tiles_per_cell)
+
+        self.cell_size = tiles_per_cell * self.tile_size
+
+        if tiles_per_cell <= num_used:
+            #OR together the first tile of every cell, then the second, and so on.
+            number = 0
+
+            for offset in range(tiles_per_cell):
+                row = self.tiles[offset::tiles_per_cell]
+                number |= to_number(row + bytearray(num_used - len(row)))
+
+            cells = from_number(number, num_used)
+
+        else:
+            #There are only a few cells, so look at each one's tiles in turn.
+            cells = bytearray(min(self.tiles[start:start + tiles_per_cell])
+                              for start in range(0, num_tiles, tiles_per_cell))
+
+        self.cells = cells.translate(STATUS_TABLE) + bytearray(max(self.num_cells - num_used,
+                                                                   0))
+
+    def get_rgb(self):
+        """Return the colours of the cells as RGB data, 3 bytes per cell"""
+        rgb = bytearray(3 * len(self.cells))
+
+        for number, table in enumerate(COLOUR_TABLES):
+            rgb[number::3] = self.cells.translate(table)
+
+        return rgb
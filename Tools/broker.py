@@ -0,0 +1,494 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Privileged helper broker for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+A long-lived privileged helper, so the user only has to authenticate once per session,
+and privileged commands don't each need their own pkexec round trip.
+
+BrokerClient starts the broker as root through pkexec (with
+Tools/helpers/runasroot_linux_broker.sh). The broker makes a Unix socket in a new
+directory that only root can change, lets only the user who started it use the socket,
+and prints the socket's path when it is ready. It also checks the user ID of everything
+that connects to it. Each connection runs one command, given as a JSON list of
+arguments, and the output is sent back a line at a time as it arrives, followed by the
+return code, as JSON lines. Only the commands check_arguments() allows can be run, with
+the arguments the GUI uses. The broker exits when its stdin is closed, which happens
+when the GUI exits, even if it crashes.
+"""
+
+#Do future imports to support python 2.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import json
+import logging
+import os
+import shutil
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#Where the programs the broker runs are looked for. The user's PATH isn't used, because
+#the broker runs as root.
+SAFE_PATH = ("/usr/local/sbin", "/usr/local/bin", "/usr/sbin", "/usr/bin", "/sbin", "/bin")
+
+#The only place the broker will make directories and mount filesystems.
+MOUNT_ROOT = "/mnt/ddrescue-gui"
+
+#The lsblk commands the GUI uses when mounting output files.
+ALLOWED_LSBLK_ARGUMENTS = (["-h"], ["-J", "-o", "NAME,FSTYPE,SIZE"],
+                           ["-r", "-o", "NAME,FSTYPE,SIZE"])
+
+#run_getdevinfo.py is run from next to the broker, with the broker's python.
+GETDEVINFO_SCRIPT = "run_getdevinfo.py"
+
+#What the broker prints when it is ready for connections, followed by its socket's path.
+READY_MESSAGE = "DDRescue-GUI broker ready"
+
+#How often to check whether the broker should exit, in seconds.
+POLL_INTERVAL = 0.5
+
+#How much of a command's output to read at once.
+CHUNK_SIZE = 65536
+
+def is_block_device(path):
+    """Return whether path is a device node for a disk or partition"""
+    try:
+        return path.startswith("/dev/") and stat.S_ISBLK(os.stat(path).st_mode)
+
+    except OSError:
+        return False
+
+def is_under_mount_root(path):
+    """
+    Return whether path is inside MOUNT_ROOT, without any ".." or symlinks that could
+    lead outside it.
+    """
+
+    return (os.path.isabs(path) and ".." not in path.split("/")
+            and os.path.realpath(path) == os.path.normpath(path)
+            and os.path.normpath(path).startswith(MOUNT_ROOT+"/"))
+
+def is_owned_file(path, uid):
+    """Return whether path is a regular file owned by user uid"""
+    try:
+        details = os.stat(path)
+
+    except OSError:
+        return False
+
+    return stat.S_ISREG(details.st_mode) and details.st_uid == uid
+
+def is_users_ddrescue(pid, uid):
+    """
+    Return whether pid is a ddrescue process that user uid started (ie its parent is
+    one of uid's processes, normally the GUI).
+    """
+
+    if not pid.isdigit():
+        return False
+
+    try:
+        with open("/proc/"+pid+"/comm", "r") as comm_file:
+            if comm_file.read().strip() != "ddrescue":
+                return False
+
+        with open("/proc/"+pid+"/status", "r") as status_file:
+            parent = [line.split()[1] for line in status_file
+                      if line.startswith("PPid:")][0]
+
+        return os.stat("/proc/"+parent).st_uid == uid
+
+    except (IOError, OSError, IndexError):
+        return False
+
+def check_arguments(program, args, uid):
+    """
+    Return the arguments to run program with, if the broker will run it with args on
+    behalf of user uid, or None if it won't. Only the things the GUI does are allowed:
+    read-only mounts of disks and partitions inside MOUNT_ROOT, unmounting, setting up
+    loop devices for the user's own images, and stopping the user's own ddrescue.
+    """
+
+    if program == "mkdir" and len(args) == 2 and args[0] == "-p":
+        if is_under_mount_root(args[1]):
+            return args
+
+    elif program == "mount":
+        #Listing the mounted filesystems is harmless.
+        if args == []:
+            return args
+
+        if args[:-2] in ([], ["-r"]) and len(args) >= 2 and is_block_device(args[-2]) \
+           and is_under_mount_root(args[-1]):
+
+            return ["-r", "-o", "nosuid,nodev"]+args[-2:]
+
+    elif program == "umount" and len(args) == 1:
+        if is_block_device(args[0]) or is_under_mount_root(args[0]):
+            return args
+
+    elif program == "kpartx" and len(args) == 2 and args[0] in ("-a", "-l", "-d"):
+        path = os.path.realpath(args[1])
+
+        if is_block_device(path) or is_owned_file(path, uid):
+            return [args[0], path]
+
+    elif program == "lsblk" and args in ALLOWED_LSBLK_ARGUMENTS:
+        return args
+
+    elif program == "partprobe" and args == []:
+        return args
+
+    elif program == "kill" and len(args) == 2 and args[0] == "-INT":
+        if is_users_ddrescue(args[1], uid):
+            return args
+
+    return None
+
+def get_command(args, uid=None):
+    """
+    Return the command to run for a list of arguments, with the program's full path,
+    or None if it isn't allowed for user uid (by default, the current user).
+    """
+
+    if uid is None:
+        uid = os.getuid()
+
+    if not args or not all(isinstance(arg, unicode) for arg in args):
+        return None
+
+    if len(args) == 2 and os.path.basename(args[1]) == GETDEVINFO_SCRIPT:
+        return [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                             GETDEVINFO_SCRIPT)]
+
+    program = os.path.basename(args[0])
+    arguments = check_arguments(program, args[1:], uid)
+
+    if arguments is None:
+        return None
+
+    for directory in SAFE_PATH:
+        path = os.path.join(directory, program)
+
+        if os.access(path, os.X_OK):
+            return [path]+arguments
+
+    return None
+
+def is_allowed(args):
+    """Return whether the broker will run a command (a list of arguments)"""
+    return get_command(args) is not None
+
+def split_lines(chunks):
+    """
+    Yield each line in an iterable of chunks of output. Lines end at "\\n" or "\\r" (like
+    Tools.tools.read_lines()), and are returned as unicode without "NULL" characters.
+    """
+
+    buffered = b""
+
+    for chunk in chunks:
+        buffered += chunk.replace(b"\r", b"\n")
+        lines = buffered.split(b"\n")
+        buffered = lines.pop()
+
+        for line in lines:
+            yield line.decode("utf-8", errors="ignore").replace("\x00", "")
+
+    if buffered:
+        yield buffered.decode("utf-8", errors="ignore").replace("\x00", "")
+
+def send(connection, message):
+    """Send a JSON message on a connection, on its own line"""
+    connection.sendall(json.dumps(message).encode("utf-8")+b"\n")
+
+class BrokerServer(object):
+    """
+    The root side of the broker. Listens on a Unix socket, and runs each allowed command
+    it is sent on behalf of user allowed_uid.
+    """
+
+    def __init__(self, allowed_uid):
+        """Initialise the server"""
+        self.allowed_uid = allowed_uid
+        self.socket_dir = None
+        self.socket_path = None
+        self.listener = None
+        self.running = False
+
+    def start(self):
+        """
+        Listen on a new socket, letting only allowed_uid connect. The socket's directory
+        is ours, and only we can change what is in it, so the socket can't be swapped for
+        something else before we give it to allowed_uid.
+        """
+
+        self.socket_dir = tempfile.mkdtemp(prefix="ddrescue-gui-broker-")
+        self.socket_path = os.path.join(self.socket_dir, "broker")
+
+        #Make sure the socket is never usable by anyone else, even for a moment.
+        old_umask = os.umask(0o177)
+
+        try:
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.listener.bind(self.socket_path)
+
+        finally:
+            os.umask(old_umask)
+
+        if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+            raise OSError("Socket replaced: "+self.socket_path)
+
+        os.lchown(self.socket_path, self.allowed_uid, -1)
+
+        #Let allowed_uid reach the socket, but not list or change the directory.
+        os.chmod(self.socket_dir, 0o711)
+
+        self.listener.listen(8)
+        self.listener.settimeout(POLL_INTERVAL)
+        self.running = True
+
+    def stop(self):
+        """Stop accepting connections"""
+        self.running = False
+
+    def wait_for_eof(self, stream):
+        """Stop when stream (our stdin) is closed"""
+        while stream.read(CHUNK_SIZE):
+            pass
+
+        self.stop()
+
+    def serve(self):
+        """Handle connections until stop() is called, each in its own thread"""
+        while self.running:
+            try:
+                connection = self.listener.accept()[0]
+
+            except socket.timeout:
+                continue
+
+            connection.settimeout(None)
+
+            handler = threading.Thread(target=self.handle, args=(connection,))
+            handler.daemon = True
+            handler.start()
+
+        self.listener.close()
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+
+    def get_peer_uid(self, connection): #pylint: disable=no-self-use
+        """Return the user ID of the process on the other end of a connection"""
+        credentials = connection.getsockopt(socket.SOL_SOCKET, getattr(socket, "SO_PEERCRED", 17),
+                                            struct.calcsize(str("3i")))
+
+        return struct.unpack(str("3i"), credentials)[1]
+
+    def handle(self, connection):
+        """Run the command sent on a connection, sending back its output and return code"""
+        try:
+            if self.get_peer_uid(connection) not in (self.allowed_uid, 0):
+                send(connection, {"error": "Not allowed to connect"})
+                return
+
+            request = b""
+
+            while not request.endswith(b"\n"):
+                data = connection.recv(CHUNK_SIZE)
+
+                if not data:
+                    return
+
+                request += data
+
+            args = json.loads(request.decode("utf-8"))
+            command = get_command(args, uid=self.allowed_uid)
+
+            if command is None:
+                send(connection, {"error": "Not allowed: "+" ".join(args)})
+                return
+
+            process = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT,
+                                       env=dict(os.environ, LC_ALL="C"))
+
+            chunks = iter(lambda: os.read(process.stdout.fileno(), CHUNK_SIZE), b"")
+
+            for line in split_lines(chunks):
+                send(connection, {"line": line})
+
+            send(connection, {"return_code": process.wait()})
+
+        except (IOError, OSError, TypeError, ValueError):
+            #The client has gone, or sent something we can't read.
+            pass
+
+        finally:
+            connection.close()
+
+class BrokerClient(object):
+    """
+    The user's side of the broker. start() starts the broker with command (eg
+    ["pkexec", <helper>]). run() then runs commands with it.
+    """
+
+    def __init__(self, command):
+        """Initialise the client"""
+        self.command = command
+        self.process = None
+        self.socket_path = None
+        self.return_code = None
+
+    def start(self):
+        """
+        Start the broker, and wait until it's ready. Returns True if it started, or False
+        if it didn't (eg if authentication was dismissed). If it didn't, self.return_code
+        is pkexec's (or the broker's) return code.
+        """
+
+        logger.info("BrokerClient().start(): Starting the privileged helper broker...")
+
+        self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        for line in iter(self.process.stdout.readline, b""):
+            line = line.decode("utf-8", errors="ignore").strip()
+
+            if line.startswith(READY_MESSAGE+" "):
+                self.socket_path = line[len(READY_MESSAGE)+1:]
+                logger.info("BrokerClient().start(): The broker is ready...")
+
+                #Keep reading anything else the broker prints (eg warnings), so it
+                #can't fill the pipe and stop the broker.
+                reader = threading.Thread(target=self.log_output, args=(self.process.stdout,))
+                reader.daemon = True
+                reader.start()
+
+                return True
+
+        self.return_code = self.process.wait()
+        logger.warning("BrokerClient().start(): The broker didn't start! Return code: "
+                       + unicode(self.return_code))
+
+        self.stop()
+        return False
+
+    def log_output(self, stream): #pylint: disable=no-self-use
+        """Log everything else the broker prints, until it exits"""
+        for line in iter(stream.readline, b""):
+            logger.warning("BrokerClient().log_output(): Broker: "
+                           + line.decode("utf-8", errors="ignore").rstrip())
+
+    def is_running(self):
+        """Return whether the broker is running"""
+        return self.process is not None and self.process.poll() is None
+
+    def run(self, args, on_line=None):
+        """
+        Run a command (a list of arguments) with the broker. on_line, if given, is called
+        with each line of output as it arrives. Returns the return code and a list of the
+        lines of output, or None if the command couldn't be run with the broker.
+        """
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        lines = []
+
+        try:
+            connection.connect(self.socket_path)
+            send(connection, list(args))
+
+            for message in split_lines(iter(lambda: connection.recv(CHUNK_SIZE), b"")):
+                message = json.loads(message)
+
+                if "line" in message:
+                    lines.append(message["line"])
+
+                    if on_line is not None:
+                        on_line(message["line"])
+
+                elif "return_code" in message:
+                    return message["return_code"], lines
+
+                else:
+                    logger.error("BrokerClient().run(): The broker refused to run "
+                                 + " ".join(args)+": "+unicode(message.get("error")))
+
+                    return None
+
+        except (IOError, OSError, ValueError):
+            logger.error("BrokerClient().run(): Couldn't run "+" ".join(args)+" with the broker!")
+
+        finally:
+            connection.close()
+
+        return None
+
+    def stop(self):
+        """Stop the broker, by closing its stdin"""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+                self.process.wait()
+
+            except (IOError, OSError):
+                pass
+
+            self.process = None
+
+def main(args):
+    """Run the broker, and return the exit status"""
+    if args:
+        sys.stderr.write("Usage: broker.py\n")
+        return 1
+
+    #pkexec tells us who started it. Otherwise, only let our own user in.
+    allowed_uid = int(os.environ.get("PKEXEC_UID", os.getuid()))
+
+    server = BrokerServer(allowed_uid)
+    server.start()
+
+    stdin = getattr(sys.stdin, "buffer", sys.stdin)
+    watcher = threading.Thread(target=server.wait_for_eof, args=(stdin,))
+    watcher.daemon = True
+    watcher.start()
+
+    print(READY_MESSAGE+" "+server.socket_path)
+    sys.stdout.flush()
+
+    server.serve()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
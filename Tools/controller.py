@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Read Rate Controller for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Watches the read rate during a recovery, and decides when ddrescue should be restarted
+with different options because the throughput has collapsed. Each restart tries the
+next adjustment: reading from the other end of the disk, copying smaller clusters,
+telling ddrescue to skip areas slower than a minimum rate, and skipping further past
+errors. ddrescue carries on from the same map file each time. None of this uses wx.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import sys
+import time
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#The adjustments to try, in order, one per restart.
+ADJUSTMENTS = ("Reverse", "ClusterSize", "MinReadRate", "SkipSize")
+
+#The smallest cluster size (in sectors) we will go down to.
+MIN_CLUSTER_SIZE = 8
+
+#The slowest we will ask ddrescue to read at before skipping ahead, in bytes per second.
+MIN_READ_RATE = 65536
+
+#How far ddrescue should skip after a read error, in bytes, when we ask it to.
+SKIP_SIZE = 4194304
+
+def get_adjustment(name, settings, recovery):
+    """
+    Return the changes to settings for the named adjustment, and a description of them,
+    or (None, None) if the adjustment can't be made.
+    """
+
+    if name == "Reverse":
+        if settings["Reverse"] == "-R":
+            return {"Reverse": ""}, "read forwards"
+
+        return {"Reverse": "-R"}, "read backwards"
+
+    elif name == "ClusterSize":
+        cluster_size = int((settings["ClusterSize"] or "-c 128")[3:])
+
+        if cluster_size <= MIN_CLUSTER_SIZE:
+            return None, None
+
+        cluster_size = max(cluster_size // 2, MIN_CLUSTER_SIZE)
+
+        return ({"ClusterSize": "-c "+unicode(cluster_size)},
+                "copy "+unicode(cluster_size)+" sectors at a time")
+
+    elif name == "MinReadRate":
+        if settings["MinReadRate"] != "" or not recovery.average_read_rate:
+            return None, None
+
+        #Skip anything much slower than the disk has managed so far. The areas skipped
+        #are left for later.
+        min_read_rate = max(int(recovery.average_read_rate // 10), MIN_READ_RATE)
+
+        return ({"MinReadRate": "-a "+unicode(min_read_rate)},
+                "skip areas slower than "+unicode(min_read_rate)+" bytes/s")
+
+    elif name == "SkipSize":
+        #--skip-size was added in ddrescue 1.21.
+        if settings["SkipSize"] != "" or int(settings["DDRescueVersion"].split(".")[1]) < 21:
+            return None, None
+
+        return ({"SkipSize": "-K "+unicode(SKIP_SIZE)},
+                "skip "+unicode(SKIP_SIZE)+" bytes after a read error")
+
+    raise ValueError("Unknown adjustment: "+name)
+
+class RateController(object):
+    """
+    Decides when to restart ddrescue. The throughput has collapsed when the current read
+    rate stays below collapse_ratio times the best average rate seen, or nothing has been
+    read, for window seconds. New settings are always given window seconds to work before
+    they are judged. Gives up after max_restarts restarts. Every decision is logged and
+    kept in self.decisions, as (time, reason, changes, description).
+    """
+
+    def __init__(self, collapse_ratio=0.1, window=120, max_restarts=8):
+        """Initialise the controller"""
+        self.collapse_ratio = collapse_ratio
+        self.window = window
+        self.max_restarts = max_restarts
+
+        self.best_rate = 0
+        self.slow_since = None
+        self.next_adjustment = 0
+        self.restarts = 0
+        self.decisions = []
+
+    def reset(self):
+        """Forget what we know about the disk's speed (eg for a new stage)"""
+        self.best_rate = 0
+        self.slow_since = None
+
+    def check(self, settings, recovery, run_time):
+        """
+        Check the latest recovery information. run_time is how long ddrescue has been
+        running with settings. Returns the changes to make to settings before restarting
+        ddrescue, or None if it should be left alone.
+        """
+
+        if self.restarts >= self.max_restarts:
+            return None
+
+        if recovery.average_read_rate:
+            self.best_rate = max(self.best_rate, recovery.average_read_rate)
+
+        if run_time < self.window or recovery.current_read_rate is None:
+            return None
+
+        stalled = (recovery.time_since_last_read is not None
+                   and recovery.time_since_last_read >= self.window)
+
+        slow = recovery.current_read_rate < self.best_rate * self.collapse_ratio
+
+        if not stalled and not slow:
+            self.slow_since = None
+            return None
+
+        if self.slow_since is None:
+            self.slow_since = run_time
+
+        if not stalled and run_time - self.slow_since < self.window:
+            return None
+
+        if stalled:
+            reason = "nothing has been read for "+unicode(recovery.time_since_last_read)+" seconds"
+
+        else:
+            reason = ("the read rate fell to "+unicode(recovery.current_read_rate)+" bytes/s, "
+                      "from a best of "+unicode(self.best_rate)+" bytes/s")
+
+        return self.decide(settings, recovery, reason)
+
+    def decide(self, settings, recovery, reason):
+        """Pick the next adjustment that can be made, and record the decision"""
+        for number in range(len(ADJUSTMENTS)):
+            name = ADJUSTMENTS[(self.next_adjustment + number) % len(ADJUSTMENTS)]
+            changes, description = get_adjustment(name, settings, recovery)
+
+            if changes is not None:
+                self.next_adjustment = (self.next_adjustment + number + 1) % len(ADJUSTMENTS)
+                self.restarts += 1
+                self.slow_since = None
+
+                logger.info("RateController().decide(): Restarting ddrescue to "+description
+                            + ", because "+reason+" (restart "+unicode(self.restarts)+" of "
+                            + unicode(self.max_restarts)+")...")
+
+                self.decisions.append((time.time(), reason, changes, description))
+                return changes
+
+        logger.info("RateController().decide(): "+reason+", but there's nothing left to "
+                    "adjust. Leaving ddrescue alone...")
+
+        self.decisions.append((time.time(), reason, None, "leave ddrescue alone"))
+        self.restarts = self.max_restarts
+        return None
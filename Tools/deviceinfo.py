@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Device Information Format Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+The format run_getdevinfo.py uses to send the disk information back to the GUI.
+
+It is JSON lines, so the GUI can read each disk as soon as it arrives rather than waiting
+for (and then evaluating) one big dictionary. The first line is a header with the format's
+version, each disk is on a line of its own, and the last line holds the number of disks,
+so we can tell if the output was cut short:
+
+    {"format": "ddrescue-gui-deviceinfo", "version": 1}
+    {"device": "/dev/sda", "info": {"Name": "/dev/sda", "Type": "Device", ...}}
+    {"end": 1}
+
+DeviceInfoDecoder checks each disk's information against SCHEMA, so the rest of the GUI
+can rely on the fields it uses being there, with the right types. This file doesn't
+import anything from the rest of DDRescue-GUI, because run_getdevinfo.py imports it
+as root.
+"""
+
+#Do future imports to support python 2.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import json
+import logging
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+FORMAT_NAME = "ddrescue-gui-deviceinfo"
+FORMAT_VERSION = 1
+
+#The fields the GUI uses, with their types and the values to use if they are missing.
+#Any other fields getdevinfo gives us are passed on as they are.
+SCHEMA = {"Name": (unicode, "Unknown"), "Type": (unicode, "Unknown"),
+          "HostDevice": (unicode, "N/A"), "Vendor": (unicode, "Unknown"),
+          "Product": (unicode, "Unknown"), "Capacity": (unicode, "Unknown"),
+          "RawCapacity": (unicode, "Unknown"), "Description": (unicode, "N/A"),
+          "Partitions": (list, [])}
+
+def encode_header():
+    """Return the first line of the output"""
+    return json.dumps({"format": FORMAT_NAME, "version": FORMAT_VERSION}, sort_keys=True)
+
+def encode_device(name, info):
+    """Return the line for one disk. Values JSON can't hold are sent as strings"""
+    return json.dumps({"device": name, "info": info}, sort_keys=True, default=unicode)
+
+def encode_end(count):
+    """Return the last line of the output, given the number of disks that were sent"""
+    return json.dumps({"end": count})
+
+def encode(disk_info):
+    """Return getdevinfo's dictionary as a list of lines, in the order they are sent"""
+    return ([encode_header()]
+            + [encode_device(name, disk_info[name]) for name in sorted(disk_info)]
+            + [encode_end(len(disk_info))])
+
+def check_info(info):
+    """
+    Return a copy of one disk's information with the fields in SCHEMA present and of the
+    right types, converting them if we can, and using the defaults if not.
+    """
+
+    if not isinstance(info, dict):
+        info = {}
+
+    info = dict(info)
+
+    for field, (field_type, default) in SCHEMA.items():
+        value = info.get(field)
+
+        if value is None:
+            info[field] = type(default)(default)
+
+        elif field_type is list:
+            if isinstance(value, (list, tuple)):
+                info[field] = [unicode(item) for item in value]
+
+            else:
+                info[field] = type(default)(default)
+
+        elif not isinstance(value, unicode):
+            info[field] = unicode(value)
+
+    return info
+
+class DeviceInfoDecoder(object):
+    """
+    Reads run_getdevinfo.py's output a line at a time. Lines that aren't part of the
+    output (eg warnings from pkexec) are skipped.
+    """
+
+    def __init__(self):
+        """Initialise the decoder"""
+        self.devices = {}
+        self.version = None
+        self.finished = False
+
+    def feed(self, line):
+        """
+        Read a line of output. Returns the name and information of the disk in it, or None
+        if it didn't hold a disk.
+        """
+
+        try:
+            message = json.loads(line)
+
+        except ValueError:
+            message = None
+
+        if not isinstance(message, dict):
+            if line.strip():
+                logger.debug("DeviceInfoDecoder().feed(): Skipping line: "+line)
+
+            return None
+
+        if message.get("format") == FORMAT_NAME:
+            #A new header means the output was started again (eg after pkexec failed).
+            self.__init__()
+            self.version = message.get("version")
+
+            if self.version != FORMAT_VERSION:
+                logger.error("DeviceInfoDecoder().feed(): Unsupported format version "
+                             + unicode(self.version)+"! Ignoring the disk information...")
+
+            return None
+
+        if self.version != FORMAT_VERSION or self.finished:
+            return None
+
+        if "end" in message:
+            self.finished = message["end"] == len(self.devices)
+
+            if not self.finished:
+                logger.error("DeviceInfoDecoder().feed(): Expected "+unicode(message["end"])
+                             + " disks, but got "+unicode(len(self.devices))+"!")
+
+            return None
+
+        if not isinstance(message.get("device"), unicode):
+            return None
+
+        name = message["device"]
+        self.devices[name] = check_info(message.get("info"))
+
+        return name, self.devices[name]
+
+def decode(output):
+    """
+    Return the disk information in run_getdevinfo.py's output (a string), or None if the
+    output was incomplete.
+    """
+
+    decoder = DeviceInfoDecoder()
+
+    for line in output.split("\n"):
+        decoder.feed(line)
+
+    if not decoder.finished:
+        return None
+
+    return decoder.devices
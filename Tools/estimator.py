@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Estimator Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Estimates how long the current phase of a recovery will take. The average read rate
+over the whole recovery says little about how long trimming or scraping a failing disk
+will take, so the estimate uses an exponentially weighted moving average (EWMA) of how
+quickly work is being done in the current phase, and starts again when the phase changes.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import math
+import sys
+
+#Import tools modules.
+from . import metrics as Metrics
+from . import units as Units
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#The phases of a recovery, named after how ddrescue's status messages for them start.
+PHASES = ("Copying", "Trimming", "Scraping", "Splitting", "Retrying", "Finished")
+
+#How quickly (in seconds) older rates stop counting, how often to take a sample, and
+#how many samples are needed before giving an estimate.
+TIME_CONSTANT = 30
+INTERVAL = 1
+MIN_SAMPLES = 3
+
+def get_phase(status):
+    """Return the phase of the recovery ddrescue's status message is for, or None"""
+    for phase in PHASES:
+        if status.startswith(phase):
+            return phase
+
+    return None
+
+def get_progress(phase, values):
+    """
+    Return how much work has been done (in bytes, counting from any point), and how many
+    bytes are left to deal with in phase, from the latest values reported by ddrescue.
+    Returns (None, None) if we can't tell yet.
+
+    While copying, the work done is the data rescued plus the data found to be bad, as
+    ddrescue shows these most precisely. In the other phases, it is how much the areas
+    left to go over have shrunk. ddrescue 1.21+ says how much is left to copy, trim and
+    scrape. For older versions, we use the disk capacity and the error size.
+    """
+
+    try:
+        if phase == "Copying":
+            done = sum(values.get(name) or 0 for name in ("recovered_data", "error_size",
+                                                           "non_trimmed", "non_scraped"))
+
+            if values.get("non_tried") is not None:
+                return done, values["non_tried"]
+
+            return done, values["disk_capacity"] - done
+
+        elif phase == "Trimming" and values.get("non_trimmed") is not None:
+            left = values["non_trimmed"]
+
+        elif phase == "Scraping" and values.get("non_scraped") is not None:
+            left = values["non_scraped"]
+
+        else:
+            #Splitting, retrying, or an older version of ddrescue: the bad areas are left.
+            left = values["error_size"]
+
+        return -left, left
+
+    except (KeyError, TypeError):
+        return None, None
+
+def format_estimate(estimate):
+    """Format an estimate from ETAEstimator.estimate() for display"""
+    if estimate is None:
+        return "Unknown"
+
+    time_left, low, high = estimate
+
+    if high is None:
+        return Units.format_duration(time_left)+" (at least "+Units.format_duration(low)+")"
+
+    return (Units.format_duration(time_left)+" ("+Units.format_duration(low)+" to "
+            + Units.format_duration(high)+")")
+
+class ETAEstimator(object):
+    """
+    Estimates the time left in the current phase of a recovery. Call update() with each
+    set of values from Tools.DDRescueTools.parser.StatusParser, and sample() once per
+    status update.
+
+    The rate (bytes of work done per second) and its variance are both kept as EWMAs,
+    and the confidence interval is the time left at one standard deviation either side
+    of the average rate.
+    """
+
+    def __init__(self, time_constant=TIME_CONSTANT, interval=INTERVAL,
+                 min_samples=MIN_SAMPLES, clock=Metrics.get_time):
+        """Initialise the estimator"""
+        self.time_constant = time_constant
+        self.interval = interval
+        self.min_samples = min_samples
+        self.clock = clock
+
+        self.values = {}
+        self.phase = None
+        self.reset()
+
+    def reset(self):
+        """Forget the rates we've seen, eg when a new phase starts"""
+        self.last_time = None
+        self.last_work_done = None
+        self.work_left = None
+        self.rate = None
+        self.variance = 0
+        self.num_samples = 0
+
+    def update(self, values):
+        """Keep the latest values from ddrescue, and notice when the phase changes"""
+        self.values.update(values)
+
+        if "status" in values:
+            phase = get_phase(values["status"])
+
+            if phase is not None and phase != self.phase:
+                self.phase = phase
+                self.reset()
+
+    def sample(self):
+        """Work out the current rate, if it has been long enough since the last sample"""
+        now = self.clock()
+        work_done, work_left = get_progress(self.phase, self.values)
+
+        if work_left is None:
+            return
+
+        self.work_left = work_left
+
+        if self.last_time is None:
+            self.last_time = now
+            self.last_work_done = work_done
+            return
+
+        time_passed = now - self.last_time
+
+        if time_passed < self.interval:
+            return
+
+        rate = (work_done - self.last_work_done) / time_passed
+
+        self.last_time = now
+        self.last_work_done = work_done
+        self.num_samples += 1
+
+        if self.rate is None:
+            self.rate = rate
+            return
+
+        #Weight the new rate by how long it was measured over.
+        weight = 1 - math.exp(-time_passed / self.time_constant)
+        difference = rate - self.rate
+
+        self.rate += weight * difference
+        self.variance = (1 - weight) * (self.variance + weight * difference ** 2)
+
+    def estimate(self):
+        """
+        Return the estimated time left in the current phase, and the shortest and
+        longest it is likely to take (in seconds), or None if we can't tell. The longest
+        time is None if the work might not get done at all at the current rates.
+        """
+
+        if self.phase == "Finished":
+            return 0, 0, 0
+
+        if self.num_samples < self.min_samples or self.rate is None or self.rate <= 0:
+            return None
+
+        deviation = math.sqrt(self.variance)
+        low = self.work_left / (self.rate + deviation)
+
+        if self.rate - deviation > 0:
+            high = self.work_left / (self.rate - deviation)
+
+        else:
+            high = None
+
+        return self.work_left / self.rate, low, high
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Exporter Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Serves the live state of running recoveries over HTTP in the OpenMetrics (Prometheus)
+text format, so they can be watched from a monitoring system like Grafana.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import sys
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+except ImportError:
+    #Python 2.
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#The port to serve the metrics on if none is given.
+DEFAULT_PORT = 9776
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+#The metrics we serve for each recovery: name, type, unit, help text, and the
+#Recovery attribute the value comes from.
+METRICS = (("ddrescue_disk_capacity_bytes", "gauge", "bytes",
+            "Size of the input file or disk.", "disk_capacity"),
+           ("ddrescue_rescued_bytes", "gauge", "bytes", "Data recovered so far.",
+            "recovered_data"),
+           ("ddrescue_error_size_bytes", "gauge", "bytes",
+            "Size of the areas that couldn't be read.", "error_size"),
+           ("ddrescue_bad_areas", "gauge", "", "Number of areas that couldn't be read.",
+            "num_errors"),
+           ("ddrescue_read_errors", "counter", "",
+            "Number of failed reads (ddrescue 1.22 - 1.23 only).", "read_errors"),
+           ("ddrescue_current_read_rate", "gauge", "", "Current read rate in bytes per second.",
+            "current_read_rate"),
+           ("ddrescue_average_read_rate", "gauge", "", "Average read rate in bytes per second.",
+            "average_read_rate"),
+           ("ddrescue_input_position_bytes", "gauge", "bytes",
+            "Position ddrescue is reading from.", "input_pos"),
+           ("ddrescue_time_since_last_read_seconds", "gauge", "seconds",
+            "Time since ddrescue last read any data successfully.", "time_since_last_read"))
+
+def escape_label(value):
+    """Escape a label value for the OpenMetrics text format"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def get_labels(recovery):
+    """Return the labels that identify recovery, formatted for the OpenMetrics text format"""
+    return ",".join(name+"=\""+escape_label(recovery.settings[setting])+"\"" for name, setting
+                    in (("input", "InputFile"), ("output", "OutputFile"), ("map", "MapFile")))
+
+def render(recoveries):
+    """Return the metrics for recoveries (a list of Tools.recovery.Recovery) as text"""
+    lines = []
+    labels = [get_labels(recovery) for recovery in recoveries]
+
+    lines.append("# TYPE ddrescue_recovery info")
+    lines.append("# HELP ddrescue_recovery What ddrescue is doing.")
+
+    for recovery, recovery_labels in zip(recoveries, labels):
+        lines.append("ddrescue_recovery_info{"+recovery_labels+",status=\""
+                     + escape_label(recovery.old_status)+"\"} 1")
+
+    for name, metric_type, unit, help_text, attribute in METRICS:
+        lines.append("# TYPE "+name+" "+metric_type)
+
+        if unit:
+            lines.append("# UNIT "+name+" "+unit)
+
+        lines.append("# HELP "+name+" "+help_text)
+
+        if metric_type == "counter":
+            name += "_total"
+
+        for recovery, recovery_labels in zip(recoveries, labels):
+            value = getattr(recovery, attribute)
+
+            #Leave out values ddrescue hasn't told us yet.
+            if value is not None:
+                lines.append(name+"{"+recovery_labels+"} "+unicode(value))
+
+    lines.append("# EOF")
+
+    return "\n".join(lines)+"\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics for a MetricsExporter"""
+
+    def do_GET(self): #pylint: disable=invalid-name
+        """Send the metrics, or a 404 error for any other path"""
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = render(self.server.exporter.get_recoveries()).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", unicode(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): #pylint: disable=redefined-builtin
+        """Log requests to our log file rather than stderr"""
+        logger.debug("MetricsHandler(): "+self.address_string()+": "+(format % args))
+
+class MetricsExporter(object):
+    """
+    Serves the metrics of running recoveries at http://address/metrics.
+
+    Recoveries are found by calling each source added with add_source(), which must
+    return a list of the Tools.recovery.Recovery objects that are running.
+    """
+
+    def __init__(self, address=("", DEFAULT_PORT)):
+        """Initialise the exporter"""
+        self.address = address
+        self.sources = []
+        self.server = None
+        self.thread = None
+
+    def add_source(self, source):
+        """Add a function that returns running recoveries"""
+        self.sources.append(source)
+
+    def get_recoveries(self):
+        """Return all of the running recoveries"""
+        recoveries = []
+
+        for source in self.sources:
+            recoveries.extend(source())
+
+        return recoveries
+
+    def start(self):
+        """Start serving the metrics in a background thread"""
+        self.server = HTTPServer(self.address, MetricsHandler)
+        self.server.exporter = self
+
+        logger.info("MetricsExporter().start(): Serving metrics on port "
+                    + unicode(self.server.server_address[1])+"...")
+
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop serving the metrics"""
+        if self.server is None:
+            return
+
+        logger.info("MetricsExporter().stop(): Stopping serving metrics...")
+
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        self.server = None
+        self.thread = None
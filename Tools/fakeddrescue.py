@@ -0,0 +1,749 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Fake ddrescue for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+A stand-in for GNU ddrescue, for testing the recovery pipeline without root or a failing
+disk. It copies a fake device (usually a sparse file, see create_device()) to the output
+file, keeping a real map file, and shows the banner and status output of whichever
+version of ddrescue it is pretending to be. It is started with the same options as
+ddrescue, so it is set up with these environment variables:
+
+    FAKE_DDRESCUE_VERSION       The version of ddrescue to pretend to be. Default: 1.23.
+    FAKE_DDRESCUE_SIZE          The size of the fake device, in bytes. The input file is
+                                created as a sparse file of this size if it doesn't exist.
+    FAKE_DDRESCUE_ERRORS        The bad areas of the device, as POS:SIZE[:READS],... in
+                                bytes. Each sector in an area fails READS times before it
+                                can be read, or every time if READS isn't given.
+    FAKE_DDRESCUE_RATE          How fast the device reads, in bytes per second.
+                                Default: as fast as possible.
+    FAKE_DDRESCUE_ERROR_DELAY   How long each failed read takes, in seconds. Default: 0.
+
+The GUI and the headless mode can be pointed at it with the DDRESCUE_GUI_DDRESCUE
+environment variable (see Tools.recovery.get_ddrescue_override()). The -b, -c, -n, -N,
+-r, -R and -s options are honoured, and ddrescue's other options are ignored.
+"""
+
+#Do future imports to support python 2.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import os
+import signal
+import sys
+import time
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+DEFAULT_VERSION = "1.23"
+SECTOR_SIZE = 512
+CLUSTER_SIZE = 128
+
+#How often to redraw the status, and save the map file, in seconds.
+UPDATE_INTERVAL = 1
+
+#The layout of the status for each version of ddrescue.
+STATUS_1_14 = ("rescued: {rescued},  errsize: {error_size},  current rate: {current_rate}\n"
+               "   ipos: {ipos},   errors: {errors},    average rate: {average_rate}\n"
+               "   opos: {opos},     time since last successful read: {last_read}\n")
+
+STATUS_1_18 = ("rescued: {rescued},  errsize: {error_size},  current rate: {current_rate}\n"
+               "   ipos: {ipos},   errors: {errors},    average rate: {average_rate}\n"
+               "   opos: {opos}, run time: {run_time},  successful read: {last_read} ago\n")
+
+STATUS_1_21 = ("     ipos: {ipos}, non-trimmed: {non_trimmed},  current rate: {current_rate}\n"
+               "     opos: {opos}, non-scraped: {non_scraped},  average rate: {average_rate}\n"
+               "non-tried: {non_tried},     errsize: {error_size},      run time: {run_time}\n"
+               "  rescued: {rescued},      errors: {errors},  remaining time: {remaining}\n"
+               "percent rescued: {percent}%      time since last successful read: {last_read}\n")
+
+STATUS_1_22 = ("     ipos: {ipos}, non-trimmed: {non_trimmed},  current rate: {current_rate}\n"
+               "     opos: {opos}, non-scraped: {non_scraped},  average rate: {average_rate}\n"
+               "non-tried: {non_tried},  bad-sector: {error_size},    error rate: {error_rate}\n"
+               "  rescued: {rescued},   bad areas: {errors},        run time: {run_time}\n"
+               "pct rescued: {percent}%, read errors: {read_errors},  remaining time: {remaining}\n"
+               "                              time since last successful read: {last_read}\n")
+
+#The status of a block for each phase, and for a finished recovery.
+PHASE_STATUSES = {"copying": "?", "trimming": "*", "scraping": "/", "retrying": "-",
+                  "finished": "+"}
+
+def get_minor_version(version):
+    """Return the minor version of a version of ddrescue (eg 22 for 1.22)"""
+    return int(version.split(".")[1])
+
+def get_status_layout(version):
+    """Return the status layout for the given version of ddrescue"""
+    minor_version = get_minor_version(version)
+
+    if minor_version < 18:
+        return STATUS_1_14
+
+    elif minor_version < 21:
+        return STATUS_1_18
+
+    elif minor_version == 21:
+        return STATUS_1_21
+
+    return STATUS_1_22
+
+def get_phase_message(phase, version, reverse=False, number=1):
+    """Return ddrescue's status message for a phase, and pass or retry number"""
+    if phase == "finished":
+        return "Finished"
+
+    minor_version = get_minor_version(version)
+    direction = " (backwards)" if reverse else " (forwards)"
+
+    if phase == "copying":
+        if minor_version < 18:
+            return "Copying non-tried blocks..."
+
+        return "Copying non-tried blocks... Pass "+unicode(number)+direction
+
+    elif phase == "trimming":
+        if minor_version < 18:
+            return "Trimming failed blocks..."
+
+        return "Trimming failed blocks..."+direction
+
+    elif phase == "scraping":
+        if minor_version < 18:
+            return "Splitting failed blocks..."
+
+        return "Scraping failed blocks..."+direction
+
+    if minor_version < 18:
+        return "Retrying bad sectors... Retry "+unicode(number)
+
+    return "Retrying bad sectors... Retry "+unicode(number)+direction
+
+def format_size(num_bytes, unit="B"):
+    """Format a size like ddrescue does (eg "12345 MB")"""
+    prefixes = ["", "k", "M", "G", "T", "P", "E"]
+    power = 0
+
+    while num_bytes // 1000**power >= 100000:
+        power += 1
+
+    return unicode(num_bytes // 1000**power)+" "+prefixes[power]+unit
+
+def format_time(seconds, version):
+    """Format a time like ddrescue does, or "n/a" if seconds is None"""
+    if seconds is None:
+        return "n/a"
+
+    seconds = int(seconds)
+
+    if get_minor_version(version) < 21:
+        return unicode(seconds)+" s"
+
+    elif seconds < 60:
+        return unicode(seconds)+"s"
+
+    elif seconds < 3600:
+        return unicode(seconds // 60)+"m "+unicode(seconds % 60)+"s"
+
+    elif seconds < 86400:
+        return unicode(seconds // 3600)+"h "+unicode(seconds % 3600 // 60)+"m"
+
+    return unicode(seconds // 86400)+"d "+unicode(seconds % 86400 // 3600)+"h"
+
+def parse_errors(text):
+    """
+    Parse the bad areas in FAKE_DDRESCUE_ERRORS. Returns a list of [pos, size, reads],
+    where reads is None for areas that can never be read.
+    """
+
+    areas = []
+
+    for area in text.split(","):
+        if area.strip() == "":
+            continue
+
+        fields = [int(field, 0) for field in area.split(":")]
+
+        if len(fields) == 2:
+            fields.append(None)
+
+        elif len(fields) != 3:
+            raise ValueError("Bad area: "+area)
+
+        areas.append(fields)
+
+    return areas
+
+def parse_options(args):
+    """
+    Parse ddrescue's options. Options and their values can be separate arguments or one
+    argument (the GUI passes eg "-r 2"). Returns a dictionary of options, and a list of
+    the other arguments.
+    """
+
+    options = {}
+    arguments = []
+    with_values = "abcefiKmoOrsTxZ"
+    args = list(args)
+
+    while args:
+        arg = args.pop(0)
+
+        if arg.startswith("--"):
+            options[arg] = ""
+
+        elif arg.startswith("-") and len(arg) > 1:
+            option, value = arg[1], arg[2:].strip()
+
+            if option in with_values and value == "" and args:
+                value = args.pop(0)
+
+            options[option] = value
+
+        else:
+            arguments.append(arg)
+
+    return options, arguments
+
+def create_device(path, size):
+    """Create a sparse file to use as a fake device"""
+    with open(path, "wb") as device_file:
+        device_file.truncate(size)
+
+class Map(object):
+    """
+    The blocks of a map file, as a sorted list of [pos, size, status], with the current
+    position, phase and pass.
+    """
+
+    def __init__(self, size):
+        """Initialise a map with the whole rescue domain non-tried"""
+        self.size = size
+        self.blocks = [[0, size, "?"]]
+        self.current_pos = 0
+        self.current_status = "?"
+        self.current_pass = 1
+
+    def load(self, path):
+        """Read an existing map file, if there is one. Returns whether there was"""
+        try:
+            with open(path, "r") as map_file:
+                lines = [line.split() for line in map_file
+                         if line.strip() != "" and not line.startswith("#")]
+
+        except (IOError, OSError):
+            return False
+
+        if not lines:
+            return False
+
+        current = lines.pop(0)
+        self.current_pos = int(current[0], 0)
+        self.current_status = current[1]
+
+        if len(current) > 2:
+            self.current_pass = int(current[2])
+
+        for line in lines:
+            self.set_status(int(line[0], 0), int(line[1], 0), line[2])
+
+        return True
+
+    def save(self, path, version, command_line, start_time, message):
+        """Write the map file, in the format the given version of ddrescue uses"""
+        if get_minor_version(version) < 20:
+            lines = ["# Rescue Logfile. Created by GNU ddrescue version "+version,
+                     "# Command line: "+command_line]
+
+        else:
+            lines = ["# Mapfile. Created by GNU ddrescue version "+version,
+                     "# Command line: "+command_line,
+                     "# Start time:   "+start_time,
+                     "# Current time: "+time.strftime("%Y-%m-%d %H:%M:%S")]
+
+        lines.append("# "+message)
+
+        if get_minor_version(version) < 20:
+            lines.append("# current_pos  current_status")
+            lines.append("0x%08X     %s" % (self.current_pos, self.current_status))
+
+        else:
+            lines.append("# current_pos  current_status  current_pass")
+            lines.append("0x%08X     %s               %d" % (self.current_pos,
+                                                             self.current_status,
+                                                             self.current_pass))
+
+        lines.append("#      pos        size  status")
+
+        for pos, size, status in self.blocks:
+            lines.append("0x%08X  0x%08X  %s" % (pos, size, status))
+
+        with open(path, "w") as map_file:
+            map_file.write("\n".join(lines)+"\n")
+
+    def set_status(self, pos, size, status):
+        """Set the status of an area, merging it with its neighbours where they match"""
+        end = min(pos + size, self.size)
+
+        if end <= pos:
+            return
+
+        blocks = []
+
+        for block in self.blocks:
+            block_pos, block_size, block_status = block
+            block_end = block_pos + block_size
+
+            if block_end <= pos or block_pos >= end:
+                blocks.append(block)
+                continue
+
+            if block_pos < pos:
+                blocks.append([block_pos, pos - block_pos, block_status])
+
+            if block_pos <= pos:
+                blocks.append([pos, end - pos, status])
+
+            if block_end > end:
+                blocks.append([end, block_end - end, block_status])
+
+        #Join neighbours with the same status.
+        self.blocks = []
+
+        for block in blocks:
+            if self.blocks and self.blocks[-1][2] == block[2]:
+                self.blocks[-1][1] += block[1]
+
+            else:
+                self.blocks.append(block)
+
+    def get_areas(self, statuses):
+        """Return a list of (pos, size) of the blocks with any of the given statuses"""
+        return [(pos, size) for pos, size, status in self.blocks if status in statuses]
+
+    def get_sizes(self):
+        """Return a dictionary of the number of bytes in each status"""
+        sizes = dict((status, 0) for status in "?*/-+")
+
+        for pos, size, status in self.blocks: #pylint: disable=unused-variable
+            sizes[status] += size
+
+        return sizes
+
+    def count_areas(self, statuses):
+        """Return the number of blocks with any of the given statuses"""
+        return len(self.get_areas(statuses))
+
+class Device(object):
+    """
+    The fake device. Reads from the input file, failing in the bad areas, at the rate
+    read_rate (in bytes per second, or as fast as possible if None).
+    """
+
+    def __init__(self, path, errors, sector_size, read_rate=None, error_delay=0):
+        """Open the input file"""
+        self.input_file = open(path, "rb")
+        self.errors = errors
+        self.sector_size = sector_size
+        self.read_rate = read_rate
+        self.error_delay = error_delay
+
+        #How many times each sector in an area that can be read eventually has failed.
+        self.failures = {}
+
+        #When the device will have finished the reads so far, at its read rate.
+        self.busy_until = time.time()
+
+    def close(self):
+        """Close the input file"""
+        self.input_file.close()
+
+    def fails(self, pos, size):
+        """Return whether reading size bytes at pos fails, counting the failure"""
+        failed = False
+
+        for error_pos, error_size, reads in self.errors:
+            if error_pos >= pos + size or error_pos + error_size <= pos:
+                continue
+
+            if reads is None:
+                failed = True
+                continue
+
+            #Count a failure for each sector of the area that is being read.
+            first = max(pos, error_pos) // self.sector_size
+            last = (min(pos + size, error_pos + error_size) - 1) // self.sector_size
+
+            for sector in range(first, last + 1):
+                if self.failures.get(sector, 0) < reads:
+                    self.failures[sector] = self.failures.get(sector, 0) + 1
+                    failed = True
+
+        return failed
+
+    def wait(self, seconds):
+        """Take as long as the device would to do the read"""
+        self.busy_until = max(self.busy_until, time.time()) + seconds
+        delay = self.busy_until - time.time()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def read(self, pos, size):
+        """Read size bytes at pos. Returns the data, or None if the read failed"""
+        if self.fails(pos, size):
+            self.wait(self.error_delay)
+            return None
+
+        if self.read_rate:
+            self.wait(size / self.read_rate)
+
+        self.input_file.seek(pos)
+        data = self.input_file.read(size)
+
+        #Sparse files and devices are padded to the size of the rescue domain.
+        return data + b"\0" * (size - len(data))
+
+class FakeDDRescue(object): #pylint: disable=too-many-instance-attributes
+    """Runs a fake recovery, like ddrescue would"""
+
+    def __init__(self, version, options, input_path, output_path, map_path, device):
+        """Initialise the recovery"""
+        self.version = version
+        self.input_path = input_path
+        self.output_path = output_path
+        self.map_path = map_path
+        self.device = device
+
+        self.sector_size = device.sector_size
+        self.cluster_size = int(options.get("c", CLUSTER_SIZE)) * self.sector_size
+        self.reverse = "R" in options
+        self.no_trim = "N" in options
+        self.no_scrape = "n" in options
+        self.retries = int(options.get("r", 0))
+
+        if "s" in options:
+            size = int(options["s"], 0)
+
+        else:
+            size = get_size(input_path)
+
+        self.map = Map(size)
+        self.resumed = self.map.load(map_path)
+        self.command_line = " ".join(["ddrescue"] + sys.argv[1:])
+
+        if os.path.exists(output_path):
+            self.output_file = open(output_path, "r+b")
+
+        else:
+            self.output_file = open(output_path, "w+b")
+
+        self.layout = get_status_layout(version)
+        self.message = ""
+        self.drawn = False
+
+        self.start_time = time.time()
+        self.start_time_text = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.last_update = self.start_time
+        self.last_read = None
+        self.read_this_run = 0
+        self.read_since_update = 0
+        self.errors_since_update = 0
+        self.read_errors = 0
+
+    def write(self, text):
+        """Write to stdout straight away, as ddrescue's output is usually a pipe"""
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def show_banner(self):
+        """Show what ddrescue shows before it starts"""
+        self.write("GNU ddrescue "+self.version+"\n")
+        self.write("About to copy "+format_size(self.map.size, unit="Bytes")+" from "
+                   + self.input_path+" to "+self.output_path+"\n")
+
+        self.write("    Starting positions: infile = 0 B,  outfile = 0 B\n")
+        self.write("    Copy block size: "+unicode(self.cluster_size // self.sector_size)
+                   + " sectors       Initial skip size: "
+                   + unicode(self.cluster_size // self.sector_size)+" sectors\n")
+
+        self.write("Sector size: "+unicode(self.sector_size)+" Bytes\n\n")
+        self.write("Press Ctrl-C to interrupt\n")
+
+    def get_fields(self):
+        """Return the values to fill in the status layout with"""
+        now = time.time()
+        run_time = now - self.start_time
+        since_update = now - self.last_update
+        sizes = self.map.get_sizes()
+        pos = self.map.current_pos
+
+        if get_minor_version(self.version) < 21:
+            error_size = sizes["*"] + sizes["/"] + sizes["-"]
+            errors = self.map.count_areas("*/-")
+
+        else:
+            error_size = sizes["-"]
+            errors = self.map.count_areas("-")
+
+        fields = {"ipos": format_size(pos), "opos": format_size(pos),
+                  "rescued": format_size(sizes["+"]), "error_size": format_size(error_size),
+                  "non_tried": format_size(sizes["?"]), "non_trimmed": format_size(sizes["*"]),
+                  "non_scraped": format_size(sizes["/"]), "errors": unicode(errors),
+                  "read_errors": unicode(self.read_errors),
+                  "run_time": format_time(run_time, self.version)}
+
+        current_rate = average_rate = error_rate = 0
+
+        if since_update > 0:
+            current_rate = int(self.read_since_update / since_update)
+            error_rate = int(self.errors_since_update / since_update)
+
+        if run_time > 0:
+            average_rate = int(self.read_this_run / run_time)
+
+        fields["current_rate"] = format_size(current_rate)+"/s"
+        fields["average_rate"] = format_size(average_rate)+"/s"
+        fields["error_rate"] = format_size(error_rate)+"/s"
+
+        fields["remaining"] = "n/a"
+
+        if average_rate > 0:
+            fields["remaining"] = format_time(sizes["?"] // average_rate, self.version)
+
+        fields["last_read"] = "n/a"
+
+        if self.last_read is not None:
+            fields["last_read"] = format_time(now - self.last_read, self.version)
+
+        fields["percent"] = "%.2f" % (sizes["+"] * 100 / max(self.map.size, 1))
+
+        return fields
+
+    def show_status(self, message=None):
+        """Redraw the status, with a new status message if one is given, and save the map"""
+        if self.drawn:
+            #Go back to the start of the status, and redraw it.
+            self.write("\r"+"\x1b[A" * self.layout.count("\n"))
+
+        if message is not None:
+            #Pad the message to cover the last one.
+            message = message.ljust(len(self.message))
+            self.message = message.strip()
+
+        else:
+            message = self.message
+
+        self.write(self.layout.format(**self.get_fields())+message)
+        self.drawn = True
+
+        self.last_update = time.time()
+        self.read_since_update = self.errors_since_update = 0
+
+        self.map.save(self.map_path, self.version, self.command_line, self.start_time_text,
+                      self.message)
+
+    def update(self):
+        """Redraw the status if it's time to"""
+        if time.time() - self.last_update >= UPDATE_INTERVAL:
+            self.show_status()
+
+    def read(self, pos, size, good_status, bad_status):
+        """
+        Read an area, and mark it in the map with good_status if it could be read, or
+        bad_status if it couldn't. Returns whether the read worked.
+        """
+
+        self.map.current_pos = pos
+        data = self.device.read(pos, size)
+
+        if data is None:
+            self.map.set_status(pos, size, bad_status)
+            self.read_errors += 1
+            self.errors_since_update += size
+
+        else:
+            self.output_file.seek(pos)
+            self.output_file.write(data)
+            self.map.set_status(pos, size, good_status)
+
+            self.last_read = time.time()
+            self.read_this_run += size
+            self.read_since_update += size
+
+        self.update()
+
+        return data is not None
+
+    def get_chunks(self, pos, size, chunk_size):
+        """Return the (pos, size) of each chunk of an area, in the order to read them"""
+        chunks = [(chunk_pos, min(chunk_size, pos + size - chunk_pos))
+                  for chunk_pos in range(pos, pos + size, chunk_size)]
+
+        if self.reverse:
+            chunks.reverse()
+
+        return chunks
+
+    def start_phase(self, phase, number=1):
+        """Record the phase in the map, and show its status message"""
+        self.map.current_status = PHASE_STATUSES[phase]
+        self.map.current_pass = number
+
+        self.show_status(get_phase_message(phase, self.version, self.reverse, number))
+
+    def copy(self):
+        """Copy the non-tried areas a cluster at a time, marking failed ones non-trimmed"""
+        areas = self.map.get_areas("?")
+
+        if self.reverse:
+            areas.reverse()
+
+        for pos, size in areas:
+            for chunk_pos, chunk_size in self.get_chunks(pos, size, self.cluster_size):
+                self.read(chunk_pos, chunk_size, "+", "*")
+
+    def trim(self):
+        """
+        Read the non-trimmed areas a sector at a time from both ends, up to the first
+        bad sector, marking the rest non-scraped
+        """
+
+        for pos, size in self.map.get_areas("*"):
+            sectors = self.get_chunks(pos, size, self.sector_size)
+            trimmed = set()
+
+            for ends in (sectors, sectors[::-1]):
+                for sector_pos, sector_size in ends:
+                    if (sector_pos, sector_size) in trimmed:
+                        break
+
+                    trimmed.add((sector_pos, sector_size))
+
+                    if not self.read(sector_pos, sector_size, "+", "-"):
+                        break
+
+            for sector_pos, sector_size in sectors:
+                if (sector_pos, sector_size) not in trimmed:
+                    self.map.set_status(sector_pos, sector_size, "/")
+
+    def scrape(self, statuses):
+        """Read the areas with the given statuses a sector at a time"""
+        for pos, size in self.map.get_areas(statuses):
+            for sector_pos, sector_size in self.get_chunks(pos, size, self.sector_size):
+                self.read(sector_pos, sector_size, "+", "-")
+
+    def run(self):
+        """Run the recovery"""
+        self.show_banner()
+
+        if self.map.get_areas("?"):
+            self.start_phase("copying")
+            self.copy()
+
+        if not self.no_trim and self.map.get_areas("*"):
+            self.start_phase("trimming")
+            self.trim()
+
+        #Without trimming, the non-trimmed areas are scraped.
+        statuses = "/" if not self.no_trim else "*/"
+
+        if not self.no_scrape and self.map.get_areas(statuses):
+            self.start_phase("scraping")
+            self.scrape(statuses)
+
+        retry = 1
+
+        while self.map.get_areas("-") and (self.retries < 0 or retry <= self.retries):
+            self.start_phase("retrying", retry)
+            self.scrape("-")
+            retry += 1
+
+        self.finish("finished")
+
+    def finish(self, phase):
+        """Show the final status, and save the map. phase is "finished" or "interrupted\""""
+        if phase == "finished":
+            self.map.current_status = PHASE_STATUSES["finished"]
+            self.map.current_pass = 1
+            self.show_status("Finished")
+
+        else:
+            self.show_status("Interrupted by user")
+
+        self.write("\n")
+        self.output_file.close()
+        self.device.close()
+
+def get_size(path):
+    """Return the size of a file or device"""
+    with open(path, "rb") as device_file:
+        device_file.seek(0, 2)
+        return device_file.tell()
+
+def main(args):
+    """Run the fake ddrescue with the given arguments, and return the exit status"""
+    version = os.environ.get("FAKE_DDRESCUE_VERSION", DEFAULT_VERSION)
+    options, arguments = parse_options(args)
+
+    if "--version" in options or "V" in options:
+        print("GNU ddrescue "+version)
+        print("License GPLv2+: GNU GPL version 2 or later <http://gnu.org/licenses/gpl.html>")
+        print("This is free software: you are free to change and redistribute it.")
+        print("There is NO WARRANTY, to the extent permitted by law.")
+        return 0
+
+    if len(arguments) != 3:
+        sys.stderr.write("ddrescue: Both input and output files must be specified.\n")
+        return 1
+
+    input_path, output_path, map_path = arguments
+
+    if "FAKE_DDRESCUE_SIZE" in os.environ and not os.path.exists(input_path):
+        create_device(input_path, int(os.environ["FAKE_DDRESCUE_SIZE"], 0))
+
+    read_rate = float(os.environ.get("FAKE_DDRESCUE_RATE", 0)) or None
+
+    try:
+        device = Device(input_path, parse_errors(os.environ.get("FAKE_DDRESCUE_ERRORS", "")),
+                        int(options.get("b", SECTOR_SIZE)), read_rate=read_rate,
+                        error_delay=float(os.environ.get("FAKE_DDRESCUE_ERROR_DELAY", 0)))
+
+    except (IOError, OSError) as error:
+        sys.stderr.write("ddrescue: Can't open input file: "+unicode(error.strerror)+"\n")
+        return 1
+
+    recovery = FakeDDRescue(version, options, input_path, output_path, map_path, device)
+
+    try:
+        recovery.run()
+
+    except KeyboardInterrupt:
+        recovery.finish("interrupted")
+
+        #Like ddrescue, exit with the status of the signal.
+        return 128 + signal.SIGINT
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
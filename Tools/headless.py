@@ -0,0 +1,568 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Headless Mode for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Runs recoveries without the GUI (DDRescue_GUI.py --headless), reporting progress as
+text or JSON lines on stdout, or as JSON lines to a socket. Several disks can be
+recovered at once with --job, using a Tools.scheduler.Scheduler, and progress can be
+served for Prometheus with --exporter. wx is never imported, so this works on machines
+without a display, and starts quickly.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import getopt
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+#Import tools modules.
+from . import estimator as Estimator
+from . import exporter as Exporter
+from . import journal as Journal
+from . import recovery as Recovery
+from . import scheduler as Scheduler
+from . import snapshot as Snapshot
+from . import strategy as Strategy
+from . import units as Units
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+def usage():
+    """
+    Outputs information on cmdline options for the user.
+    """
+
+    print("\nUsage: DDRescue-GUI.py --headless [OPTION]... INPUT OUTPUT MAPFILE")
+    print("   or: DDRescue-GUI.py --headless [OPTION]... --job=INPUT:OUTPUT:MAPFILE...\n\n")
+    print("Options:\n")
+    print("       -h, --help:                   Show this help message")
+    print("       -f, --format=FORMAT:          Report progress as \"text\" (the default) or")
+    print("                                     \"json\" (one JSON object per line).")
+    print("       -s, --socket=HOST:PORT:       Send JSON lines to HOST:PORT instead of stdout.")
+    print("       -i, --interval=SECONDS:       How often to report progress. Default: 1.")
+    print("           --ddrescue=PATH:          The ddrescue to run. Default: ddrescue, or")
+    print("                                     $DDRESCUE_GUI_DDRESCUE if it is set.")
+    print("           --exporter=[HOST:]PORT:   Serve the recoveries' progress for Prometheus")
+    print("                                     at http://HOST:PORT/metrics.")
+    print("           --job=INPUT:OUTPUT:MAPFILE:")
+    print("                                     Add a recovery. Can be given more than once.")
+    print("           --max-jobs=N:             How many recoveries to run at once. Disks on")
+    print("                                     the same bus are never recovered together.")
+    print("                                     Default: 2.")
+    print("           --journal=PATH:           Keep the queue of jobs in a journal at PATH, so")
+    print("                                     it can be resumed after a crash or reboot.")
+    print("           --resume:                 Restart the jobs in the journal that didn't")
+    print("                                     finish. Uses the GUI's journal if --journal")
+    print("                                     isn't given.")
+    print("           --strategy=NAME:          Recover in several passes. NAME can be:")
+
+    for name in sorted(Strategy.STRATEGIES):
+        print("                                     "+name+": "
+              + Strategy.STRATEGY_DESCRIPTIONS[name])
+
+    print("           --adaptive:               Restart ddrescue with adjusted settings if the")
+    print("                                     read rate collapses.")
+    print("           --no-direct:              Don't use direct disk access.")
+    print("           --overwrite:              Overwrite the output file (ddrescue -f).")
+    print("           --reverse:                Read the disk backwards (ddrescue -R).")
+    print("           --preallocate:            Preallocate the output file (ddrescue -p).")
+    print("           --no-split:               Don't split failed blocks (ddrescue -n).")
+    print("           --retries=N:              Retry bad sectors N times (-1 for forever).")
+    print("                                     Default: 2.")
+    print("           --max-errors=N:           Stop after N errors (ddrescue -e).")
+    print("           --cluster-size=N:         Sectors to copy at a time. Default: 128.")
+    print("           --no-transcript:          Don't save ddrescue's output next to the map file.")
+    print("           --compress-transcript:    Compress the saved output with gzip.")
+    print("           --no-metrics:             Don't save the recovery's statistics over time")
+    print("                                     next to the map file.\n")
+
+def get_settings(options, arguments):
+    """
+    Return the settings for a recovery from the options and arguments given to getopt,
+    in the same form as the GUI's SETTINGS. Raises ValueError if they are invalid.
+    """
+
+    jobs = []
+
+    if len(arguments) == 3:
+        jobs.append(tuple(arguments))
+
+    elif arguments:
+        raise ValueError("INPUT, OUTPUT and MAPFILE must be given.")
+
+    for option, value in options:
+        if option == "--job":
+            if len(value.split(":")) != 3:
+                raise ValueError("Jobs must be given as INPUT:OUTPUT:MAPFILE.")
+
+            jobs.append(tuple(value.split(":")))
+
+    resume = ("--resume", "") in options
+
+    if not jobs and not resume:
+        raise ValueError("INPUT, OUTPUT and MAPFILE must be given.")
+
+    settings = dict(Recovery.DEFAULT_OPTIONS)
+
+    if jobs:
+        settings["InputFile"], settings["OutputFile"], settings["MapFile"] = jobs[0]
+
+    settings["Jobs"] = jobs
+    settings["MaxJobs"] = 2
+    settings["Resume"] = resume
+    settings["Journal"] = None
+    settings["Strategy"] = ""
+    settings["AdaptiveControl"] = False
+    settings["SaveTranscript"] = True
+    settings["CompressTranscript"] = False
+    settings["SaveMetrics"] = True
+
+    #Report as text to stdout, every second, by default.
+    settings["Format"] = "text"
+    settings["Socket"] = None
+    settings["Interval"] = 1
+    settings["DDRescue"] = Recovery.get_ddrescue_override() or "ddrescue"
+    settings["Exporter"] = None
+
+    switches = {"--no-direct": ("DirectAccess", ""), "--overwrite": ("OverwriteOutputFile", "-f"),
+                "--reverse": ("Reverse", "-R"), "--preallocate": ("Preallocate", "-p"),
+                "--no-split": ("NoSplit", "-n"), "--no-transcript": ("SaveTranscript", False),
+                "--compress-transcript": ("CompressTranscript", True),
+                "--no-metrics": ("SaveMetrics", False),
+                "--adaptive": ("AdaptiveControl", True)}
+
+    numbers = {"--retries": ("BadSectorRetries", "-r "), "--max-errors": ("MaxErrors", "-e "),
+               "--cluster-size": ("ClusterSize", "-c ")}
+
+    for option, value in options:
+        if option in switches:
+            settings[switches[option][0]] = switches[option][1]
+
+        elif option in numbers:
+            settings[numbers[option][0]] = numbers[option][1]+unicode(int(value))
+
+        elif option in ["-f", "--format"]:
+            if value not in ("text", "json"):
+                raise ValueError("Unknown format: "+value)
+
+            settings["Format"] = value
+
+        elif option in ["-s", "--socket"]:
+            host, port = value.rsplit(":", 1)
+            settings["Socket"] = (host, int(port))
+            settings["Format"] = "json"
+
+        elif option in ["-i", "--interval"]:
+            settings["Interval"] = float(value)
+
+        elif option == "--ddrescue":
+            settings["DDRescue"] = value
+
+        elif option == "--exporter":
+            if ":" in value:
+                host, port = value.rsplit(":", 1)
+
+            else:
+                host, port = "", value
+
+            settings["Exporter"] = (host, int(port))
+
+        elif option == "--strategy":
+            if value not in Strategy.STRATEGIES:
+                raise ValueError("Unknown strategy: "+value)
+
+            settings["Strategy"] = value
+
+        elif option == "--journal":
+            settings["Journal"] = value
+
+        elif option == "--max-jobs":
+            settings["MaxJobs"] = int(value)
+
+            if settings["MaxJobs"] < 1:
+                raise ValueError("At least 1 job must be allowed to run.")
+
+    if resume and settings["Journal"] is None:
+        settings["Journal"] = Journal.DEFAULT_PATH
+
+    return settings
+
+class TextReporter(object):
+    """
+    Reports progress as lines of text. When several recoveries are running, job is
+    the name of the one being reported on.
+    """
+
+    def __init__(self, stream):
+        """Initialise the reporter"""
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def write(self, text, job=None):
+        """Write a line to the stream"""
+        if job is not None:
+            text = "["+job+"] "+text
+
+        with self.lock:
+            self.stream.write(text+"\n")
+            self.stream.flush()
+
+    def report_started(self, ddrescue_version, exec_list, job=None):
+        """Report that ddrescue has been started"""
+        self.write("Running ddrescue "+ddrescue_version+": "+" ".join(exec_list), job)
+
+    def report_progress(self, recovery, changes, job=None):
+        """Report the latest recovery information, if any of it changed"""
+        if "status" in changes:
+            self.write(changes["status"], job)
+
+        if "recovered_data" not in changes and "error_size" not in changes:
+            return
+
+        if recovery.disk_capacity:
+            percent = " ("+unicode(round(recovery.recovered_data * 100
+                                         / recovery.disk_capacity, 2))+"%)"
+
+        else:
+            percent = ""
+
+        self.write("Recovered "+Units.format_size(recovery.recovered_data)+" of "
+                   + Units.format_size(recovery.disk_capacity)+percent+", errors: "
+                   + unicode(recovery.num_errors)+" ("+Units.format_size(recovery.error_size)
+                   + "), rate: "+Units.format_rate(recovery.current_read_rate)
+                   + ", time remaining ("+(recovery.phase or "this phase")+"): "
+                   + Estimator.format_estimate(recovery.time_remaining),
+                   job)
+
+    def report_finished(self, result, return_code, job=None):
+        """Report that ddrescue has exited"""
+        self.write("Finished: "+result+" (ddrescue exited with "+unicode(return_code)+").",
+                   job)
+
+class JSONReporter(TextReporter):
+    """Reports progress as one JSON object per line"""
+
+    def write_event(self, event, job=None, **values):
+        """Write an event, with the given values"""
+        values["event"] = event
+        values["time"] = time.time()
+
+        if job is not None:
+            values["job"] = job
+
+        self.write(json.dumps(values, sort_keys=True))
+
+    def report_started(self, ddrescue_version, exec_list, job=None):
+        """Report that ddrescue has been started"""
+        self.write_event("started", job, ddrescue_version=ddrescue_version, command=exec_list)
+
+    def report_progress(self, recovery, changes, job=None):
+        """
+        Report the latest recovery information, if any of it changed. The time remaining
+        is in seconds, with the shortest and longest it is likely to take, and is only for
+        the current phase.
+        """
+
+        if not changes:
+            return
+
+        time_remaining = recovery.time_remaining or (None, None, None)
+
+        self.write_event("progress", job, status=recovery.old_status,
+                         disk_capacity=recovery.disk_capacity,
+                         recovered_data=recovery.recovered_data,
+                         error_size=recovery.error_size, num_errors=recovery.num_errors,
+                         current_read_rate=recovery.current_read_rate,
+                         average_read_rate=recovery.average_read_rate,
+                         input_pos=recovery.input_pos, output_pos=recovery.output_pos,
+                         time_since_last_read=recovery.time_since_last_read,
+                         time_remaining=time_remaining[0],
+                         time_remaining_range=time_remaining[1:], phase=recovery.phase)
+
+    def report_finished(self, result, return_code, job=None):
+        """Report that ddrescue has exited"""
+        self.write_event("finished", job, result=result, return_code=return_code)
+
+def get_ddrescue_version(ddrescue):
+    """Return the version of the ddrescue at path ddrescue"""
+    output = subprocess.check_output([ddrescue, "--version"]).decode("utf-8", errors="ignore")
+    ddrescue_version, prerelease = Recovery.parse_ddrescue_version(output)
+
+    if ddrescue_version not in Recovery.SUPPORTED_VERSIONS or prerelease:
+        logger.warning("get_ddrescue_version(): Unsupported or prerelease ddrescue version "
+                       + ddrescue_version+"!")
+
+        sys.stderr.write("Warning: ddrescue "+ddrescue_version+" is not a supported "
+                         "release. There may be problems reading its output.\n")
+
+    return ddrescue_version
+
+def show_error(message):
+    """Log an error, and tell the user about it on stderr"""
+    logger.error("main(): "+message)
+    sys.stderr.write("Error: "+message+"\n")
+
+def get_ddrescue_command(settings):
+    """Return how to start ddrescue"""
+    ddrescue_command = [settings["DDRescue"], "-v"]
+
+    #Get root privileges if we don't have them, unless we're running a stand-in for
+    #ddrescue (see Recovery.get_ddrescue_override()).
+    if os.geteuid() != 0 and settings["DDRescue"] != Recovery.get_ddrescue_override():
+        ddrescue_command.insert(0, "sudo")
+
+    return ddrescue_command
+
+def run(settings, reporter, exporter=None):
+    """
+    Run a recovery, reporting progress with reporter, and serving it with exporter if
+    given. Returns the result
+    """
+    if settings.get("DDRescueVersion") is None:
+        settings["DDRescueVersion"] = get_ddrescue_version(settings["DDRescue"])
+    ddrescue_command = get_ddrescue_command(settings)
+
+    snapshot = Snapshot.RecoverySnapshot()
+    runner = Strategy.StrategyRunner(settings, snapshot, ddrescue_command,
+                                     linux=sys.platform.startswith("linux"))
+
+    if exporter is not None:
+        exporter.add_source(lambda: [runner.recovery])
+
+    #Run the recovery in another thread, and report progress from this one.
+    results = []
+
+    def run_recovery():
+        """Run the recovery, and keep the result"""
+        try:
+            results.append(runner.run())
+
+        except (IOError, OSError):
+            logger.error("run(): Couldn't start ddrescue!")
+            results.append("CouldNotStart")
+
+        except Exception: #pylint: disable=broad-except
+            logger.exception("run(): Unexpected error while recovering data!")
+            results.append("Failed")
+
+    run_thread = threading.Thread(target=run_recovery)
+    run_thread.start()
+
+    reporter.report_started(settings["DDRescueVersion"], runner.exec_list)
+    recovery = runner.recovery
+
+    while run_thread.is_alive():
+        run_thread.join(settings["Interval"])
+
+        #Report each stage's command when it starts.
+        if runner.recovery is not recovery:
+            reporter.report_progress(recovery, snapshot.take_changes()[0])
+            reporter.report_started(settings["DDRescueVersion"], runner.exec_list)
+            recovery = runner.recovery
+
+        #Throw away ddrescue's output - it's saved in the transcript.
+        reporter.report_progress(recovery, snapshot.take_changes()[0])
+
+    reporter.report_finished(results[0], recovery.return_code)
+
+    return results[0]
+
+def run_jobs(settings, reporter, exporter=None):
+    """
+    Run all of the recoveries in settings["Jobs"], and any restored from the journal,
+    reporting progress with reporter, and serving the running ones with exporter if given.
+    Returns a list of the results, in the same order as the jobs.
+    """
+
+    if settings.get("DDRescueVersion") is None:
+        settings["DDRescueVersion"] = get_ddrescue_version(settings["DDRescue"])
+
+    journal = None
+
+    if settings["Journal"] is not None:
+        journal = Journal.JobJournal(settings["Journal"])
+
+    scheduler = Scheduler.Scheduler(get_ddrescue_command(settings),
+                                    max_jobs=settings["MaxJobs"],
+                                    linux=sys.platform.startswith("linux"), journal=journal)
+
+    jobs = []
+
+    if settings["Resume"]:
+        #Use the version of ddrescue we have now, in case it has been updated.
+        jobs.extend(scheduler.restore_jobs({"DDRescueVersion": settings["DDRescueVersion"]}))
+
+    for input_file, output_file, map_file in settings["Jobs"]:
+        job_settings = dict(settings)
+        job_settings.update({"InputFile": input_file, "OutputFile": output_file,
+                             "MapFile": map_file})
+
+        jobs.append(scheduler.add_job(job_settings))
+
+    if exporter is not None:
+        exporter.add_source(lambda: [job.runner.recovery for job in jobs
+                                     if job.state == "Running"])
+
+    scheduler.start()
+    reported_states = dict((job, "Queued") for job in jobs)
+
+    while True:
+        #Check this first, so everything a job did before finishing gets reported.
+        busy = scheduler.is_busy()
+
+        for job in jobs:
+            state = job.state
+
+            if reported_states[job] == "Queued" and state != "Queued":
+                reporter.report_started(settings["DDRescueVersion"], job.runner.exec_list,
+                                        job.name)
+
+            if state != "Queued":
+                reporter.report_progress(job.runner.recovery, job.snapshot.take_changes()[0],
+                                         job.name)
+
+            if reported_states[job] != "Finished" and state == "Finished":
+                reporter.report_finished(job.result, job.runner.recovery.return_code,
+                                         job.name)
+
+            reported_states[job] = state
+
+        if not busy:
+            break
+
+        time.sleep(settings["Interval"])
+
+    return [job.result for job in jobs]
+
+def main(argv):
+    """Run a recovery with the given command line options. Returns the exit code"""
+    logging.basicConfig(filename='/tmp/ddrescue-gui.log',
+                        format='%(asctime)s - %(name)s - %(levelname)s: %(message)s',
+                        datefmt='%d/%m/%Y %I:%M:%S %p')
+
+    try:
+        options, arguments = getopt.gnu_getopt(argv, "hf:s:i:",
+                                               ["headless", "help", "format=", "socket=",
+                                                "interval=", "ddrescue=", "no-direct",
+                                                "overwrite", "reverse", "preallocate",
+                                                "no-split", "retries=", "max-errors=",
+                                                "cluster-size=", "no-transcript",
+                                                "compress-transcript", "no-metrics", "job=",
+                                                "max-jobs=", "journal=", "resume",
+                                                "strategy=", "adaptive", "exporter="])
+
+        if ("-h", "") in options or ("--help", "") in options:
+            usage()
+            return 0
+
+        settings = get_settings(options, arguments)
+
+    except (getopt.GetoptError, ValueError) as err:
+        #Invalid options. Show the help message and then exit.
+        print(unicode(err))
+        usage()
+        return 2
+
+    #Make sure ddrescue can be run before starting anything.
+    try:
+        settings["DDRescueVersion"] = get_ddrescue_version(settings["DDRescue"])
+
+    except (OSError, subprocess.CalledProcessError) as err:
+        show_error("Couldn't run "+settings["DDRescue"]+" to find its version: "
+                   + unicode(err))
+
+        return 1
+
+    connection = None
+
+    if settings["Socket"] is not None:
+        try:
+            connection = socket.create_connection(settings["Socket"])
+
+        except (IOError, OSError) as err:
+            show_error("Couldn't connect to "+settings["Socket"][0]+":"
+                       + unicode(settings["Socket"][1])+": "+unicode(err))
+
+            return 1
+
+        stream = connection.makefile("w")
+
+    else:
+        stream = sys.stdout
+
+    if settings["Format"] == "json":
+        reporter = JSONReporter(stream)
+
+    else:
+        reporter = TextReporter(stream)
+
+    exporter = None
+
+    if settings["Exporter"] is not None:
+        exporter = Exporter.MetricsExporter(settings["Exporter"])
+
+        try:
+            exporter.start()
+
+        except (IOError, OSError) as err:
+            show_error("Couldn't serve statistics on port "+unicode(settings["Exporter"][1])
+                       + ": "+unicode(err))
+
+            if connection is not None:
+                stream.close()
+                connection.close()
+
+            return 1
+
+    try:
+        if len(settings["Jobs"]) == 1 and settings["Journal"] is None:
+            results = [run(settings, reporter, exporter)]
+
+        else:
+            results = run_jobs(settings, reporter, exporter)
+
+    finally:
+        if exporter is not None:
+            exporter.stop()
+
+        if connection is not None:
+            stream.close()
+            connection.close()
+
+    if all(result == "Success" for result in results):
+        return 0
+
+    return 1
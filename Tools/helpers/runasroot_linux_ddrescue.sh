@@ -14,6 +14,6 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
-#Keep processes' stderr by redirecting it to stdout.
-$@ 2>&1
-exit $?
+#Run ddrescue in place of this script, so the GUI can stop it by its process ID.
+#Keep its stderr by redirecting it to stdout.
+exec "$@" 2>&1
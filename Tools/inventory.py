@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Device Inventory Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Keeps the disk information up to date as disks are plugged in and removed, without
+running getdevinfo again every time. DeviceInventory listens for the kernel's uevents
+(or, if it can't, polls sysfs every few seconds), works out which block devices were
+added, changed or removed since it last looked, and reads the information for just those
+devices from sysfs. This doesn't need root. The changes are passed on as deltas in the
+same format as getdevinfo's dictionary, to be merged into it. None of this uses wx.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import os
+import socket
+import sys
+import threading
+
+#Import tools modules.
+from . import units as Units
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+SYSFS_BLOCK_PATH = "/sys/class/block"
+
+#Block devices that aren't disks, which getdevinfo doesn't list either.
+IGNORED_PREFIXES = ("loop", "ram", "zram")
+
+#The kernel's uevent netlink protocol, and its multicast group.
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_GROUP = 1
+
+#How often to look at sysfs if we can't get uevents, in seconds.
+POLL_INTERVAL = 2
+
+#sysfs sizes are always in 512-byte sectors.
+SECTOR_SIZE = 512
+
+def read_attribute(path, default="Unknown"):
+    """Return the contents of a sysfs attribute, or default if it can't be read"""
+    try:
+        with open(path, "r") as attribute_file:
+            return attribute_file.read().strip() or default
+
+    except (IOError, OSError):
+        return default
+
+def get_device_path(name):
+    """Return the /dev path for a sysfs block device name (eg cciss!c0d0 -> /dev/cciss/c0d0)"""
+    return "/dev/"+name.replace("!", "/")
+
+def scan(sysfs_path=SYSFS_BLOCK_PATH):
+    """
+    Return a dictionary of the block devices in sysfs_path, with their device numbers and
+    sizes, to tell when they change.
+    """
+
+    try:
+        names = os.listdir(sysfs_path)
+
+    except OSError:
+        return {}
+
+    devices = {}
+
+    for name in names:
+        if name.startswith(IGNORED_PREFIXES):
+            continue
+
+        path = os.path.join(sysfs_path, name)
+        devices[name] = (read_attribute(os.path.join(path, "dev")),
+                         read_attribute(os.path.join(path, "size")))
+
+    return devices
+
+def get_host(name, sysfs_path=SYSFS_BLOCK_PATH):
+    """Return the name of the device a partition is on, or None if name isn't a partition"""
+    path = os.path.join(sysfs_path, name)
+
+    if not os.path.exists(os.path.join(path, "partition")):
+        return None
+
+    #Partitions are in their device's directory.
+    return os.path.basename(os.path.dirname(os.path.realpath(path)))
+
+def get_partitions(name, sysfs_path=SYSFS_BLOCK_PATH):
+    """Return the names of the partitions on a device"""
+    path = os.path.realpath(os.path.join(sysfs_path, name))
+
+    try:
+        return sorted(entry for entry in os.listdir(path)
+                      if os.path.exists(os.path.join(path, entry, "partition")))
+
+    except OSError:
+        return []
+
+def probe(name, sysfs_path=SYSFS_BLOCK_PATH):
+    """
+    Return the information for one device or partition from sysfs, with the keys
+    getdevinfo uses.
+    """
+
+    path = os.path.join(sysfs_path, name)
+    host = get_host(name, sysfs_path)
+
+    try:
+        raw_capacity = int(read_attribute(os.path.join(path, "size"), "0")) * SECTOR_SIZE
+
+    except ValueError:
+        raw_capacity = 0
+
+    info = {"Name": get_device_path(name), "RawCapacity": unicode(raw_capacity),
+            "Capacity": Units.format_size(raw_capacity)}
+
+    if host is not None:
+        host_path = os.path.join(sysfs_path, host)
+
+        info.update({"Type": "Partition", "HostDevice": get_device_path(host),
+                     "Partitions": [], "Description": "Partition "
+                                                      + read_attribute(os.path.join(path,
+                                                                                    "partition"))
+                                                      + " on "+get_device_path(host)})
+
+    else:
+        host_path = path
+
+        if read_attribute(os.path.join(path, "removable"), "0") == "1":
+            description = "Removable Disk"
+
+        elif read_attribute(os.path.join(path, "queue", "rotational"), "1") == "0":
+            description = "Solid State Drive"
+
+        else:
+            description = "Hard Disk Drive"
+
+        info.update({"Type": "Device", "HostDevice": "N/A", "Description": description,
+                     "Partitions": [get_device_path(partition)
+                                    for partition in get_partitions(name, sysfs_path)]})
+
+    #Partitions have the vendor and product of their device.
+    info["Vendor"] = read_attribute(os.path.join(host_path, "device", "vendor"))
+    info["Product"] = read_attribute(os.path.join(host_path, "device", "model"))
+
+    return info
+
+def merge(disk_info, added, removed):
+    """Merge a delta from DeviceInventory into getdevinfo's dictionary, in place"""
+    for path in removed:
+        disk_info.pop(path, None)
+
+    disk_info.update(added)
+
+class DeviceInventory(object):
+    """
+    Follows the block devices in sysfs_path, and calls on_change(added, removed) when
+    they change: added is a dictionary of the information for the devices that were added
+    or changed (and for the devices whose partitions changed), and removed is a list of
+    the /dev paths of the devices that were removed. on_change is called from the
+    inventory's thread.
+    """
+
+    def __init__(self, on_change, sysfs_path=SYSFS_BLOCK_PATH, use_uevents=True):
+        """Initialise the inventory"""
+        self.on_change = on_change
+        self.sysfs_path = sysfs_path
+        self.use_uevents = use_uevents
+
+        self.devices = None
+        self.hosts = {}
+        self.uevent_socket = None
+        self.thread = None
+        self.running = False
+
+    def check(self):
+        """
+        Look for changes since the last check, and pass them on. Returns the added and
+        removed devices (which are empty if nothing changed). The first check only
+        records what is there.
+        """
+
+        devices = scan(self.sysfs_path)
+
+        if self.devices is None:
+            self.devices = devices
+            self.hosts = dict((name, get_host(name, self.sysfs_path)) for name in devices)
+            return {}, []
+
+        changed = set(name for name in devices if devices[name] != self.devices.get(name))
+        removed = set(self.devices) - set(devices)
+
+        #Remember which device each partition is on, because once it's gone (maybe with
+        #its device) we can't tell from sysfs.
+        hosts = dict((name, self.hosts.get(name)) for name in devices if name not in changed)
+        hosts.update((name, get_host(name, self.sysfs_path)) for name in changed)
+
+        #A partition coming or going changes its device's list of partitions.
+        for name in changed | removed:
+            host = hosts.get(name) if name in devices else self.hosts.get(name)
+
+            if host is not None and host in devices:
+                changed.add(host)
+
+        self.devices = devices
+        self.hosts = hosts
+
+        if not changed and not removed:
+            return {}, []
+
+        added = dict((get_device_path(name), probe(name, self.sysfs_path))
+                     for name in sorted(changed))
+
+        removed = sorted(get_device_path(name) for name in removed)
+
+        logger.info("DeviceInventory().check(): Added or changed: "+", ".join(sorted(added))
+                    + ". Removed: "+", ".join(removed)+".")
+
+        self.on_change(added, removed)
+
+        return added, removed
+
+    def open_uevent_socket(self):
+        """Start listening for uevents. Returns False if we can't"""
+        if not self.use_uevents or not hasattr(socket, "AF_NETLINK"):
+            return False
+
+        try:
+            self.uevent_socket = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM,
+                                               NETLINK_KOBJECT_UEVENT)
+
+            self.uevent_socket.bind((0, UEVENT_GROUP))
+            self.uevent_socket.settimeout(POLL_INTERVAL)
+
+        except (IOError, OSError):
+            logger.warning("DeviceInventory().open_uevent_socket(): Couldn't listen for "
+                           "uevents! Polling sysfs instead...")
+
+            self.uevent_socket = None
+            return False
+
+        return True
+
+    def wait(self):
+        """
+        Wait until something might have changed. Returns True if a block device uevent
+        arrived, or False if we timed out.
+        """
+
+        if self.uevent_socket is None:
+            threading.Event().wait(POLL_INTERVAL)
+            return False
+
+        try:
+            event = self.uevent_socket.recv(65536)
+
+        except socket.timeout:
+            return False
+
+        except (IOError, OSError):
+            return False
+
+        #The message is NUL-separated "KEY=value" pairs.
+        return b"SUBSYSTEM=block" in event.split(b"\0")
+
+    def run(self):
+        """Check for changes whenever there might have been some, until stopped"""
+        while self.running:
+            if self.wait() or self.uevent_socket is None:
+                try:
+                    self.check()
+
+                except Exception: #pylint: disable=broad-except
+                    logger.exception("DeviceInventory().run(): Error checking for device "
+                                     "changes!")
+
+    def start(self):
+        """Record the current devices, and start following changes in a thread"""
+        self.open_uevent_socket()
+        self.check()
+
+        self.running = True
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        """Stop following changes"""
+        self.running = False
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.uevent_socket is not None:
+            self.uevent_socket.close()
+            self.uevent_socket = None
@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Job Journal for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Keeps the recovery job queue on disk as a journal of JSON lines, so jobs that were
+interrupted by a crash, reboot or power cut can be started again. ddrescue carries on
+from where it left off using each job's map file. Each line is one event for a job,
+and is flushed to disk before we carry on, so a crash can at worst leave a torn last
+line, which is ignored.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#Where the GUI keeps its journal. Not in /tmp, because it has to survive a reboot.
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".ddrescue-gui", "jobs.jsonl")
+
+def new_job_id():
+    """Return a new, unique job id"""
+    return uuid.uuid4().hex
+
+def sync_directory(path):
+    """Make sure a new or renamed file in directory path is on disk"""
+    try:
+        directory = os.open(path, os.O_RDONLY)
+
+    except OSError:
+        #Not possible on every platform.
+        return
+
+    try:
+        os.fsync(directory)
+
+    except OSError:
+        pass
+
+    finally:
+        os.close(directory)
+
+class JobJournal(object):
+    """
+    The journal at path. Events are "added" (with the job's settings), "started",
+    "finished" (with the result) and "removed". Jobs that were added, but not finished
+    or removed, are pending, and are kept in order in self.pending, as a dictionary of
+    job ids to settings.
+    """
+
+    def __init__(self, path):
+        """Load the journal, and rewrite it with only the pending jobs in it"""
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.order = []
+
+        self.load()
+        self.compact()
+
+    def load(self):
+        """Read the journal, and work out which jobs are still pending"""
+        if not os.path.exists(self.path):
+            return
+
+        with io.open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                    job_id = record["id"]
+                    event = record["event"]
+
+                except (ValueError, KeyError, TypeError):
+                    #Probably a line we were writing when we crashed.
+                    logger.warning("JobJournal().load(): Ignoring invalid line in "+self.path
+                                   + ": "+line.strip())
+                    continue
+
+                if event == "added" and job_id not in self.pending:
+                    self.pending[job_id] = record["settings"]
+                    self.order.append(job_id)
+
+                elif event in ("finished", "removed") and job_id in self.pending:
+                    del self.pending[job_id]
+                    self.order.remove(job_id)
+
+        logger.info("JobJournal().load(): Found "+unicode(len(self.order))+" pending jobs in "
+                    + self.path+"...")
+
+    def compact(self):
+        """
+        Replace the journal with one that only holds the pending jobs. The new journal
+        is written next to the old one and renamed over it, so one of them is always
+        complete.
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        temp_path = self.path+".new"
+
+        with self.lock:
+            with io.open(temp_path, "w", encoding="utf-8") as journal_file:
+                for job_id in self.order:
+                    journal_file.write(self.make_line("added", job_id,
+                                                      settings=self.pending[job_id]))
+
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+            os.rename(temp_path, self.path)
+            sync_directory(directory)
+
+    def make_line(self, event, job_id, **values): #pylint: disable=no-self-use
+        """Return the line for an event"""
+        values.update({"event": event, "id": job_id, "time": time.time()})
+        return unicode(json.dumps(values, sort_keys=True))+"\n"
+
+    def write(self, event, job_id, **values):
+        """Append an event to the journal, and make sure it's on disk"""
+        line = self.make_line(event, job_id, **values)
+
+        with self.lock:
+            with io.open(self.path, "a", encoding="utf-8") as journal_file:
+                journal_file.write(line)
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+
+    def add(self, job_id, settings):
+        """Record that a job was queued with the given settings"""
+        self.write("added", job_id, settings=settings)
+
+        with self.lock:
+            self.pending[job_id] = dict(settings)
+            self.order.append(job_id)
+
+    def start(self, job_id):
+        """Record that a job was started"""
+        self.write("started", job_id)
+
+    def finish(self, job_id, result):
+        """Record that a job finished, so it won't be started again"""
+        self.write("finished", job_id, result=result)
+        self.forget(job_id)
+
+    def remove(self, job_id):
+        """Record that a job was removed from the queue"""
+        self.write("removed", job_id)
+        self.forget(job_id)
+
+    def forget(self, job_id):
+        """Stop treating a job as pending"""
+        with self.lock:
+            if job_id in self.pending:
+                del self.pending[job_id]
+                self.order.remove(job_id)
+
+    def get_pending(self):
+        """Return a list of (job id, settings) for each pending job, in the order added"""
+        with self.lock:
+            return [(job_id, dict(self.pending[job_id])) for job_id in self.order]
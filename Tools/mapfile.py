@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Map File Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Reads ddrescue's map files (previously called log files), which hold the authoritative
+state of a recovery. Blocks are kept in sorted arrays of starts, sizes and statuses,
+rather than as a Python object per block, so maps of very badly damaged disks with
+millions of blocks can be handled. When ddrescue rewrites the map, only the lines that
+changed are parsed again.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import array
+import bisect
+import os
+import re
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Unsigned 64-bit integers. Python 2's array module doesn't have "Q", but "L" is
+#64 bits on the 64-bit systems we run on.
+try:
+    array.array(str("Q"))
+    ARRAY_TYPE = str("Q")
+
+except ValueError:
+    ARRAY_TYPE = str("L")
+
+#How much of a map file to compare at once when looking for changes.
+CHUNK_SIZE = 65536
+
+#What each block status means.
+BLOCK_STATUSES = {"?": "non-tried", "*": "non-trimmed", "/": "non-scraped",
+                  "-": "bad-sector", "+": "finished"}
+
+#What ddrescue was doing when it last wrote the map file.
+CURRENT_STATUSES = {"?": "copying", "*": "trimming", "/": "scraping", "-": "retrying",
+                    "F": "filling", "G": "generating", "+": "finished"}
+
+#"pos  size  status" lines, and the "current_pos  current_status  [current_pass]" line.
+#Comment lines start with "#", so these never match them.
+BLOCK_REGEX = re.compile(br"^[ \t]*(0[xX][0-9A-Fa-f]+|\d+)[ \t]+(0[xX][0-9A-Fa-f]+|\d+)"
+                         br"[ \t]+(\S)", re.MULTILINE)
+
+CURRENT_REGEX = re.compile(br"^[ \t]*(0[xX][0-9A-Fa-f]+|\d+)[ \t]+(\S)(?:[ \t]+(\d+))?[ \t]*\r?$",
+                           re.MULTILINE)
+
+def to_int(number):
+    """Convert a number from a map file (hex with 0x, or decimal) to an int"""
+    return int(number, 0)
+
+def parse_blocks(data, start=0, end=None):
+    """
+    Parse the block lines in data[start:end]. Returns arrays of their starts and sizes,
+    a bytearray of their statuses, and whether they were in order.
+    """
+
+    if end is None:
+        end = len(data)
+
+    starts = array.array(ARRAY_TYPE)
+    sizes = array.array(ARRAY_TYPE)
+    statuses = bytearray()
+
+    #Go through the blocks one at a time, rather than making a list of them, to
+    #save memory with huge maps.
+    in_order = True
+    last_start = -1
+
+    for match in BLOCK_REGEX.finditer(data, start, end):
+        block_start = to_int(match.group(1))
+
+        if block_start < last_start:
+            in_order = False
+
+        last_start = block_start
+
+        starts.append(block_start)
+        sizes.append(to_int(match.group(2)))
+        statuses.append(ord(match.group(3)))
+
+    return starts, sizes, statuses, in_order
+
+def find_block(starts, sizes, offset):
+    """Return the number of the block containing offset, or None if no block does"""
+    number = bisect.bisect_right(starts, offset) - 1
+
+    if number < 0 or offset >= starts[number] + sizes[number]:
+        return None
+
+    return number
+
+def get_common_prefix_length(first, first_start, second, second_start):
+    """
+    Return the length of the longest common prefix of first[first_start:] and
+    second[second_start:]. Compares a chunk at a time, so this is fast even with
+    hundreds of megabytes.
+    """
+
+    limit = min(len(first) - first_start, len(second) - second_start)
+    length = 0
+    size = 0
+
+    while length < limit:
+        size = min(CHUNK_SIZE, limit - length)
+
+        if (first[first_start+length:first_start+length+size]
+                != second[second_start+length:second_start+length+size]):
+            break
+
+        length += size
+
+    else:
+        return limit
+
+    #The difference is in this chunk. Narrow it down.
+    low, high = length, length + size
+
+    while high - low > 1:
+        middle = (low + high) // 2
+
+        if (first[first_start+low:first_start+middle]
+                == second[second_start+low:second_start+middle]):
+            low = middle
+
+        else:
+            high = middle
+
+    return low
+
+def get_common_suffix_length(first, second, limit):
+    """Return the length (up to limit) of the longest common suffix of first and second"""
+    first_end = len(first)
+    second_end = len(second)
+    length = 0
+    size = 0
+
+    while length < limit:
+        size = min(CHUNK_SIZE, limit - length)
+
+        if (first[first_end-length-size:first_end-length]
+                != second[second_end-length-size:second_end-length]):
+            break
+
+        length += size
+
+    else:
+        return limit
+
+    low, high = length, length + size
+
+    while high - low > 1:
+        middle = (low + high) // 2
+
+        if first[first_end-middle:first_end-low] == second[second_end-middle:second_end-low]:
+            low = middle
+
+        else:
+            high = middle
+
+    return low
+
+def diff_blocks(old_blocks, new_blocks):
+    """
+    Compare two sets of blocks, each given as (starts, sizes, statuses), and return
+    a list of (start, end) ranges where the status is different.
+    """
+
+    boundaries = set()
+
+    for starts, sizes, _statuses in (old_blocks, new_blocks):
+        for start, size in zip(starts, sizes):
+            boundaries.add(start)
+            boundaries.add(start + size)
+
+    boundaries = sorted(boundaries)
+    ranges = []
+
+    for start, end in zip(boundaries, boundaries[1:]):
+        statuses = []
+
+        for starts, sizes, block_statuses in (old_blocks, new_blocks):
+            number = find_block(starts, sizes, start)
+            statuses.append(None if number is None else block_statuses[number])
+
+        if statuses[0] == statuses[1]:
+            continue
+
+        #Join this range to the last one if they touch.
+        if ranges != [] and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+
+        else:
+            ranges.append((start, end))
+
+    return ranges
+
+class MapFile(object):
+    """
+    The blocks in a ddrescue map file.
+
+    self.starts, self.sizes and self.statuses hold the start, size and status character
+    (as a byte) of each block, sorted by start. Also holds the current position, status
+    and pass from the map file, if it has them.
+
+    The contents of the file are kept, so that when it is rewritten update() only has to
+    parse the lines that changed.
+    """
+
+    def __init__(self):
+        """Initialise an empty map"""
+        self.starts = array.array(ARRAY_TYPE)
+        self.sizes = array.array(ARRAY_TYPE)
+        self.statuses = bytearray()
+
+        self.current_pos = None
+        self.current_status = None
+        self.current_pass = None
+
+        #Bytes in each status, worked out when the map is loaded.
+        self.status_sizes = {}
+
+        #The contents of the file, where the first block is in it, and whether
+        #there is exactly one block on each line after that (as ddrescue writes them).
+        self.data = b""
+        self.blocks_offset = 0
+        self.one_block_per_line = True
+
+    def __len__(self):
+        """Return the number of blocks"""
+        return len(self.starts)
+
+    def parse_header(self, data):
+        """Read the current position, status and pass, and return where the blocks start"""
+        match = CURRENT_REGEX.search(data)
+        position = 0
+
+        self.current_pos = self.current_status = self.current_pass = None
+
+        if match is not None:
+            self.current_pos = to_int(match.group(1))
+            self.current_status = match.group(2).decode("ascii", "replace")
+
+            if match.group(3) is not None:
+                self.current_pass = int(match.group(3))
+
+            #Don't mistake this line for a block.
+            position = match.end()
+
+        match = BLOCK_REGEX.search(data, position)
+
+        if match is None:
+            return len(data)
+
+        return match.start()
+
+    def load(self, data):
+        """Load the map from the contents of a map file (bytes)"""
+        self.__init__()
+
+        self.data = data
+        self.blocks_offset = self.parse_header(data)
+        self.starts, self.sizes, self.statuses, in_order = parse_blocks(data, self.blocks_offset)
+
+        #ddrescue writes blocks in order, but make sure.
+        if not in_order:
+            order = sorted(range(len(self.starts)), key=self.starts.__getitem__)
+
+            self.starts = array.array(ARRAY_TYPE, (self.starts[number] for number in order))
+            self.sizes = array.array(ARRAY_TYPE, (self.sizes[number] for number in order))
+            self.statuses = bytearray(self.statuses[number] for number in order)
+
+        self.one_block_per_line = (in_order
+                                   and data.count(b"\n", self.blocks_offset) == len(self.starts))
+
+        self.status_sizes = self.count_status_sizes()
+
+    def reload(self, data):
+        """Load the map again from scratch, and return the range it covers as having changed"""
+        end = self.get_end()
+        self.load(data)
+
+        return [(0, max(end, self.get_end()))]
+
+    def update(self, data):
+        """
+        Update the map from new contents of the map file, re-parsing only the lines that
+        changed. Returns a list of (start, end) ranges on the disk whose status changed.
+        """
+
+        if not self.one_block_per_line:
+            return self.reload(data)
+
+        old_data = self.data
+        old_offset = self.blocks_offset
+        new_offset = self.parse_header(data)
+
+        #Find the part of the blocks that changed.
+        prefix = get_common_prefix_length(old_data, old_offset, data, new_offset)
+        old_length = len(old_data) - old_offset
+        new_length = len(data) - new_offset
+
+        if prefix == old_length == new_length:
+            #Only the comments or current position changed.
+            self.data = data
+            self.blocks_offset = new_offset
+            return []
+
+        suffix = get_common_suffix_length(old_data, data, min(old_length, new_length) - prefix)
+
+        #The first line that changed, and the first line after that which didn't.
+        first = old_data.count(b"\n", old_offset, old_offset + prefix)
+        old_start = max(old_data.rfind(b"\n", old_offset, old_offset + prefix) + 1, old_offset)
+        newline = old_data.find(b"\n", len(old_data) - suffix)
+
+        if newline == -1:
+            last = len(self)
+            new_end = len(data)
+
+        else:
+            last = first + old_data.count(b"\n", old_start, newline + 1)
+            new_end = newline + 1 + len(data) - len(old_data)
+
+        new_start = new_offset + old_start - old_offset
+        starts, sizes, statuses, in_order = parse_blocks(data, new_start, new_end)
+
+        #Start again if the new lines don't fit in with the rest.
+        if (not in_order or data.count(b"\n", new_start, new_end) != len(starts)
+                or (starts and first > 0 and self.starts[first-1] > starts[0])
+                or (starts and last < len(self) and starts[-1] > self.starts[last])):
+            return self.reload(data)
+
+        old_blocks = (self.starts[first:last], self.sizes[first:last], self.statuses[first:last])
+        changes = diff_blocks(old_blocks, (starts, sizes, statuses))
+
+        for status, size in zip(old_blocks[2], old_blocks[1]):
+            self.status_sizes[chr(status)] -= size
+
+        for status, size in zip(statuses, sizes):
+            status = chr(status)
+            self.status_sizes[status] = self.status_sizes.get(status, 0) + size
+
+        self.starts[first:last] = starts
+        self.sizes[first:last] = sizes
+        self.statuses[first:last] = statuses
+
+        self.data = data
+        self.blocks_offset = new_offset
+
+        return changes
+
+    def count_status_sizes(self):
+        """Return a dictionary of the number of bytes in each status"""
+        totals = dict((status, 0) for status in BLOCK_STATUSES)
+
+        for status, size in zip(self.statuses, self.sizes):
+            status = chr(status)
+            totals[status] = totals.get(status, 0) + size
+
+        return totals
+
+    def find_block(self, offset):
+        """Return the number of the block containing offset, or None if no block does"""
+        return find_block(self.starts, self.sizes, offset)
+
+    def get_status(self, offset):
+        """Return the status character of the block containing offset, or None"""
+        number = self.find_block(offset)
+
+        if number is None:
+            return None
+
+        return chr(self.statuses[number])
+
+    def get_block(self, number):
+        """Return (start, size, status character) for block number"""
+        return self.starts[number], self.sizes[number], chr(self.statuses[number])
+
+    def get_end(self):
+        """Return the end of the last block (the size of the rescue domain)"""
+        if len(self) == 0:
+            return 0
+
+        return self.starts[-1] + self.sizes[-1]
+
+class MapFileWatcher(object):
+    """
+    Follows a map file as ddrescue rewrites it during a recovery. Call check()
+    every few seconds to pick up changes.
+    """
+
+    def __init__(self, path):
+        """Initialise the watcher. The file is read on the first check()"""
+        self.path = path
+        self.mapfile = MapFile()
+        self.loaded = False
+
+        #The modification time and size when the file was last read.
+        self.stat = None
+
+    def check(self):
+        """
+        Re-read the map file if it has been modified. Returns a list of (start, end)
+        ranges on the disk whose status changed, which is empty if nothing did.
+        """
+
+        try:
+            stat = os.stat(self.path)
+
+        except OSError:
+            #ddrescue hasn't written it yet.
+            return []
+
+        stat = (stat.st_mtime, stat.st_size)
+
+        if stat == self.stat:
+            return []
+
+        with open(self.path, "rb") as map_file:
+            data = map_file.read()
+
+        #ddrescue rewrites the file in place, so it may be half-written. Try again next time.
+        if not data.endswith(b"\n"):
+            return []
+
+        self.stat = stat
+
+        if not self.loaded:
+            self.loaded = True
+            self.mapfile.load(data)
+
+            if len(self.mapfile) == 0:
+                return []
+
+            return [(0, self.mapfile.get_end())]
+
+        return self.mapfile.update(data)
+
+def read_mapfile(path):
+    """Read the map file at path, and return a MapFile"""
+    with open(path, "rb") as map_file:
+        data = map_file.read()
+
+    mapfile = MapFile()
+    mapfile.load(data)
+
+    return mapfile
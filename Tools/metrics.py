@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Metrics Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Records the values ddrescue reports during a recovery as a time series, in a CSV file next
+to the map file, so the throughput over time can be plotted, slow regions found, and drives
+compared afterwards.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import os
+import sys
+import time
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#The columns in a metrics file. Sizes and positions are in bytes, rates in bytes per
+#second, and times in seconds. Values older versions of ddrescue don't report are left
+#empty.
+COLUMNS = ("time", "input_pos", "output_pos", "recovered_data", "error_size", "non_tried",
+           "non_trimmed", "non_scraped", "num_errors", "read_errors", "current_read_rate",
+           "average_read_rate", "time_since_last_read", "percent_rescued")
+
+#Record at most one sample every INTERVAL seconds, and write them to disk every
+#FLUSH_INTERVAL seconds, so saving the metrics costs very little during a recovery.
+INTERVAL = 1
+FLUSH_INTERVAL = 30
+
+#Use a clock that can't go backwards if we have one (Python 3.3+).
+get_time = getattr(time, "monotonic", time.time) #pylint: disable=invalid-name
+
+def get_metrics_path(map_file):
+    """Return the path to save the metrics of a recovery that uses map_file at"""
+    return map_file+".metrics.csv"
+
+def read_metrics(path):
+    """
+    Read the samples in the metrics file at path. Returns a list of dictionaries with the
+    values as numbers (or None if they weren't reported).
+    """
+
+    samples = []
+
+    with open(path, "rb") as metrics_file:
+        lines = metrics_file.read().decode("utf-8").split("\n")
+
+    columns = lines[0].split(",")
+
+    for line in lines[1:]:
+        #Skip blank and partly written lines.
+        if len(line.split(",")) != len(columns):
+            continue
+
+        sample = {}
+
+        for name, value in zip(columns, line.split(",")):
+            if value == "":
+                sample[name] = None
+
+            elif "." in value:
+                sample[name] = float(value)
+
+            else:
+                sample[name] = int(value)
+
+        samples.append(sample)
+
+    return samples
+
+def get_slow_regions(samples, min_rate):
+    """
+    Return the regions of the input file where the current read rate was below min_rate,
+    as a list of (start, end) input positions, in the order they were read.
+    """
+
+    regions = []
+    start = None
+
+    for sample in samples:
+        rate = sample.get("current_read_rate")
+        position = sample.get("input_pos")
+
+        if rate is None or position is None:
+            continue
+
+        if rate < min_rate and start is None:
+            start = position
+
+        elif rate >= min_rate and start is not None:
+            regions.append((start, position))
+            start = None
+
+    if start is not None:
+        regions.append((start, samples[-1]["input_pos"]))
+
+    return regions
+
+class MetricsWriter(object):
+    """
+    Records samples of ddrescue's values in the CSV file at path. If the file already
+    exists (eg the recovery was resumed), the new samples are added to the end of it.
+
+    The time column is the time since the epoch, but is measured with a monotonic clock
+    during the recovery, so the samples stay in order if the system clock is changed.
+    """
+
+    def __init__(self, path, interval=INTERVAL, flush_interval=FLUSH_INTERVAL, clock=get_time):
+        """Initialise the writer, and open the file"""
+        self.path = path
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.clock = clock
+
+        self.start_time = time.time()
+        self.start_clock = clock()
+        self.last_sample = None
+        self.last_flush = self.start_clock
+
+        self.values = {}
+        self.buffer = []
+
+        self.metrics_file = open(path, "ab")
+
+        if self.metrics_file.tell() == 0:
+            self.buffer.append(",".join(COLUMNS))
+
+        else:
+            #If we crashed while writing the last sample, start a new line after it.
+            with open(path, "rb") as metrics_file:
+                metrics_file.seek(-1, os.SEEK_END)
+
+                if metrics_file.read() != b"\n":
+                    self.buffer.append("")
+
+    def record(self, values):
+        """
+        Keep the latest values from ddrescue, and take a sample if we haven't for
+        self.interval seconds.
+        """
+
+        for name in COLUMNS:
+            if name in values:
+                self.values[name] = values[name]
+
+        #Don't write a row of empty values before ddrescue has told us anything.
+        if not self.values:
+            return
+
+        if self.last_sample is None or self.clock() - self.last_sample >= self.interval:
+            self.sample()
+
+    def sample(self):
+        """Take a sample of the latest values, and write the samples to disk if it's time"""
+        now = self.clock()
+        self.last_sample = now
+
+        row = ["%.3f" % (self.start_time + now - self.start_clock)]
+
+        for name in COLUMNS[1:]:
+            value = self.values.get(name)
+            row.append("" if value is None else unicode(value))
+
+        self.buffer.append(",".join(row))
+
+        if now - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write the samples we have to disk"""
+        self.last_flush = self.clock()
+
+        if self.buffer:
+            self.metrics_file.write(("\n".join(self.buffer)+"\n").encode("utf-8"))
+            self.metrics_file.flush()
+            self.buffer = []
+
+    def close(self):
+        """Take a last sample of the final values, write everything to disk, and close the file"""
+        if self.values:
+            self.sample()
+
+        self.flush()
+        self.metrics_file.close()
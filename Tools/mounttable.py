@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Mount Table Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Keeps track of what is mounted where on Linux, by reading /proc/self/mountinfo directly
+rather than running "mount" and parsing its output. The table is cached, and only read
+again when the kernel says it has changed: the mountinfo file reports POLLPRI and POLLERR
+to poll() whenever something is mounted or unmounted. Lookups are then just dictionary
+lookups.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import os
+import re
+import select
+import sys
+import threading
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+#Spaces, tabs, newlines and backslashes in paths are escaped as octal (eg \040).
+ESCAPE_REGEX = re.compile(r"\\([0-7]{3})")
+
+def unescape(path):
+    """Undo the octal escapes in a path from mountinfo"""
+    return ESCAPE_REGEX.sub(lambda match: chr(int(match.group(1), 8)), path)
+
+def parse_mountinfo(data):
+    """
+    Parse the contents of a mountinfo file. Returns a list of (source, mount point,
+    filesystem type) for each mount, in the order they were mounted.
+    """
+
+    mounts = []
+
+    for line in data.split("\n"):
+        #The fields after the optional ones are separated from them with a "-".
+        fields = line.split(" - ", 1)
+
+        if len(fields) != 2:
+            continue
+
+        before, after = fields[0].split(), fields[1].split()
+
+        if len(before) < 5 or len(after) < 2:
+            continue
+
+        mounts.append((unescape(after[1]), unescape(before[4]), after[0]))
+
+    return mounts
+
+class MountTable(object):
+    """
+    A cached copy of the mount table in path. How changes are noticed depends on the file:
+    /proc files are polled for change notifications, and other files (eg in the tests) are
+    read again when their modification time or size changes.
+    """
+
+    def __init__(self, path=MOUNTINFO_PATH):
+        """Initialise the table. It is read the first time it's used"""
+        self.path = path
+        self.lock = threading.Lock()
+
+        self.mounts = None
+        self.sources = {}
+        self.mount_points = {}
+
+        self.mountinfo_file = None
+        self.poller = None
+        self.stat = None
+
+    def open(self):
+        """Open the file, and watch it for changes if we can"""
+        self.mountinfo_file = open(self.path, "rb")
+
+        if self.path.startswith("/proc/") and hasattr(select, "poll"):
+            self.poller = select.poll()
+            self.poller.register(self.mountinfo_file.fileno(), select.POLLPRI | select.POLLERR)
+
+    def close(self):
+        """Close the file"""
+        with self.lock:
+            if self.mountinfo_file is not None:
+                self.mountinfo_file.close()
+
+            self.mountinfo_file = self.poller = self.mounts = None
+
+    def has_changed(self):
+        """Return whether the file has changed since it was last read"""
+        if self.mounts is None:
+            return True
+
+        elif self.poller is not None:
+            #Polling also resets the notification.
+            return bool(self.poller.poll(0))
+
+        elif self.path.startswith("/proc/"):
+            #We can't tell, so always read it.
+            return True
+
+        stat = os.fstat(self.mountinfo_file.fileno())
+        return (stat.st_mtime, stat.st_size) != self.stat
+
+    def refresh(self):
+        """Read the table again if it has changed"""
+        if self.mountinfo_file is None:
+            self.open()
+
+        if not self.has_changed():
+            return
+
+        logger.debug("MountTable().refresh(): Reading the mount table...")
+
+        stat = os.fstat(self.mountinfo_file.fileno())
+        self.stat = (stat.st_mtime, stat.st_size)
+
+        self.mountinfo_file.seek(0)
+        self.mounts = parse_mountinfo(self.mountinfo_file.read().decode("utf-8", "replace"))
+
+        #Like "mount", use the first place a source is mounted. A later mount at the
+        #same mount point hides the earlier one.
+        self.sources = {}
+        self.mount_points = {}
+
+        for source, mount_point, fstype in self.mounts: #pylint: disable=unused-variable
+            self.sources.setdefault(source, mount_point)
+            self.mount_points[mount_point] = source
+
+    def get_mounts(self):
+        """Return a list of (source, mount point, filesystem type) for each mount"""
+        with self.lock:
+            self.refresh()
+            return self.mounts
+
+    def is_mounted(self, path):
+        """Return whether path is mounted, or has something mounted on it"""
+        with self.lock:
+            self.refresh()
+            return path in self.sources or path in self.mount_points
+
+    def get_mount_point(self, source):
+        """Return where source is mounted, or None if it isn't"""
+        with self.lock:
+            self.refresh()
+            return self.sources.get(source)
+
+    def get_source(self, mount_point):
+        """Return what is mounted at mount_point, or None if nothing is"""
+        with self.lock:
+            self.refresh()
+            return self.mount_points.get(mount_point)
+
+#The table for this process, shared by everything that uses get_table().
+TABLE = None
+TABLE_LOCK = threading.Lock()
+
+def get_table():
+    """Return the shared MountTable for /proc/self/mountinfo"""
+    global TABLE
+
+    with TABLE_LOCK:
+        if TABLE is None:
+            TABLE = MountTable()
+
+        return TABLE
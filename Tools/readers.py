@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Output Readers for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Buffered readers for the output of the processes we start (ddrescue, mount, lsblk etc).
+These read pipes in large chunks and split them into records incrementally, rather than
+reading and decoding one character at a time.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import os
+import re
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#How much to ask for with each os.read() call. os.read() returns as soon as any data is
+#available, so this only limits how much we can pick up in one go.
+CHUNK_SIZE = 65536
+
+class ChunkedReader(object):
+    """
+    Reads from a pipe with os.read() and splits what it gets into records.
+
+    A record is everything up to and including one of the given separators.
+    Separators can be more than one byte long (eg b"\\x1b[A"), and are handled correctly
+    if they are split across two reads. Records are returned as bytes, unchanged.
+    """
+
+    def __init__(self, pipe, separators=(b"\n",), chunk_size=CHUNK_SIZE):
+        """
+        Initialise the reader. pipe can be a file object (eg Popen().stdout) or
+        a file descriptor.
+        """
+
+        if isinstance(pipe, int):
+            self.file_descriptor = pipe
+
+        else:
+            self.file_descriptor = pipe.fileno()
+
+        self.chunk_size = chunk_size
+        self.separator_regex = re.compile(b"|".join([re.escape(separator)
+                                                     for separator in separators]))
+
+        self.buffer = b""
+
+    def feed(self, data):
+        """
+        Add some data to the buffer, and return a list of all the records
+        that are now complete. Anything left over is kept for next time.
+        """
+
+        self.buffer += data
+
+        records = []
+        start = 0
+
+        for match in self.separator_regex.finditer(self.buffer):
+            records.append(self.buffer[start:match.end()])
+            start = match.end()
+
+        self.buffer = self.buffer[start:]
+
+        return records
+
+    def flush(self):
+        """Return whatever is left in the buffer (a record with no separator), and clear it"""
+        remainder = self.buffer
+        self.buffer = b""
+
+        return remainder
+
+    def read_records(self):
+        """
+        Generator that yields complete records as soon as they are read, until the
+        other end of the pipe is closed. Any unterminated data left at the end is
+        yielded last.
+        """
+
+        while True:
+            data = os.read(self.file_descriptor, self.chunk_size)
+
+            if data == b"":
+                #EOF. The process has closed its output.
+                break
+
+            for record in self.feed(data):
+                yield record
+
+        remainder = self.flush()
+
+        if remainder != b"":
+            yield remainder
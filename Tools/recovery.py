@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Runs ddrescue and follows its output during a recovery. None of this uses wx, so it is
+shared by the GUI's BackendThread and the headless mode.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import subprocess
+import logging
+import os
+import signal
+import sys
+
+#Import tools modules.
+from . import estimator as Estimator
+from . import metrics as Metrics
+from . import readers as Readers
+from . import transcript as Transcript
+from .DDRescueTools import parser as DDRescueParser
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#Versions of ddrescue we support.
+SUPPORTED_VERSIONS = ("1.14", "1.15", "1.16", "1.17", "1.18", "1.18.1", "1.19", "1.20",
+                      "1.21", "1.22", "1.23")
+
+#Default options for ddrescue.
+DEFAULT_OPTIONS = {"DirectAccess": "-d", "OverwriteOutputFile": "", "Reverse": "",
+                   "Preallocate": "", "NoSplit": "", "NoTrim": "", "BadSectorRetries": "-r 2",
+                   "MaxErrors": "", "ClusterSize": "-c 128", "MinReadRate": "", "SkipSize": "",
+                   "DiskSize": "", "InputFileBlockSize": ""}
+
+#The environment variable that replaces ddrescue with another program (eg
+#Tools/fakeddrescue.py for testing).
+DDRESCUE_OVERRIDE_VARIABLE = "DDRESCUE_GUI_DDRESCUE"
+
+def get_ddrescue_override():
+    """
+    Return the program to run instead of ddrescue, from the DDRESCUE_GUI_DDRESCUE
+    environment variable, or None if it isn't set. It is run without root privileges.
+    """
+
+    return os.environ.get(DDRESCUE_OVERRIDE_VARIABLE) or None
+
+def parse_ddrescue_version(output):
+    """
+    Get the version of ddrescue from the output of "ddrescue --version". Returns the
+    version without any -rc or -pre suffix, or minor version (eg 1.19.5 -> 1.19), and
+    whether it is a prerelease version.
+    """
+
+    ddrescue_version = output.split("\n")[0].split(" ")[-1]
+
+    #Remove the -rc and -pre flags if they exist.
+    prerelease = False
+
+    if "-rc" in ddrescue_version:
+        prerelease = True
+        ddrescue_version = ddrescue_version.split("-rc")[0]
+
+    elif "-pre" in ddrescue_version:
+        prerelease = True
+        ddrescue_version = ddrescue_version.split("-pre")[0]
+
+    #Ignore any monitor changes. eg: treat 1.19.5 as 1.19 - strip anything after that off.
+    ddrescue_version = '.'.join(ddrescue_version.split(".")[:2])
+
+    return ddrescue_version, prerelease
+
+def build_exec_list(settings, ddrescue_command, linux=True):
+    """
+    Return the command to run ddrescue with the options in settings. ddrescue_command is
+    how to start ddrescue (eg ["pkexec", <helper>, "ddrescue", "-v"]).
+    """
+
+    options_list = [settings["DirectAccess"], settings["OverwriteOutputFile"],
+                    settings["DiskSize"], settings["Reverse"], settings["Preallocate"],
+                    settings["NoSplit"], settings["NoTrim"], settings["BadSectorRetries"],
+                    settings["MaxErrors"], settings["ClusterSize"], settings["MinReadRate"],
+                    settings["SkipSize"], settings["InputFileBlockSize"],
+                    settings["InputFile"], settings["OutputFile"], settings["MapFile"]]
+
+    exec_list = list(ddrescue_command)
+
+    for number, option in enumerate(options_list):
+        #Handle direct disk access on OS X.
+        if not linux and number == 0 and option != "":
+            #If we're recovering from a file, don't enable direct disk access (it won't work).
+            if settings["InputFile"][0:5] == "/dev/":
+                #Switch InputFile with a string that uses /dev/rdisk (raw disk)
+                #instead of /dev/disk.
+                options_list[-3] = "/dev/r" + settings["InputFile"].split("/dev/")[1]
+
+            #Either way, "-d" isn't added to the exec_list. It doesn't work on macOS.
+
+        elif option != "":
+            exec_list.append(option)
+
+    return exec_list
+
+class Recovery(object): #pylint: disable=too-many-instance-attributes
+    """
+    Runs ddrescue, and follows its output until it exits.
+
+    The latest recovery information is kept as attributes, and put in snapshot (a
+    Tools.snapshot.RecoverySnapshot) for the GUI, as numbers (sizes in bytes, rates in bytes
+    per second, and times in seconds). Tools.units.format_value() formats them for display.
+    on_initial_status, if given, is called when ddrescue's initial status arrives.
+    """
+
+    def __init__(self, settings, snapshot, on_initial_status=None):
+        """Initialise the recovery, and set up the parser for our version of ddrescue"""
+        self.settings = settings
+        self.snapshot = snapshot
+        self.on_initial_status = on_initial_status
+        self.parser = DDRescueParser.StatusParser(settings["DDRescueVersion"])
+        self.estimator = Estimator.ETAEstimator()
+
+        self.cmd = None
+        self.transcript = None
+        self.metrics = None
+        self.return_code = None
+
+        self.old_status = ""
+        self.got_initial_status = False
+
+        self.disk_capacity = None
+        self.recovered_data = 0
+        self.input_pos = None
+        self.output_pos = None
+        self.error_size = None
+        self.current_read_rate = None
+        self.average_read_rate = None
+        self.num_errors = None
+        self.read_errors = None
+        self.time_since_last_read = None
+        self.time_remaining = None
+        self.phase = None
+
+    def start(self, exec_list):
+        """Start ddrescue, and the transcript if we're saving one"""
+        logger.debug("Recovery().start(): Running ddrescue with: '"+' '.join(exec_list)+"'...")
+
+        self.cmd = subprocess.Popen(exec_list, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        #Save all of ddrescue's output next to the map file, as the output box only keeps
+        #the most recent lines.
+        if self.settings.get("SaveTranscript"):
+            transcript_path = Transcript.get_transcript_path(self.settings["MapFile"])
+
+            try:
+                self.transcript = Transcript.TranscriptWriter(
+                    transcript_path, compress=self.settings["CompressTranscript"])
+
+            except (IOError, OSError):
+                logger.warning("Recovery().start(): Couldn't create "+transcript_path+"! "
+                               "Not saving ddrescue's output...")
+
+        #Record the values ddrescue reports over time next to the map file too.
+        if self.settings.get("SaveMetrics"):
+            metrics_path = Metrics.get_metrics_path(self.settings["MapFile"])
+
+            try:
+                self.metrics = Metrics.MetricsWriter(metrics_path)
+
+            except (IOError, OSError):
+                logger.warning("Recovery().start(): Couldn't create "+metrics_path+"! "
+                               "Not saving the recovery's metrics...")
+
+    def stop(self):
+        """
+        Ask ddrescue to stop, as if Ctrl-C was pressed. This only works if we're allowed
+        to send signals to it (eg through sudo, which passes them on).
+        """
+
+        logger.info("Recovery().stop(): Asking ddrescue to stop...")
+
+        try:
+            self.cmd.send_signal(signal.SIGINT)
+
+        except OSError:
+            logger.warning("Recovery().stop(): Couldn't send SIGINT to ddrescue!")
+
+    def follow(self):
+        """Read ddrescue's output until it closes it"""
+        #Grab information from ddrescue in large chunks, one line at a time. The \r and
+        #\x1b[A sequences ddrescue uses to redraw its status are kept inside each line,
+        #because process_line() relies on the status message and the next status line
+        #arriving together.
+        for raw_line in Readers.ChunkedReader(self.cmd.stdout).read_records():
+            if self.transcript is not None:
+                try:
+                    self.transcript.write(raw_line)
+
+                except (IOError, OSError):
+                    logger.warning("Recovery().follow(): Couldn't write to ddrescue's "
+                                   "transcript! Not saving the rest of ddrescue's output...")
+
+                    self.transcript = None
+
+            line = raw_line.decode("utf-8", errors="ignore")
+            tidy_line = line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
+
+            if tidy_line != "":
+                try:
+                    self.process_line(tidy_line)
+
+                except Exception:
+                    #Handle unexpected errors. Can happen once in normal operation on
+                    #ddrescue v1.22+. TODO make smarter, don't fill log with these.
+                    #TODO suppress 1st error if on new versions.
+                    logger.warning("Recovery().follow(): Unexpected error parsing ddrescue's "
+                                   "output! Can happen once on newer versions of ddrescue "
+                                   "(1.22+) in normal operation. Are you running a "
+                                   "newer/older version of ddrescue than we support?")
+
+            #The output box handles the carriage returns and \x1b[A (up one line)
+            #sequences itself.
+            self.snapshot.add_output(line)
+
+    def finish(self):
+        """
+        Wait for ddrescue to exit, and return the result of the recovery:
+        "NoInitialStatus", "BadReturnCode", or "Success".
+        """
+
+        #Make sure ddrescue's return code is available.
+        self.cmd.wait()
+        self.return_code = int(self.cmd.returncode)
+
+        if self.transcript is not None:
+            self.transcript.close()
+
+        if self.metrics is not None:
+            try:
+                self.metrics.close()
+
+            except (IOError, OSError):
+                logger.warning("Recovery().finish(): Couldn't write the recovery's metrics!")
+
+        #Check if we got ddrescue's init status, and if ddrescue exited with a status other
+        #than 0.
+        if self.got_initial_status is False:
+            logger.error("Recovery().finish(): We didn't get the initial status before "
+                         "ddrescue exited! Something has gone wrong...")
+
+            return "NoInitialStatus"
+
+        elif self.return_code != 0:
+            logger.error("Recovery().finish(): ddrescue exited with exit status "
+                         + unicode(self.return_code)+"! Something has gone wrong...")
+
+            return "BadReturnCode"
+
+        logger.info("Recovery().finish(): ddrescue finished recovering data...")
+        return "Success"
+
+    def process_line(self, line):
+        """
+        Process a given line to get ddrescue's current status and recovery information,
+        and put it in the snapshot.
+        """
+
+        values = self.parser.parse(line)
+        self.estimator.update(values)
+
+        if self.metrics is not None:
+            try:
+                self.metrics.record(values)
+
+            except (IOError, OSError):
+                logger.warning("Recovery().process_line(): Couldn't write the recovery's "
+                               "metrics! Not saving the rest of them...")
+
+                self.metrics = None
+
+        if "disk_capacity" in values and not self.got_initial_status:
+            logger.info("Recovery().process_line(): Got Initial Status...")
+
+            self.got_initial_status = True
+            self.disk_capacity = values["disk_capacity"]
+
+            if self.on_initial_status is not None:
+                self.on_initial_status()
+
+        if "status" in values and values["status"] != self.old_status:
+            self.snapshot.set(status=values["status"])
+            self.old_status = values["status"]
+
+        #Keep the latest values, and pass them on to the user.
+        for name in ("input_pos", "output_pos", "error_size", "current_read_rate",
+                     "average_read_rate", "num_errors", "time_since_last_read"):
+
+            if name in values:
+                setattr(self, name, values[name])
+                self.snapshot.set(**{name: values[name]})
+
+        #Only ddrescue 1.21+ reports this.
+        if "read_errors" in values:
+            self.read_errors = values["read_errors"]
+
+        if "recovered_data" in values:
+            self.recovered_data = values["recovered_data"]
+            self.estimator.sample()
+            self.time_remaining = self.calculate_time_remaining()
+            self.phase = self.estimator.phase
+
+            #The estimate is only for the current phase, so it goes with its phase.
+            self.snapshot.set(recovered_data=self.recovered_data,
+                              time_remaining=self.time_remaining, phase=self.phase)
+
+            #Don't crash if we're reading the initial status from the map file.
+            if self.disk_capacity:
+                self.snapshot.set(progress=(self.recovered_data, self.disk_capacity))
+
+        elif self.estimator.phase != self.phase:
+            #The old phase's estimate doesn't count any more, so don't wait for the next
+            #status update to replace it.
+            self.time_remaining = self.calculate_time_remaining()
+            self.phase = self.estimator.phase
+
+            self.snapshot.set(time_remaining=self.time_remaining, phase=self.phase)
+
+    def calculate_time_remaining(self):
+        """
+        Estimate the time left in the current phase of the recovery (see self.phase), not
+        the whole recovery. Returns the estimate, and the shortest and longest it is likely
+        to take, in seconds, or None if we can't tell yet. Tools.estimator.format_estimate()
+        formats it for display.
+        """
+
+        return self.estimator.estimate()
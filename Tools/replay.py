@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Replay Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Replays recorded ddrescue output (eg a transcript saved next to a map file) through the
+same path as a real recovery: Recovery's reading and parsing of each line, the snapshot,
+and formatting the values and drawing the output box like the GUI does. This can be done
+at full speed, or at a simulated rate, and the time and memory used are measured. Nothing
+here needs wx, root access, or a real disk.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import os
+import sys
+import threading
+import time
+
+try:
+    import tracemalloc
+
+except ImportError:
+    #Python 2 can't measure allocations.
+    tracemalloc = None #pylint: disable=invalid-name
+
+#Import tools modules.
+from . import estimator as Estimator
+from . import recovery as Recovery
+from . import snapshot as Snapshot
+from . import terminal as Terminal
+from . import units as Units
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Use CPU time, rather than wall-clock time, where we can.
+if hasattr(time, "process_time"):
+    CPU_TIME = time.process_time #pylint: disable=no-member
+
+else:
+    CPU_TIME = time.clock #pylint: disable=no-member
+
+#How often to update the display (like SETTINGS["DisplayRefreshRate"]), and how many
+#rows to keep in the output box (like SETTINGS["OutputBoxLines"]), by default.
+REFRESH_RATE = 5
+OUTPUT_BOX_LINES = 10000
+
+class ReplayProcess(object):
+    """
+    Stands in for the subprocess.Popen object of a ddrescue process, feeding the recorded
+    output to Recovery through a pipe. If rate is given, no more than rate lines are sent
+    each second.
+    """
+
+    def __init__(self, data, rate=None):
+        """Start sending data through the pipe"""
+        read_descriptor, self.write_descriptor = os.pipe()
+        self.stdout = os.fdopen(read_descriptor, "rb")
+        self.returncode = None
+
+        #Keep the carriage returns inside the lines, like Recovery.follow() does.
+        lines = [line+b"\n" for line in data.split(b"\n")]
+        lines[-1] = lines[-1][:-1]
+
+        self.thread = threading.Thread(target=self.send, args=(lines, rate))
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, data):
+        """Write all of data to the pipe"""
+        while data:
+            data = data[os.write(self.write_descriptor, data):]
+
+    def send(self, lines, rate):
+        """Send the lines, pacing them if a rate is given, then close the pipe"""
+        try:
+            if rate is None:
+                self.write(b"".join(lines))
+                return
+
+            start = time.time()
+            sent = 0
+
+            while sent < len(lines):
+                elapsed = time.time() - start
+                due = min(int(elapsed * rate) + 1, len(lines))
+
+                if due > sent:
+                    self.write(b"".join(lines[sent:due]))
+                    sent = due
+
+                else:
+                    #Wait until the next line is due.
+                    time.sleep(min(sent / rate - elapsed, 0.1))
+
+        finally:
+            os.close(self.write_descriptor)
+
+    def wait(self):
+        """Wait until all of the output has been sent. Like ddrescue exiting normally"""
+        self.thread.join()
+        self.returncode = 0
+
+        return self.returncode
+
+class ReplayDisplay(object):
+    """Does the GUI's work of showing the changes in the snapshot, without wx"""
+
+    def __init__(self, snapshot, max_rows=OUTPUT_BOX_LINES):
+        """Initialise the display"""
+        self.snapshot = snapshot
+        self.terminal = Terminal.VirtualTerminal(max_rows=max_rows)
+        self.labels = {}
+        self.updates = 0
+
+    def update(self):
+        """Format the values that changed, and draw the new output"""
+        changes, output = self.snapshot.take_changes()
+
+        for name, value in changes.items():
+            if name in Units.FORMATTERS:
+                self.labels[name] = Units.format_value(name, value)
+
+            elif name == "time_remaining":
+                self.labels[name] = Estimator.format_estimate(value)
+
+        self.terminal.write(output)
+        self.terminal.take_dropped_rows()
+        self.terminal.take_dirty_rows()
+        self.updates += 1
+
+class ReplayResult(object): #pylint: disable=too-few-public-methods
+    """The results of a replay"""
+
+    def __init__(self, recovery, display, result, lines, cpu_time, wall_time,
+                 peak_memory=None):
+        """Keep the results"""
+        self.recovery = recovery
+        self.display = display
+        self.result = result
+        self.lines = lines
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+        self.peak_memory = peak_memory
+
+def count_lines(data):
+    """Count the lines Recovery will process in data, like Recovery.follow() does"""
+    return sum(1 for line in data.split(b"\n")
+               if line.replace(b"\r", b"").replace(b"\x1b[A", b"") != b"")
+
+def replay(data, ddrescue_version, rate=None, refresh_rate=REFRESH_RATE,
+           trace_allocations=False):
+    """
+    Replay data (bytes recorded from ddrescue's stdout) as if it was from the given
+    version of ddrescue. If rate is given, only send rate lines a second. If
+    trace_allocations is True, and we can, measure the peak memory allocated while
+    replaying (this makes it a lot slower). Returns a ReplayResult.
+    """
+
+    settings = {"DDRescueVersion": ddrescue_version, "SaveTranscript": False,
+                "SaveMetrics": False}
+
+    snapshot = Snapshot.RecoverySnapshot()
+    recovery = Recovery.Recovery(settings, snapshot)
+    display = ReplayDisplay(snapshot)
+
+    trace_allocations = trace_allocations and tracemalloc is not None
+
+    if trace_allocations:
+        tracemalloc.start()
+
+    start_cpu_time = CPU_TIME()
+    start_time = time.time()
+
+    recovery.cmd = ReplayProcess(data, rate)
+
+    #Follow the output in another thread, and update the display from this one, like
+    #BackendThread and DisplayUpdateThread.
+    follow_thread = threading.Thread(target=recovery.follow)
+    follow_thread.start()
+
+    while follow_thread.is_alive():
+        follow_thread.join(1 / refresh_rate)
+        display.update()
+
+    result = recovery.finish()
+    display.update()
+
+    cpu_time = CPU_TIME() - start_cpu_time
+    wall_time = time.time() - start_time
+    peak_memory = None
+
+    if trace_allocations:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    recovery.cmd.stdout.close()
+
+    return ReplayResult(recovery, display, result, count_lines(data), cpu_time, wall_time,
+                        peak_memory)
@@ -16,7 +16,8 @@
 # along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
 
 """
-This is used to run getdevinfo to obtain device information.
+This is used to run getdevinfo to obtain device information. The information is written
+to stdout a disk at a time, in the format in Tools/deviceinfo.py.
 """
 
 #Do future imports to support python 2.
@@ -31,9 +32,16 @@ import sys
 
 import getdevinfo #pylint: disable=import-error
 
+#This is run as a script, so deviceinfo is imported from next to it.
+import deviceinfo as DeviceInfo #pylint: disable=import-error
+
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
 
-sys.stdout.write(unicode(getdevinfo.getdevinfo.get_info()))
+#Write each line as soon as it is ready, so the GUI can show the disks as they arrive.
+for line in DeviceInfo.encode(getdevinfo.getdevinfo.get_info()):
+    sys.stdout.write(line+"\n")
+    sys.stdout.flush()
+
 sys.exit(0)
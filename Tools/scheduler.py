@@ -0,0 +1,354 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery Scheduler for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Runs several recoveries at once. Each Job has its own settings, snapshot and
+Strategy.StrategyRunner, and the Scheduler starts queued jobs while fewer than max_jobs are running.
+Jobs whose input disks are on the same bus (eg the same USB hub or disk controller)
+are never run together, because they would only slow each other down, and a failing
+disk can make its bus reset. If the Scheduler is given a Tools.journal.JobJournal,
+the queue is kept on disk, and jobs that were interrupted can be restored. None of
+this uses wx.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+#Import tools modules.
+from . import journal as Journal
+from . import snapshot as Snapshot
+from . import strategy as Strategy
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#What USB devices (eg "1-2" or "1-2.4") and PCI functions (eg "0000:00:1f.2") look like
+#in sysfs paths.
+USB_DEVICE_REGEX = re.compile(r"^\d+-[\d.]+$")
+PCI_FUNCTION_REGEX = re.compile(r"^[0-9a-f]{4}:[0-9a-f]{2}:[0-9a-f]{2}\.[0-7]$")
+
+def get_bus_from_path(sysfs_path):
+    """
+    Return the bus a disk is on from its device path in sysfs. For USB disks, this is
+    the hub the disk is plugged into. Otherwise, it is the PCI device (eg the SATA
+    controller, HBA or NVMe drive) the disk is attached to. Returns None if neither
+    was found.
+    """
+
+    components = sysfs_path.split("/")
+
+    #Look for the USB device closest to the disk first.
+    for number in range(len(components) - 1, -1, -1):
+        if USB_DEVICE_REGEX.match(components[number]):
+            return "/".join(components[:number])
+
+    for number in range(len(components) - 1, -1, -1):
+        if PCI_FUNCTION_REGEX.match(components[number]):
+            return "/".join(components[:number+1])
+
+    return None
+
+def get_bus(device, linux=True):
+    """
+    Return the bus the disk or partition at device (eg "/dev/sdb") is on, or None if
+    it isn't a disk or we can't tell.
+    """
+
+    if not linux or device[0:5] != "/dev/":
+        return None
+
+    sysfs_path = "/sys/class/block/"+os.path.basename(os.path.realpath(device))
+
+    if not os.path.exists(sysfs_path):
+        return None
+
+    return get_bus_from_path(os.path.realpath(sysfs_path))
+
+class Job(object): #pylint: disable=too-many-instance-attributes
+    """
+    One recovery in the Scheduler. state is "Queued", "Running" or "Finished", and
+    result is the result from Strategy.StrategyRunner.run() once the job has finished
+    (or "CouldNotStart" if ddrescue couldn't be run, "Aborted" if the user aborted it, or
+    "Failed" if something else went wrong).
+    """
+
+    def __init__(self, settings, ddrescue_command, bus=None, job_id=None, linux=True,
+                 stop=None): #pylint: disable=too-many-arguments
+        """Initialise the job, with its own copy of settings"""
+        if job_id is None:
+            job_id = Journal.new_job_id()
+
+        self.job_id = job_id
+        self.settings = dict(settings)
+        self.name = self.settings["InputFile"]
+        self.bus = bus
+
+        self.snapshot = Snapshot.RecoverySnapshot()
+        self.runner = Strategy.StrategyRunner(self.settings, self.snapshot, ddrescue_command,
+                                              linux=linux, stop=stop)
+
+        self.state = "Queued"
+        self.result = None
+        self.start_time = None
+        self.end_time = None
+
+    def get_elapsed_time(self):
+        """Return the number of seconds this job has been (or was) running for"""
+        if self.start_time is None:
+            return 0
+
+        elif self.end_time is None:
+            return time.time() - self.start_time
+
+        return self.end_time - self.start_time
+
+class Scheduler(object):
+    """
+    Runs queued jobs, with at most max_jobs running at once, and only one running on
+    each bus. ddrescue_command is how to start ddrescue (see
+    Recovery.build_exec_list()). on_job_finished, if given, is called with each job when
+    it finishes, from the job's thread. journal, if given, is a Journal.JobJournal that
+    every change to the queue is recorded in. stop, if given, is how to stop each job's
+    ddrescue (see Strategy.StrategyRunner).
+    """
+
+    def __init__(self, ddrescue_command, max_jobs=2, linux=True, on_job_finished=None,
+                 journal=None, stop=None): #pylint: disable=too-many-arguments
+        """Initialise the scheduler"""
+        self.ddrescue_command = ddrescue_command
+        self.stop = stop
+        self.max_jobs = max_jobs
+        self.linux = linux
+        self.on_job_finished = on_job_finished
+        self.journal = journal
+
+        self.lock = threading.RLock()
+        self.jobs = []
+        self.threads = []
+        self.running = False
+
+    def add_job(self, settings, job_id=None):
+        """
+        Queue a recovery with the given settings, and return its Job. job_id is only
+        given for jobs that are already in the journal.
+        """
+
+        job = Job(settings, self.ddrescue_command, job_id=job_id, linux=self.linux,
+                  bus=get_bus(settings["InputFile"], linux=self.linux), stop=self.stop)
+
+        if self.journal is not None and job_id is None:
+            self.journal.add(job.job_id, job.settings)
+
+        logger.info("Scheduler().add_job(): Queued recovery of "+job.name+" (bus: "
+                    + unicode(job.bus)+")...")
+
+        with self.lock:
+            self.jobs.append(job)
+
+            if self.running:
+                self.schedule()
+
+        return job
+
+    def remove_job(self, job):
+        """Remove a job, if it hasn't started yet. Returns True if it was removed"""
+        with self.lock:
+            if job.state != "Queued":
+                return False
+
+            self.jobs.remove(job)
+
+        if self.journal is not None:
+            self.journal.remove(job.job_id)
+
+        return True
+
+    def abort_job(self, job):
+        """
+        Abort a job. Queued jobs are removed, and running ones have their ddrescue
+        stopped, without touching any other job. Returns False if the job had already
+        finished.
+        """
+
+        if self.remove_job(job):
+            return True
+
+        with self.lock:
+            if job.state != "Running":
+                return False
+
+            logger.info("Scheduler().abort_job(): Aborting the recovery of "+job.name+"...")
+
+            #Don't run any more of the job's stages.
+            job.runner.abort()
+
+        job.runner.stop_ddrescue()
+        return True
+
+    def restore_jobs(self, overrides=None):
+        """
+        Queue the jobs in the journal that didn't finish, and return them. overrides is
+        a dictionary of settings to change (eg the version of ddrescue, in case it has
+        been updated since). ddrescue will pick up where it left off from the map files.
+        """
+
+        if self.journal is None:
+            return []
+
+        jobs = []
+
+        with self.lock:
+            known_ids = set(job.job_id for job in self.jobs)
+
+        for job_id, settings in self.journal.get_pending():
+            if job_id in known_ids:
+                continue
+
+            settings.update(overrides or {})
+
+            logger.info("Scheduler().restore_jobs(): Restoring the recovery of "
+                        + settings["InputFile"]+" from the journal...")
+
+            jobs.append(self.add_job(settings, job_id=job_id))
+
+        return jobs
+
+    def get_jobs(self):
+        """Return a list of all the jobs"""
+        with self.lock:
+            return list(self.jobs)
+
+    def set_max_jobs(self, max_jobs):
+        """Change how many jobs may run at once"""
+        with self.lock:
+            self.max_jobs = max_jobs
+
+            if self.running:
+                self.schedule()
+
+    def start(self):
+        """Start running jobs"""
+        with self.lock:
+            self.running = True
+            self.schedule()
+
+    def is_busy(self):
+        """Return True if any jobs are queued or running"""
+        with self.lock:
+            return any(job.state != "Finished" for job in self.jobs)
+
+    def schedule(self):
+        """Start as many queued jobs as we are allowed to"""
+        with self.lock:
+            running_jobs = [job for job in self.jobs if job.state == "Running"]
+            busy_buses = set(job.bus for job in running_jobs if job.bus is not None)
+
+            for job in self.jobs:
+                if len(running_jobs) >= self.max_jobs:
+                    break
+
+                if job.state != "Queued" or job.bus in busy_buses:
+                    continue
+
+                logger.info("Scheduler().schedule(): Starting recovery of "+job.name+"...")
+
+                job.state = "Running"
+                job.start_time = time.time()
+                running_jobs.append(job)
+
+                if job.bus is not None:
+                    busy_buses.add(job.bus)
+
+                thread = threading.Thread(target=self.run_job, args=(job,))
+                self.threads.append(thread)
+                thread.start()
+
+    def run_job(self, job):
+        """Run a job's recovery. Runs in the job's thread"""
+        if self.journal is not None:
+            self.journal.start(job.job_id)
+
+        result = "Failed"
+
+        try:
+            result = job.runner.run()
+
+        except (IOError, OSError):
+            logger.error("Scheduler().run_job(): Couldn't start ddrescue to recover "
+                         + job.name+"!")
+
+            result = "CouldNotStart"
+
+        except Exception: #pylint: disable=broad-except
+            logger.exception("Scheduler().run_job(): Unexpected error while recovering "
+                             + job.name+"!")
+
+            result = "Failed"
+
+        finally:
+            #ddrescue doesn't exit with 0 when it's interrupted.
+            if job.runner.aborted and result != "Success":
+                result = "Aborted"
+
+            logger.info("Scheduler().run_job(): Recovery of "+job.name+" ended with result: "
+                        + result+"...")
+
+            #Free the job's slot, whatever happened.
+            with self.lock:
+                job.result = result
+                job.end_time = time.time()
+                job.state = "Finished"
+
+            if self.journal is not None:
+                self.journal.finish(job.job_id, result)
+
+            if self.on_job_finished is not None:
+                self.on_job_finished(job)
+
+            #Start the next job, if there is one.
+            self.schedule()
+
+    def wait(self, timeout=None):
+        """Wait until all the jobs have finished. Returns False if we timed out"""
+        if timeout is not None:
+            end_time = time.time() + timeout
+
+        while self.is_busy():
+            if timeout is not None and time.time() >= end_time:
+                return False
+
+            time.sleep(0.1)
+
+        return True
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery Snapshot for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+The snapshot of a recovery's state that is shared between the backend and the GUI.
+The backend overwrites values in place as ddrescue reports them, and the GUI
+collects whatever has changed a few times a second, rather than being sent a
+separate event for every value on every line of ddrescue's output.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import sys
+import threading
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+class RecoverySnapshot(object):
+    """
+    Holds the latest value of each piece of recovery information (eg "input_pos"),
+    plus any of ddrescue's output that the GUI hasn't displayed yet.
+
+    Safe to use from more than one thread. Setting a value to what it already is
+    doesn't count as a change.
+    """
+
+    def __init__(self):
+        """Initialise the snapshot"""
+        self.lock = threading.Lock()
+
+        self.values = {}
+        self.changed = set()
+        self.output = []
+
+        #True when the GUI has been asked to update, but hasn't collected the changes yet.
+        self.update_requested = False
+
+    def set(self, **values):
+        """Overwrite the given values, eg set(input_pos="10 MB", num_errors="0")"""
+        with self.lock:
+            for name, value in values.items():
+                if name not in self.values or self.values[name] != value:
+                    self.values[name] = value
+                    self.changed.add(name)
+
+    def get(self, name, default=None):
+        """Return the latest value for name, or default if we don't have one yet"""
+        with self.lock:
+            return self.values.get(name, default)
+
+    def add_output(self, text):
+        """Queue some of ddrescue's output to be added to the output box"""
+        with self.lock:
+            self.output.append(text)
+
+    def request_update(self):
+        """
+        Return True if there are changes the GUI hasn't been asked to collect yet.
+        When True is returned, the caller must make sure take_changes() gets called,
+        and this will return False until it has been, so that requests can't pile up
+        in the GUI's event queue.
+        """
+
+        with self.lock:
+            if self.update_requested or (not self.changed and not self.output):
+                return False
+
+            self.update_requested = True
+            return True
+
+    def take_changes(self):
+        """
+        Return a dictionary of the values that have changed since the last call,
+        and all of the queued output joined together, then forget about them.
+        """
+
+        with self.lock:
+            changes = dict((name, self.values[name]) for name in self.changed)
+            output = "".join(self.output)
+
+            self.changed = set()
+            self.output = []
+            self.update_requested = False
+
+        return changes, output
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Startup Cache Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Remembers what the GUI found out last time it started, so the main window can be shown
+straight away instead of waiting for "ddrescue --version" and getdevinfo.
+
+The ddrescue version is kept with the path, modification time and size of the ddrescue
+that was run, so it is found again whenever ddrescue is upgraded or replaced. The disk
+information is kept with the boot ID, so it is only used until the next reboot, and even
+then it is only shown until the GUI has had a chance to look at the disks again.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import io
+import json
+import logging
+import os
+import sys
+
+#Import tools modules.
+from . import deviceinfo as DeviceInfo
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+#Where the GUI keeps its cache, next to the job journal.
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".ddrescue-gui", "startup.json")
+
+#Changes every time the computer boots. Linux only.
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+#Change this if the layout of the cache changes, so old caches are ignored.
+CACHE_VERSION = 1
+
+def get_boot_id(path=BOOT_ID_PATH):
+    """Return the current boot ID, or None if we can't tell"""
+    try:
+        with open(path, "r") as boot_id_file:
+            return boot_id_file.read().strip() or None
+
+    except (IOError, OSError):
+        return None
+
+def find_program(program):
+    """Return the full path to program, searching PATH if needed, or None if it isn't there"""
+    if os.sep in program:
+        paths = [program]
+
+    else:
+        paths = [os.path.join(directory, program)
+                 for directory in os.environ.get("PATH", "").split(os.pathsep)]
+
+    for path in paths:
+        if os.path.isfile(path):
+            return os.path.realpath(path)
+
+    return None
+
+def get_program_key(program):
+    """
+    Return the path, modification time and size of program, which change if it is
+    replaced, or None if it can't be found.
+    """
+
+    path = find_program(program)
+
+    if path is None:
+        return None
+
+    try:
+        stat = os.stat(path)
+
+    except OSError:
+        return None
+
+    return [path, stat.st_mtime, stat.st_size]
+
+class StartupCache(object):
+    """The cache at path"""
+
+    def __init__(self, path, boot_id_path=BOOT_ID_PATH):
+        """Load the cache"""
+        self.path = path
+        self.boot_id = get_boot_id(boot_id_path)
+        self.cache = {}
+
+        self.load()
+
+    def load(self):
+        """Read the cache, ignoring it if it's missing, invalid, or from another version"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with io.open(self.path, "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+
+        except (IOError, OSError, ValueError):
+            logger.warning("StartupCache().load(): Ignoring invalid cache "+self.path+"...")
+            return
+
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            logger.info("StartupCache().load(): Ignoring cache from another version...")
+            return
+
+        self.cache = cache
+
+    def save(self):
+        """
+        Write the cache. It is written next to the old one and renamed over it, so it is
+        never left half-written. The cache isn't important, so errors are only logged.
+        """
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = self.path+".new"
+
+        self.cache["version"] = CACHE_VERSION
+
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            with io.open(temp_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(unicode(json.dumps(self.cache, sort_keys=True, default=unicode)))
+
+            os.rename(temp_path, self.path)
+
+        except (IOError, OSError):
+            logger.warning("StartupCache().save(): Couldn't save the cache to "+self.path+"!")
+
+    def get_ddrescue_version(self, program):
+        """
+        Return the version of ddrescue, and whether it is a prerelease version, as found
+        last time program was run, or None if program has changed since then.
+        """
+
+        cached = self.cache.get("ddrescue")
+        key = get_program_key(program)
+
+        if not isinstance(cached, dict) or key is None or cached.get("program") != key:
+            return None
+
+        return cached["version"], cached["prerelease"]
+
+    def set_ddrescue_version(self, program, ddrescue_version, prerelease):
+        """Remember the version of ddrescue program is"""
+        key = get_program_key(program)
+
+        if key is None:
+            return
+
+        self.cache["ddrescue"] = {"program": key, "version": ddrescue_version,
+                                  "prerelease": prerelease}
+
+        self.save()
+
+    def get_diskinfo(self):
+        """
+        Return the disk information found last time, or None if we don't have it, or the
+        computer has been restarted since then (or we can't tell).
+        """
+
+        cached = self.cache.get("diskinfo")
+
+        if (self.boot_id is None or not isinstance(cached, dict)
+                or cached.get("boot_id") != self.boot_id
+                or not isinstance(cached.get("disks"), dict)):
+
+            return None
+
+        return dict((name, DeviceInfo.check_info(info))
+                    for name, info in cached["disks"].items())
+
+    def set_diskinfo(self, disk_info):
+        """Remember the disk information, for this boot"""
+        if self.boot_id is None:
+            return
+
+        self.cache["diskinfo"] = {"boot_id": self.boot_id, "disks": disk_info}
+        self.save()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Recovery Strategies for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Runs a recovery as a series of ddrescue passes over the same map file. Each Stage has
+its own ddrescue options, and can be stopped early (eg when the disk stops responding),
+leaving the rest of the work to the later stages. Getting the healthy areas off a
+dying disk first, and only then going back for the difficult areas, gets the most data
+back before the disk gets any worse. If settings["AdaptiveControl"] is set, a
+Controller.RateController can also restart ddrescue with adjusted options within a
+stage when the read rate collapses. None of this uses wx.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import logging
+import sys
+import threading
+import time
+
+#Import tools modules.
+from . import controller as Controller
+from . import recovery as Recovery
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Set up logging.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+class Stage(object): #pylint: disable=too-few-public-methods
+    """
+    One pass of a strategy. options are the ddrescue settings to use for it (see
+    Recovery.DEFAULT_OPTIONS), in place of the user's. The stage is stopped early if
+    nothing has been read for max_time_since_last_read seconds, if the current read
+    rate stays below min_rate bytes per second for rate_window seconds, or after
+    max_time seconds.
+    """
+
+    def __init__(self, name, options, max_time_since_last_read=None, min_rate=None,
+                 rate_window=60, max_time=None): #pylint: disable=too-many-arguments
+        """Initialise the stage"""
+        self.name = name
+        self.options = options
+        self.max_time_since_last_read = max_time_since_last_read
+        self.min_rate = min_rate
+        self.rate_window = rate_window
+        self.max_time = max_time
+
+#The strategies the user can pick, as lists of stages. Without one, a recovery is a
+#single pass with the user's settings.
+STRATEGIES = {
+    #Copy the healthy areas without trimming or scraping, and move on as soon as the
+    #disk struggles. Then trim the edges of the failed areas, scrape what's left from
+    #the other end, and finally retry the bad sectors.
+    "MultiPass": [
+        Stage("Copying healthy areas", {"NoSplit": "-n", "NoTrim": "-N", "Reverse": "",
+                                        "BadSectorRetries": ""},
+              max_time_since_last_read=300, min_rate=100000, rate_window=300),
+
+        Stage("Trimming failed areas", {"NoSplit": "-n", "NoTrim": "", "Reverse": "",
+                                        "BadSectorRetries": ""},
+              max_time_since_last_read=1800),
+
+        Stage("Scraping backwards", {"NoSplit": "", "NoTrim": "", "Reverse": "-R",
+                                     "BadSectorRetries": ""}),
+
+        Stage("Retrying bad sectors", {"NoSplit": "", "NoTrim": "", "Reverse": "",
+                                       "BadSectorRetries": "-r 3"}),
+    ],
+}
+
+#How to describe each strategy to the user.
+STRATEGY_DESCRIPTIONS = {"MultiPass": "Multi-pass (healthy areas first)"}
+
+def get_stages(settings):
+    """Return the stages for the strategy in settings (or a single pass if there isn't one)"""
+    if settings.get("Strategy"):
+        return STRATEGIES[settings["Strategy"]]
+
+    return [Stage("Recovering data", {})]
+
+class StrategyRunner(object): #pylint: disable=too-many-instance-attributes
+    """
+    Runs each stage of a recovery in turn, with a new Recovery.Recovery for each one,
+    reporting to the same snapshot. recovery and exec_list are for the current stage.
+
+    stop, if given, is called with ddrescue's process ID to stop it when a stage's stop
+    condition is met, or the controller restarts it, instead of Recovery.stop() (eg if
+    ddrescue is running as root, and we aren't). It must only stop that process.
+    on_initial_status, if given, is called when the first stage's initial status arrives.
+    """
+
+    def __init__(self, settings, snapshot, ddrescue_command, linux=True, stop=None,
+                 on_initial_status=None): #pylint: disable=too-many-arguments
+        """Initialise the runner, and prepare the first stage"""
+        self.settings = settings
+        self.snapshot = snapshot
+        self.ddrescue_command = ddrescue_command
+        self.linux = linux
+        self.stop = stop
+        self.on_initial_status = on_initial_status
+
+        self.stages = get_stages(settings)
+        self.results = []
+
+        #Changes the controller has made to the current stage's options.
+        self.controller = None
+        self.adjustments = {}
+
+        if settings.get("AdaptiveControl"):
+            self.controller = Controller.RateController()
+
+        self.aborted = False
+        self.got_initial_status = False
+
+        #How often to check the stop conditions.
+        self.interval = 1
+
+        self.stage_number = None
+        self.stage = None
+        self.stage_settings = None
+        self.recovery = None
+        self.exec_list = None
+        self.prepare_stage(0)
+
+    def prepare_stage(self, number):
+        """
+        Set up the Recovery and command for the given stage, with any adjustments the
+        controller has made
+        """
+
+        self.stage_number = number
+        self.stage = self.stages[number]
+
+        settings = dict(self.settings)
+        settings.update(self.stage.options)
+        settings.update(self.adjustments)
+
+        #ddrescue can't skip trimming before 1.18.
+        if int(settings["DDRescueVersion"].split(".")[1]) < 18:
+            settings["NoTrim"] = ""
+
+        self.stage_settings = settings
+        self.recovery = Recovery.Recovery(settings, self.snapshot,
+                                          on_initial_status=self.initial_status)
+
+        self.exec_list = Recovery.build_exec_list(settings, self.ddrescue_command,
+                                                  linux=self.linux)
+
+    def initial_status(self):
+        """Pass on the initial status from the first stage only"""
+        if not self.got_initial_status:
+            self.got_initial_status = True
+
+            if self.on_initial_status is not None:
+                self.on_initial_status()
+
+    def abort(self):
+        """
+        Stop ddrescue (within self.interval seconds), and don't start it again. Safe to
+        call from any thread, at any time.
+        """
+
+        self.aborted = True
+
+    def get_stop_reason(self, run_time, slow_since):
+        """
+        Return why the current stage should be stopped, or None if it shouldn't be,
+        and when the read rate first fell below the stage's minimum (or None).
+        """
+
+        stage = self.stage
+        recovery = self.recovery
+
+        if stage.max_time is not None and run_time >= stage.max_time:
+            return "it has run for "+unicode(int(run_time))+" seconds", slow_since
+
+        if (stage.max_time_since_last_read is not None
+                and recovery.time_since_last_read is not None
+                and recovery.time_since_last_read >= stage.max_time_since_last_read):
+
+            return ("nothing has been read for "+unicode(recovery.time_since_last_read)
+                    + " seconds"), slow_since
+
+        if stage.min_rate is None or recovery.current_read_rate is None:
+            return None, slow_since
+
+        if recovery.current_read_rate >= stage.min_rate:
+            return None, None
+
+        if slow_since is None:
+            return None, run_time
+
+        if run_time - slow_since >= stage.rate_window:
+            return ("the read rate has been below "+unicode(stage.min_rate)+" bytes/s for "
+                    + unicode(int(run_time - slow_since))+" seconds"), slow_since
+
+        return None, slow_since
+
+    def stop_ddrescue(self):
+        """Stop this runner's ddrescue, and no other"""
+        if self.recovery.cmd is None:
+            logger.warning("StrategyRunner().stop_ddrescue(): ddrescue hasn't been started "
+                           "yet! Not stopping it...")
+
+            return
+
+        if self.stop is not None:
+            self.stop(self.recovery.cmd.pid)
+
+        else:
+            self.recovery.stop()
+
+    def run_stage(self):
+        """
+        Run the current stage, restarting ddrescue whenever the controller adjusts the
+        options, and return its result.
+        """
+
+        logger.info("StrategyRunner().run_stage(): Starting stage "
+                    + unicode(self.stage_number+1)+" of "+unicode(len(self.stages))+": "
+                    + self.stage.name+"...")
+
+        if len(self.stages) > 1:
+            self.snapshot.set(status="Stage "+unicode(self.stage_number+1)+" of "
+                              + unicode(len(self.stages))+": "+self.stage.name+"...")
+
+        stage_start_time = time.time()
+        stopped = False
+        result = "Aborted"
+
+        while True:
+            #We might have been aborted while getting ready, eg to restart ddrescue.
+            if self.aborted:
+                logger.info("StrategyRunner().run_stage(): Aborted. Not starting ddrescue...")
+                break
+
+            self.recovery.start(self.exec_list)
+
+            #Follow ddrescue's output in another thread, and check the stop conditions
+            #in this one.
+            follow_thread = threading.Thread(target=self.recovery.follow)
+            follow_thread.start()
+
+            start_time = time.time()
+            slow_since = None
+            stopped = False
+            changes = None
+
+            while follow_thread.is_alive():
+                follow_thread.join(self.interval)
+
+                if stopped or changes or not follow_thread.is_alive():
+                    continue
+
+                if self.aborted:
+                    logger.info("StrategyRunner().run_stage(): Stopping "+self.stage.name
+                                + ", because the recovery was aborted...")
+
+                    stopped = True
+                    self.stop_ddrescue()
+                    continue
+
+                reason, slow_since = self.get_stop_reason(time.time() - stage_start_time,
+                                                          slow_since)
+
+                if reason is not None:
+                    logger.info("StrategyRunner().run_stage(): Stopping "+self.stage.name
+                                + ", because "+reason+"...")
+
+                    stopped = True
+                    self.stop_ddrescue()
+
+                elif self.controller is not None:
+                    changes = self.controller.check(self.stage_settings, self.recovery,
+                                                    time.time() - start_time)
+
+                    if changes:
+                        self.snapshot.set(status="Restarting ddrescue to "
+                                          + self.controller.decisions[-1][3]+"...")
+
+                        self.stop_ddrescue()
+
+            result = self.recovery.finish()
+
+            #If ddrescue finished (or failed) before it could be stopped, there's nothing
+            #to restart.
+            if not changes or result != "BadReturnCode" or self.aborted:
+                break
+
+            #Carry on from the same map file with the new options.
+            self.adjustments.update(changes)
+            self.prepare_stage(self.stage_number)
+
+        #ddrescue doesn't exit with 0 when it's interrupted, but we stopped it on purpose.
+        #Don't mistake an abort for a stop condition, though.
+        if self.aborted and result != "Success":
+            result = "Aborted"
+
+        elif stopped and result == "BadReturnCode":
+            result = "Stopped"
+
+        return result
+
+    def run(self):
+        """
+        Run each stage in turn. Returns "Success" if every stage finished or was stopped
+        by its stop conditions, "Aborted" if the recovery was aborted before ddrescue
+        finished, or otherwise the result of the stage that failed.
+        """
+
+        result = None
+
+        for number in range(len(self.stages)):
+            if number > 0:
+                #Each stage starts again from its own options.
+                self.adjustments = {}
+
+                if self.controller is not None:
+                    self.controller.reset()
+
+                self.prepare_stage(number)
+
+            result = self.run_stage()
+            self.results.append((self.stage.name, result))
+
+            if self.aborted:
+                logger.info("StrategyRunner().run(): Aborted. Not running any more stages...")
+                return result
+
+            if result not in ("Success", "Stopped"):
+                logger.error("StrategyRunner().run(): "+self.stage.name+" failed with "
+                             "result: "+result+". Not running any more stages...")
+
+                return result
+
+        return "Success"
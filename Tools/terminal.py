@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Virtual Terminal for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+A very small terminal emulator, used to work out what ddrescue's output should look
+like in the output box. ddrescue redraws its status with carriage returns and
+"cursor up" escape sequences, so we keep a screen of rows and a cursor, and keep
+track of which rows have changed so only those need redrawing.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import re
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#The control sequences we understand: carriage return, newline, and cursor up.
+CONTROL_REGEX = re.compile("(\r|\n|\x1b\\[A)")
+
+class VirtualTerminal(object):
+    """
+    Keeps a list of rows of text, and a cursor position (row and column).
+
+    Text overwrites whatever is under the cursor. Moving the cursor costs the same
+    however much output there has been, and rows that have changed since the
+    last call to take_dirty_rows() are tracked.
+
+    If max_rows is given, old rows are thrown away so that no more than about that
+    many are kept (rows are thrown away in batches, so there can be up to 10% more).
+    """
+
+    def __init__(self, max_rows=None):
+        """Initialise the terminal, with one empty row"""
+        self.max_rows = max_rows
+        self.rows = [""]
+        self.row = 0
+        self.column = 0
+
+        #The first row that has changed since take_dirty_rows() was last called.
+        #Rows are only ever changed close to the end, so everything after this
+        #is considered to have changed too.
+        self.first_dirty_row = 0
+
+        #The start of an escape sequence that was cut off at the end of the last write.
+        self.pending = ""
+
+        #The number of rows thrown away since take_dropped_rows() was last called.
+        self.dropped_rows = 0
+
+    def mark_dirty(self, row):
+        """Note that row (and so everything after it) needs redrawing"""
+        if self.first_dirty_row is None or row < self.first_dirty_row:
+            self.first_dirty_row = row
+
+    def write(self, text):
+        """Apply some of ddrescue's output to the screen"""
+        text = self.pending + text
+        self.pending = ""
+
+        #Keep the start of an escape sequence until we have the rest of it.
+        for prefix in ("\x1b[", "\x1b"):
+            if text.endswith(prefix):
+                text, self.pending = text[:-len(prefix)], prefix
+                break
+
+        for part in CONTROL_REGEX.split(text):
+            if part == "":
+                continue
+
+            elif part == "\r":
+                self.column = 0
+
+            elif part == "\n":
+                self.row += 1
+                self.column = 0
+
+                if self.row == len(self.rows):
+                    self.rows.append("")
+
+                    #The newline before this row is new too.
+                    self.mark_dirty(self.row - 1)
+
+                    if self.max_rows is not None and len(self.rows) > self.max_rows * 1.1:
+                        self.drop_old_rows()
+
+            elif part == "\x1b[A":
+                if self.row > 0:
+                    self.row -= 1
+
+            else:
+                row_text = self.rows[self.row]
+
+                #Pad with spaces if the cursor is past the end of the row.
+                if self.column > len(row_text):
+                    row_text += " " * (self.column - len(row_text))
+
+                self.rows[self.row] = (row_text[:self.column] + part
+                                       + row_text[self.column+len(part):])
+
+                self.column += len(part)
+                self.mark_dirty(self.row)
+
+    def drop_old_rows(self):
+        """Throw away the oldest rows, so that we have max_rows rows left"""
+        number = len(self.rows) - self.max_rows
+
+        del self.rows[:number]
+        self.row -= number
+        self.dropped_rows += number
+
+        if self.first_dirty_row is not None:
+            self.first_dirty_row = max(self.first_dirty_row - number, 0)
+
+    def take_dropped_rows(self):
+        """
+        Return the number of rows that have been thrown away from the start since this was
+        last called. The row numbers given by take_dirty_rows() are after these have gone.
+        """
+
+        number = self.dropped_rows
+        self.dropped_rows = 0
+
+        return number
+
+    def take_dirty_rows(self):
+        """
+        Return the number of the first row that has changed, and a list of that row and
+        all of the rows after it, then mark everything as clean. Returns (None, [])
+        if nothing has changed.
+        """
+
+        first_row = self.first_dirty_row
+        self.first_dirty_row = None
+
+        if first_row is None:
+            return None, []
+
+        return first_row, self.rows[first_row:]
+
+    def get_text(self):
+        """Return all of the text on the screen"""
+        return "\n".join(self.rows)
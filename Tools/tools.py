@@ -41,6 +41,11 @@ import plistlib
 import time
 import wx
 
+from . import broker as Broker
+from . import mounttable as MountTable
+from . import readers
+from . import recovery as Recovery
+
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
     unicode = str #pylint: disable=redefined-builtin,invalid-name
@@ -74,6 +79,14 @@ elif "wxMac" in wx.PlatformInfo:
 AUTH_DIALOG_OPEN = False
 APPICON = None
 
+#The privileged helper broker (Linux only), and whether it couldn't be started.
+BROKER = None
+BROKER_FAILED = False
+BROKER_LOCK = threading.Lock()
+
+#Where output files are mounted on Linux. The broker won't mount anything anywhere else.
+MOUNT_ROOT = Broker.MOUNT_ROOT
+
 #Set up logging.
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -346,12 +359,88 @@ def get_helper(cmd):
 
     return "pkexec "+helper
 
-def start_process(cmd, return_output=False, privileged=False):
-    """Start a given process, and return output and return value if needed"""
+def get_broker():
+    """
+    Return the privileged helper broker, starting it if it isn't running, or None if it
+    can't be started. Like start_process(), asks the user to authenticate again if they
+    dismiss the request.
+    """
+
+    global BROKER
+    global BROKER_FAILED
+
+    with BROKER_LOCK:
+        if BROKER is not None and BROKER.is_running():
+            return BROKER
+
+        if BROKER_FAILED:
+            return None
+
+        BROKER = Broker.BrokerClient(["pkexec", "/usr/share/ddrescue-gui/Tools/helpers/"
+                                      "runasroot_linux_broker.sh"])
+
+        while not BROKER.start():
+            if BROKER.return_code not in (126, 127):
+                #Don't try again, and run each command with its own helper instead.
+                logger.error("get_broker(): Couldn't start the privileged helper broker! "
+                             "Falling back to running each command with pkexec...")
+
+                BROKER = None
+                BROKER_FAILED = True
+                return None
+
+            logger.debug("get_broker(): Bad auth or dismissed by user. Trying again...")
+
+        return BROKER
+
+def stop_broker():
+    """Stop the privileged helper broker, if it is running"""
+    global BROKER
+
+    with BROKER_LOCK:
+        if BROKER is not None:
+            BROKER.stop()
+            BROKER = None
+
+def stop_ddrescue(pid):
+    """
+    Ask the ddrescue with process ID pid to stop, as if Ctrl-C was pressed. ddrescue runs
+    as root, so this is done as root, but only that ddrescue is stopped.
+    """
+
+    logger.info("stop_ddrescue(): Asking ddrescue (PID "+unicode(pid)+") to stop...")
+    return start_process("kill -INT "+unicode(pid), privileged=True)
+
+def start_process(cmd, return_output=False, privileged=False, on_line=None):
+    """
+    Start a given process, and return output and return value if needed. on_line, if
+    given, is called with each line of output as it arrives.
+    """
+
     #Save the command as it was passed, in case we need
     #to call recursively (pkexec auth failure/dismissal).
     origcmd = cmd
 
+    #Run privileged commands with the broker if we can, so the user only has to
+    #authenticate once, and we don't have to start pkexec every time.
+    if privileged and LINUX and Broker.is_allowed(shlex.split(cmd)):
+        broker = get_broker()
+        result = None
+
+        if broker is not None:
+            result = broker.run(shlex.split(cmd), on_line=on_line)
+
+        if result is not None:
+            retval, output = result
+
+            logger.debug("start_process(): Process (with broker): "+cmd+": Return Value: "
+                         +unicode(retval)+", output: \"\n\n"+'\n'.join(output)+"\"\n")
+
+            if not return_output:
+                return retval
+
+            return retval, '\n'.join(output)
+
     #If this is to be a privileged process, add the helper script to the cmdline.
     if privileged:
         if LINUX:
@@ -402,7 +491,13 @@ def start_process(cmd, return_output=False, privileged=False):
 
     #Save the output, and runcmd.returncode,
     #as they tend to reset fairly quickly. Handle unicode properly.
-    output = read(runcmd)
+    output = []
+
+    for line in read_lines(runcmd):
+        output.append(line)
+
+        if on_line is not None:
+            on_line(line)
 
     retval = int(runcmd.returncode)
 
@@ -414,7 +509,8 @@ def start_process(cmd, return_output=False, privileged=False):
         #Try again, auth dismissed / bad password 3 times.
         #A lot of recursion is allowed (~1000 times), so this shouldn't be a problem.
         logger.debug("start_process(): Bad auth or dismissed by user. Trying again...")
-        return start_process(cmd=origcmd, return_output=return_output, privileged=privileged)
+        return start_process(cmd=origcmd, return_output=return_output, privileged=privileged,
+                             on_line=on_line)
 
     if not return_output:
         #Return the return code back to whichever function ran this process, so it handles errors.
@@ -424,93 +520,83 @@ def start_process(cmd, return_output=False, privileged=False):
         #Return the return code, as well as the output.
         return retval, '\n'.join(output)
 
-def read(cmd, testing=False): #pylint: disable=redefined-variable-type
+def read(cmd, testing=False):
     """
-    Read the cmd's output char by char, but do as little processing as
-    possible to improve startup performance
+    Read all of the cmd's output, and return it as a list of lines.
+    See read_lines() for details.
     """
 
-    #Get ready to run the command(s).
-    #Read up to 100 empty "" characters after the process finishes to
-    #make sure we get all the output.
-    counter = 0
-    line = str(b"")
-    line_list = []
-
-    while cmd.poll() is None or counter < 100:
-        char = cmd.stdout.read(1)
+    return list(read_lines(cmd, testing=testing))
 
-        if char == b"":
-            counter += 1
-            continue
-
-        line += char
-
-        if char in (b"\n", b"\r"):
-            #Interpret as Unicode and remove "NULL" characters.
-            line = line.decode("UTF-8", errors="ignore").replace("\x00", "")
+def read_lines(cmd, testing=False):
+    """
+    Generator that reads the cmd's output in large chunks, and yields each line as
+    soon as it is complete, so large outputs can be streamed to the caller.
 
-            if testing:
-                line_list.append(line)
+    Lines end at "\\n" or "\\r". They are interpreted as unicode, and "NULL" characters
+    are removed. If testing is True, the line terminators are kept.
 
-            else:
-                line_list.append(line.replace("\n", "").replace("\r", ""))
-
-            #Reset line.
-            line = str(b"")
+    When the output ends, waits for cmd to exit, so cmd.returncode is always set afterwards.
+    """
 
-    #Catch it if there's not a newline at the end. TODO Note fix for WxFixBoot.
-    if line != b"":
+    for line in readers.ChunkedReader(cmd.stdout, separators=(b"\n", b"\r")).read_records():
         #Interpret as Unicode and remove "NULL" characters.
         line = line.decode("UTF-8", errors="ignore").replace("\x00", "")
 
         if testing:
-            line_list.append(line)
+            yield line
 
         else:
-            line_list.append(line.replace("\n", "").replace("\r", ""))
+            yield line.replace("\n", "").replace("\r", "")
+
+    cmd.wait()
+
+def get_ddrescue_program():
+    """Return the ddrescue to run: a stand-in if one is set, or the system's or bundled one"""
+    override = Recovery.get_ddrescue_override()
+
+    if override is not None:
+        return override
 
-    return line_list
+    elif LINUX:
+        return "ddrescue"
 
-def determine_ddrescue_version():
+    return RESOURCEPATH+"/ddrescue"
+
+def determine_ddrescue_version(cache=None):
     """
     Used to determine the version of ddrescue installed on the system,
     or (for macOS) bundled with the GUI.
 
     Handles -pre and -rc versions too, by stripping that information
     from the version string and warning the user.
-    """
-
-    #Use correct command.
-    if LINUX:
-        cmd = "ddrescue --version"
 
-    else:
-        cmd = RESOURCEPATH+"/ddrescue --version"
+    If cache (a StartupCache.StartupCache) is given, the version is taken from it
+    if ddrescue hasn't changed since it was saved, rather than running ddrescue.
+    """
 
-    ddrescue_version = \
-    start_process(cmd=cmd, return_output=True)[1].split("\n")[0].split(" ")[-1]
+    program = get_ddrescue_program()
+    cached = None
 
-    logger.info("ddrescue version "+ddrescue_version+"...")
+    if cache is not None:
+        cached = cache.get_ddrescue_version(program)
 
-    #Remove the -rc and -pre flags if they exist.
-    #But note if we are running a prerelease version so we can warn the user.
-    prerelease = False
+    if cached is not None:
+        ddrescue_version, prerelease = cached
+        logger.info("Using the ddrescue version found last time...")
 
-    if "-rc" in ddrescue_version:
-        prerelease = True
-        ddrescue_version = ddrescue_version.split("-rc")[0]
+    else:
+        ddrescue_version, prerelease = \
+        Recovery.parse_ddrescue_version(start_process(cmd=program+" --version",
+                                                      return_output=True)[1])
 
-    elif "-pre" in ddrescue_version:
-        prerelease = True
-        ddrescue_version = ddrescue_version.split("-pre")[0]
+        if cache is not None:
+            cache.set_ddrescue_version(program, ddrescue_version, prerelease)
 
-    #Ignore any monitor changes. eg: treat 1.19.5 as 1.19 - strip anything after that off.
-    ddrescue_version = '.'.join(ddrescue_version.split(".")[:2])
+    logger.info("ddrescue version "+ddrescue_version+"...")
 
     #Warn if not on a supported version.
-    if ddrescue_version not in ("1.14", "1.15", "1.16", "1.17", "1.18", "1.18.1", "1.19", "1.20",
-                                "1.21", "1.22", "1.23"):
+    if ddrescue_version not in Recovery.SUPPORTED_VERSIONS:
         logger.warning("Unsupported ddrescue version "+ddrescue_version+"! "
                        "Please upgrade DDRescue-GUI if possible.")
 
@@ -707,20 +793,25 @@ def is_mounted(partition, mount_point=None):
 
     if mount_point is None:
         logger.debug("is_mounted(): Checking if "+partition+" is mounted...")
-        mount_info = start_process("mount", return_output=True)[1]
 
-        disk_is_mounted = False
+        #LINUX fix: Accept any mountpoint when called with just one argument.
+        if LINUX:
+            disk_is_mounted = MountTable.get_table().is_mounted(partition)
 
-        #OS X fix: Handle paths with /tmp in them, as paths with /private/tmp.
-        if not LINUX and "/tmp" in partition:
-            partition = partition.replace("/tmp", "/private/tmp")
+        else:
+            mount_info = start_process("mount", return_output=True)[1]
 
-        #LINUX fix: Accept any mountpoint when called with just one argument.
-        for line in mount_info.split("\n"):
-            if len(line) != 0:
-                if line.split()[0] == partition or line.split()[2] == partition:
-                    disk_is_mounted = True
-                    break
+            disk_is_mounted = False
+
+            #OS X fix: Handle paths with /tmp in them, as paths with /private/tmp.
+            if "/tmp" in partition:
+                partition = partition.replace("/tmp", "/private/tmp")
+
+            for line in mount_info.split("\n"):
+                if len(line) != 0:
+                    if line.split()[0] == partition or line.split()[2] == partition:
+                        disk_is_mounted = True
+                        break
 
     else:
         #Check where it's mounted to.
@@ -748,16 +839,21 @@ def get_mount_point(partition):
     Otherwise, return None"""
     logger.info("get_mount_point(): Trying to get mount point of partition "+partition+"...")
 
-    mount_info = start_process("mount", return_output=True)[1]
     mount_point = None
 
-    for line in mount_info.split("\n"):
-        split_line = line.split()
+    if LINUX:
+        mount_point = MountTable.get_table().get_mount_point(partition)
 
-        if len(split_line) != 0:
-            if partition == split_line[0]:
-                mount_point = split_line[2]
-                break
+    else:
+        mount_info = start_process("mount", return_output=True)[1]
+
+        for line in mount_info.split("\n"):
+            split_line = line.split()
+
+            if len(split_line) != 0:
+                if partition == split_line[0]:
+                    mount_point = split_line[2]
+                    break
 
     if mount_point != None:
         logger.info("get_mount_point(): Found it! mount_point is "+mount_point+"...")
@@ -782,7 +878,11 @@ def mount_disk(partition, mount_point, options=""):
         logger.info("mount_disk(): Preparing to mount "+partition+" at "+mount_point
                     +" with no extra options...")
 
-    mount_info = start_process("mount", return_output=True)[1]
+    if LINUX:
+        mount_point_in_use = MountTable.get_table().is_mounted(mount_point)
+
+    else:
+        mount_point_in_use = mount_point in start_process("mount", return_output=True)[1]
 
     #There is a partition mounted here. Check if it's ours.
     if mount_point == get_mount_point(partition):
@@ -791,7 +891,7 @@ def mount_disk(partition, mount_point, options=""):
                      +mount_point+". Continuing...")
         return 0
 
-    elif mount_point in mount_info:
+    elif mount_point_in_use:
         #Something else is in the way. Unmount that partition, and continue.
         logger.warning("mount_disk(): Unmounting filesystem in the way at "+mount_point+"...")
         if unmount_disk(mount_point) != 0:
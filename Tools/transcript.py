@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Transcript Writer for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Saves the full, unaltered output of ddrescue to disk, as the output box only keeps the
+most recent lines. Files are rotated when they get too big, and can be compressed. When a
+recovery is resumed (or restarted for its next stage), the new output is added after the
+old, with a line between them to show where ddrescue was started again.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import gzip
+import os
+import sys
+import time
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Default size (in bytes, before compression) at which to start a new file, and
+#how many old files to keep.
+MAX_SIZE = 64 * 1024 * 1024
+BACKUPS = 5
+
+#Written between the output of each time ddrescue was run, when adding to a transcript.
+SESSION_SEPARATOR = "\n--- DDRescue-GUI: ddrescue started again at {0} ---\n"
+
+def get_transcript_path(map_file):
+    """Return the path to save the transcript of a recovery that uses map_file at"""
+    return map_file+".transcript"
+
+class TranscriptWriter(object):
+    """
+    Writes ddrescue's output to path (or path.gz if compressing).
+
+    When the file reaches max_size bytes, it is renamed to path.1 (path.1 to path.2, and
+    so on, keeping at most backups old files), and a new file is started. If the file
+    already exists, the output is added to the end, after SESSION_SEPARATOR. For
+    compressed files, the size of the existing file is its compressed size.
+    """
+
+    def __init__(self, path, max_size=MAX_SIZE, backups=BACKUPS, compress=False):
+        """Initialise the writer, and open the file, keeping any older transcript"""
+        self.max_size = max_size
+        self.backups = backups
+        self.compress = compress
+
+        if compress:
+            self.path = path+".gz"
+
+        else:
+            self.path = path
+
+        try:
+            self.size = os.path.getsize(self.path)
+
+        except OSError:
+            self.size = 0
+
+        self.transcript_file = self.open_file()
+
+        if self.size > 0:
+            self.write(SESSION_SEPARATOR.format(time.strftime("%Y-%m-%d %H:%M:%S"))
+                       .encode("utf-8"))
+
+    def open_file(self):
+        """Open self.path for adding to"""
+        if self.compress:
+            return gzip.open(self.path, "ab")
+
+        return open(self.path, "ab")
+
+    def get_backup_path(self, number):
+        """Return the path of old file number number"""
+        if self.compress:
+            return self.path[:-3]+"."+unicode(number)+".gz"
+
+        return self.path+"."+unicode(number)
+
+    def rotate(self):
+        """Move the current file out of the way, deleting the oldest one, and start a new one"""
+        self.transcript_file.close()
+
+        if self.backups > 0:
+            for number in range(self.backups - 1, 0, -1):
+                if os.path.exists(self.get_backup_path(number)):
+                    os.rename(self.get_backup_path(number), self.get_backup_path(number + 1))
+
+            os.rename(self.path, self.get_backup_path(1))
+
+        self.size = 0
+        self.transcript_file = self.open_file()
+
+    def write(self, data):
+        """Write some of ddrescue's output (bytes)"""
+        if self.size >= self.max_size:
+            self.rotate()
+
+        self.transcript_file.write(data)
+        self.size += len(data)
+
+    def close(self):
+        """Close the file"""
+        self.transcript_file.close()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Units Tools for DDRescue-GUI Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Conversion between sizes as ddrescue writes them (eg "12345 MB") and integer numbers
+of bytes, and formatting of bytes, rates and times for display.
+
+Everything else keeps sizes and positions as integer numbers of bytes, rates in bytes
+per second, and times in seconds. They are only formatted when they are shown, through
+format_value(), which remembers the values it has formatted recently.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import functools
+import sys
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#SI prefixes, in order. ddrescue uses "k" for kilo, but accept "K" too.
+PREFIXES = ["", "k", "M", "G", "T", "P", "E", "Z", "Y"]
+
+#How many formatted values each formatter remembers.
+CACHE_SIZE = 1024
+
+def cached(function):
+    """
+    Remember what function (which takes one value) returned for recent values, as most
+    values are the same from one status update to the next.
+    """
+
+    cache = {}
+
+    @functools.wraps(function)
+    def wrapper(value):
+        """Return the remembered result, or call function and remember its result"""
+        try:
+            return cache[value]
+
+        except KeyError:
+            #Start again rather than growing forever.
+            if len(cache) >= CACHE_SIZE:
+                cache.clear()
+
+            result = cache[value] = function(value)
+            return result
+
+    wrapper.cache = cache
+    return wrapper
+
+def to_bytes(number, prefix="", binary=False):
+    """
+    Convert a number and unit prefix as written by ddrescue (eg "12345", "M")
+    to an integer number of bytes. binary means the prefix is a power of 1024
+    (eg "MiB"), rather than 1000.
+    """
+
+    if binary:
+        base = 1024
+
+    else:
+        base = 1000
+
+    return int(round(float(number) * base**PREFIXES.index(prefix.replace("K", "k"))))
+
+@cached
+def format_size(num_bytes):
+    """Format a number of bytes for display, eg 12345000000 -> "12.35 GB\""""
+    if num_bytes is None:
+        return "Unknown"
+
+    power = 0
+    value = num_bytes
+
+    while abs(value) >= 1000 and power < len(PREFIXES) - 1:
+        value /= 1000
+        power += 1
+
+    if power == 0:
+        return unicode(int(value))+" B"
+
+    return unicode(round(value, 2))+" "+PREFIXES[power]+"B"
+
+@cached
+def format_rate(bytes_per_second):
+    """Format a rate in bytes per second for display, eg 52428000 -> "52.43 MB/s\""""
+    if bytes_per_second is None:
+        return "Unknown"
+
+    return format_size(bytes_per_second)+"/s"
+
+@cached
+def format_duration(seconds):
+    """
+    Format a number of seconds for display, in seconds, minutes, hours, or days,
+    to make the value as understandable as possible.
+    """
+
+    if seconds is None:
+        return "Unknown"
+
+    if seconds <= 60:
+        return unicode(int(round(seconds)))+" seconds"
+
+    elif seconds <= 3600:
+        return unicode(round(seconds/60, 1))+" minutes"
+
+    elif seconds <= 86400:
+        return unicode(round(seconds/3600, 2))+" hours"
+
+    return unicode(round(seconds/86400, 2))+" days"
+
+def format_time_since_last_read(seconds):
+    """Format the time since ddrescue last read data for display. None means n/a."""
+    if seconds is None:
+        return "n/a"
+
+    return format_duration(seconds)
+
+#How to format each piece of recovery information.
+FORMATTERS = {"disk_capacity": format_size, "recovered_data": format_size,
+              "error_size": format_size, "input_pos": format_size, "output_pos": format_size,
+              "current_read_rate": format_rate, "average_read_rate": format_rate,
+              "time_since_last_read": format_time_since_last_read, "num_errors": unicode}
+
+def format_value(name, value):
+    """Format a piece of recovery information (eg "input_pos") for display"""
+    return FORMATTERS[name](value)
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# DDRescue-GUI Benchmarks Script Version 2.0.0
+# This file is part of DDRescue-GUI.
+# Copyright (C) 2013-2018 Hamish McIntyre-Bhatty
+# DDRescue-GUI is free software: you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 3 or,
+# at your option, any later version.
+#
+# DDRescue-GUI is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with DDRescue-GUI.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is used to run the benchmarks for DDRescue-GUI.
+Unlike the tests, these don't need root access, wxPython, or a display.
+"""
+
+#Do future imports to prepare to support python 3.
+#Use unicode strings rather than ASCII strings, as they fix potential problems.
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+
+#Import modules.
+import getopt
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+#Custom tools modules.
+from Tools import readers as Readers #pylint: disable=import-error
+from Tools import replay as Replay #pylint: disable=import-error
+from Tools.DDRescueTools import parser as DDRescueParser #pylint: disable=import-error
+
+#Make unicode an alias for str in Python 3.
+if sys.version_info[0] == 3:
+    unicode = str #pylint: disable=redefined-builtin,invalid-name
+
+#Global vars.
+VERSION = "2.0.0"
+
+#Use CPU time, rather than wall-clock time, where we can.
+if hasattr(time, "process_time"):
+    CPU_TIME = time.process_time #pylint: disable=no-member
+
+else:
+    CPU_TIME = time.clock #pylint: disable=no-member
+
+#One status update from ddrescue 1.22 -v, as it appears on ddrescue's stdout.
+STATUS_UPDATE = ("\r\x1b[A\x1b[A\x1b[A\x1b[A\x1b[A\x1b[A"
+                 "     ipos:   12345 MB, non-trimmed:        0 B,  current rate:  52428 kB/s\n"
+                 "     opos:   12345 MB, non-scraped:        0 B,  average rate:  50123 kB/s\n"
+                 "non-tried:  487762 MB,  bad-sector:        0 B,    error rate:       0 B/s\n"
+                 "  rescued:   12345 MB,   bad areas:        0,        run time:      4m  6s\n"
+                 "pct rescued:    2.46%, read errors:        0,  remaining time:      2h 40m\n"
+                 "                              time since last successful read:         n/a\n"
+                 "Copying non-tried blocks... Pass 1 (forwards)").encode("utf-8")
+
+#What ddrescue 1.22 -v writes before its first status update.
+BANNER = ("GNU ddrescue 1.22\n"
+          "About to copy 500 GBytes from /dev/sdb to /home/user/disk.img\n"
+          "    Starting positions: infile = 0 B,  outfile = 0 B\n"
+          "    Copy block size: 128 sectors       Initial skip size: 128 sectors\n"
+          "Sector size: 512 Bytes\n\n"
+          "Press Ctrl-C to interrupt\n").encode("utf-8")
+
+def usage():
+    """Outputs usage information"""
+    print("\nUsage: benchmarks.py [OPTION]\n\n")
+    print("Options:\n")
+    print("       -h, --help:                   Display this help text.")
+    print("       -r, --reader:                 Benchmark reading ddrescue's output.")
+    print("       -p, --parser:                 Benchmark parsing ddrescue's output.")
+    print("       -R, --replay:                 Benchmark following a whole recovery: reading,")
+    print("                                     parsing, and showing ddrescue's output.")
+    print("       -t, --rate:                   Replay this many lines a second, rather than")
+    print("                                     as fast as possible.")
+    print("       -s, --size:                   Amount of output to read, in MB. Default: 16.")
+    print("       -f, --file:                   Parse a recorded transcript of ddrescue's output")
+    print("                                     (eg <map file>.transcript), instead of fake")
+    print("                                     output.")
+    print("       -v, --version:                The version of ddrescue the transcript is from.")
+    print("                                     Default: 1.22.")
+    print("       -a, --all:                    Run all the benchmarks. The default.\n")
+    print("DDRescue-GUI "+VERSION+" is released under the GNU GPL VERSION 3")
+    print("Copyright (C) Hamish McIntyre-Bhatty 2013-2018")
+
+def create_fake_output(size_mb):
+    """Write at least size_mb MB of fake ddrescue output to a temporary file, and return its path"""
+    repeats = (size_mb * 1000000) // len(STATUS_UPDATE) + 1
+
+    handle, path = tempfile.mkstemp(prefix="ddrescue-gui-bench-")
+
+    with os.fdopen(handle, "wb") as output_file:
+        output_file.write(STATUS_UPDATE * repeats)
+
+    return path
+
+def read_one_char_at_a_time(cmd):
+    """
+    The way BackendThread used to read ddrescue's output (before using Readers.ChunkedReader).
+    Returns the number of lines read.
+    """
+
+    line = ""
+    char = " "
+    lines = 0
+
+    while cmd.poll() is None or char != "":
+        char = cmd.stdout.read(1).decode("utf-8")
+        line += char
+
+        if char == "\n":
+            line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
+            lines += 1
+            line = ""
+
+    return lines
+
+def read_in_chunks(cmd):
+    """The way BackendThread reads ddrescue's output now. Returns the number of lines read."""
+    lines = 0
+
+    for raw_line in Readers.ChunkedReader(cmd.stdout).read_records():
+        line = raw_line.decode("utf-8", errors="ignore")
+        line.replace("\n", "").replace("\r", "").replace("\x1b[A", "")
+        lines += 1
+
+    cmd.wait()
+
+    return lines
+
+def benchmark_reader(size_mb):
+    """Compare the CPU time used per MB of ddrescue output by the old and new reading loops"""
+    path = create_fake_output(size_mb)
+    actual_size_mb = os.path.getsize(path) / 1000000
+
+    print("Reading "+unicode(round(actual_size_mb, 2))+" MB of fake ddrescue output through "
+          "a pipe...\n")
+
+    results = {}
+
+    try:
+        for name, function in (("One char at a time", read_one_char_at_a_time),
+                               ("Chunked", read_in_chunks)):
+
+            cmd = subprocess.Popen(["cat", path], stdout=subprocess.PIPE)
+
+            start = CPU_TIME()
+            lines = function(cmd)
+            results[name] = (CPU_TIME() - start) / actual_size_mb
+
+            print(name+": "+unicode(lines)+" lines, "+unicode(round(results[name], 4))
+                  + " CPU seconds per MB")
+
+    finally:
+        os.remove(path)
+
+    if results["Chunked"] > 0:
+        print("\nSpeedup: "+unicode(round(results["One char at a time"]
+                                          / results["Chunked"], 1))+"x")
+
+def benchmark_parser(size_mb, path=None, ddrescue_version="1.22"):
+    """
+    Measure how fast ddrescue's output can be parsed, either from a recorded transcript
+    or from size_mb MB of fake output.
+    """
+
+    if path is None:
+        path = create_fake_output(size_mb)
+        remove = True
+
+    else:
+        remove = False
+
+    try:
+        with open(path, "rb") as transcript_file:
+            data = transcript_file.read()
+
+    finally:
+        if remove:
+            os.remove(path)
+
+    #Split the output into lines in the same way as BackendThread.
+    lines = []
+
+    for raw_line in data.split(b"\n"):
+        line = raw_line.decode("utf-8", errors="ignore")
+        line = line.replace("\r", "").replace("\x1b[A", "")
+
+        if line != "":
+            lines.append(line)
+
+    parser = DDRescueParser.StatusParser(ddrescue_version)
+
+    print("Parsing "+unicode(len(lines))+" lines of output from ddrescue "+ddrescue_version
+          + "...\n")
+
+    start = CPU_TIME()
+    values = 0
+
+    for line in lines:
+        values += len(parser.parse(line))
+
+    cpu_time = CPU_TIME() - start
+
+    print("Found "+unicode(values)+" values in "+unicode(round(cpu_time, 4))+" CPU seconds")
+
+    if cpu_time > 0:
+        print("Lines per second: "+unicode(int(len(lines) / cpu_time)))
+
+def benchmark_replay(size_mb, path=None, ddrescue_version="1.22", rate=None):
+    """
+    Measure how much time and memory following a recovery takes, by replaying a recorded
+    transcript, or size_mb MB of fake output, through Tools.replay.
+    """
+
+    if path is None:
+        fake_path = create_fake_output(size_mb)
+
+        try:
+            with open(fake_path, "rb") as output_file:
+                data = BANNER + output_file.read()
+
+        finally:
+            os.remove(fake_path)
+
+    else:
+        with open(path, "rb") as transcript_file:
+            data = transcript_file.read()
+
+    if rate is None:
+        speed = "as fast as possible"
+
+    else:
+        speed = "at "+unicode(rate)+" lines per second"
+
+    print("Replaying "+unicode(Replay.count_lines(data))+" lines of output from ddrescue "
+          + ddrescue_version+" "+speed+"...\n")
+
+    result = Replay.replay(data, ddrescue_version, rate=rate)
+
+    print("Result: "+result.result+", "+unicode(result.display.updates)+" display updates")
+    print("CPU time: "+unicode(round(result.cpu_time, 4))+" seconds")
+    print("Wall-clock time: "+unicode(round(result.wall_time, 4))+" seconds")
+
+    if result.cpu_time > 0:
+        print("Lines per CPU second: "+unicode(int(result.lines / result.cpu_time)))
+
+    #Measure the memory used separately, as it slows everything down.
+    if Replay.tracemalloc is not None:
+        result = Replay.replay(data, ddrescue_version, rate=rate, trace_allocations=True)
+        print("Peak memory allocated: "+unicode(result.peak_memory // 1000)+" kB")
+
+if __name__ == "__main__":
+    #Check all cmdline options are valid.
+    try:
+        OPTIONS = getopt.getopt(sys.argv[1:], "hrpRt:s:f:v:a",
+                                ["help", "reader", "parser", "replay", "rate=", "size=", "file=",
+                                 "version=", "all"])[0]
+
+    except getopt.GetoptError as err:
+        #Invalid option. Show the help message and then exit.
+        #Show the error.
+        print(unicode(err))
+        usage()
+        sys.exit(2)
+
+    BENCHMARKS = [benchmark_reader, benchmark_parser, benchmark_replay]
+    SIZE_MB = 16
+    RATE = None
+    TRANSCRIPT = None
+    DDRESCUE_VERSION = "1.22"
+
+    for o, a in OPTIONS:
+        if o in ["-r", "--reader"]:
+            BENCHMARKS = [benchmark_reader]
+        elif o in ["-p", "--parser"]:
+            BENCHMARKS = [benchmark_parser]
+        elif o in ["-R", "--replay"]:
+            BENCHMARKS = [benchmark_replay]
+        elif o in ["-t", "--rate"]:
+            RATE = float(a)
+        elif o in ["-s", "--size"]:
+            SIZE_MB = int(a)
+        elif o in ["-f", "--file"]:
+            TRANSCRIPT = a
+        elif o in ["-v", "--version"]:
+            DDRESCUE_VERSION = a
+        elif o in ["-a", "--all"]:
+            BENCHMARKS = [benchmark_reader, benchmark_parser, benchmark_replay]
+        elif o in ["-h", "--help"]:
+            usage()
+            sys.exit()
+        else:
+            assert False, "unhandled option"
+
+    for benchmark in BENCHMARKS:
+        print("\n\n---------------------------- "+benchmark.__name__
+              + " ----------------------------\n\n")
+
+        if benchmark == benchmark_parser:
+            benchmark(SIZE_MB, TRANSCRIPT, DDRESCUE_VERSION)
+
+        elif benchmark == benchmark_replay:
+            benchmark(SIZE_MB, TRANSCRIPT, DDRESCUE_VERSION, RATE)
+
+        else:
+            benchmark(SIZE_MB)
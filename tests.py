@@ -40,6 +40,30 @@ from Tools import tools as BackendTools #pylint: disable=import-error
 
 #Import test modules.
 from Tests import BackendToolsTests #pylint: disable=import-error
+from Tests import ReadersTests #pylint: disable=import-error
+from Tests import SnapshotTests #pylint: disable=import-error
+from Tests import TerminalTests #pylint: disable=import-error
+from Tests import TranscriptTests #pylint: disable=import-error
+from Tests import ParserTests #pylint: disable=import-error
+from Tests import UnitsTests #pylint: disable=import-error
+from Tests import MapFileTests #pylint: disable=import-error
+from Tests import BlockMapTests #pylint: disable=import-error
+from Tests import RecoveryTests #pylint: disable=import-error
+from Tests import HeadlessTests #pylint: disable=import-error
+from Tests import SchedulerTests #pylint: disable=import-error
+from Tests import JournalTests #pylint: disable=import-error
+from Tests import StrategyTests #pylint: disable=import-error
+from Tests import ControllerTests #pylint: disable=import-error
+from Tests import MetricsTests #pylint: disable=import-error
+from Tests import ExporterTests #pylint: disable=import-error
+from Tests import EstimatorTests #pylint: disable=import-error
+from Tests import ReplayTests #pylint: disable=import-error
+from Tests import FakeDDRescueTests #pylint: disable=import-error
+from Tests import BrokerTests #pylint: disable=import-error
+from Tests import MountTableTests #pylint: disable=import-error
+from Tests import InventoryTests #pylint: disable=import-error
+from Tests import DeviceInfoTests #pylint: disable=import-error
+from Tests import StartupCacheTests #pylint: disable=import-error
 
 #Make unicode an alias for str in Python 3.
 if sys.version_info[0] == 3:
@@ -56,6 +80,30 @@ def usage():
     print("       -d, --debug:                  Set logging level to debug; show all messages.")
     print("                                     Default: show only critical logging messages.\n")
     print("       -b, --backendtools:           Run tests for BackendTools module.")
+    print("       -r, --readers:                Run tests for Readers module.")
+    print("       -s, --snapshot:               Run tests for Snapshot module.")
+    print("       -e, --terminal:               Run tests for Terminal module.")
+    print("       -o, --transcript:             Run tests for Transcript module.")
+    print("       -p, --parser:                 Run tests for DDRescueTools parser module.")
+    print("       -u, --units:                  Run tests for Units module.")
+    print("       -f, --mapfile:                Run tests for MapFile module.")
+    print("       -l, --blockmap:               Run tests for BlockMap module.")
+    print("       -c, --recovery:               Run tests for Recovery module.")
+    print("       -g, --headless:               Run tests for Headless module.")
+    print("       -k, --scheduler:              Run tests for Scheduler module.")
+    print("       -j, --journal:                Run tests for Journal module.")
+    print("       -y, --strategy:               Run tests for Strategy module.")
+    print("       -n, --controller:             Run tests for Controller module.")
+    print("       -x, --metrics:                Run tests for Metrics module.")
+    print("       -w, --exporter:               Run tests for Exporter module.")
+    print("       -z, --estimator:              Run tests for Estimator module.")
+    print("       -i, --replay:                 Run tests for Replay module.")
+    print("       -q, --fakeddrescue:           Run tests for FakeDDRescue module.")
+    print("       -v, --broker:                 Run tests for Broker module.")
+    print("       -M, --mounttable:             Run tests for MountTable module.")
+    print("       -I, --inventory:              Run tests for Inventory module.")
+    print("       -D, --deviceinfo:             Run tests for DeviceInfo module.")
+    print("       -S, --startupcache:           Run tests for StartupCache module.")
     print("       -m, --main:                   Run tests for main file (DDRescue-GUI.py).")
     print("       -a, --all:                    Run all the tests. The default.\n")
     print("       -t, --tests:                  Ignored.")
@@ -69,8 +117,14 @@ if __name__ == "__main__":
 
     #Check all cmdline options are valid.
     try:
-        OPTIONS, ARGUMENTS = getopt.getopt(sys.argv[1:], "hdbmat", ["help", "debug", "backendtools",
-                                                                    "main", "all", "tests"])
+        OPTIONS, ARGUMENTS = getopt.getopt(sys.argv[1:], "hdbrseopuflcgkjynxwziqvMIDSmat",
+                                           ["help", "debug", "backendtools", "readers", "snapshot",
+                                            "terminal", "transcript", "parser", "units", "mapfile",
+                                            "blockmap", "recovery", "headless", "scheduler",
+                                            "journal", "strategy", "controller", "metrics",
+                                            "exporter", "estimator", "replay", "fakeddrescue",
+                                            "broker", "mounttable", "inventory", "deviceinfo",
+                                            "startupcache", "main", "all", "tests"])
 
     except getopt.GetoptError as err:
         #Invalid option. Show the help message and then exit.
@@ -80,7 +134,12 @@ if __name__ == "__main__":
         sys.exit(2)
 
 #Set up which tests to run based on options given.
-TEST_SUITES = [BackendToolsTests] #*** Set up full defaults when finished ***
+#*** Set up full defaults when finished ***
+TEST_SUITES = [BackendToolsTests, ReadersTests, SnapshotTests, TerminalTests, TranscriptTests,
+               ParserTests, UnitsTests, MapFileTests, BlockMapTests, RecoveryTests, HeadlessTests,
+               SchedulerTests, JournalTests, StrategyTests, ControllerTests, MetricsTests,
+               ExporterTests, EstimatorTests, ReplayTests, FakeDDRescueTests, BrokerTests,
+               MountTableTests, InventoryTests, DeviceInfoTests, StartupCacheTests]
 
 #Log only critical message by default.
 LOGGER_LEVEL = logging.CRITICAL
@@ -89,11 +148,64 @@ if __name__ == "__main__":
     for o, a in OPTIONS:
         if o in ["-b", "--backendtools"]:
             TEST_SUITES = [BackendToolsTests]
+        elif o in ["-r", "--readers"]:
+            TEST_SUITES = [ReadersTests]
+        elif o in ["-s", "--snapshot"]:
+            TEST_SUITES = [SnapshotTests]
+        elif o in ["-e", "--terminal"]:
+            TEST_SUITES = [TerminalTests]
+        elif o in ["-o", "--transcript"]:
+            TEST_SUITES = [TranscriptTests]
+        elif o in ["-p", "--parser"]:
+            TEST_SUITES = [ParserTests]
+        elif o in ["-u", "--units"]:
+            TEST_SUITES = [UnitsTests]
+        elif o in ["-f", "--mapfile"]:
+            TEST_SUITES = [MapFileTests]
+        elif o in ["-l", "--blockmap"]:
+            TEST_SUITES = [BlockMapTests]
+        elif o in ["-c", "--recovery"]:
+            TEST_SUITES = [RecoveryTests]
+        elif o in ["-g", "--headless"]:
+            TEST_SUITES = [HeadlessTests]
+        elif o in ["-k", "--scheduler"]:
+            TEST_SUITES = [SchedulerTests]
+        elif o in ["-j", "--journal"]:
+            TEST_SUITES = [JournalTests]
+        elif o in ["-y", "--strategy"]:
+            TEST_SUITES = [StrategyTests]
+        elif o in ["-n", "--controller"]:
+            TEST_SUITES = [ControllerTests]
+        elif o in ["-x", "--metrics"]:
+            TEST_SUITES = [MetricsTests]
+        elif o in ["-w", "--exporter"]:
+            TEST_SUITES = [ExporterTests]
+        elif o in ["-z", "--estimator"]:
+            TEST_SUITES = [EstimatorTests]
+        elif o in ["-i", "--replay"]:
+            TEST_SUITES = [ReplayTests]
+        elif o in ["-q", "--fakeddrescue"]:
+            TEST_SUITES = [FakeDDRescueTests]
+        elif o in ["-v", "--broker"]:
+            TEST_SUITES = [BrokerTests]
+        elif o in ["-M", "--mounttable"]:
+            TEST_SUITES = [MountTableTests]
+        elif o in ["-I", "--inventory"]:
+            TEST_SUITES = [InventoryTests]
+        elif o in ["-D", "--deviceinfo"]:
+            TEST_SUITES = [DeviceInfoTests]
+        elif o in ["-S", "--startupcache"]:
+            TEST_SUITES = [StartupCacheTests]
         elif o in ["-m", "--main"]:
             #TEST_SUITES = [MainTests]
             assert False, "Not implemented yet"
         elif o in ["-a", "--all"]:
-            TEST_SUITES = [BackendToolsTests]
+            TEST_SUITES = [BackendToolsTests, ReadersTests, SnapshotTests, TerminalTests,
+                           TranscriptTests, ParserTests, UnitsTests, MapFileTests, BlockMapTests,
+                           RecoveryTests, HeadlessTests, SchedulerTests, JournalTests,
+                           StrategyTests, ControllerTests, MetricsTests, ExporterTests,
+                           EstimatorTests, ReplayTests, FakeDDRescueTests, BrokerTests,
+                           MountTableTests, InventoryTests, DeviceInfoTests, StartupCacheTests]
             #TEST_SUITES.append(MainTests)
         elif o in ["-t", "--tests"]:
             pass